@@ -0,0 +1,90 @@
+# bench_backends.py
+# Per-step cost of the array-backed Verlet integration on the NumPy and Numba backends.
+#
+# Each scene is built once per backend from the same topology and stepped with the
+# same settings; the first steps (which include Numba's compilation) are excluded from
+# the timing. Without Numba installed, only the NumPy backend is measured.
+#
+# Usage: python benchmarks/bench_backends.py
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+
+from core.vector2d import Vector2D  # noqa: E402
+from src.core.particle_system import ParticleSystem  # noqa: E402
+from src.core.topology import Topology, grid_topology  # noqa: E402
+from src.integration.backends import BACKENDS, numba_available  # noqa: E402
+from src.integration.verlet import VerletIntegrator  # noqa: E402
+
+WARMUP_STEPS = 3
+STEPS = 20
+ITERATIONS = 8
+
+
+def cloths(count, size=32):
+    """count cloths of size x size particles, pinned along their top rows."""
+    topology = grid_topology(size, size, pattern=("structural", "shear")).replace(
+        fixed=np.arange(size * size) < size
+    )
+    return topology, [(k * (size + 4), 0.0) for k in range(count)]
+
+
+def ropes(count, length=500):
+    """count ropes of length particles, pinned at their first particle."""
+    positions = np.column_stack((np.zeros(length), np.arange(length, dtype=float)))
+    edges = np.column_stack((np.arange(length - 1), np.arange(1, length)))
+    topology = Topology(
+        positions, edges, np.ones(length - 1), fixed=np.arange(length) == 0
+    )
+    return topology, [(2.0 * k, 0.0) for k in range(count)]
+
+
+def time_per_step(topology, offsets, backend):
+    """Return the mean wall time (ms) of one integration step."""
+    system = ParticleSystem()
+    system.add_instances(topology, offsets)
+    integrator = VerletIntegrator(
+        system,
+        constraint_iterations=ITERATIONS,
+        gravity=Vector2D(0, 9.81),
+        backend=backend,
+    )
+    for _ in range(WARMUP_STEPS):
+        integrator.integrate(0.016)
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        integrator.integrate(0.016)
+    return (time.perf_counter() - start) / STEPS * 1e3, system.num_particles
+
+
+def main():
+    scenes = [
+        ("cloth 32x32 x1", *cloths(1)),
+        ("cloth 32x32 x100", *cloths(100)),
+        ("rope 500 x200", *ropes(200)),
+    ]
+    backends = BACKENDS if numba_available() else ("numpy",)
+    if not numba_available():
+        print("Numba is not installed; measuring the NumPy backend only.")
+    print(f"{ITERATIONS} constraint iterations per step, mean of {STEPS} steps")
+    header = f"{'scene':<20}{'particles':>10}"
+    header += "".join(f"{name + ' (ms)':>14}" for name in backends)
+    print(header + (f"{'speedup':>9}" if len(backends) > 1 else ""))
+    for name, topology, offsets in scenes:
+        times = [time_per_step(topology, offsets, backend) for backend in backends]
+        row = f"{name:<20}{times[0][1]:>10}"
+        row += "".join(f"{elapsed:>14.2f}" for elapsed, _ in times)
+        if len(times) > 1:
+            row += f"{times[0][0] / times[1][0]:>8.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
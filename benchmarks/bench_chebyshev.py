@@ -0,0 +1,122 @@
+# bench_chebyshev.py
+# Iterations-to-tolerance of the vectorized constraint solve, with and without
+# Chebyshev semi-iterative acceleration.
+#
+# Each scene is converted to an array-backed ParticleSystem and given a sudden yank:
+# every free particle starts the step moving away from the pins. One time step is then
+# solved with increasing iteration counts until the largest relative stretch of any
+# constraint falls below the tolerance. The unaccelerated Jacobi solve is compared
+# against several spectral radius estimates.
+#
+# Usage: python benchmarks/bench_chebyshev.py
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+
+from core.vector2d import Vector2D  # noqa: E402
+from objects.cloth import Cloth  # noqa: E402
+from objects.rope import Rope  # noqa: E402
+from src.core.particle_system import ParticleSystem  # noqa: E402
+from src.core.topology import Topology  # noqa: E402
+from src.integration.verlet import VerletIntegrator  # noqa: E402
+
+TOLERANCE = 1e-2
+MAX_ITERATIONS = 1 << 14
+YANK = 0.1
+WARMUP = 2
+
+
+def cloth_scene():
+    """A 16x16 cloth pinned at its two top corners."""
+    cloth = Cloth(16, 16)
+    topology = Topology.from_particles(cloth.particles, cloth.springs)
+    fixed = np.zeros(topology.num_particles, dtype=bool)
+    fixed[[0, 15]] = True
+    return topology.replace(fixed=fixed)
+
+
+def rope_scene():
+    """A 200-particle rope pinned at its first particle."""
+    rope = Rope(Vector2D(0.0, 0.0), 200, 1.0)
+    return Topology.from_particles(rope.particles, rope.springs)
+
+
+def max_stretch(system):
+    """Return the largest relative length error of any constraint."""
+    edges = system.edges
+    delta = system.positions[edges[:, 0]] - system.positions[edges[:, 1]]
+    length = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    return float(np.max(np.abs(length - system.rest_lengths) / system.rest_lengths))
+
+
+def solve_step(topology, iterations, rho):
+    """Solve one yanked time step and return the remaining stretch."""
+    system = ParticleSystem()
+    system.add_topology(topology)
+    free = system.inv_masses > 0
+    system.old_positions[free] -= (0.0, YANK)
+    integrator = VerletIntegrator(
+        system,
+        constraint_iterations=iterations,
+        damping=1.0,
+        gravity=Vector2D(0.0, 0.0),
+        chebyshev_rho=rho,
+        chebyshev_warmup=WARMUP,
+    )
+    integrator.integrate(1.0 / 60.0)
+    return max_stretch(system)
+
+
+def iterations_to_tolerance(topology, rho):
+    """
+    Return the smallest iteration count (found by doubling, then bisection) whose
+    step ends below the tolerance, or None if MAX_ITERATIONS is not enough.
+    """
+    high = 1
+    while solve_step(topology, high, rho) > TOLERANCE:
+        high *= 2
+        if high > MAX_ITERATIONS:
+            return None
+    low = high // 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if solve_step(topology, middle, rho) > TOLERANCE:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def main():
+    scenes = [
+        ("cloth 16x16", cloth_scene(), (0.9, 0.99, 0.995, 0.999)),
+        ("rope 200", rope_scene(), (0.9, 0.95, 0.99, 0.999)),
+    ]
+    print(f"tolerance: {TOLERANCE:g} relative stretch, warm-up: {WARMUP} iterations")
+    print(f"{'scene':<14}{'rho':>10}{'iterations':>12}{'speedup':>9}{'time (ms)':>11}")
+    for name, topology, estimates in scenes:
+        baseline = None
+        for rho in (None,) + estimates:
+            iterations = iterations_to_tolerance(topology, rho)
+            label = "jacobi" if rho is None else f"{rho:g}"
+            if iterations is None:
+                print(f"{name:<14}{label:>10}{'> ' + str(MAX_ITERATIONS):>12}")
+                continue
+            start = time.perf_counter()
+            solve_step(topology, iterations, rho)
+            elapsed = (time.perf_counter() - start) * 1e3
+            if rho is None:
+                baseline = iterations
+            speedup = f"{baseline / iterations:.1f}x" if baseline else "-"
+            print(f"{name:<14}{label:>10}{iterations:>12}{speedup:>9}{elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
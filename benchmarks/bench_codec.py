@@ -0,0 +1,77 @@
+# bench_codec.py
+# Size and speed of the quantized state codec on a falling field of cloth patches.
+#
+# Each setting encodes and decodes 60 frames (one keyframe interval) of a world with
+# 100k particles in 400 randomly kicked patches, each quantized on its own grid. Sizes are
+# compared with raw float64 positions.
+#
+# Usage: python benchmarks/bench_codec.py
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+
+from core.topology import grid_topology  # noqa: E402
+from core.vector2d import Vector2D  # noqa: E402
+from src.integration.codec import StateDecoder, StateEncoder, body_ranges  # noqa: E402
+from src.integration.world import PhysicsWorld  # noqa: E402
+
+FRAMES = 60
+SETTINGS = [(16, None), (16, "zlib"), (16, "lzma"), (24, None), (24, "zlib")]
+
+
+def record(count=400):
+    """Positions of count 16x16 patches over FRAMES steps."""
+    world = PhysicsWorld(gravity=Vector2D(0, 98.1), constraint_iterations=4)
+    offsets = [(60.0 * (k % 20), 60.0 * (k // 20)) for k in range(count)]
+    world.spawn(grid_topology(16, 16, spacing_x=3.0), offsets)
+    world.system.set_fixed(np.arange(0, 256 * count, 256))
+    # Random initial velocities, so that no two patches move alike
+    rng = np.random.default_rng(0)
+    world.system.old_positions[:] -= rng.normal(0, 0.5, (256 * count, 2))
+    frames = []
+    for _ in range(FRAMES):
+        world.step(1 / 60)
+        frames.append(world.system.positions.copy())
+    return world.system, frames
+
+
+def main():
+    system, frames = record()
+    ranges = body_ranges(system)
+    raw = frames[0].astype(np.float64).nbytes
+    print(f"{len(frames[0])} particles, raw {raw / 1e6:.2f} MB per frame")
+    print(
+        f"{'delta':>11}{'bits':>5}{'compression':>13}{'MB/frame':>10}{'ratio':>8}"
+        f"{'encode (ms)':>13}{'decode (ms)':>13}{'max error':>11}"
+    )
+    for delta in ("difference", "predicted"):
+        for bits, compression in SETTINGS:
+            encoder = StateEncoder(bits, compression=compression, delta=delta)
+            decoder = StateDecoder()
+            size = encode_time = decode_time = error = 0.0
+            for positions in frames:
+                start = time.perf_counter()
+                data = encoder.encode(positions, ranges)
+                encode_time += time.perf_counter() - start
+                start = time.perf_counter()
+                decoded = decoder.decode(data)
+                decode_time += time.perf_counter() - start
+                size += len(data)
+                error = max(error, np.abs(decoded - positions).max())
+            size /= FRAMES
+            print(
+                f"{delta:>11}{bits:>5}{str(compression):>13}{size / 1e6:>10.3f}{raw / size:>7.1f}x"
+                f"{encode_time / FRAMES * 1e3:>13.2f}"
+                f"{decode_time / FRAMES * 1e3:>13.2f}{error:>11.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
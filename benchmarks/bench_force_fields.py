@@ -0,0 +1,75 @@
+# bench_force_fields.py
+# Cost of applying wind to a large cloth: per-particle apply_force versus force fields.
+#
+# The loop is what ClothFlagScene used to do every frame; the fields add the same
+# (or a turbulent) wind to the whole particle array at once. "aerodynamics" is the
+# per-triangle lift and drag model on the same grid.
+#
+# Usage: python benchmarks/bench_force_fields.py
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.aerodynamics import ClothAerodynamics  # noqa: E402
+from core.force_field import (  # noqa: E402
+    DragField,
+    RadialField,
+    TurbulentWind,
+    UniformField,
+    box_region,
+)
+from core.topology import grid_topology, grid_triangles  # noqa: E402
+from core.vector2d import Vector2D  # noqa: E402
+from objects.cloth import Cloth  # noqa: E402
+from src.integration.world import PhysicsWorld  # noqa: E402
+
+REPEATS = 20
+
+
+def per_particle(size):
+    """Mean time (ms) of the per-particle wind loop on a size x size Cloth."""
+    cloth = Cloth(width=size, height=size)
+    wind = Vector2D(0.5, 0)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for particle in cloth.particles:
+            if not particle.is_fixed:
+                particle.apply_force(wind)
+    return (time.perf_counter() - start) / REPEATS * 1e3
+
+
+def field_time(world, field):
+    """Mean time (ms) of one application of a field."""
+    field.apply(world.system, 0.0, 1 / 60)
+    start = time.perf_counter()
+    for repeat in range(REPEATS):
+        field.apply(world.system, repeat / 60, 1 / 60)
+    return (time.perf_counter() - start) / REPEATS * 1e3
+
+
+def main():
+    fields = {
+        "uniform": UniformField((0.5, 0.0)),
+        "uniform, region": UniformField((0.5, 0.0), region=box_region(0, 0, 100, 100)),
+        "attractor": RadialField((150.0, 150.0), 100.0, falloff=2.0),
+        "turbulent": TurbulentWind((0.5, 0.0), turbulence=0.25, scale=20.0),
+        "drag": DragField(linear=0.1, quadratic=0.01),
+    }
+    names = list(fields) + ["aerodynamics"]
+    print(f"{'particles':>10}{'loop (ms)':>11}" + "".join(f"{n:>17}" for n in names))
+    for size in (32, 100, 316):
+        world = PhysicsWorld()
+        world.spawn(grid_topology(size, size), [(0.0, 0.0)])
+        loop = per_particle(size) if size <= 100 else float("nan")
+        sized = dict(fields, aerodynamics=ClothAerodynamics(grid_triangles(size, size)))
+        times = "".join(f"{field_time(world, f):>17.3f}" for f in sized.values())
+        print(f"{size * size:>10}{loop:>11.2f}{times}")
+
+
+if __name__ == "__main__":
+    main()
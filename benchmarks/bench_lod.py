@@ -0,0 +1,64 @@
+# bench_lod.py
+# Per-step cost of a large world with and without simulation level of detail.
+#
+# Ropes are laid out in a grid ten viewports wide, so about a tenth of them is on
+# screen; with level of detail the others are updated every fourth step with a single
+# constraint iteration. The first steps (which include the tier hold period) are
+# excluded from the timing.
+#
+# Usage: python benchmarks/bench_lod.py
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.vector2d import Vector2D  # noqa: E402
+from src.integration.world import PhysicsWorld  # noqa: E402
+from src.objects.rope import Rope  # noqa: E402
+
+VIEWPORT = (0, 0, 800, 600)
+WARMUP_STEPS = 15
+STEPS = 30
+
+
+def build(count, lod):
+    """A world with count 30-particle ropes spread over ten viewports."""
+    world = PhysicsWorld(gravity=Vector2D(0, 9.81), constraint_iterations=8)
+    columns = max(count // 5, 1)
+    for index in range(count):
+        row, column = divmod(index, columns)
+        x = 40 + column * 8000 / columns
+        world.add(Rope(Vector2D(x, 20 + row * 110), 30, 3.0))
+    if lod:
+        world.enable_lod(VIEWPORT)
+    return world
+
+
+def time_per_step(world):
+    """Return the mean wall time (ms) of one world step."""
+    for _ in range(WARMUP_STEPS):
+        world.step(0.016)
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        world.step(0.016)
+    return (time.perf_counter() - start) / STEPS * 1e3
+
+
+def main():
+    print(f"{'ropes':>6}{'full (ms)':>12}{'lod (ms)':>12}{'speedup':>9}  tiers")
+    for count in (100, 400, 1600):
+        full = time_per_step(build(count, lod=False))
+        world = build(count, lod=True)
+        reduced = time_per_step(world)
+        tiers = ", ".join(f"{k} {v}" for k, v in world.lod.counts().items() if v)
+        print(
+            f"{count:>6}{full:>12.2f}{reduced:>12.2f}{full / reduced:>8.1f}x  {tiers}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_picking.py
+# Cost of picking particles: scanning every particle versus the lazily rebuilt index.
+#
+# "build" is the first query (the grid is built), "query" a nearest or radius query
+# on an up-to-date index, and "after step" the first query after the world stepped,
+# which checks the index against the new positions (and rarely rebuilds it).
+#
+# Usage: python benchmarks/bench_picking.py
+
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.topology import grid_topology  # noqa: E402
+from src.integration.picking import ParticlePicker  # noqa: E402
+from src.integration.world import PhysicsWorld  # noqa: E402
+
+QUERIES = 200
+
+
+def scan(positions, x, y):
+    """The nearest particle found by scanning every particle."""
+    dx = positions[:, 0] - x
+    dy = positions[:, 1] - y
+    return int(np.argmin(dx * dx + dy * dy))
+
+
+def mean_ms(function, points):
+    """Mean time (ms) of a function over query points."""
+    start = time.perf_counter()
+    for x, y in points:
+        function(x, y)
+    return (time.perf_counter() - start) / len(points) * 1e3
+
+
+def main():
+    rng = np.random.default_rng(1)
+    print(
+        f"{'particles':>10}{'scan':>10}{'build':>10}{'nearest':>10}"
+        f"{'within':>10}{'after step':>12}{'rebuilds':>10}"
+    )
+    for size in (100, 316, 1000):
+        world = PhysicsWorld(gravity=None)
+        world.spawn(grid_topology(size, size), [(0.0, 0.0)])
+        points = rng.uniform(0, size - 1, (QUERIES, 2))
+        picker = ParticlePicker(world)
+        positions = world.system.positions
+
+        scanned = mean_ms(lambda x, y: scan(positions, x, y), points[:20])
+        start = time.perf_counter()
+        picker.nearest(*points[0])
+        build = (time.perf_counter() - start) * 1e3
+        nearest = mean_ms(picker.nearest, points)
+        within = mean_ms(lambda x, y: picker.within(x, y, 3.0), points)
+        stepped = []
+        for x, y in points[:10]:
+            world.step(1 / 60)
+            start = time.perf_counter()
+            picker.nearest(x, y)
+            stepped.append(time.perf_counter() - start)
+        print(
+            f"{size * size:>10}{scanned:>10.3f}{build:>10.1f}{nearest:>10.3f}"
+            f"{within:>10.3f}{np.mean(stepped) * 1e3:>12.2f}{picker.rebuilds:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
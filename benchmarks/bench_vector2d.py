@@ -0,0 +1,126 @@
+# bench_vector2d.py
+# Micro-benchmark of the object-based Vector2D hot paths.
+#
+# Compares the slotted Vector2D against an equivalent dict-backed vector that validates
+# every construction and has no in-place operators (the previous implementation), and
+# reports per-instance memory and the per-operation cost of a Verlet position update.
+#
+# Usage: python benchmarks/bench_vector2d.py
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.vector2d import Vector2D  # noqa: E402
+
+COUNT = 10_000
+REPEAT = 5
+
+
+class LegacyVector2D:
+    """Reference vector: no __slots__, validated constructor, out-of-place updates."""
+
+    def __init__(self, x=0.0, y=0.0):
+        if isinstance(x, LegacyVector2D):
+            raise TypeError("x cannot be a vector.")
+        if isinstance(y, LegacyVector2D):
+            raise TypeError("y cannot be a vector.")
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+            raise TypeError("x and y must be numeric values.")
+        self.x = x
+        self.y = y
+
+    def __add__(self, other):
+        if isinstance(other, LegacyVector2D):
+            return LegacyVector2D(self.x + other.x, self.y + other.y)
+        return LegacyVector2D(self.x + other, self.y + other)
+
+    def __sub__(self, other):
+        return LegacyVector2D(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, other):
+        return LegacyVector2D(self.x * other, self.y * other)
+
+    def copy(self):
+        return LegacyVector2D(self.x, self.y)
+
+
+def memory_per_instance(cls):
+    """Return the average number of bytes allocated per vector."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    vectors = [cls(float(i), float(i)) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del vectors
+    return allocated / COUNT
+
+
+def best_time(statement, setup_globals, setup="pass"):
+    """Return the best per-iteration time (in nanoseconds) of a statement."""
+    timer = timeit.Timer(statement, setup, globals=setup_globals)
+    return min(timer.repeat(repeat=REPEAT, number=COUNT)) / COUNT * 1e9
+
+
+def verlet_legacy(position, old_position, acceleration, dt):
+    velocity = position - old_position
+    old_position = position.copy()
+    position = position + (velocity + acceleration * (dt * dt))
+    return position, old_position
+
+
+def verlet_fast(position, old_position, acceleration, dt):
+    velocity = position - old_position
+    old_position = position.copy()
+    position += velocity
+    position.add_scaled(acceleration, dt * dt)
+    return position, old_position
+
+
+def main():
+    legacy = {
+        "V": LegacyVector2D,
+        "a": LegacyVector2D(1.0, 2.0),
+        "b": LegacyVector2D(3.0, 4.0),
+        "step": verlet_legacy,
+    }
+    fast = {
+        "V": Vector2D,
+        "a": Vector2D(1.0, 2.0),
+        "b": Vector2D(3.0, 4.0),
+        "step": verlet_fast,
+    }
+    rows = [
+        (
+            "bytes per vector",
+            memory_per_instance(LegacyVector2D),
+            memory_per_instance(Vector2D),
+        ),
+        (
+            "construct (ns)",
+            best_time("V(1.0, 2.0)", legacy),
+            best_time("V.unchecked(1.0, 2.0)", fast),
+        ),
+        ("a + b (ns)", best_time("a + b", legacy), best_time("a + b", fast)),
+        (
+            "a += b (ns)",
+            best_time("c += b", legacy, "c = a.copy()"),
+            best_time("c += b", fast, "c = a.copy()"),
+        ),
+        (
+            "verlet update (ns)",
+            best_time("step(a.copy(), b, b, 0.016)", legacy),
+            best_time("step(a.copy(), b, b, 0.016)", fast),
+        ),
+    ]
+    print(f"{'measure':<22}{'legacy':>12}{'Vector2D':>12}{'ratio':>8}")
+    for name, before, after in rows:
+        print(f"{name:<22}{before:>12.1f}{after:>12.1f}{before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,5 +11,8 @@ setup(
     install_requires=[
         "pygame>=2.6.1",
     ],
+    extras_require={
+        "numba": ["numba>=0.57"],
+    },
     python_requires=">=3.10",
 )
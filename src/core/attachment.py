@@ -0,0 +1,178 @@
+# attachment.py
+# Long-range attachment constraints that tie free particles to their nearest anchor.
+
+import heapq
+
+import numpy as np
+
+from .constraint_set import ConstraintSet, _remapped
+
+
+class AttachmentConstraints(ConstraintSet):
+    """
+    Unilateral long-range attachments (LRA) from free particles to fixed anchors.
+
+    Every free particle is attached to the fixed particle closest to it along the
+    constraint graph, with the geodesic (shortest path) distance as its rest length.
+    The constraint only acts when the particle is farther than that distance from its
+    anchor, pulling it straight back; slack is left alone. One vectorized pass bounds the
+    stretch of a pinned rope or cloth, which iterative distance constraints only achieve
+    after many iterations.
+
+    Inside a ParticleSystem the anchors are the covered particles that are fixed and
+    active (see prepare()); inverse masses are not used for this, since particles
+    frozen by level of detail have a zero inverse mass as well. On their own, the
+    anchors are the covered particles whose inverse mass is zero. The attachments are
+    computed on the first projection and recomputed only when that set of pins changes.
+    Particles with a zero inverse mass are never moved.
+
+    Attributes:
+        indices (np.ndarray): (M, 2) (particle, anchor) pairs.
+        rest_lengths (np.ndarray): (M,) geodesic distance from each particle to its anchor.
+        stiffness (np.ndarray): (M,) stiffness (0-1) of each attachment.
+        particles (np.ndarray): (P,) particles covered by the constraint graph.
+    """
+
+    arity = 2
+    separable = False
+
+    def __init__(self, edges, lengths, stiffness=1.0):
+        """
+        Initialize the attachments for a constraint graph.
+
+        Args:
+            edges (array-like): (E, 2) particle index pairs of the constraint graph.
+            lengths (array-like): (E,) length of each edge, usually its rest length.
+            stiffness (float, optional): Stiffness (0-1) of the attachments. Defaults to 1.0.
+
+        Raises:
+            ValueError: If the arrays do not match or the stiffness is out of range.
+        """
+        super().__init__((), stiffness)
+        edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        lengths = np.asarray(lengths, dtype=np.float64).reshape(-1)
+        if len(lengths) != len(edges):
+            raise ValueError("Each edge must have exactly one length.")
+        self.particles, local_edges = np.unique(edges, return_inverse=True)
+        local_edges = local_edges.reshape(-1, 2)
+        self._adjacency = [[] for _ in range(len(self.particles))]
+        for (i, j), length in zip(local_edges.tolist(), lengths.tolist()):
+            self._adjacency[i].append((j, length))
+            self._adjacency[j].append((i, length))
+        self._stiffness_value = float(stiffness)
+        self.rest_lengths = np.zeros(0)
+        self._pins = None
+        self._pinned_by_flags = False
+
+    def shifted(self, offset):
+        """Return a copy whose particle indices (and covered particles) are shifted."""
+        shifted = super().shifted(offset)
+        shifted.particles = self.particles + offset
+        return shifted
+
+    def span(self):
+        """Return the lowest and highest covered particle, or None if none is."""
+        if self.particles.size == 0:
+            return None
+        return int(self.particles.min()), int(self.particles.max())
+
+    def discard(self, start, stop):
+        """Report whether the set can stay attached once a particle range is removed."""
+        return not ((self.particles >= start) & (self.particles < stop)).any()
+
+    def remap(self, mapping):
+        """Renumber the particle indices (and covered particles) in place."""
+        super().remap(mapping)
+        self.particles = _remapped(self.particles, mapping)
+
+    def update(self, pinned):
+        """
+        Recompute the attachments for a set of pins.
+
+        Args:
+            pinned (array-like): (P,) mask of the pinned particles, aligned with
+                ``particles``.
+        """
+        pinned = np.asarray(pinned, dtype=bool)
+        anchors, distances = _nearest_sources(self._adjacency, np.flatnonzero(pinned))
+        attached = ~pinned & (anchors >= 0)
+        self.indices = np.column_stack(
+            (self.particles[attached], self.particles[anchors[attached]])
+        ).reshape(-1, 2)
+        self.rest_lengths = distances[attached]
+        self.stiffness = np.full(len(self.indices), self._stiffness_value)
+        self._pins = pinned
+
+    def prepare(self, system):
+        """
+        Take the pins from a system's fixed and active flags.
+
+        Args:
+            system (ParticleSystem): The system the set is attached to.
+        """
+        particles = self.particles
+        self._pinned_by_flags = True
+        self._refresh(system.fixed[particles] & system.active[particles])
+
+    def _refresh(self, pinned):
+        """Recompute the attachments if the pins changed."""
+        if self._pins is None or not np.array_equal(pinned, self._pins):
+            self.update(pinned)
+
+    def project(self, positions, inv_masses):
+        """
+        Pull every over-stretched particle back towards its anchor, in place.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions, updated in place.
+            inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        """
+        if not self._pinned_by_flags:
+            self._refresh(inv_masses[self.particles] == 0)
+        if len(self) == 0:
+            return
+        particle, anchor = self.indices[:, 0], self.indices[:, 1]
+        delta = positions[particle] - positions[anchor]
+        distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        stretched = (distance > self.rest_lengths) & (inv_masses[particle] > 0)
+        scale = np.zeros_like(distance)
+        scale[stretched] = (
+            self.stiffness[stretched]
+            * (distance[stretched] - self.rest_lengths[stretched])
+            / distance[stretched]
+        )
+        positions[particle] -= delta * scale[:, None]
+
+
+def _nearest_sources(adjacency, sources):
+    """
+    Multi-source Dijkstra: the closest source of every node along a weighted graph.
+
+    Args:
+        adjacency (list[list[tuple[int, float]]]): (neighbor, length) pairs of each node.
+        sources (array-like): The source nodes.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The closest source of every node (-1 if none is
+            reachable) and the distance to it (inf if none is reachable).
+    """
+    count = len(adjacency)
+    distances = [float("inf")] * count
+    nearest = [-1] * count
+    heap = []
+    for source in np.asarray(sources, dtype=np.intp).tolist():
+        distances[source] = 0.0
+        nearest[source] = source
+        heap.append((0.0, source, source))
+    heapq.heapify(heap)
+    while heap:
+        distance, node, source = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        for neighbor, length in adjacency[node]:
+            candidate = distance + length
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                nearest[neighbor] = source
+                heapq.heappush(heap, (candidate, neighbor, source))
+    return np.array(nearest, dtype=np.intp), np.array(distances)
@@ -0,0 +1,197 @@
+# bending.py
+# Batched position-based bending constraints over particle triplets.
+
+import numpy as np
+
+from .constraint_set import ConstraintSet
+
+# Bending modes:
+#   angle:    keep the signed angle at the middle particle at its target
+#   distance: keep the distance between the outer particles at its target ("skip-one")
+BENDING_MODES = ("angle", "distance")
+
+
+class BendingConstraints(ConstraintSet):
+    """
+    A batch of bending constraints, each acting on a particle triplet (p1, p2, p3).
+
+    In "angle" mode each constraint keeps the signed angle at p2, measured from the arm
+    p1 - p2 to the arm p3 - p2 in the range (-pi, pi], at its target. In the cheaper
+    "distance" mode it keeps the distance between p1 and p3 at its target instead.
+    All constraints are projected together, in the same position-based iterations as
+    the distance constraints.
+
+    Attributes:
+        indices (np.ndarray): (M, 3) particle triplets; the middle particle is the vertex.
+        targets (np.ndarray): (M,) target angles (radians) or distances.
+        stiffness (np.ndarray): (M,) stiffness (0-1) of each constraint.
+        mode (str): "angle" or "distance".
+    """
+
+    arity = 3
+    _row_fields = ("targets",)
+
+    def __init__(self, indices=(), targets=(), stiffness=1.0, mode="angle"):
+        """
+        Initialize the bending constraints.
+
+        Args:
+            indices (array-like, optional): (M, 3) particle triplets. Defaults to none.
+            targets (array-like, optional): (M,) target angles or distances. Defaults to none.
+            stiffness (float or array-like, optional): Stiffness (0-1). Defaults to 1.0.
+            mode (str, optional): "angle" or "distance". Defaults to "angle".
+
+        Raises:
+            ValueError: If the mode is unknown or the arrays do not match.
+        """
+        if mode not in BENDING_MODES:
+            raise ValueError(f"Mode must be one of {BENDING_MODES}.")
+        super().__init__(indices, stiffness)
+        self.targets = np.asarray(targets, dtype=np.float64).reshape(-1)
+        if len(self.targets) != len(self.indices):
+            raise ValueError("Each triplet must have exactly one target.")
+        self.mode = mode
+
+    @classmethod
+    def from_positions(cls, positions, indices, stiffness=1.0, mode="angle"):
+        """
+        Create constraints whose targets are the current angles or distances.
+
+        Args:
+            positions (array-like): (N, 2) particle positions.
+            indices (array-like): (M, 3) particle triplets.
+            stiffness (float or array-like, optional): Stiffness (0-1). Defaults to 1.0.
+            mode (str, optional): "angle" or "distance". Defaults to "angle".
+
+        Returns:
+            BendingConstraints: The new constraints.
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 3)
+        targets = measure_bending(
+            np.asarray(positions, dtype=np.float64), indices, mode
+        )
+        return cls(indices, targets, stiffness, mode)
+
+    def add(self, indices, targets, stiffness=1.0):
+        """
+        Append constraints to the batch.
+
+        Args:
+            indices (array-like): (K, 3) particle triplets.
+            targets (array-like): (K,) target angles or distances.
+            stiffness (float or array-like, optional): Stiffness (0-1). Defaults to 1.0.
+
+        Raises:
+            ValueError: If the arrays do not match or a stiffness is out of range.
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 3)
+        targets = np.asarray(targets, dtype=np.float64).reshape(-1)
+        if len(targets) != len(indices):
+            raise ValueError("Each triplet must have exactly one target.")
+        stiffness = self._per_constraint(stiffness, len(indices))
+        self._check_stiffness(stiffness)
+        self.indices = np.concatenate((self.indices, indices))
+        self.targets = np.concatenate((self.targets, targets))
+        self.stiffness = np.concatenate((self.stiffness, stiffness))
+
+    def project(self, positions, inv_masses):
+        """
+        Project every bending constraint once, adjusting positions in place.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions, updated in place.
+            inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        """
+        if len(self) == 0:
+            return
+        if self.mode == "distance":
+            self._project_distance(positions, inv_masses)
+        else:
+            self._project_angle(positions, inv_masses)
+
+    def _project_distance(self, positions, inv_masses):
+        i, k = self.indices[:, 0], self.indices[:, 2]
+        delta = positions[k] - positions[i]
+        length = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        w_i, w_k = inv_masses[i], inv_masses[k]
+        weight = w_i + w_k
+        live = (length > 0) & (weight > 0) & (self.stiffness > 0)
+        scale = np.zeros_like(length)
+        scale[live] = (
+            self.stiffness[live]
+            * (length[live] - self.targets[live])
+            / (length[live] * weight[live])
+        )
+        step = delta * scale[:, None]
+        corrections = np.zeros((len(self), 3, 2))
+        corrections[:, 0] = step * w_i[:, None]
+        corrections[:, 2] = -step * w_k[:, None]
+        self._apply_corrections(positions, corrections, live)
+
+    def _project_angle(self, positions, inv_masses):
+        i, j, k = self.indices.T
+        a = positions[i] - positions[j]
+        b = positions[k] - positions[j]
+        a_squared = np.einsum("ij,ij->i", a, a)
+        b_squared = np.einsum("ij,ij->i", b, b)
+        valid = (a_squared > 0) & (b_squared > 0)
+        a_squared = np.where(valid, a_squared, 1.0)
+        b_squared = np.where(valid, b_squared, 1.0)
+
+        error = _wrap_angle(_signed_angle(a, b) - self.targets)
+
+        # Gradients of the angle with respect to the three particles.
+        grad_i = -_perpendicular(a) / a_squared[:, None]
+        grad_k = _perpendicular(b) / b_squared[:, None]
+        grad_j = -(grad_i + grad_k)
+        w_i, w_j, w_k = inv_masses[i], inv_masses[j], inv_masses[k]
+        denominator = (
+            w_i * np.einsum("ij,ij->i", grad_i, grad_i)
+            + w_j * np.einsum("ij,ij->i", grad_j, grad_j)
+            + w_k * np.einsum("ij,ij->i", grad_k, grad_k)
+        )
+        live = valid & (denominator > 0) & (self.stiffness > 0)
+        multiplier = np.zeros_like(error)
+        multiplier[live] = -self.stiffness[live] * error[live] / denominator[live]
+
+        corrections = np.empty((len(self), 3, 2))
+        corrections[:, 0] = grad_i * (multiplier * w_i)[:, None]
+        corrections[:, 1] = grad_j * (multiplier * w_j)[:, None]
+        corrections[:, 2] = grad_k * (multiplier * w_k)[:, None]
+        self._apply_corrections(positions, corrections, live)
+
+
+def measure_bending(positions, indices, mode="angle"):
+    """
+    Measure the current bending of particle triplets.
+
+    Args:
+        positions (np.ndarray): (N, 2) particle positions.
+        indices (np.ndarray): (M, 3) particle triplets.
+        mode (str, optional): "angle" for signed angles, "distance" for outer distances.
+            Defaults to "angle".
+
+    Returns:
+        np.ndarray: (M,) angles (radians) or distances.
+    """
+    i, j, k = np.asarray(indices, dtype=np.intp).reshape(-1, 3).T
+    if mode == "distance":
+        return np.linalg.norm(positions[k] - positions[i], axis=1)
+    return _signed_angle(positions[i] - positions[j], positions[k] - positions[j])
+
+
+def _signed_angle(a, b):
+    """Signed angles from the (M, 2) vectors a to the (M, 2) vectors b."""
+    return np.arctan2(
+        a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0], np.einsum("ij,ij->i", a, b)
+    )
+
+
+def _perpendicular(vectors):
+    """Rotate (M, 2) vectors by 90 degrees."""
+    return np.column_stack((-vectors[:, 1], vectors[:, 0]))
+
+
+def _wrap_angle(angles):
+    """Wrap angles to the range [-pi, pi)."""
+    return (angles + np.pi) % (2 * np.pi) - np.pi
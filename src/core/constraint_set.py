@@ -0,0 +1,198 @@
+# constraint_set.py
+# Base class for batched constraints stored as particle index arrays.
+
+import copy
+
+import numpy as np
+
+
+class ConstraintSet:
+    """
+    Base class for a batch of constraints of the same kind.
+    Each constraint acts on a fixed number of particles (``arity``), whose indices are
+    stored as one row of an (M, arity) array; all constraints are projected at once by
+    project(), which subclasses implement with vectorized NumPy code.
+
+    Constraint sets can be attached to a ParticleSystem (see add_constraint_set), in which
+    case they are solved in the same iterations as the distance constraints.
+
+    Attributes:
+        indices (np.ndarray): (M, arity) particle indices of each constraint.
+        stiffness (np.ndarray): (M,) stiffness (0-1) of each constraint.
+    """
+
+    arity = 2
+
+    # Per-constraint arrays besides indices and stiffness, filtered with them when
+    # constraints are discarded.
+    _row_fields = ()
+
+    # Whether single constraints can be dropped without changing the others. Sets
+    # whose constraints are coupled (e.g. share a polygon or a cluster) are discarded
+    # as a whole once any of their particles is removed.
+    separable = True
+
+    def __init__(self, indices=(), stiffness=1.0):
+        """
+        Initialize the constraint set.
+
+        Args:
+            indices (array-like, optional): (M, arity) particle indices. Defaults to none.
+            stiffness (float or array-like, optional): Stiffness (0-1). Defaults to 1.0.
+
+        Raises:
+            ValueError: If a stiffness is outside the 0-1 range.
+        """
+        self.indices = np.asarray(indices, dtype=np.intp).reshape(-1, self.arity)
+        self.stiffness = self._per_constraint(stiffness, len(self.indices))
+        self._check_stiffness(self.stiffness)
+
+    @staticmethod
+    def _per_constraint(values, count):
+        """Broadcast a scalar or array to one float per constraint."""
+        return np.array(np.broadcast_to(np.asarray(values, dtype=np.float64), count))
+
+    @staticmethod
+    def _check_stiffness(stiffness):
+        if np.any((stiffness < 0) | (stiffness > 1)):
+            raise ValueError("Stiffness must be between 0 and 1.")
+
+    def __len__(self):
+        return len(self.indices)
+
+    def shifted(self, offset):
+        """
+        Return a copy whose particle indices are shifted by offset.
+        Used to move a body's local constraints into a shared particle buffer.
+
+        Args:
+            offset (int): The amount to add to every index.
+
+        Returns:
+            ConstraintSet: The shifted copy.
+        """
+        shifted = copy.copy(self)
+        shifted.indices = self.indices + offset
+        return shifted
+
+    def span(self):
+        """
+        Return the lowest and highest particle index the constraints act on.
+
+        Returns:
+            tuple[int, int] or None: The index range, or None if the set is empty.
+        """
+        if self.indices.size == 0:
+            return None
+        return int(self.indices.min()), int(self.indices.max())
+
+    def discard(self, start, stop):
+        """
+        Drop the constraints that act on a range of particles, e.g. a despawned body.
+
+        Args:
+            start (int): First particle of the range.
+            stop (int): End (exclusive) of the range.
+
+        Returns:
+            bool: Whether the set still holds constraints and should stay attached.
+        """
+        touched = ((self.indices >= start) & (self.indices < stop)).any(axis=1)
+        if not touched.any():
+            return True
+        if not self.separable:
+            return False
+        kept = ~touched
+        self.indices = self.indices[kept]
+        self.stiffness = self.stiffness[kept]
+        for name in self._row_fields:
+            setattr(self, name, getattr(self, name)[kept])
+        return len(self) > 0
+
+    def remap(self, mapping):
+        """
+        Renumber the particle indices in place, e.g. after a buffer compaction.
+
+        Args:
+            mapping (np.ndarray): New index of every old particle index; negative for
+                removed particles.
+
+        Raises:
+            ValueError: If a constraint acts on a removed particle.
+        """
+        self.indices = _remapped(self.indices, mapping)
+
+    def prepare(self, system):
+        """
+        Refresh state that depends on the system's flags, once per step before the
+        projections. Does nothing by default.
+
+        Args:
+            system (ParticleSystem): The system the set is attached to.
+        """
+
+    def project(self, positions, inv_masses):
+        """
+        Project every constraint once, adjusting positions in place.
+        This method should be overridden by subclasses to implement specific constraint logic.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions, updated in place.
+            inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        """
+        raise NotImplementedError("Subclasses must implement the project method.")
+
+    def _apply_corrections(self, positions, corrections, live):
+        """
+        Add per-constraint corrections to the positions, averaging the contributions of
+        all live constraints that share a particle (Jacobi style).
+
+        Args:
+            positions (np.ndarray): (N, 2) positions, updated in place.
+            corrections (np.ndarray): (M, arity, 2) position change for every constraint particle.
+            live (np.ndarray): (M,) mask of the constraints that produced a correction.
+        """
+        count = len(positions)
+        indices = self.indices[live].ravel()
+        if len(indices) == 0:
+            return
+        corrections = corrections[live].reshape(-1, 2)
+        shared = np.maximum(np.bincount(indices, minlength=count), 1)
+        for axis in range(2):
+            positions[:, axis] += (
+                np.bincount(indices, corrections[:, axis], count) / shared
+            )
+
+    def __repr__(self):
+        return f"{type(self).__name__}(constraints={len(self)})"
+
+
+def _remapped(indices, mapping):
+    """Renumber an index array, rejecting indices of removed particles."""
+    remapped = mapping[indices]
+    if remapped.size and remapped.min() < 0:
+        raise ValueError("Constraint refers to a removed particle.")
+    return remapped
+
+
+def project_particles(constraint_sets, particles):
+    """
+    Project constraint sets once on a list of Particle objects.
+    The positions are gathered into an array, projected, and written back to the
+    particles that are not fixed.
+
+    Args:
+        constraint_sets (list[ConstraintSet]): The sets to project, in order.
+        particles (list[Particle]): The particles the set indices refer to.
+    """
+    positions = np.array(
+        [(p.position.x, p.position.y) for p in particles], dtype=np.float64
+    ).reshape(-1, 2)
+    inv_masses = np.array(
+        [0.0 if p.is_fixed else p.inv_mass for p in particles], dtype=np.float64
+    )
+    for constraint_set in constraint_sets:
+        constraint_set.project(positions, inv_masses)
+    for particle, (x, y) in zip(particles, positions.tolist()):
+        if not particle.is_fixed:
+            particle.position.set(x, y)
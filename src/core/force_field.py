@@ -0,0 +1,526 @@
+# force_field.py
+# Vectorized force fields (wind, drag, attractors, vortices) applied to particle arrays.
+
+import functools
+
+import numpy as np
+
+# Side of the square lattice of random values behind value_noise(); the noise repeats
+# every NOISE_PERIOD units.
+NOISE_PERIOD = 256
+
+
+def _evaluate(value, time):
+    """Return a parameter at a given time; callables are evaluated, others returned."""
+    return value(time) if callable(value) else value
+
+
+def _vector(value, time):
+    """Evaluate a vector parameter (Vector2D or (x, y)) as a (2,) array."""
+    value = _evaluate(value, time)
+    if hasattr(value, "x"):
+        value = (value.x, value.y)
+    return np.asarray(value, dtype=np.float64).reshape(2)
+
+
+def box_region(min_x, min_y, max_x, max_y):
+    """
+    Build a region selecting the particles inside an axis-aligned box.
+
+    Args:
+        min_x (float): Left edge of the box.
+        min_y (float): Top edge of the box.
+        max_x (float): Right edge of the box.
+        max_y (float): Bottom edge of the box.
+
+    Returns:
+        callable: region(positions) -> (N,) boolean mask.
+    """
+
+    def region(positions):
+        return (
+            (positions[:, 0] >= min_x)
+            & (positions[:, 0] <= max_x)
+            & (positions[:, 1] >= min_y)
+            & (positions[:, 1] <= max_y)
+        )
+
+    return region
+
+
+def circle_region(center, radius):
+    """
+    Build a region selecting the particles inside a circle.
+
+    Args:
+        center (Vector2D or array-like): Center of the circle.
+        radius (float): Radius of the circle.
+
+    Returns:
+        callable: region(positions) -> (N,) boolean mask.
+    """
+    center = _vector(center, 0.0)
+
+    def region(positions):
+        dx = positions[:, 0] - center[0]
+        dy = positions[:, 1] - center[1]
+        return dx * dx + dy * dy <= radius * radius
+
+    return region
+
+
+def value_noise(x, y, seed=0):
+    """
+    Smooth 2D value noise in [-1, 1].
+
+    Random values on the integer lattice (a table of NOISE_PERIOD x NOISE_PERIOD values
+    per seed, repeated) are blended with a smoothstep, so the noise is continuous and
+    varies over about one unit.
+
+    Args:
+        x (np.ndarray): X coordinates.
+        y (np.ndarray): Y coordinates, of the same shape.
+        seed (int, optional): Selects an independent noise pattern. Defaults to 0.
+
+    Returns:
+        np.ndarray: The noise at every point.
+    """
+    (noise,) = _noise(x, y, (seed,))
+    return noise
+
+
+@functools.lru_cache(maxsize=64)
+def _noise_table(seed):
+    """The flattened lattice values of a seed."""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1.0, 1.0, NOISE_PERIOD * NOISE_PERIOD)
+
+
+def _noise(x, y, seeds):
+    """value_noise() for several seeds, sharing the lattice lookups."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = x - x0
+    fy = y - y0
+    fx *= fx * (3.0 - 2.0 * fx)
+    fy *= fy * (3.0 - 2.0 * fy)
+    mask = NOISE_PERIOD - 1
+    i0 = x0.astype(np.int64) & mask
+    j0 = y0.astype(np.int64) & mask
+    i1 = ((i0 + 1) & mask) * NOISE_PERIOD
+    i0 *= NOISE_PERIOD
+    j1 = (j0 + 1) & mask
+    corners = (i0 + j0, i1 + j0, i0 + j1, i1 + j1)
+    results = []
+    for seed in seeds:
+        table = _noise_table(seed)
+        v00, v10, v01, v11 = (table[corner] for corner in corners)
+        top = v00 + (v10 - v00) * fx
+        bottom = v01 + (v11 - v01) * fx
+        results.append(top + (bottom - top) * fy)
+    return results
+
+
+class ForceField:
+    """
+    Base class of force fields acting on the particle arrays of a ParticleSystem.
+
+    A field computes the forces (or accelerations) on many particles in a few NumPy
+    expressions and adds the resulting accelerations to the system's accumulator, like
+    ParticleSystem.apply_force(). Fixed particles are never affected. A field can be
+    limited to some particles (``indices``), to the particles inside a region
+    (``region``, a callable mapping (N, 2) positions to an (N,) boolean mask, see
+    box_region() and circle_region()), or both. Every parameter of the built-in fields
+    may be a callable of the simulation time instead of a value, which makes it vary
+    over time (for instance gusts or a moving attractor).
+
+    Fields work on the x and y columns separately: NumPy broadcasting over the short
+    last axis of (N, 2) arrays is several times slower than whole-column operations.
+    Subclasses implement forces(), or accelerations() when the result does not scale
+    with the inverse mass; fields that use the particle velocities set
+    ``uses_velocity``.
+
+    Attributes:
+        region (callable or None): Selects the affected particles by position.
+        indices (slice, np.ndarray or None): The particles the field may act on.
+        enabled (bool): Whether apply() does anything.
+    """
+
+    uses_velocity = False
+
+    def __init__(self, region=None, indices=None):
+        """
+        Initialize a field.
+
+        Args:
+            region (callable, optional): region(positions) -> boolean mask of the
+                affected particles. Defaults to None (everywhere).
+            indices (slice or array-like, optional): Particles the field may act on,
+                such as BodyHandle.particles. Defaults to None (all particles).
+        """
+        self.region = region
+        if indices is not None and not isinstance(indices, slice):
+            indices = np.asarray(indices, dtype=np.intp)
+        self.indices = indices
+        self.enabled = True
+
+    def forces(self, positions, velocities, time):
+        """
+        Compute the forces on some particles.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions.
+            velocities (tuple or None): (N,) x and y velocities, or None if the field
+                does not use them.
+            time (float): Simulation time.
+
+        Returns:
+            tuple: The x and y forces, each a number or an (N,) array.
+        """
+        raise NotImplementedError("Subclasses must implement the forces method.")
+
+    def accelerations(self, positions, velocities, inv_masses, time, delta_time):
+        """
+        Compute the accelerations of some particles.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions.
+            velocities (tuple or None): (N,) x and y velocities.
+            inv_masses (np.ndarray): (N,) inverse masses; zero for fixed particles.
+            time (float): Simulation time.
+            delta_time (float or None): Length of the coming step.
+
+        Returns:
+            tuple: The x and y accelerations, (N,) arrays.
+        """
+        fx, fy = self.forces(positions, velocities, time)
+        return fx * inv_masses, fy * inv_masses
+
+    def apply(self, system, time=0.0, delta_time=None):
+        """
+        Add the field's accelerations to a particle system's accumulators.
+
+        Args:
+            system (ParticleSystem): The particle system.
+            time (float, optional): Simulation time. Defaults to 0.0.
+            delta_time (float, optional): Length of the coming step; the velocities of
+                the particles are estimated from their last displacement over it.
+                Required by fields that use velocities. Defaults to None.
+
+        Raises:
+            ValueError: If the field uses velocities and no time step is given.
+        """
+        if not self.enabled:
+            return
+        indices = self.indices
+        if self.region is not None:
+            positions = system.positions
+            local = positions if indices is None else positions[indices]
+            selected = np.flatnonzero(self.region(local))
+            if isinstance(indices, slice):
+                indices = np.arange(*indices.indices(len(positions)))
+            indices = selected if indices is None else indices[selected]
+        if indices is None:
+            indices = slice(None)
+        elif isinstance(indices, np.ndarray) and len(indices) == 0:
+            return
+        positions = system.positions[indices]
+        velocities = None
+        if self.uses_velocity:
+            if not delta_time:
+                raise ValueError("A time step is needed to estimate velocities.")
+            old_positions = system.old_positions[indices]
+            velocities = (
+                (positions[:, 0] - old_positions[:, 0]) / delta_time,
+                (positions[:, 1] - old_positions[:, 1]) / delta_time,
+            )
+        ax, ay = self.accelerations(
+            positions, velocities, system.inv_masses[indices], time, delta_time
+        )
+        accelerations = system.accelerations
+        accelerations[indices, 0] += ax
+        accelerations[indices, 1] += ay
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class UniformField(ForceField):
+    """
+    A force (or acceleration) that is the same everywhere, such as steady wind.
+
+    Attributes:
+        force (Vector2D, tuple or callable): The force, or acceleration if
+            ``acceleration`` is set.
+        acceleration (bool): Whether ``force`` is an acceleration, which moves light
+            and heavy particles alike (like gravity).
+    """
+
+    def __init__(self, force, acceleration=False, region=None, indices=None):
+        """
+        Initialize a uniform field.
+
+        Args:
+            force (Vector2D, tuple or callable): The force, or a callable of time.
+            acceleration (bool, optional): Treat ``force`` as an acceleration.
+                Defaults to False.
+            region (callable, optional): Region of the field. Defaults to None.
+            indices (slice or array-like, optional): Affected particles.
+                Defaults to None.
+        """
+        super().__init__(region, indices)
+        self.force = force
+        self.acceleration = acceleration
+
+    def forces(self, positions, velocities, time):
+        fx, fy = _vector(self.force, time)
+        return fx, fy
+
+    def accelerations(self, positions, velocities, inv_masses, time, delta_time):
+        if not self.acceleration:
+            return super().accelerations(
+                positions, velocities, inv_masses, time, delta_time
+            )
+        fx, fy = _vector(self.force, time)
+        movable = inv_masses > 0
+        return fx * movable, fy * movable
+
+    def __repr__(self):
+        return f"UniformField(force={self.force}, acceleration={self.acceleration})"
+
+
+class RadialField(ForceField):
+    """
+    A force toward (attractor) or away from (repulsor) a center.
+
+    The magnitude is ``strength / max(r, softening) ** falloff`` at distance r, so a
+    falloff of 0 pulls equally hard everywhere and 2 follows an inverse-square law;
+    the softening keeps it finite near the center. Positive strengths attract,
+    negative ones repel, and particles beyond ``radius`` are not affected.
+
+    Attributes:
+        center (Vector2D, tuple or callable): Center of the field.
+        strength (float or callable): Force at unit distance.
+        radius (float or None): Range of the field; None for unlimited.
+        falloff (float): Exponent of the decrease with distance.
+        softening (float): Distance below which the force stops growing.
+    """
+
+    def __init__(
+        self,
+        center,
+        strength,
+        radius=None,
+        falloff=0.0,
+        softening=1.0,
+        region=None,
+        indices=None,
+    ):
+        """
+        Initialize a radial field.
+
+        Args:
+            center (Vector2D, tuple or callable): Center of the field.
+            strength (float or callable): Force at unit distance; negative repels.
+            radius (float, optional): Range of the field. Defaults to None.
+            falloff (float, optional): Distance exponent. Defaults to 0.0.
+            softening (float, optional): Minimum distance used for the falloff.
+                Defaults to 1.0.
+            region (callable, optional): Region of the field. Defaults to None.
+            indices (slice or array-like, optional): Affected particles.
+                Defaults to None.
+
+        Raises:
+            ValueError: If the softening is not positive.
+        """
+        if softening <= 0:
+            raise ValueError("Softening must be positive.")
+        super().__init__(region, indices)
+        self.center = center
+        self.strength = strength
+        self.radius = radius
+        self.falloff = falloff
+        self.softening = softening
+
+    def _offsets(self, positions, time):
+        """Offsets from the center and the force magnitude per unit of offset."""
+        cx, cy = _vector(self.center, time)
+        dx = positions[:, 0] - cx
+        dy = positions[:, 1] - cy
+        distances = np.sqrt(dx * dx + dy * dy)
+        clamped = np.maximum(distances, self.softening)
+        scale = _evaluate(self.strength, time) / np.maximum(distances, 1e-12)
+        if self.falloff:
+            scale /= clamped**self.falloff
+        if self.radius is not None:
+            scale[distances > self.radius] = 0.0
+        return dx, dy, scale
+
+    def forces(self, positions, velocities, time):
+        dx, dy, scale = self._offsets(positions, time)
+        return -dx * scale, -dy * scale
+
+    def __repr__(self):
+        return f"RadialField(center={self.center}, strength={self.strength}, radius={self.radius})"
+
+
+class VortexField(RadialField):
+    """
+    A force circling a center, perpendicular to the direction to it.
+
+    The magnitude follows RadialField; positive strengths turn from +x toward +y.
+    """
+
+    def forces(self, positions, velocities, time):
+        dx, dy, scale = self._offsets(positions, time)
+        return -dy * scale, dx * scale
+
+    def __repr__(self):
+        return f"VortexField(center={self.center}, strength={self.strength}, radius={self.radius})"
+
+
+class TurbulentWind(ForceField):
+    """
+    A mean wind force with smooth turbulence that drifts downwind.
+
+    The turbulent part is value noise of wavelength ``scale`` (world units) per force
+    component, with ``octaves`` layers of halving wavelength and amplitude. The noise
+    pattern is carried along the wind direction at ``speed`` world units per second
+    and slowly changes shape, so gusts travel across a cloth instead of pushing all of
+    it at once.
+
+    Attributes:
+        force (Vector2D, tuple or callable): Mean wind force.
+        turbulence (float or callable): Amplitude of the turbulent force.
+        scale (float): Wavelength of the turbulence.
+        speed (float): Speed the turbulence drifts at.
+        octaves (int): Number of noise layers.
+        seed (int): Selects the noise pattern.
+    """
+
+    def __init__(
+        self,
+        force,
+        turbulence=0.0,
+        scale=50.0,
+        speed=100.0,
+        octaves=2,
+        seed=0,
+        region=None,
+        indices=None,
+    ):
+        """
+        Initialize a wind field.
+
+        Args:
+            force (Vector2D, tuple or callable): Mean wind force.
+            turbulence (float or callable, optional): Amplitude of the turbulent force.
+                Defaults to 0.0.
+            scale (float, optional): Turbulence wavelength. Defaults to 50.0.
+            speed (float, optional): Drift speed of the turbulence. Defaults to 100.0.
+            octaves (int, optional): Number of noise layers. Defaults to 2.
+            seed (int, optional): Noise pattern. Defaults to 0.
+            region (callable, optional): Region of the field. Defaults to None.
+            indices (slice or array-like, optional): Affected particles.
+                Defaults to None.
+
+        Raises:
+            ValueError: If the scale is not positive or octaves is below 1.
+        """
+        if scale <= 0:
+            raise ValueError("Scale must be positive.")
+        if octaves < 1:
+            raise ValueError("Octaves must be at least 1.")
+        super().__init__(region, indices)
+        self.force = force
+        self.turbulence = turbulence
+        self.scale = scale
+        self.speed = speed
+        self.octaves = octaves
+        self.seed = seed
+
+    def forces(self, positions, velocities, time):
+        fx, fy = _vector(self.force, time)
+        turbulence = _evaluate(self.turbulence, time)
+        if not turbulence:
+            return fx, fy
+        length = np.hypot(fx, fy)
+        ux, uy = (fx / length, fy / length) if length > 0 else (0.0, 0.0)
+        drift = self.speed * time
+        x = (positions[:, 0] - ux * drift) / self.scale
+        y = (positions[:, 1] - uy * drift) / self.scale
+        # Slow change of shape, a tenth of the drift rate
+        phase = 0.1 * drift / self.scale
+        noise_x = noise_y = 0.0
+        amplitude, frequency, total = 1.0, 1.0, 0.0
+        for octave in range(self.octaves):
+            seed = self.seed * 131 + octave * 2
+            nx, ny = _noise(
+                x * frequency + phase, y * frequency - phase, (seed, seed + 1)
+            )
+            noise_x = noise_x + amplitude * nx
+            noise_y = noise_y + amplitude * ny
+            total += amplitude
+            amplitude *= 0.5
+            frequency *= 2.0
+        gain = turbulence / total
+        return fx + gain * noise_x, fy + gain * noise_y
+
+    def __repr__(self):
+        return f"TurbulentWind(force={self.force}, turbulence={self.turbulence}, scale={self.scale})"
+
+
+class DragField(ForceField):
+    """
+    Linear and quadratic drag against the velocity relative to a moving medium.
+
+    The force is ``-(linear + quadratic * |v|) * v`` for the velocity v relative to
+    ``flow`` (still air by default; a flow turns the drag into wind that pushes
+    particles toward its speed). The resulting acceleration is limited so that one
+    step can at most stop a particle relative to the medium, which keeps strong drag
+    stable with explicit integration.
+
+    Attributes:
+        linear (float or callable): Linear drag coefficient.
+        quadratic (float or callable): Quadratic drag coefficient.
+        flow (Vector2D, tuple or callable): Velocity of the medium.
+    """
+
+    uses_velocity = True
+
+    def __init__(
+        self, linear=0.0, quadratic=0.0, flow=(0.0, 0.0), region=None, indices=None
+    ):
+        """
+        Initialize a drag field.
+
+        Args:
+            linear (float or callable, optional): Linear coefficient. Defaults to 0.0.
+            quadratic (float or callable, optional): Quadratic coefficient.
+                Defaults to 0.0.
+            flow (Vector2D, tuple or callable, optional): Velocity of the medium.
+                Defaults to (0.0, 0.0).
+            region (callable, optional): Region of the field. Defaults to None.
+            indices (slice or array-like, optional): Affected particles.
+                Defaults to None.
+        """
+        super().__init__(region, indices)
+        self.linear = linear
+        self.quadratic = quadratic
+        self.flow = flow
+
+    def accelerations(self, positions, velocities, inv_masses, time, delta_time):
+        flow_x, flow_y = _vector(self.flow, time)
+        vx = velocities[0] - flow_x
+        vy = velocities[1] - flow_y
+        rates = _evaluate(self.linear, time)
+        quadratic = _evaluate(self.quadratic, time)
+        if quadratic:
+            rates = rates + quadratic * np.sqrt(vx * vx + vy * vy)
+        rates = np.minimum(rates * inv_masses, 1.0 / delta_time)
+        return -rates * vx, -rates * vy
+
+    def __repr__(self):
+        return f"DragField(linear={self.linear}, quadratic={self.quadratic}, flow={self.flow})"
@@ -28,7 +28,8 @@ class Particle:
         """
         if mass < 0:
             raise ValueError("Mass cannot be negative.")
-        self.position = position
+        # Positions are updated in place, so never share the caller's vector
+        self.position = position.copy()
         self.old_position = position.copy()
         self.velocity = Vector2D(0, 0)
         self.acceleration = Vector2D(0, 0)
@@ -49,7 +50,7 @@ class Particle:
         if not isinstance(force, Vector2D):
             raise TypeError("Force must be a Vector2D.")
         if not self.is_fixed:
-            self.acceleration += force * self.inv_mass
+            self.acceleration.add_scaled(force, self.inv_mass)
 
     def update_position(self, delta_time):
         """
@@ -59,12 +60,13 @@ class Particle:
             delta_time (float): The time step for the update.
         """
         if not self.is_fixed:
-            velocity = self.position - self.old_position
-            self.old_position = self.position.copy()
-            delta_time_squared = delta_time**2
-            self.position += velocity + self.acceleration * delta_time_squared
+            position = self.position
+            velocity = position - self.old_position
+            self.old_position = position.copy()
+            position += velocity
+            position.add_scaled(self.acceleration, delta_time * delta_time)
             self.velocity = velocity
-            self.acceleration = Vector2D(0, 0)
+            self.acceleration = Vector2D.unchecked(0.0, 0.0)
 
     def __repr__(self):
         return f"Particle(position={self.position}, mass={self.mass}, is_fixed={self.is_fixed})"
@@ -0,0 +1,244 @@
+# spatial_grid.py
+# A uniform grid index over line segments for fast rectangle queries.
+
+import numpy as np
+
+
+def segment_bounds(starts, ends):
+    """
+    Return the axis-aligned bounding boxes of line segments.
+
+    Args:
+        starts (array-like): (M, 2) first endpoints.
+        ends (array-like): (M, 2) second endpoints.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (M, 2) minimum and maximum corners.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+    return np.minimum(starts, ends), np.maximum(starts, ends)
+
+
+def boxes_in_rect(lower, upper, rect):
+    """
+    Test which boxes overlap a rectangle.
+
+    Args:
+        lower (np.ndarray): (M, 2) minimum corners.
+        upper (np.ndarray): (M, 2) maximum corners.
+        rect (tuple): (min_x, min_y, max_x, max_y) of the rectangle.
+
+    Returns:
+        np.ndarray: (M,) boolean mask of the overlapping boxes.
+    """
+    min_x, min_y, max_x, max_y = rect
+    return (
+        (upper[:, 0] >= min_x)
+        & (lower[:, 0] <= max_x)
+        & (upper[:, 1] >= min_y)
+        & (lower[:, 1] <= max_y)
+    )
+
+
+class SegmentGrid:
+    """
+    A uniform grid that buckets line segments by the cells their bounding boxes cover.
+
+    The grid is built with a few vectorized passes (no Python loop over segments):
+    every segment is entered once per covered cell, and the entries are sorted by cell
+    so that the segments of any cell are one contiguous run found by binary search. A
+    rectangle query gathers the runs of the cells it covers and keeps the segments
+    whose bounding boxes actually overlap it, so its cost grows with the content of the
+    rectangle rather than with the number of segments. Queries covering more cells than
+    there are segments test all bounding boxes directly instead.
+
+    The grid is a snapshot; rebuild it after the segments move.
+
+    Attributes:
+        cell_size (float): Edge length of the square cells.
+        lower (np.ndarray): (M, 2) minimum corners of the segment bounding boxes.
+        upper (np.ndarray): (M, 2) maximum corners of the segment bounding boxes.
+    """
+
+    def __init__(self, starts, ends, cell_size):
+        """
+        Build the grid over a set of segments.
+
+        Args:
+            starts (array-like): (M, 2) first endpoints.
+            ends (array-like): (M, 2) second endpoints.
+            cell_size (float): Edge length of the cells, in world units.
+
+        Raises:
+            ValueError: If the cell size is not positive.
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive.")
+        self.cell_size = float(cell_size)
+        self.lower, self.upper = segment_bounds(starts, ends)
+        count = len(self.lower)
+        if count == 0:
+            self._keys = np.empty(0, dtype=np.int64)
+            self._ids = np.empty(0, dtype=np.intp)
+            return
+
+        first = np.floor(self.lower / self.cell_size).astype(np.int64)
+        last = np.floor(self.upper / self.cell_size).astype(np.int64)
+        spans = last - first + 1
+        covered = spans[:, 0] * spans[:, 1]
+        ids = np.repeat(np.arange(count), covered)
+        # Position of each entry within its segment's block of cells
+        offsets = np.arange(len(ids)) - np.repeat(np.cumsum(covered) - covered, covered)
+        columns = first[ids, 0] + offsets % spans[ids, 0]
+        rows = first[ids, 1] + offsets // spans[ids, 0]
+        keys = _cell_keys(columns, rows)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._ids = ids[order]
+
+    def __len__(self):
+        return len(self.lower)
+
+    def query(self, rect):
+        """
+        Return the segments whose bounding boxes overlap a rectangle.
+
+        Args:
+            rect (tuple): (min_x, min_y, max_x, max_y) of the rectangle.
+
+        Returns:
+            np.ndarray: Sorted indices of the overlapping segments.
+        """
+        min_x, min_y, max_x, max_y = rect
+        cell = self.cell_size
+        columns = np.arange(np.floor(min_x / cell), np.floor(max_x / cell) + 1)
+        rows = np.arange(np.floor(min_y / cell), np.floor(max_y / cell) + 1)
+        if len(columns) * len(rows) > len(self.lower):
+            return np.flatnonzero(boxes_in_rect(self.lower, self.upper, rect))
+
+        keys = _cell_keys(
+            np.tile(columns, len(rows)).astype(np.int64),
+            np.repeat(rows, len(columns)).astype(np.int64),
+        )
+        begins = np.searchsorted(self._keys, keys, side="left")
+        ends = np.searchsorted(self._keys, keys, side="right")
+        lengths = ends - begins
+        if not np.any(lengths):
+            return np.empty(0, dtype=np.intp)
+        entries = np.repeat(begins - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+        candidates = np.unique(self._ids[entries])
+        hit = boxes_in_rect(self.lower[candidates], self.upper[candidates], rect)
+        return candidates[hit]
+
+    def __repr__(self):
+        return f"SegmentGrid(segments={len(self)}, cell_size={self.cell_size})"
+
+
+def _cell_keys(columns, rows):
+    """Combine cell coordinates into one sortable integer key."""
+    return (rows << 32) + (columns & 0xFFFFFFFF)
+
+
+class SegmentIndex:
+    """
+    A SegmentGrid over moving segments that is only rebuilt when needed.
+
+    The segments are given as (M, 2) endpoint indices into a positions array. The grid
+    is built over bounding boxes enlarged by ``slack`` and stays valid until some
+    endpoint has moved more than ``slack`` since the build, or the segments change;
+    update() checks both with a vectorized pass and rebuilds only then. Queries
+    filter the grid's candidates with the current positions, so they are exact.
+
+    Points can be indexed as degenerate segments with both endpoints equal.
+
+    Attributes:
+        cell_size (float or None): Edge length of the grid cells; None chooses eight
+            times the mean segment extent at the first build.
+        slack (float or None): Movement tolerated before a rebuild; None chooses a
+            quarter of the cell size.
+        rebuilds (int): Number of times the grid was built.
+    """
+
+    def __init__(self, cell_size=None, slack=None):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_size (float, optional): Edge length of the cells. Defaults to None
+                (chosen from the segments).
+            slack (float, optional): Movement tolerated before a rebuild. Defaults to
+                None (a quarter of the cell size).
+        """
+        self.cell_size = cell_size
+        self.slack = slack
+        self.rebuilds = 0
+        self._grid = None
+        self._edges = None
+        self._anchor = None
+        self._positions = None
+
+    def update(self, positions, edges):
+        """
+        Point the index at the current positions, rebuilding the grid if needed.
+
+        Args:
+            positions (np.ndarray): (N, 2) current positions.
+            edges (np.ndarray): (M, 2) endpoint indices of the segments.
+
+        Returns:
+            bool: Whether the grid was rebuilt.
+        """
+        edges = np.asarray(edges)
+        self._positions = positions
+        if (
+            self._grid is not None
+            and len(positions) == len(self._anchor)
+            and np.array_equal(edges, self._edges)
+        ):
+            moved = positions - self._anchor
+            if len(moved) == 0 or max(moved.max(), -moved.min()) <= self.slack:
+                return False
+        self._build(positions, edges)
+        return True
+
+    def _build(self, positions, edges):
+        starts = positions[edges[:, 0]]
+        ends = positions[edges[:, 1]]
+        if self.cell_size is None:
+            extent = np.abs(ends - starts).max(axis=1).mean() if len(edges) else 0.0
+            self.cell_size = 8.0 * extent if extent > 0 else 64.0
+        if self.slack is None:
+            self.slack = 0.25 * self.cell_size
+        lower, upper = segment_bounds(starts, ends)
+        self._grid = SegmentGrid(lower - self.slack, upper + self.slack, self.cell_size)
+        self._edges = edges.copy()
+        self._anchor = np.array(positions, dtype=np.float64)
+        self.rebuilds += 1
+
+    def query(self, rect):
+        """
+        Return the segments whose current bounding boxes overlap a rectangle.
+
+        Args:
+            rect (tuple): (min_x, min_y, max_x, max_y) of the rectangle.
+
+        Returns:
+            np.ndarray: Sorted indices (rows of the edges) of the overlapping segments.
+
+        Raises:
+            ValueError: If update() has not been called.
+        """
+        if self._grid is None:
+            raise ValueError("The index has not been built; call update() first.")
+        candidates = self._grid.query(rect)
+        edges = self._edges[candidates]
+        lower, upper = segment_bounds(
+            self._positions[edges[:, 0]], self._positions[edges[:, 1]]
+        )
+        return candidates[boxes_in_rect(lower, upper, rect)]
+
+    def __repr__(self):
+        return f"SegmentIndex(cell_size={self.cell_size}, rebuilds={self.rebuilds})"
@@ -55,21 +55,28 @@ class Spring:
 
         # Calculate the correction factor
         correction_factor = (current_length - self.rest_length) / current_length
-        correction_vector = delta * correction_factor * 0.5 * self.stiffness
+        correction_scale = correction_factor * 0.5 * self.stiffness
 
         # Apply correction based on inverse mass (if particles are not fixed)
         if not self.particle1.is_fixed:
-            self.particle1.position += correction_vector * self.particle1.inv_mass
+            self.particle1.position.add_scaled(
+                delta, correction_scale * self.particle1.inv_mass
+            )
         if not self.particle2.is_fixed:
-            self.particle2.position -= correction_vector * self.particle2.inv_mass
+            self.particle2.position.add_scaled(
+                delta, -correction_scale * self.particle2.inv_mass
+            )
 
         # Apply damping to reduce oscillations
         velocity1 = self.particle1.position - self.particle1.old_position
         velocity2 = self.particle2.position - self.particle2.old_position
         relative_velocity = velocity2 - velocity1
-        damping_force = relative_velocity * -self.damping
 
         if not self.particle1.is_fixed:
-            self.particle1.acceleration += damping_force * self.particle1.inv_mass
+            self.particle1.acceleration.add_scaled(
+                relative_velocity, -self.damping * self.particle1.inv_mass
+            )
         if not self.particle2.is_fixed:
-            self.particle2.acceleration -= damping_force * self.particle2.inv_mass
+            self.particle2.acceleration.add_scaled(
+                relative_velocity, self.damping * self.particle2.inv_mass
+            )
@@ -0,0 +1,249 @@
+# topology.py
+# Array-based topology builders for grid-shaped objects such as cloth and softbodies.
+
+from functools import lru_cache
+
+import numpy as np
+
+# Edge families that can be requested from grid_topology.
+#   structural: horizontal and vertical neighbours
+#   diagonal:   the down-right diagonal of every cell
+#   shear:      both diagonals of every cell (supersedes "diagonal")
+#   bend:       skip-one horizontal and vertical neighbours
+GRID_PATTERNS = ("structural", "diagonal", "shear", "bend")
+
+
+class Topology:
+    """
+    Immutable description of an object's particles and distance constraints.
+    All data is stored as read-only NumPy arrays so a single topology can be shared
+    safely between every object (or instance) built from it.
+
+    Attributes:
+        positions (np.ndarray): (N, 2) rest positions of the particles.
+        edges (np.ndarray): (E, 2) particle index pairs of the distance constraints.
+        rest_lengths (np.ndarray): (E,) rest length of each distance constraint.
+        masses (np.ndarray): (N,) mass of each particle.
+        fixed (np.ndarray): (N,) whether each particle is fixed in space.
+        stiffness (np.ndarray): (E,) stiffness (0-1) of each distance constraint.
+    """
+
+    def __init__(
+        self, positions, edges, rest_lengths, masses=1.0, fixed=False, stiffness=1.0
+    ):
+        """
+        Initialize the topology from array-like data.
+
+        Args:
+            positions (array-like): (N, 2) rest positions of the particles.
+            edges (array-like): (E, 2) particle index pairs.
+            rest_lengths (array-like): (E,) rest lengths of the edges.
+            masses (float or array-like, optional): Particle masses. Defaults to 1.0.
+            fixed (bool or array-like, optional): Fixed flags of the particles. Defaults to False.
+            stiffness (float or array-like, optional): Edge stiffness (0-1). Defaults to 1.0.
+
+        Raises:
+            ValueError: If the array shapes are inconsistent or values are out of range.
+        """
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        edges = np.array(edges, dtype=np.intp).reshape(-1, 2)
+        rest_lengths = np.array(rest_lengths, dtype=np.float64).reshape(-1)
+        count = len(positions)
+        masses = np.array(np.broadcast_to(np.asarray(masses, np.float64), count))
+        fixed = np.array(np.broadcast_to(np.asarray(fixed, bool), count))
+        stiffness = np.array(
+            np.broadcast_to(np.asarray(stiffness, np.float64), len(edges))
+        )
+        if len(edges) != len(rest_lengths):
+            raise ValueError("Each edge must have exactly one rest length.")
+        if len(edges) and (edges.min() < 0 or edges.max() >= count):
+            raise ValueError("Edge indices must refer to existing particles.")
+        if np.any(masses < 0):
+            raise ValueError("Mass cannot be negative.")
+        if np.any((stiffness < 0) | (stiffness > 1)):
+            raise ValueError("Stiffness must be between 0 and 1.")
+        for array in (positions, edges, rest_lengths, masses, fixed, stiffness):
+            array.setflags(write=False)
+        self.positions = positions
+        self.edges = edges
+        self.rest_lengths = rest_lengths
+        self.masses = masses
+        self.fixed = fixed
+        self.stiffness = stiffness
+
+    @classmethod
+    def from_particles(cls, particles, springs):
+        """
+        Capture the current layout of an object-based body as a topology.
+
+        Args:
+            particles (list[Particle]): The particles of the body.
+            springs (list[Spring]): The springs connecting those particles.
+
+        Returns:
+            Topology: A topology with the particles' current positions as rest positions.
+        """
+        index = {id(particle): i for i, particle in enumerate(particles)}
+        return cls(
+            [(p.position.x, p.position.y) for p in particles],
+            [(index[id(s.particle1)], index[id(s.particle2)]) for s in springs],
+            [s.rest_length for s in springs],
+            masses=[p.mass for p in particles],
+            fixed=[p.is_fixed for p in particles],
+            stiffness=[s.stiffness for s in springs],
+        )
+
+    def replace(self, **changes):
+        """
+        Return a copy of the topology with some of its arrays replaced.
+
+        Args:
+            **changes: New values for any of the constructor arguments.
+
+        Returns:
+            Topology: The modified topology.
+        """
+        arguments = {
+            "positions": self.positions,
+            "edges": self.edges,
+            "rest_lengths": self.rest_lengths,
+            "masses": self.masses,
+            "fixed": self.fixed,
+            "stiffness": self.stiffness,
+        }
+        arguments.update(changes)
+        return Topology(**arguments)
+
+    @property
+    def num_particles(self):
+        """Number of particles described by the topology."""
+        return len(self.positions)
+
+    @property
+    def num_edges(self):
+        """Number of distance constraints described by the topology."""
+        return len(self.edges)
+
+    def __repr__(self):
+        return f"Topology(particles={self.num_particles}, edges={self.num_edges})"
+
+
+def _normalize_pattern(pattern):
+    """Turn a pattern name or iterable of names into a canonical, hashable tuple."""
+    if isinstance(pattern, str):
+        pattern = (pattern,)
+    names = set(pattern)
+    unknown = names.difference(GRID_PATTERNS)
+    if unknown:
+        raise ValueError(f"Unknown grid pattern(s): {sorted(unknown)}")
+    if "shear" in names:
+        names.discard("diagonal")
+    return tuple(name for name in GRID_PATTERNS if name in names)
+
+
+def grid_topology(rows, cols, spacing_x=1.0, spacing_y=None, pattern="structural"):
+    """
+    Build (or fetch from the cache) the topology of a rows x cols particle grid.
+    Particles are numbered row by row, starting at the origin, so particle
+    ``row * cols + col`` sits at ``(col * spacing_x, row * spacing_y)``.
+
+    Topologies are memoized by (rows, cols, spacing, pattern); repeated calls with the
+    same arguments return the same read-only instance.
+
+    Args:
+        rows (int): The number of particle rows.
+        cols (int): The number of particle columns.
+        spacing_x (float, optional): Horizontal distance between particles. Defaults to 1.0.
+        spacing_y (float, optional): Vertical distance between particles. Defaults to spacing_x.
+        pattern (str or iterable[str], optional): Edge families to generate, see GRID_PATTERNS.
+            Defaults to "structural".
+
+    Returns:
+        Topology: The grid topology.
+
+    Raises:
+        ValueError: If rows or cols is not positive or the pattern is unknown.
+    """
+    if rows <= 0 or cols <= 0:
+        raise ValueError("Rows and columns must be positive.")
+    if spacing_y is None:
+        spacing_y = spacing_x
+    return _build_grid_topology(
+        int(rows),
+        int(cols),
+        float(spacing_x),
+        float(spacing_y),
+        _normalize_pattern(pattern),
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_grid_topology(rows, cols, spacing_x, spacing_y, pattern):
+    index = np.arange(rows * cols).reshape(rows, cols)
+    ys, xs = np.indices((rows, cols))
+    positions = np.column_stack((xs.ravel() * spacing_x, ys.ravel() * spacing_y))
+
+    diagonal = float(np.hypot(spacing_x, spacing_y))
+    families = []
+    if "structural" in pattern:
+        families.append((index[:, :-1], index[:, 1:], spacing_x))
+        families.append((index[:-1, :], index[1:, :], spacing_y))
+    if "diagonal" in pattern or "shear" in pattern:
+        families.append((index[:-1, :-1], index[1:, 1:], diagonal))
+    if "shear" in pattern:
+        families.append((index[:-1, 1:], index[1:, :-1], diagonal))
+    if "bend" in pattern:
+        families.append((index[:, :-2], index[:, 2:], 2.0 * spacing_x))
+        families.append((index[:-2, :], index[2:, :], 2.0 * spacing_y))
+
+    if families:
+        edges = np.concatenate(
+            [np.column_stack((a.ravel(), b.ravel())) for a, b, _ in families]
+        )
+        rest_lengths = np.concatenate(
+            [np.full(a.size, length) for a, _, length in families]
+        )
+    else:
+        edges = np.empty((0, 2), dtype=np.intp)
+        rest_lengths = np.empty(0)
+    return Topology(positions, edges, rest_lengths)
+
+
+def grid_triangles(rows, cols):
+    """
+    Split every cell of a rows x cols particle grid into two triangles.
+
+    The cells are split along the down-right diagonal (the "diagonal" edge family of
+    grid_topology()), and particles are numbered as in grid_topology().
+
+    Args:
+        rows (int): The number of particle rows.
+        cols (int): The number of particle columns.
+
+    Returns:
+        np.ndarray: Read-only (2 * (rows - 1) * (cols - 1), 3) particle indices of the
+        triangles.
+
+    Raises:
+        ValueError: If rows or cols is not positive.
+    """
+    if rows <= 0 or cols <= 0:
+        raise ValueError("Rows and columns must be positive.")
+    return _build_grid_triangles(int(rows), int(cols))
+
+
+@lru_cache(maxsize=64)
+def _build_grid_triangles(rows, cols):
+    index = np.arange(rows * cols).reshape(rows, cols)
+    top_left = index[:-1, :-1].ravel()
+    top_right = index[:-1, 1:].ravel()
+    bottom_left = index[1:, :-1].ravel()
+    bottom_right = index[1:, 1:].ravel()
+    triangles = np.concatenate(
+        (
+            np.column_stack((top_left, top_right, bottom_right)),
+            np.column_stack((top_left, bottom_right, bottom_left)),
+        )
+    )
+    triangles.flags.writeable = False
+    return triangles
@@ -1,36 +1,58 @@
 class Vector2D:
     """
     A simple 2D vector class for handling vector operations in the physics simulation.
+
+    Vectors are mutable: the in-place operators (+=, -=, *=, /=) and the fused helpers
+    such as add_scaled() update the vector itself instead of allocating a new one, so
+    take a copy() of any vector whose current value must be kept.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float = 0.0, y: float = 0.0):
         # Type checking to prevent nested Vector2D objects
-        if isinstance(x, Vector2D):
-            raise TypeError(f"x cannot be a Vector2D object. Got: {x}")
-        if isinstance(y, Vector2D):
-            raise TypeError(f"y cannot be a Vector2D object. Got: {y}")
         if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+            if isinstance(x, Vector2D):
+                raise TypeError(f"x cannot be a Vector2D object. Got: {x}")
+            if isinstance(y, Vector2D):
+                raise TypeError(f"y cannot be a Vector2D object. Got: {y}")
             raise TypeError("x and y must be numeric values.")
         self.x = x
         self.y = y
 
+    @classmethod
+    def unchecked(cls, x, y):
+        """
+        Create a vector without validating its components.
+        Intended for hot paths whose components are already known to be numbers.
+
+        Args:
+            x (float): The x component.
+            y (float): The y component.
+
+        Returns:
+            Vector2D: The new vector.
+        """
+        vector = _new(cls)
+        vector.x = x
+        vector.y = y
+        return vector
+
     def __add__(self, other):
         """Add two vectors or a vector and a scalar."""
-        if isinstance(other, Vector2D):
-            return Vector2D(self.x + other.x, self.y + other.y)
-        elif isinstance(other, (int, float)):
-            return Vector2D(self.x + other, self.y + other)
-        else:
-            raise TypeError(
-                "Unsupported operand type(s) for +: 'Vector2D' and '{}'".format(
-                    type(other).__name__
-                )
-            )
+        try:
+            return _vector(self.x + other.x, self.y + other.y)
+        except AttributeError:
+            pass
+        if isinstance(other, (int, float)):
+            return _vector(self.x + other, self.y + other)
+        # Let the other operand (e.g. a Vector2DArray) handle the addition
+        return NotImplemented
 
     def __radd__(self, other):
         """Add a scalar to a vector (reverse addition)."""
         if isinstance(other, (int, float)):
-            return Vector2D(other + self.x, other + self.y)
+            return _vector(other + self.x, other + self.y)
         else:
             raise TypeError(
                 "Unsupported operand type(s) for +: '{}' and 'Vector2D'".format(
@@ -38,17 +60,38 @@ class Vector2D:
                 )
             )
 
+    def __iadd__(self, other):
+        """Add a vector or a scalar to this vector in place."""
+        try:
+            self.x += other.x
+            self.y += other.y
+            return self
+        except AttributeError:
+            pass
+        if isinstance(other, (int, float)):
+            self.x += other
+            self.y += other
+            return self
+        raise TypeError(
+            "Unsupported operand type(s) for +=: 'Vector2D' and '{}'".format(
+                type(other).__name__
+            )
+        )
+
     def __sub__(self, other):
         """Subtract two vectors or a vector and a scalar."""
-        if isinstance(other, Vector2D):
-            return Vector2D(self.x - other.x, self.y - other.y)
-        else:
-            return Vector2D(self.x - other, self.y - other)
+        try:
+            return _vector(self.x - other.x, self.y - other.y)
+        except AttributeError:
+            pass
+        if isinstance(other, (int, float)):
+            return _vector(self.x - other, self.y - other)
+        return NotImplemented
 
     def __rsub__(self, other):
         """Subtract a vector from a scalar (reverse subtraction)."""
         if isinstance(other, (int, float)):
-            return Vector2D(other - self.x, other - self.y)
+            return _vector(other - self.x, other - self.y)
         else:
             raise TypeError(
                 "Unsupported operand type(s) for -: '{}' and 'Vector2D'".format(
@@ -56,34 +99,74 @@ class Vector2D:
                 )
             )
 
+    def __isub__(self, other):
+        """Subtract a vector or a scalar from this vector in place."""
+        try:
+            self.x -= other.x
+            self.y -= other.y
+            return self
+        except AttributeError:
+            pass
+        if isinstance(other, (int, float)):
+            self.x -= other
+            self.y -= other
+            return self
+        raise TypeError(
+            "Unsupported operand type(s) for -=: 'Vector2D' and '{}'".format(
+                type(other).__name__
+            )
+        )
+
     def __mul__(self, other):
         """Multiply a vector by a scalar."""
         if isinstance(other, (int, float)):
-            return Vector2D(self.x * other, self.y * other)
+            return _vector(self.x * other, self.y * other)
+        else:
+            raise TypeError("Multiplication is only supported with scalars.")
+
+    def __imul__(self, other):
+        """Multiply this vector by a scalar in place."""
+        if isinstance(other, (int, float)):
+            self.x *= other
+            self.y *= other
+            return self
         else:
             raise TypeError("Multiplication is only supported with scalars.")
 
     def __truediv__(self, other):
         """Divide a vector by a scalar."""
         if isinstance(other, (int, float)):
-            return Vector2D(self.x / other, self.y / other)
+            return _vector(self.x / other, self.y / other)
+        else:
+            raise TypeError("Division is only supported with scalars.")
+
+    def __itruediv__(self, other):
+        """Divide this vector by a scalar in place."""
+        if isinstance(other, (int, float)):
+            self.x /= other
+            self.y /= other
+            return self
         else:
             raise TypeError("Division is only supported with scalars.")
 
     def __neg__(self):
         """Negate the vector."""
-        return Vector2D(-self.x, -self.y)
+        return _vector(-self.x, -self.y)
 
     def magnitude(self) -> float:
         """Calculate the magnitude (length) of the vector."""
-        return (self.x**2 + self.y**2) ** 0.5
+        return (self.x * self.x + self.y * self.y) ** 0.5
+
+    def length_squared(self) -> float:
+        """Calculate the squared magnitude of the vector, avoiding the square root."""
+        return self.x * self.x + self.y * self.y
 
     def normalize(self):
         """Normalize the vector to have a magnitude of 1."""
         mag = self.magnitude()
         if mag == 0:
             raise ZeroDivisionError("Cannot normalize a zero vector.")
-        return Vector2D(self.x / mag, self.y / mag)
+        return _vector(self.x / mag, self.y / mag)
 
     def dot(self, other) -> float:
         """Calculate the dot product of two vectors."""
@@ -91,7 +174,35 @@ class Vector2D:
 
     def copy(self):
         """Return a copy of the vector."""
-        return Vector2D(self.x, self.y)
+        return _vector(self.x, self.y)
+
+    def set(self, x, y):
+        """Overwrite both components in place and return the vector."""
+        self.x = x
+        self.y = y
+        return self
+
+    def add_scaled(self, other, scale):
+        """
+        Add another vector multiplied by a scalar to this vector in place.
+        Equivalent to ``self += other * scale`` without the temporary vector.
+
+        Args:
+            other (Vector2D): The vector to add.
+            scale (float): The factor applied to other.
+
+        Returns:
+            Vector2D: This vector.
+        """
+        self.x += other.x * scale
+        self.y += other.y * scale
+        return self
+
+    def distance_squared_to(self, other):
+        """Calculate the squared distance between this vector and another vector."""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
 
     def distance_to(self, other):
         """Calculate the distance between this vector and another vector."""
@@ -105,3 +216,14 @@ class Vector2D:
 
     def __repr__(self):
         return f"Vector2D({self.x}, {self.y})"
+
+
+_new = object.__new__
+
+
+def _vector(x, y):
+    """Create a Vector2D without validating its components (operator fast path)."""
+    vector = _new(Vector2D)
+    vector.x = x
+    vector.y = y
+    return vector
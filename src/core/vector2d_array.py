@@ -0,0 +1,249 @@
+# vector2d_array.py
+# A batch of 2D vectors backed by an (N, 2) NumPy array.
+
+import numpy as np
+
+from .vector2d import Vector2D
+
+
+class Vector2DArray:
+    """
+    A batch of 2D vectors with the same operator surface as Vector2D.
+
+    Every operation acts on all vectors at once. Operands may be another Vector2DArray
+    of the same length, a single Vector2D (applied to every element) or a scalar;
+    multiplication and division also accept one scalar per element. Reductions such as
+    magnitude() and dot() return (N,) arrays instead of floats.
+
+    Like Vector2D, the in-place operators (+=, -=, *=, /=) and add_scaled() update the
+    batch itself, so take a copy() of any batch whose current values must be kept.
+
+    Attributes:
+        data (np.ndarray): (N, 2) float array; row i holds the x and y of vector i.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data=()):
+        """
+        Initialize the batch from (x, y) rows.
+
+        Args:
+            data (array-like, optional): (N, 2) components. A Vector2DArray or
+                float64 array is wrapped without copying. Defaults to an empty batch.
+
+        Raises:
+            ValueError: If the data cannot be shaped into (N, 2) rows.
+        """
+        if isinstance(data, Vector2DArray):
+            data = data.data
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 2)
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError("Vector data must have shape (N, 2).")
+        self.data = data
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """
+        Create a batch from Vector2D objects.
+
+        Args:
+            vectors (iterable[Vector2D]): The vectors to copy.
+
+        Returns:
+            Vector2DArray: The new batch.
+        """
+        return cls([(vector.x, vector.y) for vector in vectors])
+
+    @classmethod
+    def zeros(cls, count):
+        """
+        Create a batch of zero vectors.
+
+        Args:
+            count (int): The number of vectors.
+
+        Returns:
+            Vector2DArray: The new batch.
+        """
+        return cls(np.zeros((count, 2)))
+
+    def to_vectors(self):
+        """
+        Convert the batch to a list of new Vector2D objects.
+
+        Returns:
+            list[Vector2D]: One vector per row.
+        """
+        unchecked = Vector2D.unchecked
+        return [unchecked(x, y) for x, y in self.data.tolist()]
+
+    @property
+    def xs(self):
+        """(N,) view of the x components."""
+        return self.data[:, 0]
+
+    @property
+    def ys(self):
+        """(N,) view of the y components."""
+        return self.data[:, 1]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    def __getitem__(self, index):
+        """Return one vector as a Vector2D, or a selection as a Vector2DArray."""
+        if isinstance(index, (int, np.integer)):
+            x, y = self.data[index].tolist()
+            return Vector2D.unchecked(x, y)
+        return Vector2DArray(self.data[index])
+
+    def __setitem__(self, index, value):
+        self.data[index] = _operand(value, "=")
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.data
+        return self.data.astype(dtype)
+
+    def __add__(self, other):
+        """Add a batch, a vector or a scalar to every vector."""
+        return Vector2DArray(self.data + _operand(other, "+"))
+
+    def __radd__(self, other):
+        """Add the batch to a vector or a scalar (reverse addition)."""
+        return Vector2DArray(_operand(other, "+") + self.data)
+
+    def __iadd__(self, other):
+        self.data += _operand(other, "+=")
+        return self
+
+    def __sub__(self, other):
+        """Subtract a batch, a vector or a scalar from every vector."""
+        return Vector2DArray(self.data - _operand(other, "-"))
+
+    def __rsub__(self, other):
+        """Subtract the batch from a vector or a scalar (reverse subtraction)."""
+        return Vector2DArray(_operand(other, "-") - self.data)
+
+    def __isub__(self, other):
+        self.data -= _operand(other, "-=")
+        return self
+
+    def __mul__(self, other):
+        """Multiply every vector by a scalar, or by one scalar per vector."""
+        return Vector2DArray(self.data * _scale(other, "Multiplication"))
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):
+        self.data *= _scale(other, "Multiplication")
+        return self
+
+    def __truediv__(self, other):
+        """Divide every vector by a scalar, or by one scalar per vector."""
+        return Vector2DArray(self.data / _scale(other, "Division"))
+
+    def __itruediv__(self, other):
+        self.data /= _scale(other, "Division")
+        return self
+
+    def __neg__(self):
+        """Negate every vector."""
+        return Vector2DArray(-self.data)
+
+    def magnitude(self):
+        """Calculate the magnitude (length) of every vector as an (N,) array."""
+        return np.sqrt(self.length_squared())
+
+    def length_squared(self):
+        """Calculate the squared magnitude of every vector as an (N,) array."""
+        return np.einsum("ij,ij->i", self.data, self.data)
+
+    def normalize(self):
+        """
+        Normalize every vector to have a magnitude of 1.
+
+        Raises:
+            ZeroDivisionError: If any vector has zero length.
+        """
+        magnitude = self.magnitude()
+        if np.any(magnitude == 0):
+            raise ZeroDivisionError("Cannot normalize a zero vector.")
+        return Vector2DArray(self.data / magnitude[:, None])
+
+    def dot(self, other):
+        """Calculate the dot product with a batch or a single vector as an (N,) array."""
+        if isinstance(other, Vector2DArray):
+            return np.einsum("ij,ij->i", self.data, other.data)
+        if _is_vector(other):
+            return self.data[:, 0] * other.x + self.data[:, 1] * other.y
+        raise TypeError("Dot product is only supported with vectors.")
+
+    def distance_to(self, other):
+        """Calculate the distance to a batch or a single vector as an (N,) array."""
+        return (self - other).magnitude()
+
+    def add_scaled(self, other, scale):
+        """
+        Add another batch or vector multiplied by a scalar (or one scalar per vector)
+        to this batch in place.
+
+        Args:
+            other (Vector2DArray or Vector2D): The vectors to add.
+            scale (float or array-like): The factor applied to other.
+
+        Returns:
+            Vector2DArray: This batch.
+        """
+        self.data += _operand(other, "add_scaled") * _scale(scale, "Multiplication")
+        return self
+
+    def copy(self):
+        """Return a copy of the batch."""
+        return Vector2DArray(self.data.copy())
+
+    def __eq__(self, other):
+        """Check if two batches hold the same vectors."""
+        if isinstance(other, Vector2DArray):
+            return np.array_equal(self.data, other.data)
+        return False
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Vector2DArray({self.data.tolist()})"
+
+
+def _is_vector(value):
+    """Return whether value is a single vector (anything with x and y attributes)."""
+    return hasattr(value, "x") and hasattr(value, "y")
+
+
+def _operand(value, operator):
+    """Convert the right-hand side of an element-wise operation to an array."""
+    if isinstance(value, Vector2DArray):
+        return value.data
+    if _is_vector(value):
+        return np.array((value.x, value.y), dtype=np.float64)
+    if isinstance(value, (int, float, np.ndarray)):
+        return value
+    raise TypeError(
+        "Unsupported operand type(s) for {}: 'Vector2DArray' and '{}'".format(
+            operator, type(value).__name__
+        )
+    )
+
+
+def _scale(value, operation):
+    """Convert a scalar or per-vector scalars to a factor broadcastable to (N, 2)."""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (np.ndarray, list, tuple)) and not _is_vector(value):
+        return np.asarray(value, dtype=np.float64).reshape(-1, 1)
+    raise TypeError(f"{operation} is only supported with scalars.")
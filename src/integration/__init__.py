@@ -1,12 +1,34 @@
 # Integration module initialization
 # This module contains time-stepping methods for the physics simulation.
 
+from .codec import StateDecoder, StateEncoder
+from .diagnostics import Diagnostics
+from .direct_solver import DirectDistanceSolver
 from .euler import EulerIntegrator
+from .governor import FrameBudgetGovernor
+from .lod import LevelOfDetail, LodTier
+from .metrics import MetricsExporter
+from .picking import DragSpring, ParticleDragger, ParticlePicker
 from .semi_implicit_euler import SemiImplicitEulerIntegrator
+from .server import SimulationServer
 from .verlet import VerletIntegrator
+from .world import PhysicsWorld
 
 __all__ = [
     "EulerIntegrator",
     "VerletIntegrator",
     "SemiImplicitEulerIntegrator",
+    "PhysicsWorld",
+    "DirectDistanceSolver",
+    "Diagnostics",
+    "MetricsExporter",
+    "FrameBudgetGovernor",
+    "LevelOfDetail",
+    "LodTier",
+    "SimulationServer",
+    "StateEncoder",
+    "StateDecoder",
+    "ParticlePicker",
+    "ParticleDragger",
+    "DragSpring",
 ]
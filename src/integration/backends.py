@@ -0,0 +1,53 @@
+# backends.py
+# Selection of the kernel backend used by the array-backed integration path.
+
+from . import kernels, numba_kernels
+
+# Kernel backends:
+#   numpy: vectorized NumPy kernels (integration.kernels), always available
+#   numba: the same kernels compiled with Numba (integration.numba_kernels); falls back
+#          to numpy when Numba is not installed
+BACKENDS = ("numpy", "numba")
+
+
+def numba_available():
+    """Return True if Numba is installed and the compiled kernels can be used."""
+    return numba_kernels.NUMBA_AVAILABLE
+
+
+def resolve_backend(name):
+    """
+    Return the name of the backend that will actually run for a requested backend.
+
+    Args:
+        name (str): "numpy" or "numba".
+
+    Returns:
+        str: The requested backend, or "numpy" if Numba was requested but is missing.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend must be one of {BACKENDS}.")
+    if name == "numba" and not numba_available():
+        return "numpy"
+    return name
+
+
+def load_backend(name):
+    """
+    Return the kernel module of a backend, falling back to NumPy without Numba.
+    Both modules provide verlet_integrate, apply_damping and
+    project_distance_constraints with identical signatures.
+
+    Args:
+        name (str): "numpy" or "numba".
+
+    Returns:
+        module: integration.kernels or integration.numba_kernels.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    return numba_kernels if resolve_backend(name) == "numba" else kernels
@@ -0,0 +1,283 @@
+# diagnostics.py
+# Runtime stability diagnostics computed from the particle arrays of a simulation.
+
+import numpy as np
+
+# Quantities recorded for every sample, in order.
+FIELDS = (
+    "step",
+    "time",
+    "kinetic_energy",
+    "potential_energy",
+    "momentum_x",
+    "momentum_y",
+    "max_stretch",
+    "rms_stretch",
+)
+
+_RECORD = np.dtype([("step", np.int64)] + [(name, np.float64) for name in FIELDS[1:]])
+
+
+class Diagnostics:
+    """
+    Samples energy, momentum and constraint stretch of an array-backed particle system.
+
+    Call update() once per simulation step (PhysicsWorld does so once diagnostics are
+    enabled); every ``interval`` steps it measures, straight from the particle arrays:
+
+    - kinetic energy, sum of 0.5 * m * |v|^2 with the Verlet velocity
+      v = (position - old_position) / delta_time,
+    - gravitational potential energy, sum of -m * (gravity . position),
+    - linear momentum, sum of m * v,
+    - the largest and the root-mean-square relative stretch |length - rest| / rest
+      of the live distance constraints.
+
+    Only movable particles (non-zero inverse mass) contribute to energy and momentum.
+    The most recent ``capacity`` samples are kept and can be queried with history()
+    and latest().
+
+    A sample that looks like a blow-up triggers every registered callback with
+    (diagnostics, sample, reasons), where reasons lists the tripped checks:
+    "non-finite" (NaN or infinite positions), "stretch" (max stretch above
+    max_stretch) or "energy" (kinetic energy multiplied by more than energy_growth since
+    the previous sample, ignoring samples whose previous kinetic energy is below
+    min_energy).
+
+    Attributes:
+        system (ParticleSystem): The particles and constraints being measured.
+        gravity (Vector2D or None): Gravity used for the potential energy.
+        interval (int): Number of steps between samples.
+        capacity (int): Number of samples kept.
+        max_stretch (float): Relative stretch considered a blow-up.
+        energy_growth (float): Kinetic energy growth factor considered a blow-up.
+        min_energy (float): Kinetic energy below which growth is not checked.
+        steps (int): Number of steps seen by update().
+        time (float): Simulated time seen by update().
+    """
+
+    def __init__(
+        self,
+        system,
+        gravity=None,
+        interval=1,
+        capacity=1024,
+        max_stretch=1.0,
+        energy_growth=10.0,
+        min_energy=1e-6,
+    ):
+        """
+        Initialize the diagnostics of a particle system.
+
+        Args:
+            system (ParticleSystem): The particles and constraints to measure.
+            gravity (Vector2D, optional): Gravity for the potential energy. Defaults to
+                None (no potential energy).
+            interval (int, optional): Steps between samples. Defaults to 1.
+            capacity (int, optional): Number of samples kept. Defaults to 1024.
+            max_stretch (float, optional): Relative stretch that triggers the callbacks.
+                Defaults to 1.0.
+            energy_growth (float, optional): Kinetic energy growth between samples that
+                triggers the callbacks. Defaults to 10.0.
+            min_energy (float, optional): Kinetic energy below which growth is not
+                checked. Defaults to 1e-6.
+
+        Raises:
+            ValueError: If the interval, capacity or stretch limit is not positive, or
+                the energy growth is not greater than one.
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive.")
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive.")
+        if max_stretch <= 0 or energy_growth <= 1:
+            raise ValueError(
+                "Stretch limit must be positive and energy growth greater than one."
+            )
+        self.system = system
+        self.gravity = gravity
+        self.interval = interval
+        self.capacity = capacity
+        self.max_stretch = max_stretch
+        self.energy_growth = energy_growth
+        self.min_energy = min_energy
+        self.steps = 0
+        self.time = 0.0
+        self._records = np.zeros(capacity, dtype=_RECORD)
+        self._count = 0
+        self._callbacks = []
+
+    def add_callback(self, callback):
+        """
+        Register a function called as callback(diagnostics, sample, reasons) whenever
+        a sample indicates a blow-up.
+
+        Args:
+            callback (callable): The function to call.
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        Unregister a callback previously added with add_callback().
+
+        Args:
+            callback (callable): The function to remove.
+        """
+        self._callbacks.remove(callback)
+
+    def update(self, delta_time, substep_time=None):
+        """
+        Advance the step counter and take a sample every ``interval`` steps.
+
+        Args:
+            delta_time (float): The duration of the step.
+            substep_time (float, optional): The time step that produced the current
+                positions, when the step was split into substeps. Defaults to
+                delta_time.
+
+        Returns:
+            dict or None: The new sample, or None if this step was not sampled.
+        """
+        self.steps += 1
+        self.time += delta_time
+        if self.steps % self.interval:
+            return None
+        return self.sample(substep_time if substep_time is not None else delta_time)
+
+    def sample(self, delta_time):
+        """
+        Measure the system now, record the sample and check it for a blow-up.
+
+        Args:
+            delta_time (float): The time step that produced the current positions.
+
+        Returns:
+            dict: The sample, keyed by the names in FIELDS.
+        """
+        previous = self.latest()
+        sample = self.measure(delta_time)
+        self._records[self._count % self.capacity] = tuple(
+            sample[name] for name in FIELDS
+        )
+        self._count += 1
+
+        reasons = self._blowup_reasons(sample, previous)
+        if reasons:
+            for callback in list(self._callbacks):
+                callback(self, sample, reasons)
+        return sample
+
+    def measure(self, delta_time):
+        """
+        Compute all quantities for the current state without recording them.
+
+        Args:
+            delta_time (float): The time step that produced the current positions.
+
+        Returns:
+            dict: The measured quantities, keyed by the names in FIELDS.
+        """
+        system = self.system
+        movable = system.inv_masses > 0
+        masses = system.masses[movable].astype(np.float64)
+        positions = system.positions[movable].astype(np.float64)
+        velocities = (positions - system.old_positions[movable]) / delta_time
+        momentum = masses @ velocities
+        kinetic = 0.5 * float(masses @ np.einsum("ij,ij->i", velocities, velocities))
+        potential = 0.0
+        if self.gravity is not None:
+            potential = -float(masses @ (positions @ (self.gravity.x, self.gravity.y)))
+
+        live = (
+            system.constraint_active
+            & (system.stiffness > 0)
+            & (system.rest_lengths > 0)
+        )
+        max_stretch = rms_stretch = 0.0
+        if np.any(live):
+            edges = system.edges[live]
+            delta = system.positions[edges[:, 0]] - system.positions[edges[:, 1]]
+            lengths = np.sqrt(np.einsum("ij,ij->i", delta, delta, dtype=np.float64))
+            rest_lengths = system.rest_lengths[live]
+            stretch = np.abs(lengths - rest_lengths) / rest_lengths
+            max_stretch = float(stretch.max())
+            rms_stretch = float(np.sqrt(np.mean(stretch * stretch)))
+
+        return {
+            "step": self.steps,
+            "time": self.time,
+            "kinetic_energy": kinetic,
+            "potential_energy": potential,
+            "momentum_x": float(momentum[0]),
+            "momentum_y": float(momentum[1]),
+            "max_stretch": max_stretch,
+            "rms_stretch": rms_stretch,
+        }
+
+    def _blowup_reasons(self, sample, previous):
+        """Return the blow-up checks a sample trips."""
+        reasons = []
+        if not all(np.isfinite(sample[name]) for name in FIELDS[2:]):
+            reasons.append("non-finite")
+        if sample["max_stretch"] > self.max_stretch:
+            reasons.append("stretch")
+        if (
+            previous is not None
+            and previous["kinetic_energy"] >= self.min_energy
+            and sample["kinetic_energy"]
+            > self.energy_growth * previous["kinetic_energy"]
+        ):
+            reasons.append("energy")
+        return reasons
+
+    def history(self, field=None, start=None, stop=None):
+        """
+        Return the recorded samples, oldest first.
+
+        Args:
+            field (str, optional): One of FIELDS to return a single quantity as a 1D
+                array. Defaults to all quantities as a structured array.
+            start (int, optional): Only samples taken at this step or later.
+            stop (int, optional): Only samples taken before this step.
+
+        Returns:
+            np.ndarray: The selected samples (a copy).
+
+        Raises:
+            ValueError: If the field is unknown.
+        """
+        if field is not None and field not in FIELDS:
+            raise ValueError(f"Field must be one of {FIELDS}.")
+        kept = min(self._count, self.capacity)
+        order = (np.arange(kept) + self._count - kept) % self.capacity
+        records = self._records[order]
+        steps = records["step"]
+        selected = np.ones(kept, dtype=bool)
+        if start is not None:
+            selected &= steps >= start
+        if stop is not None:
+            selected &= steps < stop
+        records = records[selected]
+        return records if field is None else records[field].copy()
+
+    def latest(self):
+        """
+        Return the most recent sample.
+
+        Returns:
+            dict or None: The sample, or None if nothing has been sampled yet.
+        """
+        if self._count == 0:
+            return None
+        record = self._records[(self._count - 1) % self.capacity]
+        return {name: record[name].item() for name in FIELDS}
+
+    def clear(self):
+        """Forget all recorded samples (the step counter and time are kept)."""
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def __repr__(self):
+        return f"Diagnostics(samples={len(self)}, interval={self.interval})"
@@ -0,0 +1,232 @@
+# direct_solver.py
+# Exact linear-time solver for distance constraints whose graph is a forest (ropes,
+# chains, ragdolls), used by the Verlet integrator in "direct" solver mode.
+
+import numpy as np
+
+# Pivots below this value belong to constraints that cannot move (both particles fixed
+# or a degenerate configuration); their multipliers are left at zero.
+_PIVOT_EPSILON = 1e-12
+
+
+class DirectDistanceSolver:
+    """
+    A direct solver for distance constraints arranged as paths or trees.
+
+    Iterative PBD moves a correction one link per pass, so long ropes stretch unless they
+    get many iterations. This solver linearizes all distance constraints around the
+    current positions and solves the coupled system
+
+        (J W J^T) lambda = -stiffness * C,    dx = W J^T lambda
+
+    exactly, where C are the constraint errors, J their gradients and W the inverse
+    masses. Constraints only couple when they share a particle, so for an acyclic
+    constraint graph the system can be eliminated leaves-first without fill-in outside
+    the constraints meeting at each particle: a rope reduces to the Thomas algorithm for
+    tridiagonal systems, a ragdoll to a small tree elimination. Each solve costs O(n)
+    and is one Newton step, so one or two solves per time step keep the constraints
+    practically inextensible.
+
+    The elimination order is computed once per constraint graph; only the numeric
+    factorization runs per solve.
+
+    Attributes:
+        edges (np.ndarray): (E, 2) particle index pairs of the constraints.
+    """
+
+    def __init__(self, edges):
+        """
+        Build the elimination structure for a set of distance constraints.
+
+        Args:
+            edges (array-like): (E, 2) particle index pairs.
+
+        Raises:
+            ValueError: If the constraint graph contains a cycle (or repeated edges).
+        """
+        self.edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        order, parents = _elimination_order(self.edges)
+        rank = np.empty(len(order), dtype=np.intp)
+        rank[order] = np.arange(len(order))
+        self._order = order
+
+        # Constraints eliminated later that share the parent particle of each
+        # constraint: the only entries its elimination updates.
+        incident = {}
+        for edge, (i, j) in enumerate(self.edges.tolist()):
+            incident.setdefault(i, []).append(edge)
+            incident.setdefault(j, []).append(edge)
+        self._neighbors = [
+            sorted(
+                rank[other]
+                for other in incident.get(parents[edge], ())
+                if rank[other] > rank[edge]
+            )
+            for edge in order.tolist()
+        ]
+
+        # Every pair of constraints sharing a particle, keyed by elimination rank.
+        first, second, shared = [], [], []
+        for particle, edges_at in incident.items():
+            for a in range(len(edges_at)):
+                for b in range(a + 1, len(edges_at)):
+                    e, f = sorted((edges_at[a], edges_at[b]), key=rank.__getitem__)
+                    first.append(e)
+                    second.append(f)
+                    shared.append(particle)
+        self._pair_first = np.array(first, dtype=np.intp)
+        self._pair_second = np.array(second, dtype=np.intp)
+        self._pair_particle = np.array(shared, dtype=np.intp)
+        self._pair_keys = list(
+            zip(rank[self._pair_first].tolist(), rank[self._pair_second].tolist())
+        )
+
+    @property
+    def num_constraints(self):
+        """Number of constraints handled by the solver."""
+        return len(self.edges)
+
+    def solve(self, positions, inv_masses, rest_lengths, stiffness=1.0):
+        """
+        Project all constraints with one exact linearized solve, in place.
+
+        Args:
+            positions (np.ndarray): (N, 2) positions, updated in place.
+            inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+            rest_lengths (array-like): (E,) rest length of each constraint.
+            stiffness (float or array-like, optional): Fraction (0-1) of each
+                constraint error to remove. Defaults to 1.0.
+        """
+        if len(self.edges) == 0:
+            return
+        i, j = self.edges[:, 0], self.edges[:, 1]
+        delta = positions[i] - positions[j]
+        length = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        w_i, w_j = inv_masses[i], inv_masses[j]
+        diagonal = w_i + w_j
+        valid = (length > 0) & (diagonal > 0)
+        normal = np.zeros_like(delta)
+        normal[valid] = delta[valid] / length[valid, None]
+        rhs = np.where(
+            valid,
+            -np.broadcast_to(stiffness, length.shape) * (length - rest_lengths),
+            0.0,
+        )
+        diagonal = np.where(valid, diagonal, 1.0)
+
+        # Coupling of two constraints through their shared particle p:
+        # w_p * (dC_e/dx_p . dC_f/dx_p).
+        first, second, shared = (
+            self._pair_first,
+            self._pair_second,
+            self._pair_particle,
+        )
+        sign_first = np.where(i[first] == shared, 1.0, -1.0)
+        sign_second = np.where(i[second] == shared, 1.0, -1.0)
+        coupling = (
+            inv_masses[shared]
+            * sign_first
+            * sign_second
+            * np.einsum("ij,ij->i", normal[first], normal[second])
+        )
+
+        multipliers = self._eliminate(
+            diagonal[self._order].tolist(),
+            rhs[self._order].tolist(),
+            dict(zip(self._pair_keys, coupling.tolist())),
+        )
+        multiplier = np.empty(len(self.edges))
+        multiplier[self._order] = multipliers
+
+        step = normal * multiplier[:, None]
+        count = len(positions)
+        for axis in range(2):
+            positions[:, axis] += inv_masses * (
+                np.bincount(i, step[:, axis], count)
+                - np.bincount(j, step[:, axis], count)
+            )
+
+    def _eliminate(self, diagonal, rhs, off_diagonal):
+        """
+        Solve the symmetric system in elimination order (forward elimination followed
+        by back substitution). All arguments are indexed by elimination rank and are
+        modified in place.
+
+        Returns:
+            list[float]: The multiplier of each constraint, by elimination rank.
+        """
+        neighbors = self._neighbors
+        for k, pivot in enumerate(diagonal):
+            if pivot < _PIVOT_EPSILON:
+                diagonal[k] = float("inf")
+                continue
+            rest = neighbors[k]
+            for index, a in enumerate(rest):
+                factor = off_diagonal[k, a] / pivot
+                rhs[a] -= factor * rhs[k]
+                diagonal[a] -= factor * off_diagonal[k, a]
+                for c in rest[index + 1 :]:
+                    off_diagonal[a, c] -= factor * off_diagonal[k, c]
+
+        solution = [0.0] * len(diagonal)
+        for k in range(len(diagonal) - 1, -1, -1):
+            value = rhs[k]
+            for a in neighbors[k]:
+                value -= off_diagonal[k, a] * solution[a]
+            solution[k] = value / diagonal[k]
+        return solution
+
+    def __repr__(self):
+        return f"DirectDistanceSolver(constraints={self.num_constraints})"
+
+
+def _elimination_order(edges):
+    """
+    Order the constraints of an acyclic graph leaves-first.
+
+    Each tree of the forest is traversed breadth-first from one of its particles; a
+    constraint's parent particle is the endpoint closer to that root. Reversing the
+    traversal puts every constraint after all constraints below it.
+
+    Args:
+        edges (np.ndarray): (E, 2) particle index pairs.
+
+    Returns:
+        tuple[np.ndarray, dict]: The constraint indices in elimination order, and the
+            parent particle of every constraint.
+
+    Raises:
+        ValueError: If the graph contains a cycle.
+    """
+    incident = {}
+    for edge, (i, j) in enumerate(edges.tolist()):
+        if i == j:
+            raise ValueError("A constraint cannot connect a particle to itself.")
+        incident.setdefault(i, []).append((edge, j))
+        incident.setdefault(j, []).append((edge, i))
+
+    visited = set()
+    parents = {}
+    traversal = []
+    for root in incident:
+        if root in visited:
+            continue
+        visited.add(root)
+        frontier = [root]
+        while frontier:
+            next_frontier = []
+            for particle in frontier:
+                for edge, other in incident[particle]:
+                    if edge in parents:
+                        continue
+                    if other in visited:
+                        raise ValueError(
+                            "The direct solver requires an acyclic constraint graph "
+                            "(ropes, chains and trees such as ragdolls)."
+                        )
+                    visited.add(other)
+                    parents[edge] = particle
+                    traversal.append(edge)
+                    next_frontier.append(other)
+            frontier = next_frontier
+    return np.array(traversal[::-1], dtype=np.intp), parents
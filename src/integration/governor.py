@@ -0,0 +1,232 @@
+# governor.py
+# Frame-time budget governor that lowers simulation quality to hold a frame deadline.
+
+import collections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GovernorDecision:
+    """
+    A quality change made by a FrameBudgetGovernor.
+
+    Attributes:
+        step (int): Number of steps recorded when the decision was made.
+        setting (str): The changed setting, "constraint_iterations" or "substeps".
+        old (int): The previous value.
+        new (int): The new value.
+        step_time (float): Smoothed step time (seconds) that led to the decision.
+        reason (str): "over budget" or "headroom".
+    """
+
+    def __init__(self, step, setting, old, new, step_time, reason):
+        self.step = step
+        self.setting = setting
+        self.old = old
+        self.new = new
+        self.step_time = step_time
+        self.reason = reason
+
+    def __repr__(self):
+        return (
+            f"GovernorDecision(step={self.step}, {self.setting}: {self.old} -> "
+            f"{self.new}, step_time={self.step_time * 1e3:.2f} ms, {self.reason})"
+        )
+
+
+class FrameBudgetGovernor:
+    """
+    Adjusts constraint iterations and substeps so that simulation steps fit a budget.
+
+    Call record() with the measured wall time of every step. The governor smooths the
+    measurements with an exponential moving average and:
+
+    - when the average exceeds the budget, lowers the constraint iterations first
+      (proportionally to the overrun, down to min_iterations) and then the substeps
+      (one at a time, down to min_substeps);
+    - when the average stays below headroom * budget for ``cooldown`` consecutive
+      steps, restores quality in reverse order, one substep and then one iteration at
+      a time, up to the maximums.
+
+    After every change, the average restarts from the next measurement and the next
+    ``settle`` measurements only update it, so that the effect of the change is seen
+    before deciding again. Every decision is
+    logged at INFO level through this module's logger, and the most recent
+    ``history`` decisions are kept in ``decisions``.
+
+    The target is any object with a writable ``constraint_iterations`` attribute, and
+    optionally a writable ``substeps`` attribute (PhysicsWorld has both,
+    VerletIntegrator only the former).
+
+    Attributes:
+        target: The simulation whose quality is adjusted.
+        budget (float): Wall time per step to hold, in seconds.
+        min_iterations (int): Lowest constraint iteration count.
+        max_iterations (int): Highest constraint iteration count.
+        min_substeps (int): Lowest substep count.
+        max_substeps (int): Highest substep count.
+        headroom (float): Fraction of the budget below which quality is restored.
+        smoothing (float): Weight of a new measurement in the moving average.
+        cooldown (int): Steps with headroom needed before each restoration.
+        settle (int): Measurements ignored for decisions after a change.
+        step_time (float or None): Smoothed step time since the last change, in
+            seconds.
+        decisions (collections.deque[GovernorDecision]): The most recent changes, in
+            order; older ones are dropped.
+        history (int): Number of decisions kept.
+    """
+
+    def __init__(
+        self,
+        target,
+        budget=1.0 / 60.0,
+        min_iterations=1,
+        max_iterations=None,
+        min_substeps=1,
+        max_substeps=None,
+        headroom=0.7,
+        smoothing=0.2,
+        cooldown=30,
+        settle=3,
+        history=256,
+    ):
+        """
+        Initialize a governor; the target's current settings are the maximums unless
+        given.
+
+        Args:
+            target: The simulation to adjust (e.g. a PhysicsWorld).
+            budget (float, optional): Seconds per step. Defaults to 1/60.
+            min_iterations (int, optional): Lowest iteration count. Defaults to 1.
+            max_iterations (int, optional): Highest iteration count. Defaults to the
+                target's current count.
+            min_substeps (int, optional): Lowest substep count. Defaults to 1.
+            max_substeps (int, optional): Highest substep count. Defaults to the
+                target's current count.
+            headroom (float, optional): Fraction of the budget below which quality is
+                restored (0-1). Defaults to 0.7.
+            smoothing (float, optional): Moving average weight (0-1]. Defaults to 0.2.
+            cooldown (int, optional): Steps with headroom before each restoration.
+                Defaults to 30.
+            settle (int, optional): Measurements skipped after a change. Defaults to 3.
+            history (int, optional): Number of decisions kept. Defaults to 256.
+
+        Raises:
+            ValueError: If the budget or history is not positive, a bound is invalid,
+                or the headroom or smoothing is outside its range.
+        """
+        if budget <= 0:
+            raise ValueError("Frame budget must be positive.")
+        if not 0 < headroom < 1:
+            raise ValueError("Headroom must be between 0 and 1.")
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing must be in (0, 1].")
+        if cooldown < 1 or settle < 0:
+            raise ValueError("Cooldown must be positive and settle non-negative.")
+        if history < 1:
+            raise ValueError("History must be positive.")
+        iterations = target.constraint_iterations
+        substeps = getattr(target, "substeps", None)
+        self.target = target
+        self.budget = budget
+        self.min_iterations = min_iterations
+        self.max_iterations = (
+            max_iterations if max_iterations is not None else iterations
+        )
+        if substeps is None:
+            self.min_substeps = self.max_substeps = None
+        else:
+            self.min_substeps = min_substeps
+            self.max_substeps = max_substeps if max_substeps is not None else substeps
+            if not 1 <= self.min_substeps <= self.max_substeps:
+                raise ValueError("Substep bounds must satisfy 1 <= min <= max.")
+        if not 1 <= self.min_iterations <= self.max_iterations:
+            raise ValueError("Iteration bounds must satisfy 1 <= min <= max.")
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.settle = settle
+        self.step_time = None
+        self.history = history
+        self.decisions = collections.deque(maxlen=history)
+        self._steps = 0
+        self._settling = 0
+        self._calm = 0
+
+    def record(self, step_time):
+        """
+        Record the wall time of one step and adjust the target if needed.
+
+        Args:
+            step_time (float): Wall time of the step, in seconds.
+
+        Returns:
+            GovernorDecision or None: The change made, if any.
+        """
+        self._steps += 1
+        if self.step_time is None:
+            self.step_time = step_time
+        else:
+            self.step_time += self.smoothing * (step_time - self.step_time)
+        if self._settling > 0:
+            self._settling -= 1
+            return None
+
+        if self.step_time > self.budget:
+            self._calm = 0
+            return self._degrade()
+        if self.step_time < self.headroom * self.budget:
+            self._calm += 1
+            if self._calm >= self.cooldown:
+                self._calm = 0
+                return self._restore()
+        else:
+            self._calm = 0
+        return None
+
+    def _degrade(self):
+        """Lower the iterations, then the substeps."""
+        iterations = self.target.constraint_iterations
+        if iterations > self.min_iterations:
+            scaled = int(iterations * self.budget / self.step_time)
+            new = max(self.min_iterations, min(scaled, iterations - 1))
+            return self._change("constraint_iterations", new, "over budget")
+        if self.min_substeps is not None and self.target.substeps > self.min_substeps:
+            return self._change("substeps", self.target.substeps - 1, "over budget")
+        return None
+
+    def _restore(self):
+        """Raise the substeps, then the iterations."""
+        if self.max_substeps is not None and self.target.substeps < self.max_substeps:
+            return self._change("substeps", self.target.substeps + 1, "headroom")
+        iterations = self.target.constraint_iterations
+        if iterations < self.max_iterations:
+            return self._change("constraint_iterations", iterations + 1, "headroom")
+        return None
+
+    def _change(self, setting, new, reason):
+        """Apply a new value to the target, then log and store the decision."""
+        old = getattr(self.target, setting)
+        setattr(self.target, setting, new)
+        decision = GovernorDecision(
+            self._steps, setting, old, new, self.step_time, reason
+        )
+        self.decisions.append(decision)
+        logger.info(
+            "step %d: %s %d -> %d (%s, step time %.2f ms, budget %.2f ms)",
+            decision.step,
+            setting,
+            old,
+            new,
+            reason,
+            self.step_time * 1e3,
+            self.budget * 1e3,
+        )
+        # Measurements before the change no longer describe the step cost
+        self._settling = self.settle
+        self.step_time = None
+        return decision
+
+    def __repr__(self):
+        return f"FrameBudgetGovernor(budget={self.budget}, decisions={len(self.decisions)})"
@@ -0,0 +1,114 @@
+# kernels.py
+# Vectorized NumPy kernels for integrating and constraining array-backed particles.
+# Every kernel works in place on (N, 2) position arrays; fixed particles are the ones
+# whose inverse mass is zero. Kernels keep the floating-point type of their inputs, so
+# float32 buffers are processed in float32 throughout.
+
+import numpy as np
+
+
+def verlet_integrate(
+    positions, old_positions, accelerations, inv_masses, gravity, delta_time
+):
+    """
+    Advance all movable particles by one position-Verlet step and clear their accelerations.
+
+    Args:
+        positions (np.ndarray): (N, 2) current positions, updated in place.
+        old_positions (np.ndarray): (N, 2) previous positions, updated in place.
+        accelerations (np.ndarray): (N, 2) accumulated accelerations, reset to zero.
+        inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        gravity (array-like): Gravity acceleration (x, y) added to every movable particle.
+        delta_time (float): The time step for the integration.
+    """
+    movable = inv_masses > 0
+    velocity = positions - old_positions
+    step = velocity + (accelerations + gravity) * (delta_time * delta_time)
+    old_positions[movable] = positions[movable]
+    positions[movable] += step[movable]
+    accelerations[:] = 0.0
+
+
+def apply_damping(positions, old_positions, inv_masses, damping):
+    """
+    Scale the implicit velocity (position - old_position) of every movable particle.
+
+    Args:
+        positions (np.ndarray): (N, 2) current positions, updated in place.
+        old_positions (np.ndarray): (N, 2) previous positions.
+        inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        damping (float): Velocity scale factor (0-1).
+    """
+    movable = inv_masses > 0
+    positions[movable] = (
+        old_positions[movable] + (positions[movable] - old_positions[movable]) * damping
+    )
+
+
+def project_distance_constraints(
+    positions, inv_masses, edges, rest_lengths, stiffness, relaxation=1.0
+):
+    """
+    Project all distance constraints once, in parallel (Jacobi style).
+
+    Each constraint computes the mass-weighted correction that would restore its rest
+    length; corrections meeting at a particle are averaged so the parallel update stays
+    stable for particles with many constraints.
+
+    Args:
+        positions (np.ndarray): (N, 2) positions, updated in place.
+        inv_masses (np.ndarray): (N,) inverse masses; zero marks a fixed particle.
+        edges (np.ndarray): (E, 2) particle index pairs.
+        rest_lengths (np.ndarray): (E,) rest lengths.
+        stiffness (np.ndarray): (E,) stiffness (0-1) of each constraint.
+        relaxation (float, optional): Over-relaxation factor applied to the averaged
+            corrections. Defaults to 1.0.
+    """
+    if len(edges) == 0:
+        return
+    count = len(positions)
+    i, j = edges[:, 0], edges[:, 1]
+    delta = positions[j] - positions[i]
+    length = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    weight = inv_masses[i] + inv_masses[j]
+    active = (length > 0) & (weight > 0)
+    scale = np.zeros_like(length)
+    scale[active] = (
+        stiffness[active]
+        * (length[active] - rest_lengths[active])
+        / (length[active] * weight[active])
+    )
+    correction = delta * scale[:, None]
+
+    live = active & (stiffness > 0)
+    constrained = np.bincount(i[live], minlength=count) + np.bincount(
+        j[live], minlength=count
+    )
+    factor = (
+        relaxation * inv_masses / np.maximum(constrained, 1).astype(inv_masses.dtype)
+    )
+    for axis in range(2):
+        moved = scatter_add(i, correction[:, axis], count) - scatter_add(
+            j, correction[:, axis], count
+        )
+        positions[:, axis] += moved * factor
+
+
+def scatter_add(indices, values, count):
+    """
+    Sum values into count bins by index, keeping the floating-point type of values.
+    np.bincount always accumulates in float64, so other types use np.add.at instead.
+
+    Args:
+        indices (np.ndarray): (K,) bin of each value.
+        values (np.ndarray): (K,) values to sum.
+        count (int): Number of bins.
+
+    Returns:
+        np.ndarray: (count,) sums, with the dtype of values.
+    """
+    if values.dtype == np.float64:
+        return np.bincount(indices, values, count)
+    sums = np.zeros(count, dtype=values.dtype)
+    np.add.at(sums, indices, values)
+    return sums
@@ -0,0 +1,429 @@
+# lod.py
+# Simulation level of detail: bodies that are offscreen or small on screen are solved
+# with fewer constraint iterations and updated at a lower rate.
+
+import numpy as np
+
+# Iteration limit of constraints that are solved in every iteration.
+_UNLIMITED = np.iinfo(np.int64).max
+
+
+class LodTier:
+    """
+    A simulation quality level.
+
+    Attributes:
+        name (str): Name of the tier, used in reports.
+        iterations (int or None): Constraint iterations of the tier's bodies, or None
+            for the world's full count.
+        interval (int): Bodies are updated every ``interval`` steps, with a time step
+            ``interval`` times longer.
+        min_screen_size (float): Smallest on-screen extent (pixels) of visible bodies
+            in this tier.
+        offscreen (bool): Whether the tier is used for bodies outside the viewport.
+    """
+
+    def __init__(
+        self, name, iterations=None, interval=1, min_screen_size=0.0, offscreen=False
+    ):
+        """
+        Initialize a tier.
+
+        Args:
+            name (str): Name of the tier.
+            iterations (int, optional): Constraint iterations. Defaults to None (full).
+            interval (int, optional): Steps between updates. Defaults to 1.
+            min_screen_size (float, optional): Smallest on-screen extent in pixels.
+                Defaults to 0.0.
+            offscreen (bool, optional): Whether the tier is for offscreen bodies.
+                Defaults to False.
+
+        Raises:
+            ValueError: If the iterations or interval are not positive.
+        """
+        if iterations is not None and iterations <= 0:
+            raise ValueError("Tier iterations must be positive.")
+        if interval <= 0:
+            raise ValueError("Tier interval must be positive.")
+        self.name = name
+        self.iterations = iterations
+        self.interval = interval
+        self.min_screen_size = min_screen_size
+        self.offscreen = offscreen
+
+    def __repr__(self):
+        return (
+            f"LodTier({self.name!r}, iterations={self.iterations}, "
+            f"interval={self.interval}, min_screen_size={self.min_screen_size}, "
+            f"offscreen={self.offscreen})"
+        )
+
+
+# Default tiers, from the highest quality down:
+#   full:      visible and at least 64 px across; every iteration, every step
+#   reduced:   visible and at least 16 px across; 4 iterations, every step
+#   distant:   visible but smaller; 2 iterations, every second step
+#   offscreen: outside the viewport; 1 iteration, every fourth step
+DEFAULT_TIERS = (
+    LodTier("full", None, 1, 64.0),
+    LodTier("reduced", 4, 1, 16.0),
+    LodTier("distant", 2, 2, 0.0),
+    LodTier("offscreen", 1, 4, offscreen=True),
+)
+
+
+class LevelOfDetail:
+    """
+    Assigns a LodTier to every tracked body of a PhysicsWorld and applies it.
+
+    Before every step the bounding boxes of all bodies are computed in one vectorized
+    pass and compared with the viewport. Visible bodies get the first visible tier whose
+    minimum screen size (largest bounding box extent times ``scale``) they reach,
+    offscreen bodies the offscreen tier. Moving to a higher quality tier takes effect
+    immediately; moving to a lower one only after the body qualified for it during
+    ``hold`` consecutive steps, so that bodies near a threshold do not flicker.
+
+    Tiers act through the world's integrator:
+
+    - iteration counts become per-constraint iteration limits of the iterative solve
+      (VerletIntegrator.iteration_limits), so the work of later iterations shrinks;
+    - a body with interval N is frozen (zero inverse mass, forces kept) on N - 1 of
+      every N steps and advanced with an N times longer time step on the remaining
+      one. Bodies of one interval are spread over the N phases to balance the load.
+      The longer step scales gravity and the accumulated forces by N and applies the
+      damping of the skipped steps. The world's force fields skip frozen bodies and
+      are scaled by N^2 on every substep of the longer step (see apply_fields()).
+
+    Changing a body's interval rescales its implicit Verlet velocity to the new step
+    length, so transitions neither add nor remove momentum. Constraints between bodies
+    (world links) always use every iteration.
+
+    Attributes:
+        world (PhysicsWorld): The world whose bodies are simulated.
+        viewport (tuple): (min_x, min_y, max_x, max_y) of the visible area in world
+            units.
+        scale (float): Screen pixels per world unit.
+        margin (float): World units added around the viewport before testing
+            visibility.
+        tiers (tuple[LodTier]): The available tiers, from the highest quality down.
+        hold (int): Steps a body must qualify for a lower tier before moving to it.
+        steps (int): Number of steps taken.
+    """
+
+    def __init__(
+        self, world, viewport, scale=1.0, margin=0.0, tiers=DEFAULT_TIERS, hold=10
+    ):
+        """
+        Initialize level of detail for a world. The world's registered objects are
+        tracked automatically; spawned bodies must be passed to track().
+
+        Args:
+            world (PhysicsWorld): The world to manage.
+            viewport (tuple): (min_x, min_y, max_x, max_y) in world units.
+            scale (float, optional): Screen pixels per world unit. Defaults to 1.0.
+            margin (float, optional): World units around the viewport still treated
+                as visible. Defaults to 0.0.
+            tiers (tuple[LodTier], optional): Tiers from the highest quality down; at
+                least one must be for visible bodies. Defaults to DEFAULT_TIERS.
+            hold (int, optional): Steps before moving to a lower tier. Defaults to 10.
+
+        Raises:
+            ValueError: If no tier is for visible bodies, the viewport is empty, or the
+                scale is not positive.
+        """
+        if not any(not tier.offscreen for tier in tiers):
+            raise ValueError("At least one tier must be for visible bodies.")
+        if scale <= 0:
+            raise ValueError("Scale must be positive.")
+        self.world = world
+        self.viewport = viewport
+        self.scale = scale
+        self.margin = margin
+        self.tiers = tuple(tiers)
+        self.hold = hold
+        self.steps = 0
+        self._tracked = []
+        self._key = None
+        self._tier_of = {}
+        self._frozen = None
+        self._visible_sizes = np.array(
+            [tier.min_screen_size for tier in self.tiers if not tier.offscreen]
+        )
+        self._visible_tiers = np.flatnonzero([not t.offscreen for t in self.tiers])
+        offscreen = [index for index, t in enumerate(self.tiers) if t.offscreen]
+        self._offscreen_tier = offscreen[0] if offscreen else len(self.tiers) - 1
+        self._intervals = np.array([tier.interval for tier in self.tiers])
+
+    @property
+    def viewport(self):
+        """(min_x, min_y, max_x, max_y) of the visible area in world units."""
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, viewport):
+        min_x, min_y, max_x, max_y = viewport
+        if max_x <= min_x or max_y <= min_y:
+            raise ValueError("Viewport must have a positive width and height.")
+        self._viewport = (min_x, min_y, max_x, max_y)
+
+    def track(self, bodies):
+        """
+        Manage bodies spawned into the world (PhysicsWorld.spawn handles).
+
+        Args:
+            bodies (BodyHandle or list[BodyHandle]): The bodies to manage.
+        """
+        if not isinstance(bodies, (list, tuple)):
+            bodies = [bodies]
+        self._tracked.extend(bodies)
+
+    def bodies(self):
+        """
+        Return the managed bodies that are still alive.
+
+        Returns:
+            list[BodyHandle]: The world's registered bodies followed by tracked ones.
+        """
+        self._tracked = [body for body in self._tracked if body.alive]
+        return list(self.world._bodies.values()) + self._tracked
+
+    def tier_of(self, body):
+        """
+        Return the current tier of a body.
+
+        Args:
+            body (BodyHandle): A managed body.
+
+        Returns:
+            LodTier: The body's tier (the highest one before the first step).
+        """
+        return self.tiers[self._tier_of.get(id(body), 0)]
+
+    def counts(self):
+        """
+        Return the number of managed bodies in each tier.
+
+        Returns:
+            dict: Tier name to body count.
+        """
+        counts = dict.fromkeys((tier.name for tier in self.tiers), 0)
+        for body in self.bodies():
+            counts[self.tier_of(body).name] += 1
+        return counts
+
+    def _layout(self, bodies):
+        """Rebuild the particle and constraint ownership when the bodies change."""
+        system = self.world.system
+        key = (
+            system.num_particles,
+            system.num_constraints,
+            tuple((b.particle_start, b.particle_count) for b in bodies),
+        )
+        if key == self._key:
+            return
+        self._key = key
+        self._tier_of = {id(body): self._tier_of.get(id(body), 0) for body in bodies}
+        particle_owner = np.full(system.num_particles, len(bodies))
+        constraint_owner = np.full(system.num_constraints, len(bodies))
+        for index, body in enumerate(bodies):
+            particle_owner[body.particles] = index
+            constraint_owner[body.constraints] = index
+        self._particle_owner = particle_owner
+        self._constraint_owner = constraint_owner
+        nonempty = [i for i, body in enumerate(bodies) if body.particle_count > 0]
+        starts = np.array([bodies[i].particle_start for i in nonempty], dtype=int)
+        ends = starts + [bodies[i].particle_count for i in nonempty]
+        order = np.argsort(starts)
+        self._segments = (
+            np.array(nonempty, dtype=int)[order],
+            starts[order],
+            ends[order],
+        )
+        self._tiers = np.array(
+            [self._tier_of.get(id(body), 0) for body in bodies], dtype=int
+        )
+        self._pending = np.zeros(len(bodies), dtype=int)
+
+    def _bounds(self, count):
+        """Return the (B, 2) minimum and maximum corners of every body."""
+        positions = self.world.system.positions
+        lower = np.full((count, 2), np.inf)
+        upper = np.full((count, 2), -np.inf)
+        owners, starts, ends = self._segments
+        if len(owners):
+            # Reduce over [start, end) of each body; the segments between bodies are
+            # reduced too and discarded.
+            cuts = np.column_stack((starts, ends)).ravel()
+            last = cuts[-1] == len(positions)
+            if last:
+                cuts = cuts[:-1]
+            lower[owners] = np.minimum.reduceat(positions, cuts, axis=0)[::2]
+            upper[owners] = np.maximum.reduceat(positions, cuts, axis=0)[::2]
+        return lower, upper
+
+    def _classify(self, bodies):
+        """Choose the tier of every body from its visibility and screen size."""
+        lower, upper = self._bounds(len(bodies))
+        min_x, min_y, max_x, max_y = self.viewport
+        margin = self.margin
+        visible = (
+            (upper[:, 0] >= min_x - margin)
+            & (lower[:, 0] <= max_x + margin)
+            & (upper[:, 1] >= min_y - margin)
+            & (lower[:, 1] <= max_y + margin)
+        )
+        size = np.max(upper - lower, axis=1) * self.scale
+        reached = size[:, None] >= self._visible_sizes[None, :]
+        # First visible tier reached, or the lowest visible tier
+        choice = np.where(
+            reached.any(axis=1), reached.argmax(axis=1), len(self._visible_tiers) - 1
+        )
+        return np.where(visible, self._visible_tiers[choice], self._offscreen_tier)
+
+    def begin_step(self):
+        """
+        Update the tiers and configure the world for the coming step. Called by
+        PhysicsWorld.step() before integrating.
+        """
+        bodies = self.bodies()
+        self._layout(bodies)
+        system = self.world.system
+        wanted = self._classify(bodies)
+
+        # Upgrades apply immediately, downgrades after being wanted for hold steps
+        lower = wanted > self._tiers
+        self._pending = np.where(lower, self._pending + 1, 0)
+        new_tiers = np.where(
+            (wanted < self._tiers) | (lower & (self._pending >= self.hold)),
+            wanted,
+            self._tiers,
+        )
+        self._pending[new_tiers != self._tiers] = 0
+        changed = np.flatnonzero(new_tiers != self._tiers)
+        if len(changed):
+            ratio = np.ones(len(bodies) + 1)
+            ratio[changed] = (
+                self._intervals[new_tiers[changed]]
+                / self._intervals[self._tiers[changed]]
+            )
+            factor = ratio[self._particle_owner]
+            rescaled = factor != 1.0
+            if np.any(rescaled):
+                velocity = system.positions[rescaled] - system.old_positions[rescaled]
+                system.old_positions[rescaled] = (
+                    system.positions[rescaled] - velocity * factor[rescaled, None]
+                )
+            self._tiers = new_tiers
+            for index in changed:
+                self._tier_of[id(bodies[index])] = int(new_tiers[index])
+
+        # Per-body interval, iteration limit and whether it is updated this step
+        intervals = np.append(self._intervals[self._tiers], 1)
+        due = (self.steps + np.arange(len(bodies) + 1)) % intervals == 0
+        limits = np.array(
+            [
+                _UNLIMITED if tier.iterations is None else tier.iterations
+                for tier in self.tiers
+            ]
+        )
+        body_limits = np.append(limits[self._tiers], _UNLIMITED)
+        body_limits[~due] = 0
+        constraint_limits = body_limits[self._constraint_owner]
+        self.world.integrator.iteration_limits = (
+            constraint_limits if np.any(constraint_limits < _UNLIMITED) else None
+        )
+
+        particle_due = due[self._particle_owner]
+        frozen = np.flatnonzero(~particle_due)
+        self._frozen = (
+            frozen,
+            system.inv_masses[frozen].copy(),
+            system.accelerations[frozen].copy(),
+        )
+        stretch = intervals[self._particle_owner]
+        self._stretched = np.flatnonzero(particle_due & (stretch > 1))
+        self._stretch = stretch[self._stretched].astype(np.float64)
+
+    def before_substep(self, first):
+        """
+        Freeze the bodies that skip this step and lengthen the step of the others.
+        Called by PhysicsWorld.step() before every substep.
+
+        Args:
+            first (bool): Whether this is the first substep of the step.
+        """
+        system = self.world.system
+        frozen, _, _ = self._frozen
+        system.inv_masses[frozen] = 0.0
+
+        stretched, n = self._stretched, self._stretch[:, None]
+        if len(stretched) == 0:
+            return
+        movable = system.inv_masses[stretched] > 0
+        stretched, n = stretched[movable], n[movable]
+        gravity = self.world.gravity
+        gravity = np.array((gravity.x, gravity.y))
+        # An N times longer step: a * (N dt)^2 = (N^2 a) dt^2. Forces accumulated
+        # over the N skipped steps are already summed, hence the factor N.
+        if first:
+            system.accelerations[stretched] *= n
+        system.accelerations[stretched] += (n * n - 1.0) * gravity
+        damping = self.world.damping
+        if 0 < damping < 1:
+            # Damping of the skipped steps; the integrator applies the last one
+            velocity = system.positions[stretched] - system.old_positions[stretched]
+            system.old_positions[stretched] = system.positions[stretched] - velocity * (
+                damping ** (n - 1.0)
+            )
+
+    def apply_fields(self, fields, time, delta_time):
+        """
+        Apply force fields for one substep. Called by PhysicsWorld.step() after
+        before_substep().
+
+        Frozen bodies have zero inverse mass here and their forces are restored after
+        the substep, so fields leave them alone. Bodies on an N times longer step get
+        N^2 times the field accelerations, like gravity, and the fields see their
+        velocities per substep rather than per long step.
+
+        Args:
+            fields (list[ForceField]): The fields to apply.
+            time (float): Simulation time.
+            delta_time (float): Length of the substep.
+        """
+        system = self.world.system
+        stretched, n = self._stretched, self._stretch[:, None]
+        if len(stretched) == 0:
+            for field in fields:
+                field.apply(system, time, delta_time)
+            return
+        accelerations = system.accelerations[stretched].copy()
+        old_positions = system.old_positions[stretched].copy()
+        positions = system.positions[stretched]
+        system.old_positions[stretched] = positions - (positions - old_positions) / n
+        for field in fields:
+            field.apply(system, time, delta_time)
+        system.old_positions[stretched] = old_positions
+        added = system.accelerations[stretched] - accelerations
+        system.accelerations[stretched] = accelerations + n * n * added
+
+    def after_substep(self):
+        """
+        Unfreeze the skipped bodies and restore their forces. Called by
+        PhysicsWorld.step() after every substep.
+        """
+        system = self.world.system
+        frozen, inv_masses, accelerations = self._frozen
+        system.inv_masses[frozen] = inv_masses
+        system.accelerations[frozen] = accelerations
+
+    def end_step(self):
+        """
+        Finish the step. Called by PhysicsWorld.step() after integrating.
+        """
+        self.world.integrator.iteration_limits = None
+        self._frozen = None
+        self.steps += 1
+
+    def __repr__(self):
+        return f"LevelOfDetail(bodies={len(self.bodies())}, tiers={len(self.tiers)})"
@@ -0,0 +1,356 @@
+# metrics.py
+# Exporter publishing throughput, step-time and memory metrics of a PhysicsWorld as
+# Prometheus text over localhost HTTP and/or as JSON lines.
+
+import collections
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .verlet import PHASES
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Upper bounds (seconds) of the step-time histogram buckets; a final +Inf bucket is
+# implied.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25)
+
+# Timed phases: the integrator phases plus the whole step.
+METRIC_PHASES = PHASES + ("step",)
+
+
+class MetricsExporter:
+    """
+    Publishes metrics of a PhysicsWorld from a background thread.
+
+    The simulation thread only calls record() once per step, which appends one tuple to
+    a bounded deque (an atomic operation that takes no lock). A background thread wakes
+    every ``interval`` seconds, drains the records and aggregates them into:
+
+    - the total step count and the steps per second over the last interval,
+    - a cumulative step-time histogram per phase (the phases of VerletIntegrator plus
+      the whole step),
+    - the total number of constraint iterations,
+    - the particle and constraint counts of the world,
+    - the resident memory of the process and the size of the simulation buffers.
+
+    The aggregate is served as Prometheus text on http://host:port/metrics when a port
+    is given (port 0 picks a free one, see address), and appended to jsonl_path as one
+    JSON object per interval when a path is given. If the simulation records faster
+    than the thread drains, the oldest records beyond ``capacity`` are dropped.
+
+    Attributes:
+        world (PhysicsWorld): The world being measured.
+        interval (float): Seconds between aggregations.
+        buckets (tuple): Upper bounds of the histogram buckets, in seconds.
+        jsonl_path (str or None): File the JSON lines are appended to.
+        steps (int): Number of steps aggregated so far.
+        dropped (int): Number of records dropped because the queue was full.
+    """
+
+    def __init__(
+        self,
+        world,
+        port=None,
+        host="127.0.0.1",
+        jsonl_path=None,
+        interval=1.0,
+        buckets=DEFAULT_BUCKETS,
+        capacity=65536,
+    ):
+        """
+        Initialize an exporter; call start() to begin publishing.
+
+        Args:
+            world (PhysicsWorld): The world to measure.
+            port (int, optional): Port of the Prometheus endpoint. Defaults to None
+                (no HTTP endpoint).
+            host (str, optional): Address the endpoint binds to. Defaults to
+                "127.0.0.1".
+            jsonl_path (str, optional): File to append JSON lines to. Defaults to None.
+            interval (float, optional): Seconds between aggregations. Defaults to 1.0.
+            buckets (tuple, optional): Increasing histogram bucket bounds in seconds.
+                Defaults to DEFAULT_BUCKETS.
+            capacity (int, optional): Maximum number of pending records.
+                Defaults to 65536.
+
+        Raises:
+            ValueError: If neither a port nor a path is given, the interval or capacity
+                is not positive, or the buckets are not increasing.
+        """
+        if port is None and jsonl_path is None:
+            raise ValueError("An HTTP port or a JSON lines path is required.")
+        if interval <= 0:
+            raise ValueError("Aggregation interval must be positive.")
+        if capacity <= 0:
+            raise ValueError("Record capacity must be positive.")
+        if len(buckets) == 0 or np.any(np.diff(buckets) <= 0):
+            raise ValueError("Histogram buckets must be increasing.")
+        self.world = world
+        self.interval = interval
+        self.buckets = tuple(buckets)
+        self.jsonl_path = jsonl_path
+        self.steps = 0
+        self.dropped = 0
+        self._port = port
+        self._host = host
+        self._capacity = capacity
+        self._records = collections.deque(maxlen=capacity)
+        self._iterations = 0
+        self._counts = np.zeros((len(METRIC_PHASES), len(self.buckets) + 1), np.int64)
+        self._sums = np.zeros(len(METRIC_PHASES))
+        self._steps_per_second = 0.0
+        self._last_flush = time.perf_counter()
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    @property
+    def address(self):
+        """(host, port) the HTTP endpoint is bound to, or None without one."""
+        if self._server is None:
+            return None
+        return self._server.server_address[:2]
+
+    def record(self, step_time, phase_times, iterations):
+        """
+        Record one simulation step. Called from the simulation thread.
+
+        Args:
+            step_time (float): Wall time of the whole step in seconds.
+            phase_times (dict): Wall time in seconds of each integrator phase.
+            iterations (int): Constraint iterations performed during the step.
+        """
+        if len(self._records) == self._capacity:
+            self.dropped += 1
+        self._records.append(
+            (
+                phase_times["integrate"],
+                phase_times["constraints"],
+                phase_times["damping"],
+                step_time,
+                iterations,
+            )
+        )
+
+    def start(self):
+        """
+        Start the HTTP endpoint (if any) and the aggregation thread.
+
+        Returns:
+            MetricsExporter: self, for chaining.
+        """
+        if self._thread is not None:
+            return self
+        if self._port is not None:
+            self._server = ThreadingHTTPServer(
+                (self._host, self._port), _handler_for(self)
+            )
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._stop.clear()
+        self._last_flush = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the thread and the endpoint after a final aggregation.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Aggregate the pending records now and write a JSON line if configured.
+
+        Returns:
+            dict: The new snapshot (see snapshot()).
+        """
+        batch = []
+        for _ in range(len(self._records)):
+            try:
+                batch.append(self._records.popleft())
+            except IndexError:
+                break
+        now = time.perf_counter()
+        gauges = self._read_gauges()
+        with self._lock:
+            if batch:
+                records = np.array(batch)
+                times = records[:, : len(METRIC_PHASES)].T
+                bins = np.searchsorted(self.buckets, times, side="left")
+                for phase, phase_bins in enumerate(bins):
+                    self._counts[phase] += np.bincount(
+                        phase_bins, minlength=len(self.buckets) + 1
+                    )
+                self._sums += times.sum(axis=1)
+                self._iterations += int(records[:, -1].sum())
+            self.steps += len(batch)
+            elapsed = now - self._last_flush
+            self._steps_per_second = len(batch) / elapsed if elapsed > 0 else 0.0
+            self._last_flush = now
+            self._gauges = gauges
+            snapshot = self._snapshot()
+        if self.jsonl_path is not None:
+            with open(self.jsonl_path, "a") as stream:
+                stream.write(json.dumps(snapshot) + "\n")
+        return snapshot
+
+    def _read_gauges(self):
+        """Read the counts and memory usage of the world."""
+        system = self.world.system
+        return {
+            "particles": int(system.num_active_particles),
+            "particle_slots": int(system.num_particles),
+            "constraints": int(np.count_nonzero(system.constraint_active)),
+            "buffer_bytes": int(
+                sum(
+                    value.nbytes
+                    for value in vars(system).values()
+                    if isinstance(value, np.ndarray)
+                )
+            ),
+            "resident_bytes": _resident_memory(),
+        }
+
+    def snapshot(self):
+        """
+        Return the current aggregate.
+
+        Returns:
+            dict: Totals, rates, gauges and per-phase histograms (bucket bounds, counts
+            per bucket and sum of the step times).
+        """
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {
+            "time": time.time(),
+            "steps": self.steps,
+            "dropped": self.dropped,
+            "steps_per_second": self._steps_per_second,
+            "constraint_iterations": self._iterations,
+            **self._gauges,
+            "phases": {
+                phase: {
+                    "buckets": list(self.buckets),
+                    "counts": self._counts[index].tolist(),
+                    "sum": float(self._sums[index]),
+                }
+                for index, phase in enumerate(METRIC_PHASES)
+            },
+        }
+
+    def prometheus(self):
+        """
+        Render the current aggregate in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE verlet_steps_total counter",
+            f"verlet_steps_total {snapshot['steps']}",
+            "# TYPE verlet_dropped_records_total counter",
+            f"verlet_dropped_records_total {snapshot['dropped']}",
+            "# TYPE verlet_constraint_iterations_total counter",
+            f"verlet_constraint_iterations_total {snapshot['constraint_iterations']}",
+            "# TYPE verlet_steps_per_second gauge",
+            f"verlet_steps_per_second {snapshot['steps_per_second']}",
+        ]
+        for name in (
+            "particles",
+            "particle_slots",
+            "constraints",
+            "buffer_bytes",
+            "resident_bytes",
+        ):
+            if name in snapshot:
+                lines.append(f"# TYPE verlet_{name} gauge")
+                lines.append(f"verlet_{name} {snapshot[name]}")
+        lines.append("# TYPE verlet_phase_seconds histogram")
+        for phase, histogram in snapshot["phases"].items():
+            cumulative = np.cumsum(histogram["counts"])
+            bounds = [repr(bound) for bound in histogram["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, cumulative):
+                lines.append(
+                    f'verlet_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} '
+                    f"{count}"
+                )
+            lines.append(
+                f'verlet_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]}'
+            )
+            lines.append(
+                f'verlet_phase_seconds_count{{phase="{phase}"}} {cumulative[-1]}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __repr__(self):
+        return f"MetricsExporter(steps={self.steps}, address={self.address})"
+
+
+def _resident_memory():
+    """Return the resident set size of the process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as stream:
+            return int(stream.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    # Peak instead of current usage; bytes on macOS, kilobytes elsewhere.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _handler_for(exporter):
+    """Build a request handler class serving the exporter's metrics."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = exporter.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
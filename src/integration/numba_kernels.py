@@ -0,0 +1,127 @@
+# numba_kernels.py
+# Numba-compiled versions of the kernels in integration.kernels, with the same
+# signatures and results. Importing this module never fails: when Numba is not
+# installed, NUMBA_AVAILABLE is False and the kernels must not be used (see
+# integration.backends, which falls back to the NumPy kernels).
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def _jit(parallel=False):
+    """Compile a function in nopython mode when Numba is available."""
+    if numba is None:
+        return lambda function: function
+    return numba.njit(cache=True, parallel=parallel)
+
+
+# Loops over particles write only to their own particle and run in parallel; loops
+# that scatter constraint corrections onto shared particles run serially.
+_prange = numba.prange if numba is not None else range
+
+
+@_jit(parallel=True)
+def _verlet_integrate(
+    positions, old_positions, accelerations, inv_masses, gravity_x, gravity_y, dt2
+):
+    for i in _prange(positions.shape[0]):
+        if inv_masses[i] > 0:
+            x, y = positions[i, 0], positions[i, 1]
+            positions[i, 0] = x + (
+                (x - old_positions[i, 0]) + (accelerations[i, 0] + gravity_x) * dt2
+            )
+            positions[i, 1] = y + (
+                (y - old_positions[i, 1]) + (accelerations[i, 1] + gravity_y) * dt2
+            )
+            old_positions[i, 0] = x
+            old_positions[i, 1] = y
+        accelerations[i, 0] = 0.0
+        accelerations[i, 1] = 0.0
+
+
+@_jit(parallel=True)
+def _apply_damping(positions, old_positions, inv_masses, damping):
+    for i in _prange(positions.shape[0]):
+        if inv_masses[i] > 0:
+            for axis in range(2):
+                old = old_positions[i, axis]
+                positions[i, axis] = old + (positions[i, axis] - old) * damping
+
+
+@_jit(parallel=True)
+def _edge_corrections(positions, inv_masses, edges, rest_lengths, stiffness):
+    count = edges.shape[0]
+    corrections = np.zeros((count, 2), dtype=positions.dtype)
+    live = np.zeros(count, dtype=np.bool_)
+    for e in _prange(count):
+        i, j = edges[e, 0], edges[e, 1]
+        dx = positions[j, 0] - positions[i, 0]
+        dy = positions[j, 1] - positions[i, 1]
+        length = np.sqrt(dx * dx + dy * dy)
+        weight = inv_masses[i] + inv_masses[j]
+        if length > 0 and weight > 0:
+            scale = stiffness[e] * (length - rest_lengths[e]) / (length * weight)
+            corrections[e, 0] = dx * scale
+            corrections[e, 1] = dy * scale
+            live[e] = stiffness[e] > 0
+    return corrections, live
+
+
+@_jit(parallel=True)
+def _scatter_corrections(positions, inv_masses, edges, corrections, live, relaxation):
+    count = positions.shape[0]
+    moved = np.zeros((count, 2), dtype=positions.dtype)
+    constrained = np.zeros(count)
+    for e in range(edges.shape[0]):
+        i, j = edges[e, 0], edges[e, 1]
+        moved[i, 0] += corrections[e, 0]
+        moved[i, 1] += corrections[e, 1]
+        moved[j, 0] -= corrections[e, 0]
+        moved[j, 1] -= corrections[e, 1]
+        if live[e]:
+            constrained[i] += 1.0
+            constrained[j] += 1.0
+    for p in _prange(count):
+        factor = relaxation * inv_masses[p] / max(constrained[p], 1.0)
+        positions[p, 0] += moved[p, 0] * factor
+        positions[p, 1] += moved[p, 1] * factor
+
+
+def verlet_integrate(
+    positions, old_positions, accelerations, inv_masses, gravity, delta_time
+):
+    """Compiled equivalent of kernels.verlet_integrate."""
+    _verlet_integrate(
+        positions,
+        old_positions,
+        accelerations,
+        inv_masses,
+        float(gravity[0]),
+        float(gravity[1]),
+        delta_time * delta_time,
+    )
+
+
+def apply_damping(positions, old_positions, inv_masses, damping):
+    """Compiled equivalent of kernels.apply_damping."""
+    _apply_damping(positions, old_positions, inv_masses, float(damping))
+
+
+def project_distance_constraints(
+    positions, inv_masses, edges, rest_lengths, stiffness, relaxation=1.0
+):
+    """Compiled equivalent of kernels.project_distance_constraints."""
+    if len(edges) == 0:
+        return
+    corrections, live = _edge_corrections(
+        positions, inv_masses, edges, rest_lengths, stiffness
+    )
+    _scatter_corrections(
+        positions, inv_masses, edges, corrections, live, float(relaxation)
+    )
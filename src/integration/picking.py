@@ -0,0 +1,385 @@
+# picking.py
+# Nearest-particle picking through a lazily rebuilt spatial index, and particle dragging.
+
+import math
+
+import numpy as np
+
+from src.core.force_field import ForceField, _vector
+from src.core.spatial_grid import SegmentIndex
+
+
+class ParticlePicker:
+    """
+    Finds the particles of a PhysicsWorld near a point without scanning all of them.
+
+    The particles are indexed in a SegmentIndex as degenerate segments. The index is
+    only touched when a query is made: the first query after the world has stepped
+    (or changed size) checks in one vectorized pass whether any particle has moved
+    further than the index's slack, and rebuilds the grid only then. Queries between
+    steps, and queries while little moves, only visit the grid cells around the query
+    point. Inactive (despawned) particles are never returned.
+
+    Attributes:
+        world (PhysicsWorld): The world whose particles are picked.
+        cell_size (float or None): Edge length of the grid cells; None chooses it from
+            the particle density when the index is built.
+        slack (float or None): Movement tolerated before a rebuild; None chooses a
+            quarter of the cell size.
+    """
+
+    def __init__(self, world, cell_size=None, slack=None):
+        """
+        Initialize a picker.
+
+        Args:
+            world (PhysicsWorld): The world whose particles are picked.
+            cell_size (float, optional): Edge length of the grid cells. Defaults to
+                None (about four particles across a cell).
+            slack (float, optional): Movement tolerated before a rebuild. Defaults to
+                None (a quarter of the cell size).
+
+        Raises:
+            ValueError: If the cell size or slack is not positive.
+        """
+        if cell_size is not None and cell_size <= 0:
+            raise ValueError("Cell size must be positive.")
+        if slack is not None and slack <= 0:
+            raise ValueError("Slack must be positive.")
+        self.world = world
+        self.cell_size = cell_size
+        self.slack = slack
+        self._index = None
+        self._points = None
+        self._bounds = None
+        self._checked = None
+
+    @property
+    def rebuilds(self):
+        """Number of times the spatial grid was built."""
+        return self._index.rebuilds if self._index is not None else 0
+
+    def invalidate(self):
+        """
+        Make the next query check the index against the current positions.
+        Needed only after moving particles by hand between steps.
+        """
+        self._checked = None
+
+    def _refresh(self):
+        """Bring the index up to date with the world, if it may be stale."""
+        system = self.world.system
+        positions = system.positions
+        state = (self.world.time, len(positions), system.num_active_particles)
+        if state == self._checked:
+            return
+        if self._points is None or len(self._points) != len(positions):
+            self._points = np.repeat(np.arange(len(positions)), 2).reshape(-1, 2)
+            self._index = SegmentIndex(
+                self.cell_size or _cell_size(positions, system.num_active_particles),
+                self.slack,
+            )
+        self._index.update(positions, self._points)
+        self._bounds = None
+        self._checked = state
+
+    def _cover(self, x, y):
+        """Radius of the square around a point that contains every particle."""
+        if self._bounds is None:
+            # Column-wise; reductions over the short axis of (N, 2) arrays are slow
+            positions = self.world.system.positions
+            self._bounds = [
+                (column.min(), column.max())
+                for column in (positions[:, 0], positions[:, 1])
+            ]
+        (min_x, max_x), (min_y, max_y) = self._bounds
+        return max(x - min_x, y - min_y, max_x - x, max_y - y, 0.0)
+
+    def _candidates(self, x, y, radius):
+        """Active particles inside the square around a point, and their distances."""
+        found = self._index.query((x - radius, y - radius, x + radius, y + radius))
+        system = self.world.system
+        found = found[system.active[found]]
+        positions = system.positions[found]
+        dx = positions[:, 0] - x
+        dy = positions[:, 1] - y
+        return found, np.sqrt(dx * dx + dy * dy)
+
+    def nearest(self, x, y, max_distance=None):
+        """
+        Return the active particle nearest to a point.
+
+        The search starts with the cells around the point and doubles its radius until
+        a particle is found inside it, so its cost depends on the local density.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+            max_distance (float, optional): Largest distance to search. Defaults to
+                None (no limit).
+
+        Returns:
+            int or None: World index of the nearest particle, or None if there is no
+            active particle within max_distance.
+        """
+        self._refresh()
+        if self.world.system.num_active_particles == 0:
+            return None
+        limit = math.inf if max_distance is None else max_distance
+        radius = min(self._index.cell_size, limit)
+        cover = math.inf
+        while True:
+            found, distances = self._candidates(x, y, radius)
+            if len(found):
+                best = int(np.argmin(distances))
+                # Anything closer would lie inside the searched square
+                if distances[best] <= min(radius, limit) or radius >= cover:
+                    return int(found[best]) if distances[best] <= limit else None
+            if radius >= min(limit, cover):
+                return None
+            if cover == math.inf:
+                # Computed only when the search has to widen
+                cover = self._cover(x, y)
+            radius = min(2.0 * radius, limit, cover)
+
+    def within(self, x, y, radius):
+        """
+        Return the active particles within a distance of a point.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+            radius (float): Search radius.
+
+        Returns:
+            np.ndarray: Sorted world indices of the particles.
+        """
+        self._refresh()
+        found, distances = self._candidates(x, y, radius)
+        return found[distances <= radius]
+
+    def __repr__(self):
+        return f"ParticlePicker(cell_size={self._index.cell_size if self._index else self.cell_size}, rebuilds={self.rebuilds})"
+
+
+def _cell_size(positions, count):
+    """A cell size holding about sixteen of count particles per cell on average."""
+    if count == 0:
+        return 1.0
+    width = float(np.ptp(positions[:, 0]))
+    height = float(np.ptp(positions[:, 1]))
+    if width * height <= 0:
+        side = max(width, height)
+        return 16.0 * side / count if side > 0 else 1.0
+    return 4.0 * math.sqrt(width * height / count)
+
+
+def _owner(system, index):
+    """Return the spawned body holding a particle, or None."""
+    for body in system._bodies:
+        if body.particle_start <= index < body.particle_start + body.particle_count:
+            return body
+    return None
+
+
+class DragSpring(ForceField):
+    """
+    A soft constraint pulling one particle towards a target point.
+
+    The particle is tied to the target by a damped spring whose acceleration does not
+    depend on the particle's mass, so light and heavy particles follow the target
+    alike, with the given natural frequency and damping ratio. The constraint is soft:
+    the particle trails a quickly moving target instead of jumping to it, and the
+    rest of its body (and its other constraints) pull back on it. Fixed particles are
+    never moved.
+
+    Given the body the particle belongs to, the spring follows the particle when the
+    system compacts its buffers. Once the particle is despawned the spring disables
+    itself, so it never acts on a stale index or on a particle spawned into the
+    freed slot.
+
+    Attributes:
+        body (BodyHandle or None): The body of the particle.
+        target (Vector2D, tuple or callable): The point the particle is pulled to.
+        frequency (float): Natural frequency of the spring in Hz.
+        damping_ratio (float): Damping ratio; 1 is critically damped.
+    """
+
+    uses_velocity = True
+
+    def __init__(self, index, target, frequency=5.0, damping_ratio=1.0, body=None):
+        """
+        Initialize the spring.
+
+        Args:
+            index (int): World index of the particle.
+            target (Vector2D, tuple or callable): The point the particle is pulled to.
+            frequency (float, optional): Natural frequency in Hz. Defaults to 5.0.
+            damping_ratio (float, optional): Damping ratio. Defaults to 1.0.
+            body (BodyHandle, optional): The body owning the particle. Defaults to
+                None (the index is only checked against the active flags).
+
+        Raises:
+            ValueError: If the frequency is not positive or the damping ratio is
+                negative.
+        """
+        if frequency <= 0:
+            raise ValueError("Frequency must be positive.")
+        if damping_ratio < 0:
+            raise ValueError("Damping ratio cannot be negative.")
+        super().__init__(indices=[index])
+        self.body = body
+        self._local = index - body.particle_start if body is not None else None
+        self.target = target
+        self.frequency = frequency
+        self.damping_ratio = damping_ratio
+
+    @property
+    def index(self):
+        """World index of the dragged particle."""
+        return int(self.indices[0])
+
+    def attached(self, system):
+        """
+        Check that the particle is still alive, disabling the spring otherwise.
+
+        Args:
+            system (ParticleSystem): The system holding the particle.
+
+        Returns:
+            bool: Whether the spring still acts on its particle.
+        """
+        if self.enabled and self.body is not None:
+            if self.body.alive:
+                self.indices[0] = self.body.particle_start + self._local
+            else:
+                self.enabled = False
+        if self.enabled:
+            active = system.active
+            if self.index >= len(active) or not active[self.index]:
+                self.enabled = False
+        return self.enabled
+
+    def apply(self, system, time=0.0, delta_time=None):
+        if self.attached(system):
+            super().apply(system, time, delta_time)
+
+    def accelerations(self, positions, velocities, inv_masses, time, delta_time):
+        target_x, target_y = _vector(self.target, time)
+        omega = 2.0 * math.pi * self.frequency
+        stiffness = omega * omega
+        damping = 2.0 * self.damping_ratio * omega
+        movable = inv_masses > 0
+        return (
+            movable
+            * (stiffness * (target_x - positions[:, 0]) - damping * velocities[0]),
+            movable
+            * (stiffness * (target_y - positions[:, 1]) - damping * velocities[1]),
+        )
+
+    def __repr__(self):
+        return f"DragSpring(index={self.index}, target={self.target}, frequency={self.frequency})"
+
+
+class ParticleDragger:
+    """
+    Picks up the particle nearest to a point and drags it with a DragSpring.
+
+    begin() picks the nearest particle within ``pick_radius`` and adds a DragSpring
+    to the world, move() moves its target, and end() removes it again. The methods
+    take world coordinates; see rendering.interaction.MouseDragHandler for driving a
+    dragger with the mouse.
+
+    Attributes:
+        world (PhysicsWorld): The world whose particles are dragged.
+        picker (ParticlePicker): The picker used to find particles.
+        pick_radius (float): Largest distance at which a particle is picked up.
+        frequency (float): Natural frequency of the drag spring in Hz.
+        damping_ratio (float): Damping ratio of the drag spring.
+        spring (DragSpring or None): The spring of the current drag.
+    """
+
+    def __init__(
+        self, world, picker=None, pick_radius=10.0, frequency=5.0, damping_ratio=1.0
+    ):
+        """
+        Initialize a dragger.
+
+        Args:
+            world (PhysicsWorld): The world whose particles are dragged.
+            picker (ParticlePicker, optional): The picker to use. Defaults to a new
+                ParticlePicker of the world.
+            pick_radius (float, optional): Largest picking distance. Defaults to 10.0.
+            frequency (float, optional): Natural frequency of the spring in Hz.
+                Defaults to 5.0.
+            damping_ratio (float, optional): Damping ratio of the spring. Defaults
+                to 1.0.
+
+        Raises:
+            ValueError: If the pick radius is negative.
+        """
+        if pick_radius < 0:
+            raise ValueError("Pick radius cannot be negative.")
+        self.world = world
+        self.picker = picker if picker is not None else ParticlePicker(world)
+        self.pick_radius = pick_radius
+        self.frequency = frequency
+        self.damping_ratio = damping_ratio
+        self.spring = None
+
+    @property
+    def dragging(self):
+        """Whether a particle is being dragged."""
+        if self.spring is not None and not self.spring.attached(self.world.system):
+            # The particle was despawned while dragged
+            self.end()
+        return self.spring is not None
+
+    def begin(self, x, y):
+        """
+        Start dragging the particle nearest to a point.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+
+        Returns:
+            int or None: World index of the picked particle, or None if no particle
+            is within the pick radius.
+        """
+        self.end()
+        index = self.picker.nearest(x, y, self.pick_radius)
+        if index is None:
+            return None
+        body = _owner(self.world.system, index)
+        self.spring = self.world.add_field(
+            DragSpring(index, (x, y), self.frequency, self.damping_ratio, body)
+        )
+        return index
+
+    def move(self, x, y):
+        """
+        Move the point the dragged particle is pulled to.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+        """
+        if not self.dragging:
+            return
+        self.spring.target = (x, y)
+
+    def end(self):
+        """
+        Release the dragged particle, if any.
+        """
+        if self.spring is None:
+            return
+        if self.spring in self.world.fields:
+            self.world.remove_field(self.spring)
+        self.spring = None
+
+    def __repr__(self):
+        return (
+            f"ParticleDragger(pick_radius={self.pick_radius}, dragging={self.dragging})"
+        )
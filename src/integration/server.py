@@ -0,0 +1,632 @@
+# server.py
+# Asyncio server stepping headless PhysicsWorlds on a fixed clock and streaming their
+# particle positions to local TCP and WebSocket clients.
+
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import logging
+import struct
+
+import numpy as np
+
+from src.core.vector2d import Vector2D
+
+logger = logging.getLogger(__name__)
+
+# Magic string of the WebSocket opening handshake (RFC 6455).
+_WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# WebSocket opcodes used by the server.
+_TEXT, _BINARY, _CLOSE, _PING, _PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+# WebSocket close status for a message larger than the server accepts.
+_MESSAGE_TOO_BIG = 1009
+
+
+class _MessageTooBig(ValueError):
+    """A client message exceeded the server's maximum message size."""
+
+
+def encode_message(header, body=b""):
+    """
+    Encode a server message: a JSON header line followed by a binary body.
+
+    Args:
+        header (dict): The header; "type" names the message.
+        body (bytes, optional): The binary body. Defaults to b"".
+
+    Returns:
+        bytes: The payload.
+    """
+    return json.dumps(header, separators=(",", ":")).encode() + b"\n" + body
+
+
+def decode_message(payload):
+    """
+    Split a server message into its header and body.
+
+    Args:
+        payload (bytes): A payload made by encode_message().
+
+    Returns:
+        tuple[dict, bytes]: The header and the body.
+    """
+    header, _, body = payload.partition(b"\n")
+    return json.loads(header), body
+
+
+def decode_positions(header, body):
+    """
+    Return the particle positions carried by a "frame" message.
+
+    Args:
+        header (dict): The frame header.
+        body (bytes): The frame body.
+
+    Returns:
+        np.ndarray: (particles, 2) float32 positions; NaN marks inactive slots.
+    """
+    return np.frombuffer(body, dtype="<f4").reshape(header["particles"], 2)
+
+
+def decode_edges(header, body):
+    """
+    Return the constraint edges carried by a "topology" message.
+
+    Args:
+        header (dict): The topology header.
+        body (bytes): The topology body.
+
+    Returns:
+        np.ndarray: (constraints, 2) int32 particle indices.
+    """
+    return np.frombuffer(body, dtype="<i4").reshape(header["constraints"], 2)
+
+
+async def read_message(reader):
+    """
+    Read one message from a TCP connection to a SimulationServer.
+
+    Args:
+        reader (asyncio.StreamReader): The connection.
+
+    Returns:
+        tuple[dict, bytes]: The header and the body.
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection closes mid-message.
+    """
+    (length,) = struct.unpack("<I", await reader.readexactly(4))
+    return decode_message(await reader.readexactly(length))
+
+
+class _WorldState:
+    """A served world with its clock state."""
+
+    def __init__(self, name, world):
+        self.name = name
+        self.world = world
+        self.paused = False
+        self.pending = 0
+        self.steps = 0
+        self.time = 0.0
+
+
+class _Client:
+    """
+    A connected viewer.
+
+    Frames wait in a bounded deque that drops the oldest frame when a new one arrives
+    and the deque is full; command replies wait in their own deque and are never
+    dropped. Instead, a client that lets more than max_replies replies pile up (by
+    sending commands faster than it reads) is disconnected. A writer task sends
+    replies first, then frames, and awaits drain() so that a slow connection only
+    holds up its own task.
+    """
+
+    def __init__(self, writer, queue_size, websocket, max_replies):
+        self.writer = writer
+        self.websocket = websocket
+        self.frames = collections.deque(maxlen=queue_size)
+        self.replies = collections.deque()
+        self.max_replies = max_replies
+        self.wakeup = asyncio.Event()
+        self.worlds = None
+        self.sent = 0
+        self.dropped = 0
+
+    def push_frame(self, payload):
+        if len(self.frames) == self.frames.maxlen:
+            self.dropped += 1
+        self.frames.append(payload)
+        self.wakeup.set()
+
+    def push_reply(self, payload, opcode=_BINARY):
+        if len(self.replies) >= self.max_replies:
+            if not self.writer.is_closing():
+                logger.warning("Disconnecting a client that does not read its replies.")
+            self.replies.clear()
+            self.close()
+            return
+        self.replies.append((opcode, payload))
+        self.wakeup.set()
+
+    def close(self):
+        self.writer.close()
+        self.wakeup.set()
+
+
+class SimulationServer:
+    """
+    Steps PhysicsWorlds on a fixed clock and streams their state to local clients.
+
+    Every tick of the clock (``rate`` ticks per second) advances each running world by
+    1 / rate seconds, and every ``frame_interval`` ticks the positions of each world
+    are encoded once and queued for every client subscribed to it. Each client has its
+    own queue of at most ``queue_size`` frames and its own writer task; when a client
+    reads slower than frames are produced, its oldest frames are dropped, so slow
+    viewers see fewer frames while the clock and the other clients carry on. If a
+    tick overruns by more than ``max_lag`` ticks, the clock skips ahead instead of
+    catching up.
+
+    Stepping runs in the event loop, between network I/O; the server is meant for
+    headless worlds (scenes render through a pygame window and are not served).
+
+    Clients connect over plain TCP (``port``) and, optionally, WebSocket
+    (``websocket_port``). Server messages are a JSON header line followed by a binary
+    body; over TCP each message is prefixed with its length as a little-endian uint32
+    (see read_message()), over WebSocket it is one binary message. Message types:
+
+    - "frame": {"world", "step", "time", "particles"} with float32 (x, y) pairs;
+      inactive particle slots are NaN.
+    - "topology": {"world", "constraints"} with int32 particle index pairs.
+    - "worlds": {"worlds": [names]}, sent on connection.
+    - "ok" / "error": {"command"} or {"error"} in reply to a command.
+
+    Clients send commands as JSON objects, one per line over TCP or one per text
+    message over WebSocket, with a "command" and optionally a "world" (all worlds
+    if omitted):
+
+    - {"command": "subscribe", "worlds": [names]}: receive only these worlds' frames.
+    - {"command": "topology", "world": name}: request the constraint edges.
+    - {"command": "pause"} / {"command": "resume"}: stop or restart the clock.
+    - {"command": "step", "count": n}: advance paused worlds by n ticks.
+    - {"command": "gravity", "value": [x, y]}: set the gravity.
+
+    Attributes:
+        worlds (dict): Served worlds by name.
+        rate (float): Clock ticks (steps) per second.
+        frame_interval (int): Ticks between streamed frames.
+        queue_size (int): Frames queued per client before the oldest are dropped.
+        max_lag (int): Ticks the clock may fall behind before skipping ahead.
+        max_replies (int): Unsent replies tolerated per client before it is
+            disconnected.
+        max_message_size (int): Largest client message, in bytes; longer WebSocket
+            messages are refused with close status 1009 and longer TCP lines end the
+            connection.
+        ticks (int): Number of clock ticks so far.
+        skipped (int): Number of times the clock skipped ahead.
+    """
+
+    def __init__(
+        self,
+        worlds,
+        host="127.0.0.1",
+        port=0,
+        websocket_port=None,
+        rate=60.0,
+        frame_interval=1,
+        queue_size=2,
+        max_lag=5,
+        max_replies=64,
+        max_message_size=1 << 16,
+    ):
+        """
+        Initialize a server; call start() (or serve()) to begin.
+
+        Args:
+            worlds (PhysicsWorld or dict): The world to serve, or worlds by name. A
+                single world is served as "world".
+            host (str, optional): Address to bind to. Defaults to "127.0.0.1".
+            port (int, optional): TCP port; 0 picks a free one. Defaults to 0.
+            websocket_port (int, optional): WebSocket port; 0 picks a free one.
+                Defaults to None (no WebSocket endpoint).
+            rate (float, optional): Steps per second. Defaults to 60.0.
+            frame_interval (int, optional): Ticks between frames. Defaults to 1.
+            queue_size (int, optional): Frames queued per client. Defaults to 2.
+            max_lag (int, optional): Ticks of lag tolerated before skipping ahead.
+                Defaults to 5.
+            max_replies (int, optional): Unsent replies tolerated per client.
+                Defaults to 64.
+            max_message_size (int, optional): Largest client message in bytes.
+                Defaults to 65536.
+
+        Raises:
+            ValueError: If no world is given, or the rate, frame interval, queue
+                size, reply limit or message size is not positive.
+        """
+        if not isinstance(worlds, dict):
+            worlds = {"world": worlds}
+        if not worlds:
+            raise ValueError("At least one world must be served.")
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        if frame_interval < 1 or queue_size < 1:
+            raise ValueError("Frame interval and queue size must be at least 1.")
+        if max_replies < 1 or max_message_size < 1:
+            raise ValueError("Reply limit and message size must be at least 1.")
+        self.worlds = dict(worlds)
+        self.rate = rate
+        self.frame_interval = frame_interval
+        self.queue_size = queue_size
+        self.max_lag = max_lag
+        self.max_replies = max_replies
+        self.max_message_size = max_message_size
+        self.ticks = 0
+        self.skipped = 0
+        self._host = host
+        self._port = port
+        self._websocket_port = websocket_port
+        self._states = {name: _WorldState(name, w) for name, w in self.worlds.items()}
+        self._clients = set()
+        self._servers = {}
+        self._clock = None
+
+    @property
+    def address(self):
+        """(host, port) of the TCP endpoint, or None when not started."""
+        return self._address("tcp")
+
+    @property
+    def websocket_address(self):
+        """(host, port) of the WebSocket endpoint, or None without one."""
+        return self._address("websocket")
+
+    def _address(self, kind):
+        server = self._servers.get(kind)
+        if server is None:
+            return None
+        return server.sockets[0].getsockname()[:2]
+
+    @property
+    def clients(self):
+        """Number of connected clients."""
+        return len(self._clients)
+
+    def paused(self, name):
+        """
+        Whether a world's clock is paused.
+
+        Args:
+            name (str): Name of the world.
+
+        Returns:
+            bool: True if the world is paused.
+        """
+        return self._states[name].paused
+
+    async def start(self):
+        """
+        Open the endpoints and start the clock.
+
+        Returns:
+            SimulationServer: self, for chaining.
+        """
+        if self._clock is not None:
+            return self
+        self._servers["tcp"] = await asyncio.start_server(
+            self._serve_tcp, self._host, self._port, limit=self.max_message_size
+        )
+        if self._websocket_port is not None:
+            self._servers["websocket"] = await asyncio.start_server(
+                self._serve_websocket, self._host, self._websocket_port
+            )
+        self._clock = asyncio.create_task(self._run_clock())
+        return self
+
+    async def stop(self):
+        """
+        Stop the clock, disconnect every client and close the endpoints.
+        """
+        if self._clock is not None:
+            self._clock.cancel()
+            try:
+                await self._clock
+            except asyncio.CancelledError:
+                pass
+            self._clock = None
+        for client in list(self._clients):
+            client.close()
+        for server in self._servers.values():
+            server.close()
+            await server.wait_closed()
+        self._servers = {}
+
+    async def serve(self, duration=None):
+        """
+        Serve until cancelled, or for a number of seconds.
+
+        Args:
+            duration (float, optional): Seconds to serve. Defaults to None (forever).
+        """
+        await self.start()
+        try:
+            if duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            await self.stop()
+
+    def run(self, duration=None):
+        """
+        Serve from a new event loop, blocking the calling thread.
+
+        Args:
+            duration (float, optional): Seconds to serve. Defaults to None (until
+                interrupted).
+        """
+        try:
+            asyncio.run(self.serve(duration))
+        except KeyboardInterrupt:
+            pass
+
+    async def _run_clock(self):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.rate
+        deadline = loop.time()
+        while True:
+            self.tick()
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < -self.max_lag * period:
+                self.skipped += 1
+                logger.info(
+                    "Simulation clock is %.1f ticks behind; skipping ahead",
+                    -delay / period,
+                )
+                deadline = loop.time()
+                delay = 0.0
+            await asyncio.sleep(max(delay, 0.0))
+
+    def tick(self):
+        """
+        Advance every running world by one step and queue frames when due.
+        Called by the clock; can also be called directly to drive the server manually.
+        """
+        period = 1.0 / self.rate
+        for state in self._states.values():
+            if not state.paused or state.pending > 0:
+                if state.pending > 0:
+                    state.pending -= 1
+                state.world.step(period)
+                state.steps += 1
+                state.time += period
+        self.ticks += 1
+        if self.ticks % self.frame_interval == 0 and self._clients:
+            self.broadcast()
+
+    def broadcast(self):
+        """
+        Queue the current frame of every world for its subscribed clients.
+        Each frame is encoded once, whatever the number of clients.
+        """
+        for name, state in self._states.items():
+            receivers = [
+                client
+                for client in self._clients
+                if client.worlds is None or name in client.worlds
+            ]
+            if not receivers:
+                continue
+            payload = self._frame(state)
+            for client in receivers:
+                client.push_frame(payload)
+
+    def _frame(self, state):
+        system = state.world.system
+        positions = system.positions.astype("<f4")
+        positions[~system.active] = np.nan
+        header = {
+            "type": "frame",
+            "world": state.name,
+            "step": state.steps,
+            "time": round(state.time, 9),
+            "particles": len(positions),
+        }
+        return encode_message(header, positions.tobytes())
+
+    def _topology(self, state):
+        system = state.world.system
+        edges = system.edges[system.constraint_active].astype("<i4")
+        header = {"type": "topology", "world": state.name, "constraints": len(edges)}
+        return encode_message(header, edges.tobytes())
+
+    def _selected(self, request):
+        """States a command applies to: the named world, or all of them."""
+        name = request.get("world")
+        if name is None:
+            return list(self._states.values())
+        if name not in self._states:
+            raise ValueError(f"Unknown world: {name!r}.")
+        return [self._states[name]]
+
+    def handle_command(self, client, text):
+        """
+        Execute one client command and queue the reply.
+
+        Args:
+            client (_Client): The client that sent the command.
+            text (str or bytes): The JSON command.
+        """
+        try:
+            request = json.loads(text)
+            command = request["command"]
+            if command == "subscribe":
+                names = request.get("worlds")
+                unknown = set(names or ()) - set(self._states)
+                if unknown:
+                    raise ValueError(f"Unknown worlds: {sorted(unknown)}.")
+                client.worlds = None if names is None else set(names)
+            elif command == "topology":
+                for state in self._selected(request):
+                    client.push_reply(self._topology(state))
+            elif command in ("pause", "resume"):
+                for state in self._selected(request):
+                    state.paused = command == "pause"
+                    state.pending = 0
+            elif command == "step":
+                count = int(request.get("count", 1))
+                if count < 1:
+                    raise ValueError("Step count must be positive.")
+                for state in self._selected(request):
+                    if state.paused:
+                        state.pending += count
+            elif command == "gravity":
+                x, y = request["value"]
+                for state in self._selected(request):
+                    state.world.gravity = Vector2D(float(x), float(y))
+            else:
+                raise ValueError(f"Unknown command: {command!r}.")
+        except (ValueError, KeyError, TypeError) as error:
+            client.push_reply(encode_message({"type": "error", "error": str(error)}))
+            return
+        client.push_reply(encode_message({"type": "ok", "command": command}))
+
+    def _connect(self, writer, websocket):
+        client = _Client(writer, self.queue_size, websocket, self.max_replies)
+        self._clients.add(client)
+        client.push_reply(
+            encode_message({"type": "worlds", "worlds": list(self._states)})
+        )
+        return client
+
+    async def _serve_tcp(self, reader, writer):
+        client = self._connect(writer, websocket=False)
+        sender = asyncio.create_task(self._send(client))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    self.handle_command(client, line)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            await self._disconnect(client, sender)
+
+    async def _serve_websocket(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        key = _websocket_key(request)
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+        accept = base64.b64encode(hashlib.sha1(key + _WEBSOCKET_GUID).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        client = self._connect(writer, websocket=True)
+        sender = asyncio.create_task(self._send(client))
+        try:
+            while True:
+                opcode, payload = await _read_websocket_frame(
+                    reader, self.max_message_size
+                )
+                if opcode == _CLOSE:
+                    break
+                if opcode == _PING:
+                    client.push_reply(payload, _PONG)
+                elif opcode == _TEXT:
+                    self.handle_command(client, payload)
+        except _MessageTooBig:
+            status = struct.pack("!H", _MESSAGE_TOO_BIG)
+            writer.write(_websocket_frame(status, _CLOSE))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await self._disconnect(client, sender)
+
+    async def _send(self, client):
+        writer = client.writer
+        try:
+            while not writer.is_closing():
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                while client.replies or client.frames:
+                    if client.replies:
+                        opcode, payload = client.replies.popleft()
+                    else:
+                        opcode, payload = _BINARY, client.frames.popleft()
+                        client.sent += 1
+                    if client.websocket:
+                        writer.write(_websocket_frame(payload, opcode))
+                    else:
+                        writer.write(struct.pack("<I", len(payload)) + payload)
+                    await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _disconnect(self, client, sender):
+        self._clients.discard(client)
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        client.writer.close()
+
+    def __repr__(self):
+        return f"SimulationServer(worlds={list(self.worlds)}, rate={self.rate}, clients={self.clients})"
+
+
+def _websocket_key(request):
+    """Return the Sec-WebSocket-Key of an upgrade request, or None."""
+    for line in request.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"sec-websocket-key":
+            return value.strip()
+    return None
+
+
+def _websocket_frame(payload, opcode):
+    """Frame a payload as one unmasked, unfragmented WebSocket message."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def _read_websocket_frame(reader, max_size):
+    """
+    Read one WebSocket frame from a client and return (opcode, payload).
+    Raises _MessageTooBig, before reading the payload, if it is longer than max_size.
+    """
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > max_size:
+        raise _MessageTooBig(f"Message of {length} bytes exceeds {max_size}.")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None and length:
+        # One vectorized XOR with the mask repeated to the payload's length
+        key = np.frombuffer(mask * (-(-length // 4)), dtype=np.uint8, count=length)
+        payload = (np.frombuffer(payload, dtype=np.uint8) ^ key).tobytes()
+    return first & 0x0F, payload
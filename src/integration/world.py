@@ -0,0 +1,448 @@
+# world.py
+# A physics world that merges every registered object into one set of global buffers.
+
+import time
+
+import numpy as np
+
+from src.core.particle_system import ParticleSystem
+from src.core.topology import Topology
+from src.core.vector2d import Vector2D
+from src.rendering.culling import array_bounds
+
+from .diagnostics import Diagnostics
+from .lod import LevelOfDetail
+from .metrics import MetricsExporter
+from .verlet import VerletIntegrator
+
+
+class PhysicsWorld:
+    """
+    A container that simulates all of its objects in one global pass.
+
+    Objects (ropes, cloths, softbodies, ragdolls, chains, ...) are registered with add();
+    their particles and springs are copied into a shared ParticleSystem, so a single
+    Verlet integration and a single vectorized constraint solve advance the whole scene
+    with world-level gravity, damping and iteration settings. Template bodies can be
+    spawned directly into the same buffers, and constraints may join particles of
+    different objects.
+
+    While an object is registered, the world owns its state; call sync() to copy the
+    simulated positions back into the object's Particle instances (for example before
+    rendering them through the object itself).
+
+    Attributes:
+        system (ParticleSystem): The global particle and constraint buffers.
+        integrator (VerletIntegrator): The integrator that advances the buffers.
+        substeps (int): Number of integration substeps per step.
+        objects (list): The registered objects, in registration order.
+        diagnostics (Diagnostics or None): Stability diagnostics sampled after every
+            step, once enabled with enable_diagnostics().
+        metrics (MetricsExporter or None): Exporter every step is recorded to, once
+            enabled with enable_metrics().
+        lod (LevelOfDetail or None): Level of detail applied to every step, once
+            enabled with enable_lod().
+        fields (list[ForceField]): Force fields applied before every substep, see
+            add_field().
+        time (float): Simulated time in seconds, passed to time-varying fields.
+    """
+
+    def __init__(
+        self,
+        gravity=None,
+        damping=0.99,
+        constraint_iterations=8,
+        substeps=1,
+        solver="iterative",
+        chebyshev_rho=None,
+        chebyshev_warmup=2,
+        backend="numpy",
+        dtype=np.float64,
+    ):
+        """
+        Initialize an empty world.
+
+        Args:
+            gravity (Vector2D, optional): Gravity acceleration. Defaults to Vector2D(0, 9.81).
+            damping (float, optional): Global damping factor (0-1). Defaults to 0.99.
+            constraint_iterations (int, optional): Constraint iterations per substep. Defaults to 8.
+            substeps (int, optional): Integration substeps per step. Defaults to 1.
+            solver (str, optional): Distance constraint solver, "iterative" or "direct"
+                (see VerletIntegrator). Defaults to "iterative".
+            chebyshev_rho (float, optional): Spectral radius estimate enabling Chebyshev
+                acceleration of the iterative solver (see VerletIntegrator).
+                Defaults to None.
+            chebyshev_warmup (int, optional): Unaccelerated iterations per substep
+                before the acceleration starts. Defaults to 2.
+            backend (str, optional): Kernel backend, "numpy" or "numba" (falls back
+                to "numpy" without Numba installed). Defaults to "numpy".
+            dtype (type or str, optional): Floating-point type of the particle and
+                constraint buffers, float32 or float64 (see ParticleSystem).
+                Defaults to np.float64.
+
+        Raises:
+            ValueError: If substeps is not positive, the backend or dtype is unknown,
+                or the solver or its settings are invalid.
+        """
+        if substeps <= 0:
+            raise ValueError("Substeps must be positive.")
+        self.system = ParticleSystem(dtype=dtype)
+        self.integrator = VerletIntegrator(
+            self.system,
+            constraint_iterations=constraint_iterations,
+            damping=damping,
+            gravity=gravity if gravity is not None else Vector2D(0, 9.81),
+            solver=solver,
+            chebyshev_rho=chebyshev_rho,
+            chebyshev_warmup=chebyshev_warmup,
+            backend=backend,
+        )
+        self.substeps = substeps
+        self.objects = []
+        self._bodies = {}
+        self._particle_index = {}
+        self._constraint_sets = {}
+        self._links = []
+        self.diagnostics = None
+        self.metrics = None
+        self.lod = None
+        self.fields = []
+        self.time = 0.0
+
+    @property
+    def gravity(self):
+        """Gravity acceleration applied to every movable particle."""
+        return self.integrator.gravity
+
+    @gravity.setter
+    def gravity(self, gravity):
+        self.integrator.gravity = gravity
+        if self.diagnostics is not None:
+            self.diagnostics.gravity = gravity
+
+    @property
+    def damping(self):
+        """Global damping factor (0-1)."""
+        return self.integrator.damping
+
+    @damping.setter
+    def damping(self, damping):
+        self.integrator.damping = damping
+
+    @property
+    def constraint_iterations(self):
+        """Constraint iterations per substep."""
+        return self.integrator.constraint_iterations
+
+    @constraint_iterations.setter
+    def constraint_iterations(self, iterations):
+        self.integrator.constraint_iterations = iterations
+
+    def add(self, obj):
+        """
+        Register an object and merge its particles and springs into the world.
+
+        Args:
+            obj: Any object exposing ``particles`` (list[Particle]) and ``springs``
+                (list[Spring]) attributes. Batched constraints listed in an optional
+                ``constraint_sets`` attribute are merged as well.
+
+        Returns:
+            BodyHandle: The slots the object occupies in the world buffers.
+
+        Raises:
+            ValueError: If the object is already registered.
+        """
+        if id(obj) in self._bodies:
+            raise ValueError("Object is already part of this world.")
+        topology = Topology.from_particles(obj.particles, obj.springs)
+        body = self.system.spawn(topology)
+        self.system.old_positions[body.particles] = [
+            (p.old_position.x, p.old_position.y) for p in obj.particles
+        ]
+        self._constraint_sets[id(obj)] = [
+            self.system.add_constraint_set(constraint_set.shifted(body.particle_start))
+            for constraint_set in getattr(obj, "constraint_sets", ())
+        ]
+        self.objects.append(obj)
+        self._bodies[id(obj)] = body
+        for local, particle in enumerate(obj.particles):
+            self._particle_index[id(particle)] = (body, local)
+        return body
+
+    def remove(self, obj):
+        """
+        Unregister an object, writing its final state back to its particles first.
+        Constraints that connect the object to other objects are removed as well.
+
+        Args:
+            obj: A registered object.
+
+        Raises:
+            ValueError: If the object is not registered.
+        """
+        body = self._bodies.get(id(obj))
+        if body is None:
+            raise ValueError("Object is not part of this world.")
+        self._sync_object(obj, body)
+        for link in [link for link, bodies in self._links if body in bodies]:
+            self.system.despawn(link)
+        self._links = [(link, bodies) for link, bodies in self._links if link.alive]
+        for constraint_set in self._constraint_sets.pop(id(obj)):
+            self.system.remove_constraint_set(constraint_set)
+        self.system.despawn(body)
+        for particle in obj.particles:
+            del self._particle_index[id(particle)]
+        del self._bodies[id(obj)]
+        self.objects.remove(obj)
+
+    def spawn(self, topology, offsets):
+        """
+        Spawn template instances directly into the world buffers.
+
+        Args:
+            topology (Topology): The template to instantiate.
+            offsets (array-like): (K, 2) translation of each instance.
+
+        Returns:
+            list[BodyHandle]: One handle per instance.
+        """
+        offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 2)
+        return [self.system.spawn(topology, offset) for offset in offsets]
+
+    def index_of(self, particle):
+        """
+        Return the index of a registered particle in the world buffers.
+
+        Args:
+            particle (Particle): A particle of a registered object.
+
+        Returns:
+            int: The particle's index in ``system`` arrays.
+
+        Raises:
+            KeyError: If the particle does not belong to a registered object.
+        """
+        body, local = self._particle_index[id(particle)]
+        return body.particle_start + local
+
+    def connect(self, particle1, particle2, rest_length=None, stiffness=1.0):
+        """
+        Add a distance constraint between two particles, possibly of different objects.
+
+        Args:
+            particle1 (Particle or int): The first particle or its world index.
+            particle2 (Particle or int): The second particle or its world index.
+            rest_length (float, optional): The rest length. Defaults to the current distance.
+            stiffness (float, optional): The stiffness (0-1) of the constraint. Defaults to 1.0.
+
+        Returns:
+            BodyHandle: A handle to the new constraint, accepted by disconnect().
+        """
+        bodies = set()
+        indices = []
+        for particle in (particle1, particle2):
+            if isinstance(particle, (int, np.integer)):
+                index = int(particle)
+                body = self._body_of(index)
+                if body is not None:
+                    bodies.add(body)
+                indices.append(index)
+            else:
+                bodies.add(self._particle_index[id(particle)][0])
+                indices.append(self.index_of(particle))
+        if rest_length is None:
+            positions = self.system.positions
+            rest_length = float(
+                np.linalg.norm(positions[indices[0]] - positions[indices[1]])
+            )
+        link = self.system.link([indices], [rest_length], stiffness)
+        self._links.append((link, bodies))
+        return link
+
+    def _body_of(self, index):
+        """Return the body of the registered object owning a world index, if any."""
+        for body in self._bodies.values():
+            if body.particle_start <= index < body.particle_start + body.particle_count:
+                return body
+        return None
+
+    def disconnect(self, link):
+        """
+        Remove a constraint created with connect().
+
+        Args:
+            link (BodyHandle): The handle returned by connect().
+        """
+        self.system.despawn(link)
+        self._links = [(other, bodies) for other, bodies in self._links if other.alive]
+
+    def apply_force(self, force, indices=None):
+        """
+        Apply a force to some or all particles in the world.
+
+        Args:
+            force (Vector2D or array-like): The force to apply.
+            indices (array-like, optional): World particle indices. Defaults to all particles.
+        """
+        self.system.apply_force(force, indices)
+
+    def add_field(self, field):
+        """
+        Apply a force field to the world before every substep.
+
+        Args:
+            field (ForceField): The field; its indices, if any, are world particle
+                indices (see BodyHandle.particles).
+
+        Returns:
+            ForceField: The field, for chaining.
+        """
+        self.fields.append(field)
+        return field
+
+    def remove_field(self, field):
+        """
+        Stop applying a force field.
+
+        Args:
+            field (ForceField): A field added with add_field().
+
+        Raises:
+            ValueError: If the field was not added.
+        """
+        self.fields.remove(field)
+
+    def step(self, delta_time):
+        """
+        Advance the whole world by one time step.
+
+        Args:
+            delta_time (float): The time step for the update.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter()
+            phase_totals = dict.fromkeys(self.integrator.phase_times, 0.0)
+        lod = self.lod
+        if lod is not None:
+            lod.begin_step()
+        sub_delta = delta_time / self.substeps
+        for substep in range(self.substeps):
+            if lod is not None:
+                lod.before_substep(substep == 0)
+                lod.apply_fields(self.fields, self.time, sub_delta)
+            else:
+                for field in self.fields:
+                    field.apply(self.system, self.time, sub_delta)
+            self.integrator.integrate(sub_delta)
+            self.time += sub_delta
+            if lod is not None:
+                lod.after_substep()
+            if metrics is not None:
+                for phase, elapsed in self.integrator.phase_times.items():
+                    phase_totals[phase] += elapsed
+        if lod is not None:
+            lod.end_step()
+        if self.diagnostics is not None:
+            self.diagnostics.update(delta_time, sub_delta)
+        if metrics is not None:
+            metrics.record(
+                time.perf_counter() - started,
+                phase_totals,
+                self.substeps * self.constraint_iterations,
+            )
+
+    def enable_diagnostics(self, **options):
+        """
+        Start sampling stability diagnostics after every step.
+
+        Args:
+            **options: Keyword arguments of Diagnostics (interval, capacity,
+                max_stretch, energy_growth, min_energy).
+
+        Returns:
+            Diagnostics: The new diagnostics, also stored in the diagnostics attribute.
+        """
+        self.diagnostics = Diagnostics(self.system, self.gravity, **options)
+        return self.diagnostics
+
+    def disable_diagnostics(self):
+        """
+        Stop sampling stability diagnostics.
+        """
+        self.diagnostics = None
+
+    def enable_lod(self, viewport, **options):
+        """
+        Start simulating offscreen and small bodies at a lower level of detail.
+
+        Args:
+            viewport (tuple): (min_x, min_y, max_x, max_y) of the visible area.
+            **options: Keyword arguments of LevelOfDetail (scale, margin, tiers, hold).
+
+        Returns:
+            LevelOfDetail: The new level of detail, also stored in the lod attribute.
+        """
+        self.lod = LevelOfDetail(self, viewport, **options)
+        return self.lod
+
+    def disable_lod(self):
+        """
+        Simulate every body at full quality again.
+        """
+        self.lod = None
+
+    def enable_metrics(self, **options):
+        """
+        Start exporting throughput, step-time and memory metrics.
+
+        Args:
+            **options: Keyword arguments of MetricsExporter (port, host, jsonl_path,
+                interval, buckets, capacity).
+
+        Returns:
+            MetricsExporter: The started exporter, also stored in the metrics attribute.
+        """
+        self.disable_metrics()
+        self.metrics = MetricsExporter(self, **options).start()
+        return self.metrics
+
+    def disable_metrics(self):
+        """
+        Stop the metrics exporter, if any.
+        """
+        if self.metrics is not None:
+            self.metrics.stop()
+            self.metrics = None
+
+    def sync(self):
+        """
+        Copy the simulated state back into the Particle objects of registered objects.
+        """
+        for obj in self.objects:
+            self._sync_object(obj, self._bodies[id(obj)])
+
+    def _sync_object(self, obj, body):
+        positions = self.system.positions[body.particles]
+        old_positions = self.system.old_positions[body.particles].tolist()
+        for particle, (x, y), (old_x, old_y) in zip(
+            obj.particles, positions.tolist(), old_positions
+        ):
+            particle.position = Vector2D(x, y)
+            particle.old_position = Vector2D(old_x, old_y)
+        if hasattr(obj, "bounds"):
+            # Objects rendered on their own are culled by these bounds
+            obj.bounds = array_bounds(positions)
+
+    def render(self, renderer):
+        """
+        Render every live particle and constraint in the world.
+
+        Args:
+            renderer: The renderer to use for drawing.
+        """
+        self.system.render(renderer)
+
+    def __repr__(self):
+        return f"PhysicsWorld(objects={len(self.objects)}, particles={self.system.num_active_particles}, constraints={self.system.num_constraints})"
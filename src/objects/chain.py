@@ -1,16 +1,31 @@
 # chain.py
 # Implementation of the Chain class for simulating a chain with angle constraints.
 
+import numpy as np
+
+from core.bending import BendingConstraints
 from core.constraint import Constraint
+from core.constraint_set import project_particles
 from core.particle import Particle
 from core.spring import Spring
 from core.vector2d import Vector2D
+from rendering.culling import (
+    bounds_visible,
+    particle_bounds,
+    renderer_viewport,
+    visible_particles,
+    visible_springs,
+)
 
 
 class Chain:
     """
     A class representing a chain with angle constraints.
     A chain is a series of particles connected by springs, with additional angle constraints to maintain rigidity.
+
+    Angle constraints are stored as one batched BendingConstraints table (see
+    ``constraint_sets``) and projected together in a single vectorized pass, both by
+    Chain.update and when the chain is simulated inside a PhysicsWorld.
     """
 
     def __init__(
@@ -49,6 +64,8 @@ class Chain:
         self.particles = []
         self.springs = []
         self.constraints = []
+        self.bending = BendingConstraints(mode="angle")
+        self.constraint_sets = [self.bending]
 
         # Create particles and springs for the chain
         for i in range(self.num_links):
@@ -73,9 +90,10 @@ class Chain:
         # Fix the first particle to create an anchor point
         if self.particles:
             self.particles[0].is_fixed = True
+        self.bounds = particle_bounds(self.particles)
 
     def add_angle_constraint(
-        self, particle1_index, particle2_index, particle3_index, angle
+        self, particle1_index, particle2_index, particle3_index, angle, stiffness=1.0
     ):
         """
         Add an angle constraint between three particles to maintain a specific angle.
@@ -84,23 +102,59 @@ class Chain:
             particle1_index (int): Index of the first particle.
             particle2_index (int): Index of the second particle (vertex of the angle).
             particle3_index (int): Index of the third particle.
-            angle (float): The desired angle in radians.
+            angle (float): The desired signed angle in radians, measured from the first
+                arm to the second; pi keeps the three particles in a straight line.
+            stiffness (float, optional): The stiffness (0-1) of the constraint. Defaults to 1.0.
         """
         if (
             0 <= particle1_index < len(self.particles)
             and 0 <= particle2_index < len(self.particles)
             and 0 <= particle3_index < len(self.particles)
         ):
-            constraint = AngleConstraint(
-                self.particles[particle1_index],
-                self.particles[particle2_index],
-                self.particles[particle3_index],
-                angle,
+            self.bending.add(
+                [(particle1_index, particle2_index, particle3_index)],
+                [angle],
+                stiffness,
             )
-            self.constraints.append(constraint)
         else:
             raise IndexError("Particle index out of range.")
 
+    def add_bending_constraints(self, stiffness=1.0, mode="distance"):
+        """
+        Constrain every consecutive particle triplet to its current shape.
+        The "distance" mode keeps the distance between every particle and the one after
+        next (the cheap "skip-one" variant); the "angle" mode keeps the angle at every
+        inner particle.
+
+        Args:
+            stiffness (float, optional): The stiffness (0-1) of the constraints. Defaults to 1.0.
+            mode (str, optional): "distance" or "angle". Defaults to "distance".
+
+        Returns:
+            BendingConstraints: The new constraints.
+        """
+        first = np.arange(len(self.particles) - 2)
+        bending = BendingConstraints.from_positions(
+            self._positions_array(),
+            np.column_stack((first, first + 1, first + 2)),
+            stiffness,
+            mode,
+        )
+        self.constraint_sets.append(bending)
+        return bending
+
+    def _positions_array(self):
+        """Return the particle positions as an (N, 2) array."""
+        return np.array(
+            [(p.position.x, p.position.y) for p in self.particles], dtype=np.float64
+        ).reshape(-1, 2)
+
+    def _project_constraint_sets(self):
+        """Project all batched constraints once on the chain's particles."""
+        if not any(len(constraint_set) for constraint_set in self.constraint_sets):
+            return
+        project_particles(self.constraint_sets, self.particles)
+
     def update(self, delta_time):
         """
         Update the chain by applying forces and constraints.
@@ -117,13 +171,17 @@ class Chain:
         for spring in self.springs:
             spring.apply()
 
-        # Apply angle constraints
+        # Apply angle and bending constraints in one batched pass
+        self._project_constraint_sets()
+
+        # Apply any other constraints
         for constraint in self.constraints:
             constraint.apply()
 
         # Update particle positions
         for particle in self.particles:
             particle.update_position(delta_time)
+        self.bounds = particle_bounds(self.particles)
 
     def render(self, renderer):
         """
@@ -132,19 +190,25 @@ class Chain:
         Args:
             renderer: The renderer to use for drawing the chain.
         """
-        for spring in self.springs:
+        viewport = renderer_viewport(renderer)
+        if not bounds_visible(self.bounds, viewport):
+            return
+
+        for spring in visible_springs(self.springs, viewport):
             renderer.draw_spring(spring)
 
-        for particle in self.particles:
+        for particle in visible_particles(self.particles, viewport):
             renderer.draw_particle(particle)
 
 
 class AngleConstraint(Constraint):
     """
     A constraint to maintain a specific angle between three particles.
+    This is the single-constraint form of BendingConstraints, for use in lists of
+    individual constraint objects; chains batch their angle constraints instead.
     """
 
-    def __init__(self, particle1, particle2, particle3, angle):
+    def __init__(self, particle1, particle2, particle3, angle, stiffness=1.0):
         """
         Initialize the angle constraint with three particles and a desired angle.
 
@@ -152,39 +216,33 @@ class AngleConstraint(Constraint):
             particle1 (Particle): The first particle.
             particle2 (Particle): The second particle (vertex of the angle).
             particle3 (Particle): The third particle.
-            angle (float): The desired angle in radians.
+            angle (float): The desired signed angle in radians.
+            stiffness (float, optional): The stiffness (0-1) of the constraint. Defaults to 1.0.
         """
-        super().__init__()
+        # An angle constraint has no rest length; the target angle takes its place.
+        super().__init__(particle1, particle3, rest_length=None)
         self.particle1 = particle1
         self.particle2 = particle2
         self.particle3 = particle3
         self.angle = angle
+        self._bending = BendingConstraints(
+            [(0, 1, 2)], [angle], stiffness, mode="angle"
+        )
 
     def apply(self):
         """
         Apply the angle constraint to the particles.
         """
-        # Calculate vectors from particle2 to particle1 and particle3
-        v1 = self.particle1.position - self.particle2.position
-        v2 = self.particle3.position - self.particle2.position
-
-        # Calculate the current angle between the vectors
-        current_angle = v1.angle_between(v2)
-
-        # Calculate the angle difference
-        angle_diff = current_angle - self.angle
-
-        # Apply corrective forces to maintain the desired angle
-        # This is a simplified approach; a more accurate method would involve torque and angular velocity
-        force_magnitude = 0.1 * angle_diff  # Adjust the multiplier as needed
-
-        # Calculate perpendicular vectors for applying torque
-        perpendicular1 = v1.perpendicular().normalized()
-        perpendicular2 = v2.perpendicular().normalized()
-
-        # Apply forces to particle1 and particle3
-        self.particle1.apply_force(perpendicular1 * force_magnitude)
-        self.particle3.apply_force(perpendicular2 * force_magnitude)
+        particles = (self.particle1, self.particle2, self.particle3)
+        positions = np.array(
+            [(p.position.x, p.position.y) for p in particles], dtype=np.float64
+        )
+        inv_masses = np.array([0.0 if p.is_fixed else p.inv_mass for p in particles])
+        self._bending.targets[0] = self.angle
+        self._bending.project(positions, inv_masses)
+        for particle, (x, y) in zip(particles, positions.tolist()):
+            if not particle.is_fixed:
+                particle.position = Vector2D(x, y)
 
     def render(self, renderer):
         """
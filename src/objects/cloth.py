@@ -1,19 +1,39 @@
 # cloth.py
 # Implementation of a simple grid-based cloth for the physics simulation.
 
+from core.attachment import AttachmentConstraints
+from core.constraint_set import project_particles
 from core.particle import Particle
 from core.spring import Spring
+from core.topology import grid_topology, grid_triangles
 from core.vector2d import Vector2D
+from core.vector2d_array import Vector2DArray
+from rendering.culling import (
+    bounds_visible,
+    particle_bounds,
+    renderer_viewport,
+    visible_particles,
+    visible_springs,
+)
 
 
 class Cloth:
     """
     A class representing a simple grid-based cloth in the simulation.
     The cloth is modeled as a grid of particles connected by springs.
+    The grid is also split into triangles (``triangles``, (T, 3) particle indices),
+    which the aerodynamic model in core.aerodynamics works on.
     """
 
     def __init__(
-        self, width, height, particle_mass=1.0, spring_stiffness=1.0, spring_damping=0.1
+        self,
+        width,
+        height,
+        particle_mass=1.0,
+        spring_stiffness=1.0,
+        spring_damping=0.1,
+        pattern=("structural", "diagonal"),
+        long_range_attachments=False,
     ):
         """
         Initialize the cloth with a grid of particles and springs.
@@ -24,6 +44,12 @@ class Cloth:
             particle_mass (float, optional): The mass of each particle. Defaults to 1.0.
             spring_stiffness (float, optional): The stiffness of the springs. Defaults to 1.0.
             spring_damping (float, optional): The damping factor of the springs. Defaults to 0.1.
+            pattern (str or iterable[str], optional): Spring families to create, see
+                core.topology.GRID_PATTERNS. Defaults to structural plus one diagonal per cell.
+            long_range_attachments (bool, optional): Tie every free particle to its nearest
+                pinned particle (along the springs) so the cloth cannot sag away from its
+                pins. The attachments follow later changes to the pinned particles.
+                Defaults to False.
 
         Raises:
             ValueError: If width or height is not positive.
@@ -32,60 +58,33 @@ class Cloth:
             raise ValueError("Width and height must be positive.")
         self.width = width
         self.height = height
-        self.particles = []
-        self.springs = []
-
-        # Create particles in a grid
-        for y in range(height):
-            for x in range(width):
-                position = Vector2D(x, y)
-                particle = Particle(position, particle_mass)
-                self.particles.append(particle)
-
-        # Create springs between particles
-        for y in range(height):
-            for x in range(width):
-                # Horizontal springs
-                if x < width - 1:
-                    particle1 = self.particles[y * width + x]
-                    particle2 = self.particles[y * width + (x + 1)]
-                    rest_length = 1.0  # Distance between adjacent particles
-                    spring = Spring(
-                        particle1,
-                        particle2,
-                        rest_length,
-                        spring_stiffness,
-                        spring_damping,
-                    )
-                    self.springs.append(spring)
-
-                # Vertical springs
-                if y < height - 1:
-                    particle1 = self.particles[y * width + x]
-                    particle2 = self.particles[(y + 1) * width + x]
-                    rest_length = 1.0  # Distance between adjacent particles
-                    spring = Spring(
-                        particle1,
-                        particle2,
-                        rest_length,
-                        spring_stiffness,
-                        spring_damping,
-                    )
-                    self.springs.append(spring)
-
-                # Diagonal springs (optional)
-                if x < width - 1 and y < height - 1:
-                    particle1 = self.particles[y * width + x]
-                    particle2 = self.particles[(y + 1) * width + (x + 1)]
-                    rest_length = 1.414  # Approximate diagonal distance
-                    spring = Spring(
-                        particle1,
-                        particle2,
-                        rest_length,
-                        spring_stiffness,
-                        spring_damping,
-                    )
-                    self.springs.append(spring)
+
+        # The grid layout is generated (and cached) as arrays; only the particle and
+        # spring objects themselves are created here.
+        self.topology = grid_topology(height, width, pattern=pattern)
+        self.triangles = grid_triangles(height, width)
+        self.particles = [
+            Particle(position, particle_mass)
+            for position in Vector2DArray(self.topology.positions)
+        ]
+        self.springs = [
+            Spring(
+                self.particles[i],
+                self.particles[j],
+                rest_length,
+                spring_stiffness,
+                spring_damping,
+            )
+            for (i, j), rest_length in zip(
+                self.topology.edges.tolist(), self.topology.rest_lengths.tolist()
+            )
+        ]
+        self.constraint_sets = []
+        if long_range_attachments:
+            self.constraint_sets.append(
+                AttachmentConstraints(self.topology.edges, self.topology.rest_lengths)
+            )
+        self.bounds = particle_bounds(self.particles)
 
     def update(self, delta_time):
         """
@@ -103,9 +102,14 @@ class Cloth:
         for spring in self.springs:
             spring.apply()
 
+        # Apply batched constraints
+        if self.constraint_sets:
+            project_particles(self.constraint_sets, self.particles)
+
         # Update particles
         for particle in self.particles:
             particle.update_position(delta_time)
+        self.bounds = particle_bounds(self.particles)
 
     def render(self, renderer):
         """
@@ -114,10 +118,14 @@ class Cloth:
         Args:
             renderer: The renderer to use for drawing the cloth.
         """
-        for spring in self.springs:
+        viewport = renderer_viewport(renderer)
+        if not bounds_visible(self.bounds, viewport):
+            return
+
+        for spring in visible_springs(self.springs, viewport):
             renderer.draw_line(spring.particle1.position, spring.particle2.position)
 
-        for particle in self.particles:
+        for particle in visible_particles(self.particles, viewport):
             renderer.draw_point(particle.position)
 
     def __repr__(self):
@@ -1,9 +1,67 @@
 # ragdoll.py
 # Implementation of a humanoid-like ragdoll for the physics simulation.
 
+from functools import lru_cache
+
 from core.particle import Particle
 from core.spring import Spring
+from core.topology import Topology
 from core.vector2d import Vector2D
+from core.vector2d_array import Vector2DArray
+from rendering.culling import (
+    bounds_visible,
+    particle_bounds,
+    renderer_viewport,
+    visible_particles,
+    visible_springs,
+)
+
+# Rest layout of the ragdoll: (offset x, offset y) in units of limb_length and mass.
+BODY_PARTS = (
+    ((0.0, 0.0), 5.0),  # Head
+    ((0.0, 1.0), 10.0),  # Torso
+    ((-1.0, 1.5), 3.0),  # Left arm
+    ((1.0, 1.5), 3.0),  # Right arm
+    ((-0.5, 2.5), 5.0),  # Left leg
+    ((0.5, 2.5), 5.0),  # Right leg
+)
+
+# Springs between body parts; every joint has a rest length of one limb_length.
+JOINTS = (
+    (0, 1),  # Head to torso
+    (1, 2),  # Torso to left arm
+    (1, 3),  # Torso to right arm
+    (1, 4),  # Torso to left leg
+    (1, 5),  # Torso to right leg
+)
+
+
+@lru_cache(maxsize=32)
+def ragdoll_topology(limb_length=20.0, stiffness=0.5):
+    """
+    Build (or fetch from the cache) the shared template of a ragdoll.
+    The template is positioned with its head at the origin and can be instanced any
+    number of times with ParticleSystem.add_instances.
+
+    Args:
+        limb_length (float, optional): The length of each limb. Defaults to 20.0.
+        stiffness (float, optional): The stiffness of the joints. Defaults to 0.5.
+
+    Returns:
+        Topology: The ragdoll template.
+
+    Raises:
+        ValueError: If limb_length is not positive.
+    """
+    if limb_length <= 0:
+        raise ValueError("Limb length must be positive.")
+    return Topology(
+        [(x * limb_length, y * limb_length) for (x, y), _ in BODY_PARTS],
+        JOINTS,
+        [limb_length] * len(JOINTS),
+        masses=[mass for _, mass in BODY_PARTS],
+        stiffness=stiffness,
+    )
 
 
 class Ragdoll:
@@ -30,51 +88,33 @@ class Ragdoll:
         self.limb_length = limb_length
         self.stiffness = stiffness
         self.damping = damping
+        self.topology = ragdoll_topology(limb_length, stiffness)
 
-        # Create particles for the ragdoll
-        self.head = Particle(position, mass=5.0)
-        self.torso = Particle(position + Vector2D(0, limb_length), mass=10.0)
-        self.left_arm = Particle(
-            position + Vector2D(-limb_length, limb_length * 1.5), mass=3.0
-        )
-        self.right_arm = Particle(
-            position + Vector2D(limb_length, limb_length * 1.5), mass=3.0
-        )
-        self.left_leg = Particle(
-            position + Vector2D(-limb_length * 0.5, limb_length * 2.5), mass=5.0
-        )
-        self.right_leg = Particle(
-            position + Vector2D(limb_length * 0.5, limb_length * 2.5), mass=5.0
-        )
-
-        # Create springs to connect the particles
-        self.springs = [
-            Spring(
-                self.head, self.torso, limb_length, stiffness, damping
-            ),  # Head to torso
-            Spring(
-                self.torso, self.left_arm, limb_length, stiffness, damping
-            ),  # Torso to left arm
-            Spring(
-                self.torso, self.right_arm, limb_length, stiffness, damping
-            ),  # Torso to right arm
-            Spring(
-                self.torso, self.left_leg, limb_length, stiffness, damping
-            ),  # Torso to left leg
-            Spring(
-                self.torso, self.right_leg, limb_length, stiffness, damping
-            ),  # Torso to right leg
-        ]
-
-        # List of all particles in the ragdoll
+        # Create particles for the ragdoll, in BODY_PARTS order
         self.particles = [
+            Particle(point, mass=mass)
+            for point, mass in zip(
+                Vector2DArray(self.topology.positions) + position,
+                self.topology.masses.tolist(),
+            )
+        ]
+        (
             self.head,
             self.torso,
             self.left_arm,
             self.right_arm,
             self.left_leg,
             self.right_leg,
+        ) = self.particles
+
+        # Create springs to connect the particles
+        self.springs = [
+            Spring(
+                self.particles[i], self.particles[j], limb_length, stiffness, damping
+            )
+            for i, j in JOINTS
         ]
+        self.bounds = particle_bounds(self.particles)
 
     def apply_forces(self):
         """
@@ -100,6 +140,7 @@ class Ragdoll:
 
         for particle in self.particles:
             particle.update_position(delta_time)
+        self.bounds = particle_bounds(self.particles)
 
     def render(self, renderer):
         """
@@ -108,10 +149,14 @@ class Ragdoll:
         Args:
             renderer: The renderer to use for drawing the ragdoll.
         """
-        for spring in self.springs:
+        viewport = renderer_viewport(renderer)
+        if not bounds_visible(self.bounds, viewport):
+            return
+
+        for spring in visible_springs(self.springs, viewport):
             renderer.draw_line(spring.particle1.position, spring.particle2.position)
 
-        for particle in self.particles:
+        for particle in visible_particles(self.particles, viewport):
             renderer.draw_point(particle.position, radius=5)
 
     def __repr__(self):
@@ -2,9 +2,18 @@
 # Implementation of a rope-like structure for the softbody ragdoll simulation.
 # Updated to use position-based dynamics with Verlet integration.
 
+from src.core.attachment import AttachmentConstraints
+from src.core.constraint_set import project_particles
 from src.core.particle import Particle
 from src.core.spring import Spring
 from src.core.vector2d import Vector2D
+from src.rendering.culling import (
+    bounds_visible,
+    particle_bounds,
+    renderer_viewport,
+    visible_particles,
+    visible_springs,
+)
 
 
 class Rope:
@@ -17,10 +26,18 @@ class Rope:
         particles (list[Particle]): List of particles in the rope.
         springs (list[Spring]): List of springs connecting the particles.
         constraints (list[Constraint]): List of constraints (currently just springs).
+        constraint_sets (list[ConstraintSet]): Batched constraints, e.g. long-range attachments.
+        bounds (tuple or None): Bounding box of the particles as of the last update,
+            used to skip the rope when it is outside the viewport.
     """
 
     def __init__(
-        self, start_position, num_particles, segment_length, mass_per_particle=1.0
+        self,
+        start_position,
+        num_particles,
+        segment_length,
+        mass_per_particle=1.0,
+        long_range_attachments=False,
     ):
         """
         Initialize the rope with a starting position, number of particles, and segment length.
@@ -30,6 +47,9 @@ class Rope:
             num_particles (int): The number of particles in the rope.
             segment_length (float): The length of each segment (distance between particles).
             mass_per_particle (float, optional): The mass of each particle. Defaults to 1.0.
+            long_range_attachments (bool, optional): Tie every free particle to its nearest
+                fixed particle so the rope cannot stretch away from its anchors.
+                Defaults to False.
         """
         if num_particles <= 0:
             raise ValueError("Number of particles must be positive.")
@@ -49,6 +69,15 @@ class Rope:
 
         # Constraints are the same as springs for now
         self.constraints = self.springs
+        self.constraint_sets = []
+        if long_range_attachments:
+            self.constraint_sets.append(
+                AttachmentConstraints(
+                    [(i, i + 1) for i in range(num_particles - 1)],
+                    [segment_length] * (num_particles - 1),
+                )
+            )
+        self.bounds = particle_bounds(self.particles)
 
     def update(self, delta_time):
         """
@@ -66,9 +95,14 @@ class Rope:
         for spring in self.springs:
             spring.apply()
 
+        # Apply batched constraints
+        if self.constraint_sets:
+            project_particles(self.constraint_sets, self.particles)
+
         # Update particle positions
         for particle in self.particles:
             particle.update_position(delta_time)
+        self.bounds = particle_bounds(self.particles)
 
     def render(self, renderer):
         """
@@ -77,10 +111,14 @@ class Rope:
         Args:
             renderer: The renderer to use for drawing the rope.
         """
-        for spring in self.springs:
+        viewport = renderer_viewport(renderer)
+        if not bounds_visible(self.bounds, viewport):
+            return
+
+        for spring in visible_springs(self.springs, viewport):
             renderer.draw_line(spring.particle1.position, spring.particle2.position)
 
-        for particle in self.particles:
+        for particle in visible_particles(self.particles, viewport):
             renderer.draw_point(particle.position)
 
     def __repr__(self):
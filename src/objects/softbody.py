@@ -1,15 +1,99 @@
 # softbody.py
 # Implementation of a classic 2D softbody (blob) for the physics simulation.
 
+from functools import lru_cache
+
+from core.area import (
+    PressureConstraints,
+    TriangleAreaConstraints,
+    grid_boundary,
+)
+from core.constraint_set import project_particles
 from core.particle import Particle
+from core.shape_matching import ShapeMatchingConstraints, grid_clusters
 from core.spring import Spring
+from core.topology import grid_topology, grid_triangles
 from core.vector2d import Vector2D
+from core.vector2d_array import Vector2DArray
+from rendering.culling import (
+    bounds_visible,
+    particle_bounds,
+    renderer_viewport,
+    visible_particles,
+    visible_springs,
+)
+
+# Area preservation modes:
+#   pressure:  one area constraint over the boundary polygon of the whole body
+#   triangles: one area constraint per triangle of the triangulated grid
+AREA_MODES = ("pressure", "triangles")
+
+
+@lru_cache(maxsize=32)
+def softbody_topology(
+    width,
+    height,
+    rows,
+    cols,
+    particle_mass=1.0,
+    spring_stiffness=1.0,
+    pattern="structural",
+):
+    """
+    Build (or fetch from the cache) the shared template of a softbody.
+    The template's top-left particle sits at the origin; it can be instanced any number
+    of times with ParticleSystem.add_instances.
+
+    Args:
+        width (float): The width of the softbody.
+        height (float): The height of the softbody.
+        rows (int): The number of rows in the particle grid.
+        cols (int): The number of columns in the particle grid.
+        particle_mass (float, optional): The mass of each particle. Defaults to 1.0.
+        spring_stiffness (float, optional): The stiffness of the springs. Defaults to 1.0.
+        pattern (str or tuple[str], optional): Spring families to create, see
+            core.topology.GRID_PATTERNS. Defaults to "structural".
+
+    Returns:
+        Topology: The softbody template.
+
+    Raises:
+        ValueError: If width or height is not positive.
+    """
+    if width <= 0 or height <= 0:
+        raise ValueError("Width and height must be positive.")
+    spacing_x = width / (cols - 1) if cols > 1 else width
+    spacing_y = height / (rows - 1) if rows > 1 else height
+    return grid_topology(rows, cols, spacing_x, spacing_y, pattern=pattern).replace(
+        masses=particle_mass, stiffness=spring_stiffness
+    )
 
 
 class SoftBody:
     """
     A class representing a classic 2D softbody (blob) in the simulation.
     The softbody is composed of particles connected by springs in a hexagonal or triangular grid.
+
+    With shape_matching set, the body also keeps its shape with meshless shape matching
+    (see core.shape_matching): every update pulls the particles towards the best-fit
+    rigid, linear or quadratic transform of the rest grid, either as a whole or per
+    overlapping cluster of cluster_size x cluster_size particles. This holds the shape
+    in one vectorized pass without diagonal springs or extra iterations.
+
+    With preserve_area set, the body also keeps its area (2D volume), either with a
+    single pressure constraint over its boundary polygon or with one area constraint
+    per triangle of the grid (see core.area).
+
+    Attributes:
+        particles (list[Particle]): The particles of the softbody.
+        springs (list[Spring]): The springs connecting the particles.
+        constraint_sets (list[ConstraintSet]): Batched constraints, e.g. shape matching.
+        shape_matching (ShapeMatchingConstraints or None): The shape matching
+            constraints, if enabled.
+        area_constraints (PressureConstraints or TriangleAreaConstraints or None): The
+            area constraints, if enabled.
+        bounds (tuple or None): Bounding box of the particles as of the last update,
+            used to skip the softbody when it is outside the viewport.
     """
 
     def __init__(
@@ -22,6 +106,13 @@ class SoftBody:
         particle_mass=1.0,
         spring_stiffness=1.0,
         spring_damping=0.1,
+        pattern="structural",
+        shape_matching=None,
+        shape_stiffness=1.0,
+        cluster_size=None,
+        preserve_area=None,
+        pressure=1.0,
+        area_stiffness=1.0,
     ):
         """
         Initialize the softbody with a position, dimensions, grid resolution, and spring properties.
@@ -35,14 +126,30 @@ class SoftBody:
             particle_mass (float, optional): The mass of each particle. Defaults to 1.0.
             spring_stiffness (float, optional): The stiffness of the springs. Defaults to 1.0.
             spring_damping (float, optional): The damping factor of the springs. Defaults to 0.1.
+            pattern (str or iterable[str], optional): Spring families to create, see
+                core.topology.GRID_PATTERNS. Defaults to "structural".
+            shape_matching (str, optional): Shape matching mode, "rigid", "linear" or
+                "quadratic"; None disables shape matching. Defaults to None.
+            shape_stiffness (float, optional): Stiffness (0-1) of the shape matching.
+                Defaults to 1.0.
+            cluster_size (int, optional): Particles along each side of the overlapping
+                shape matching clusters; None matches the whole body at once.
+                Defaults to None.
+            preserve_area (str, optional): Area preservation mode, "pressure" or
+                "triangles"; None disables it. Defaults to None.
+            pressure (float, optional): Target area of the body as a multiple of its
+                rest area, in "pressure" mode. Defaults to 1.0.
+            area_stiffness (float, optional): Stiffness (0-1) of the area constraints.
+                Defaults to 1.0.
 
         Raises:
-            ValueError: If width or height is not positive.
+            ValueError: If width or height is not positive, or the shape matching or
+                area settings are invalid.
         """
+        if preserve_area is not None and preserve_area not in AREA_MODES:
+            raise ValueError(f"Area mode must be one of {AREA_MODES}.")
         if width <= 0 or height <= 0:
             raise ValueError("Width and height must be positive.")
-        self.particles = []
-        self.springs = []
         self.width = width
         self.height = height
         self.rows = rows
@@ -52,70 +159,58 @@ class SoftBody:
         self.spacing_x = width / (cols - 1) if cols > 1 else width
         self.spacing_y = height / (rows - 1) if rows > 1 else height
 
-        # Create particles in a grid
-        for row in range(rows):
-            for col in range(cols):
-                x = position.x + col * self.spacing_x
-                y = position.y + row * self.spacing_y
-                particle = Particle(Vector2D(x, y), particle_mass)
-                self.particles.append(particle)
-
-        # Create springs between particles
-        for row in range(rows):
-            for col in range(cols):
-                index = row * cols + col
-
-                # Connect to the right neighbor
-                if col < cols - 1:
-                    right_index = index + 1
-                    rest_length = self.spacing_x
-                    spring = Spring(
-                        self.particles[index],
-                        self.particles[right_index],
-                        rest_length,
-                        spring_stiffness,
-                        spring_damping,
-                    )
-                    self.springs.append(spring)
-
-                # Connect to the bottom neighbor
-                if row < rows - 1:
-                    bottom_index = index + cols
-                    rest_length = self.spacing_y
-                    spring = Spring(
-                        self.particles[index],
-                        self.particles[bottom_index],
-                        rest_length,
-                        spring_stiffness,
-                        spring_damping,
-                    )
-                    self.springs.append(spring)
-
-                # Connect to the bottom-right neighbor (diagonal)
-                # if row < rows - 1 and col < cols - 1:
-                #     bottom_right_index = index + cols + 1
-                #     rest_length = (self.spacing_x**2 + self.spacing_y**2) ** 0.5
-                #     spring = Spring(
-                #         self.particles[index],
-                #         self.particles[bottom_right_index],
-                #         rest_length,
-                #         spring_stiffness,
-                #         spring_damping,
-                #     )
-                #     self.springs.append(spring)
-
-                # Connect to the bottom-left neighbor (diagonal)
-                # if row < rows - 1 and col > 0:
-                #     bottom_left_index = index + cols - 1
-                #     rest_length = (self.spacing_x**2 + self.spacing_y**2) ** 0.5
-                #     spring = Spring(
-                #         self.particles[index],
-                #         self.particles[bottom_left_index],
-                #         rest_length,
-                #         spring_stiffness,
-                #         spring_damping,
-                #     )
-                #     self.springs.append(spring)
+        # Build the grid layout as arrays (cached per shape), then offset it to the
+        # requested position and create the particle and spring objects.
+        if not isinstance(pattern, str):
+            pattern = tuple(pattern)
+        self.topology = softbody_topology(
+            width, height, rows, cols, particle_mass, spring_stiffness, pattern
+        )
+        positions = Vector2DArray(self.topology.positions) + position
+        self.particles = [Particle(point, particle_mass) for point in positions]
+        self.springs = [
+            Spring(
+                self.particles[i],
+                self.particles[j],
+                rest_length,
+                spring_stiffness,
+                spring_damping,
+            )
+            for (i, j), rest_length in zip(
+                self.topology.edges.tolist(), self.topology.rest_lengths.tolist()
+            )
+        ]
+
+        self.constraint_sets = []
+        self.shape_matching = None
+        if shape_matching is not None:
+            clusters = None
+            if cluster_size is not None:
+                clusters = grid_clusters(rows, cols, cluster_size)
+            self.shape_matching = ShapeMatchingConstraints(
+                self.topology.positions,
+                self.topology.masses,
+                clusters,
+                shape_stiffness,
+                mode=shape_matching,
+            )
+            self.constraint_sets.append(self.shape_matching)
+
+        self.area_constraints = None
+        if preserve_area == "pressure":
+            self.area_constraints = PressureConstraints.from_positions(
+                self.topology.positions,
+                [grid_boundary(rows, cols)],
+                area_stiffness,
+                pressure,
+            )
+        elif preserve_area == "triangles":
+            self.area_constraints = TriangleAreaConstraints.from_positions(
+                self.topology.positions, grid_triangles(rows, cols), area_stiffness
+            )
+        if self.area_constraints is not None:
+            self.constraint_sets.append(self.area_constraints)
+        self.bounds = particle_bounds(self.particles)
 
     def apply_force(self, force):
         """
@@ -129,7 +224,8 @@ class SoftBody:
 
     def update(self, delta_time):
         """
-        Update the softbody by updating all particles and applying spring forces.
+        Update the softbody by updating all particles and applying spring forces and
+        any batched constraints.
 
         Args:
             delta_time (float): The time step for the update.
@@ -144,6 +240,11 @@ class SoftBody:
 
         for particle in self.particles:
             particle.update_position(delta_time)
+        self.bounds = particle_bounds(self.particles)
+
+        # Project batched constraints (shape matching, area) on the new positions
+        if self.constraint_sets:
+            project_particles(self.constraint_sets, self.particles)
 
     def render(self, renderer):
         """
@@ -152,10 +253,14 @@ class SoftBody:
         Args:
             renderer: The renderer to use for drawing the softbody.
         """
-        for spring in self.springs:
+        viewport = renderer_viewport(renderer)
+        if not bounds_visible(self.bounds, viewport):
+            return
+
+        for spring in visible_springs(self.springs, viewport):
             renderer.draw_line(spring.particle1.position, spring.particle2.position)
 
-        for particle in self.particles:
+        for particle in visible_particles(self.particles, viewport):
             renderer.draw_point(particle.position)
 
     def __repr__(self):
@@ -0,0 +1,99 @@
+# camera.py
+# A 2D camera mapping a rectangle of the world onto the screen.
+
+
+class Camera:
+    """
+    A 2D camera that shows a rectangle of the world in a window.
+
+    World point (x, y) is drawn at screen position ((x - self.x) * zoom,
+    (y - self.y) * zoom), so (x, y) is the world point at the top-left corner of the
+    window. Renderers given a camera draw in world coordinates through it and report
+    its viewport, which objects use to skip offscreen geometry.
+
+    Attributes:
+        x (float): World x coordinate at the left edge of the window.
+        y (float): World y coordinate at the top edge of the window.
+        width (int): Window width in pixels.
+        height (int): Window height in pixels.
+        zoom (float): Screen pixels per world unit.
+        margin (float): Pixels added around the window when culling, so that
+            geometry partly inside it (such as point markers) is still drawn.
+    """
+
+    def __init__(self, x=0.0, y=0.0, width=800, height=600, zoom=1.0, margin=8.0):
+        """
+        Initialize a camera.
+
+        Args:
+            x (float, optional): World x at the left edge. Defaults to 0.0.
+            y (float, optional): World y at the top edge. Defaults to 0.0.
+            width (int, optional): Window width in pixels. Defaults to 800.
+            height (int, optional): Window height in pixels. Defaults to 600.
+            zoom (float, optional): Pixels per world unit. Defaults to 1.0.
+            margin (float, optional): Culling margin in pixels. Defaults to 8.0.
+
+        Raises:
+            ValueError: If the size or zoom is not positive.
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Camera size must be positive.")
+        if zoom <= 0:
+            raise ValueError("Camera zoom must be positive.")
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.zoom = zoom
+        self.margin = margin
+
+    @property
+    def viewport(self):
+        """(min_x, min_y, max_x, max_y) of the visible world area, margin included."""
+        margin = self.margin / self.zoom
+        return (
+            self.x - margin,
+            self.y - margin,
+            self.x + self.width / self.zoom + margin,
+            self.y + self.height / self.zoom + margin,
+        )
+
+    def center_on(self, x, y):
+        """
+        Move the camera so that a world point is at the center of the window.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+        """
+        self.x = x - self.width / (2 * self.zoom)
+        self.y = y - self.height / (2 * self.zoom)
+
+    def to_screen(self, x, y):
+        """
+        Convert world coordinates to screen coordinates.
+
+        Args:
+            x (float): World x coordinate.
+            y (float): World y coordinate.
+
+        Returns:
+            tuple[float, float]: The screen coordinates.
+        """
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, x, y):
+        """
+        Convert screen coordinates (such as a mouse position) to world coordinates.
+
+        Args:
+            x (float): Screen x coordinate.
+            y (float): Screen y coordinate.
+
+        Returns:
+            tuple[float, float]: The world coordinates.
+        """
+        return self.x + x / self.zoom, self.y + y / self.zoom
+
+    def __repr__(self):
+        return f"Camera(x={self.x}, y={self.y}, width={self.width}, height={self.height}, zoom={self.zoom})"
@@ -0,0 +1,145 @@
+# culling.py
+# Helpers that let objects skip geometry outside a renderer's viewport.
+
+import numpy as np
+
+
+def renderer_viewport(renderer):
+    """
+    Return the world area a renderer shows.
+
+    Args:
+        renderer: Any renderer.
+
+    Returns:
+        tuple or None: (min_x, min_y, max_x, max_y), or None if the renderer has no
+        camera and everything must be drawn.
+    """
+    return getattr(renderer, "viewport", None)
+
+
+def particle_bounds(particles):
+    """
+    Return the bounding box of a set of particles.
+    Objects compute it once per update, so rendering can reject an offscreen object
+    from the box alone without visiting its particles.
+
+    Args:
+        particles (list[Particle]): The particles of an object.
+
+    Returns:
+        tuple or None: (min_x, min_y, max_x, max_y), or None if there are no particles.
+    """
+    if not particles:
+        return None
+    coordinates = np.array(
+        [(particle.position.x, particle.position.y) for particle in particles]
+    )
+    return array_bounds(coordinates)
+
+
+def array_bounds(positions):
+    """
+    Return the bounding box of an (N, 2) position array.
+
+    Args:
+        positions (np.ndarray): (N, 2) positions.
+
+    Returns:
+        tuple or None: (min_x, min_y, max_x, max_y), or None if the array is empty.
+    """
+    if len(positions) == 0:
+        return None
+    # Column-wise; reductions over the short axis of (N, 2) arrays are slow
+    xs, ys = positions[:, 0], positions[:, 1]
+    return (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+
+
+def bounds_visible(bounds, viewport):
+    """
+    Test whether a bounding box overlaps the viewport.
+
+    Args:
+        bounds (tuple or None): (min_x, min_y, max_x, max_y), or None for an empty object.
+        viewport (tuple or None): The viewport, or None to accept everything.
+
+    Returns:
+        bool: True if any of the box may be visible.
+    """
+    if viewport is None:
+        return True
+    if bounds is None:
+        return False
+    min_x, min_y, max_x, max_y = viewport
+    return (
+        bounds[2] >= min_x
+        and bounds[0] <= max_x
+        and bounds[3] >= min_y
+        and bounds[1] <= max_y
+    )
+
+
+def particles_visible(particles, viewport):
+    """
+    Test whether the bounding box of a set of particles overlaps the viewport.
+    This visits every particle; objects test their cached bounds with
+    bounds_visible() instead.
+
+    Args:
+        particles (list[Particle]): The particles of an object.
+        viewport (tuple or None): The viewport, or None to accept everything.
+
+    Returns:
+        bool: True if any of the object may be visible.
+    """
+    if viewport is None:
+        return True
+    return bounds_visible(particle_bounds(particles), viewport)
+
+
+def visible_springs(springs, viewport):
+    """
+    Yield the springs whose segment bounding boxes overlap the viewport.
+
+    Args:
+        springs (list[Spring]): Springs (or constraints) with particle1 and particle2.
+        viewport (tuple or None): The viewport, or None to yield every spring.
+
+    Yields:
+        Spring: The springs to draw.
+    """
+    if viewport is None:
+        yield from springs
+        return
+    min_x, min_y, max_x, max_y = viewport
+    for spring in springs:
+        start = spring.particle1.position
+        end = spring.particle2.position
+        if (
+            max(start.x, end.x) >= min_x
+            and min(start.x, end.x) <= max_x
+            and max(start.y, end.y) >= min_y
+            and min(start.y, end.y) <= max_y
+        ):
+            yield spring
+
+
+def visible_particles(particles, viewport):
+    """
+    Yield the particles inside the viewport.
+
+    Args:
+        particles (list[Particle]): The particles.
+        viewport (tuple or None): The viewport, or None to yield every particle.
+
+    Yields:
+        Particle: The particles to draw.
+    """
+    if viewport is None:
+        yield from particles
+        return
+    min_x, min_y, max_x, max_y = viewport
+    for particle in particles:
+        position = particle.position
+        if min_x <= position.x <= max_x and min_y <= position.y <= max_y:
+            yield particle
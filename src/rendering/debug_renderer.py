@@ -10,9 +10,35 @@ class DebugRenderer:
     """
     A simple renderer for debugging purposes.
     This renderer draws lines and points to visualize the simulation.
+
+    With a camera, positions are world coordinates mapped to the window through it, and
+    the camera's viewport is exposed so that objects can skip offscreen geometry.
+
+    In dirty-rectangle mode, draw calls are recorded instead of drawn, and render()
+    compares the recorded lines and points with those on screen. Only the regions of
+    geometry that appeared or disappeared are cleared, the primitives overlapping them
+    are redrawn, and just those regions are sent to the display, so a scene where
+    little moves costs little to present. The first frame, and any frame after
+    invalidate(), is drawn in full.
+
+    Attributes:
+        dirty_rects (bool): Whether dirty-rectangle mode is on.
+        max_dirty_rects (int): Number of regions above which they are merged into
+            their bounding rectangle.
+        updated (list[pygame.Rect]): Screen regions presented by the last render().
+        handlers (list[callable]): Called with every pygame event handle_events()
+            receives, such as a rendering.interaction.MouseDragHandler.
     """
 
-    def __init__(self, width=800, height=600, background_color=(0, 0, 0)):
+    def __init__(
+        self,
+        width=800,
+        height=600,
+        background_color=(0, 0, 0),
+        camera=None,
+        dirty_rects=False,
+        max_dirty_rects=64,
+    ):
         """
         Initialize the debug renderer with a window size and background color.
 
@@ -20,6 +46,12 @@ class DebugRenderer:
             width (int, optional): The width of the rendering window. Defaults to 800.
             height (int, optional): The height of the rendering window. Defaults to 600.
             background_color (tuple, optional): The background color of the window. Defaults to (0, 0, 0).
+            camera (Camera, optional): The camera to view the world through. Defaults to
+                None (world coordinates are screen coordinates and nothing is culled).
+            dirty_rects (bool, optional): Whether to redraw only the changed regions.
+                Defaults to False.
+            max_dirty_rects (int, optional): Number of regions above which they are
+                merged. Defaults to 64.
         """
         pygame.init()
         self.width = width
@@ -28,6 +60,26 @@ class DebugRenderer:
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Debug Renderer")
         self.clock = pygame.time.Clock()
+        self.camera = camera
+        self.handlers = []
+        self.dirty_rects = dirty_rects
+        self.max_dirty_rects = max_dirty_rects
+        self.updated = []
+        # Recorded primitives of the frame being drawn and of the one on screen,
+        # each mapping (kind, color, geometry) to its screen bounding rectangle
+        self._frame = {}
+        self._shown = None
+
+    @property
+    def viewport(self):
+        """The world area shown by the camera, or None without a camera."""
+        return self.camera.viewport if self.camera is not None else None
+
+    def _to_screen(self, position):
+        """Return the screen coordinates of a world position."""
+        if self.camera is None:
+            return position.x, position.y
+        return self.camera.to_screen(position.x, position.y)
 
     def draw_line(self, start, end, color=(255, 255, 255)):
         """
@@ -38,7 +90,18 @@ class DebugRenderer:
             end (Vector2D): The ending point of the line.
             color (tuple, optional): The color of the line. Defaults to (255, 255, 255).
         """
-        pygame.draw.line(self.screen, color, (start.x, start.y), (end.x, end.y), 1)
+        if not self.dirty_rects:
+            pygame.draw.line(
+                self.screen, color, self._to_screen(start), self._to_screen(end), 1
+            )
+            return
+        color = tuple(color)
+        x1, y1 = (int(value) for value in self._to_screen(start))
+        x2, y2 = (int(value) for value in self._to_screen(end))
+        rect = pygame.Rect(
+            min(x1, x2) - 1, min(y1, y2) - 1, abs(x2 - x1) + 3, abs(y2 - y1) + 3
+        )
+        self._frame[("line", color, (x1, y1), (x2, y2))] = rect
 
     def draw_point(self, position, color=(255, 0, 0), radius=3):
         """
@@ -49,21 +112,78 @@ class DebugRenderer:
             color (tuple, optional): The color of the point. Defaults to (255, 0, 0).
             radius (int, optional): The radius of the point. Defaults to 3.
         """
-        pygame.draw.circle(
-            self.screen, color, (int(position.x), int(position.y)), radius
+        x, y = self._to_screen(position)
+        center = (int(x), int(y))
+        if not self.dirty_rects:
+            pygame.draw.circle(self.screen, color, center, radius)
+            return
+        color = tuple(color)
+        rect = pygame.Rect(
+            center[0] - radius - 1,
+            center[1] - radius - 1,
+            2 * radius + 3,
+            2 * radius + 3,
         )
+        self._frame[("point", color, center, radius)] = rect
 
     def clear(self):
         """
         Clear the screen with the background color.
+        In dirty-rectangle mode, start recording a new frame instead; render() clears
+        what needs clearing.
         """
+        if self.dirty_rects:
+            self._frame = {}
+            return
         self.screen.fill(self.background_color)
 
+    def invalidate(self):
+        """
+        Make the next render() redraw and present the whole window.
+        """
+        self._shown = None
+
     def render(self):
         """
         Update the display to show the rendered content.
         """
-        pygame.display.flip()
+        if not self.dirty_rects:
+            self.updated = [self.screen.get_rect()]
+            pygame.display.flip()
+            return
+
+        frame, shown = self._frame, self._shown
+        self._shown, self._frame = frame, {}
+        if shown is None:
+            self.screen.fill(self.background_color)
+            for primitive in frame:
+                self._draw(primitive)
+            self.updated = [self.screen.get_rect()]
+            pygame.display.flip()
+            return
+
+        dirty = [rect for primitive, rect in shown.items() if primitive not in frame]
+        dirty += [rect for primitive, rect in frame.items() if primitive not in shown]
+        if len(dirty) > self.max_dirty_rects:
+            dirty = [dirty[0].unionall(dirty[1:])]
+        self.updated = dirty
+        if not dirty:
+            return
+        for rect in dirty:
+            self.screen.fill(self.background_color, rect)
+        # Redraw everything crossing a cleared region, static geometry included
+        for primitive, rect in frame.items():
+            if rect.collidelist(dirty) != -1:
+                self._draw(primitive)
+        pygame.display.update(dirty)
+
+    def _draw(self, primitive):
+        """Draw a recorded line or point on the screen surface."""
+        kind, color, first, second = primitive
+        if kind == "line":
+            pygame.draw.line(self.screen, color, first, second, 1)
+        else:
+            pygame.draw.circle(self.screen, color, first, second)
 
     def handle_events(self):
         """
@@ -71,6 +191,8 @@ class DebugRenderer:
         Returns True if the application should continue running, False otherwise.
         """
         for event in pygame.event.get():
+            for handler in self.handlers:
+                handler(event)
             if event.type == pygame.QUIT:
                 print("DEBUG: Received QUIT event")
                 return False
@@ -78,6 +200,9 @@ class DebugRenderer:
                 if event.key == pygame.K_ESCAPE:
                     print("DEBUG: Received ESC key event")
                     return False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window contents were lost; present everything again
+                self.invalidate()
         # Control the frame rate and allow the event queue to process
         self.clock.tick(60)
         return True
@@ -0,0 +1,65 @@
+# interaction.py
+# Mouse interaction with the simulation in the pygame renderers.
+
+import pygame
+
+
+class MouseDragHandler:
+    """
+    Drives a ParticleDragger with the mouse.
+
+    Add the handler to a renderer's ``handlers``: pressing the mouse button picks up
+    the particle nearest to the cursor, moving the mouse drags it, and releasing the
+    button lets it go. Screen positions are converted to world coordinates through
+    the camera, if any.
+
+    Attributes:
+        dragger (ParticleDragger): The dragger to drive.
+        camera (Camera or None): The camera the world is viewed through.
+        button (int): The mouse button that drags.
+    """
+
+    def __init__(self, dragger, camera=None, button=1):
+        """
+        Initialize the handler.
+
+        Args:
+            dragger (ParticleDragger): The dragger to drive.
+            camera (Camera, optional): The camera the world is viewed through.
+                Defaults to None (screen coordinates are world coordinates).
+            button (int, optional): The mouse button that drags. Defaults to 1 (left).
+        """
+        self.dragger = dragger
+        self.camera = camera
+        self.button = button
+
+    def _to_world(self, position):
+        """Return the world coordinates of a screen position."""
+        x, y = position
+        if self.camera is None:
+            return float(x), float(y)
+        return self.camera.to_world(x, y)
+
+    def __call__(self, event):
+        """
+        Handle a pygame event.
+
+        Args:
+            event (pygame.event.Event): The event.
+
+        Returns:
+            bool: Whether the event was used.
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == self.button:
+            return self.dragger.begin(*self._to_world(event.pos)) is not None
+        if event.type == pygame.MOUSEMOTION and self.dragger.dragging:
+            self.dragger.move(*self._to_world(event.pos))
+            return True
+        if event.type == pygame.MOUSEBUTTONUP and event.button == self.button:
+            used = self.dragger.dragging
+            self.dragger.end()
+            return used
+        return False
+
+    def __repr__(self):
+        return f"MouseDragHandler(dragger={self.dragger}, button={self.button})"
@@ -9,15 +9,28 @@ class MatplotlibRenderer:
     """
     A renderer for visualizing the physics simulation using Matplotlib.
     This renderer is useful for analysis and plotting trajectories.
+
+    With a camera, the axes show the camera's viewport and objects can skip geometry
+    outside it.
     """
 
-    def __init__(self):
+    def __init__(self, camera=None):
         """
         Initialize the Matplotlib renderer.
+
+        Args:
+            camera (Camera, optional): The camera whose viewport the axes show.
+                Defaults to None (automatic limits, nothing is culled).
         """
         self.fig, self.ax = plt.subplots()
         self.lines = []
         self.points = []
+        self.camera = camera
+
+    @property
+    def viewport(self):
+        """The world area shown by the camera, or None without a camera."""
+        return self.camera.viewport if self.camera is not None else None
 
     def draw_line(self, start, end, color="b"):
         """
@@ -60,6 +73,10 @@ class MatplotlibRenderer:
         """
         Update the plot to reflect the current state.
         """
+        if self.camera is not None:
+            min_x, min_y, max_x, max_y = self.camera.viewport
+            self.ax.set_xlim(min_x, max_x)
+            self.ax.set_ylim(min_y, max_y)
         plt.draw()
         plt.pause(0.01)
 
@@ -10,9 +10,15 @@ class PygameRenderer:
     """
     A renderer for visualizing the physics simulation using Pygame.
     This renderer provides methods for drawing particles, springs, and other simulation elements.
+
+    With a camera, positions are world coordinates mapped to the window through it, and
+    the camera's viewport is exposed so that objects can skip offscreen geometry.
+
+    Every pygame event is also passed to the callables in ``handlers``, such as a
+    rendering.interaction.MouseDragHandler.
     """
 
-    def __init__(self, width=800, height=600, background_color=(0, 0, 0)):
+    def __init__(self, width=800, height=600, background_color=(0, 0, 0), camera=None):
         """
         Initialize the Pygame renderer with a window size and background color.
 
@@ -20,6 +26,8 @@ class PygameRenderer:
             width (int, optional): The width of the Pygame window. Defaults to 800.
             height (int, optional): The height of the Pygame window. Defaults to 600.
             background_color (tuple, optional): The background color of the window as an RGB tuple. Defaults to (0, 0, 0).
+            camera (Camera, optional): The camera to view the world through. Defaults to
+                None (world coordinates are screen coordinates and nothing is culled).
         """
         pygame.init()
         self.width = width
@@ -29,6 +37,20 @@ class PygameRenderer:
         pygame.display.set_caption("Softbody Ragdoll Simulation")
         self.clock = pygame.time.Clock()
         self.running = False
+        self.camera = camera
+        self.handlers = []
+
+    @property
+    def viewport(self):
+        """The world area shown by the camera, or None without a camera."""
+        return self.camera.viewport if self.camera is not None else None
+
+    def _to_screen(self, position):
+        """Return the integer screen coordinates of a world position."""
+        x, y = position.x, position.y
+        if self.camera is not None:
+            x, y = self.camera.to_screen(x, y)
+        return int(x), int(y)
 
     def start(self):
         """
@@ -53,6 +75,8 @@ class PygameRenderer:
         Handle Pygame events, such as quitting the application.
         """
         for event in pygame.event.get():
+            for handler in self.handlers:
+                handler(event)
             if event.type == pygame.QUIT:
                 self.running = False
 
@@ -81,7 +105,7 @@ class PygameRenderer:
         pygame.draw.circle(
             self.screen,
             color,
-            (int(position.x), int(position.y)),
+            self._to_screen(position),
             radius,
         )
 
@@ -98,8 +122,8 @@ class PygameRenderer:
         pygame.draw.line(
             self.screen,
             color,
-            (int(start.x), int(start.y)),
-            (int(end.x), int(end.y)),
+            self._to_screen(start),
+            self._to_screen(end),
             width,
         )
 
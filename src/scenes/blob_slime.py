@@ -8,7 +8,9 @@ from objects.softbody import SoftBody
 class BlobSlime:
     """
     A scene demonstrating a slime-like softbody.
-    The softbody is initialized with specific properties to simulate a blob of slime.
+    The softbody is initialized with specific properties to simulate a blob of slime:
+    soft springs let it wobble, while a pressure constraint over its boundary keeps its
+    volume when it is squashed.
     """
 
     def __init__(self):
@@ -25,6 +27,7 @@ class BlobSlime:
             particle_mass=1.0,
             spring_stiffness=0.5,
             spring_damping=0.2,
+            preserve_area="pressure",
         )
 
     def update(self, delta_time):
@@ -1,8 +1,15 @@
 # cloth_flag.py
 # Implementation of a cloth flag scene for the physics simulation.
 
+import math
+
+from core.aerodynamics import ClothAerodynamics
 from core.vector2d import Vector2D
+from integration.picking import ParticleDragger
+from integration.world import PhysicsWorld
 from objects.cloth import Cloth
+from rendering.camera import Camera
+from rendering.interaction import MouseDragHandler
 from scenes.scene_base import SceneBase
 
 
@@ -10,27 +17,74 @@ class ClothFlagScene(SceneBase):
     """
     A scene demonstrating a cloth flag simulation.
     The cloth is fixed at the top and allowed to sway in the wind.
+    The cloth is simulated in a PhysicsWorld, and the wind acts on every triangle of the
+    cloth through a gusting aerodynamic lift and drag model.
+    The cloth can be grabbed and dragged with the left mouse button.
     """
 
-    def __init__(self):
+    def __init__(self, long_range_attachments=True):
         """
         Initialize the cloth flag scene.
+
+        Args:
+            long_range_attachments (bool, optional): Keep the cloth from sagging away from
+                the flagpole with long-range attachments. Defaults to True.
         """
         super().__init__()
+        self.long_range_attachments = long_range_attachments
         self.cloth = None
-        self.wind_force = Vector2D(0.5, 0)  # Constant wind force
+        self.world = None
+        self.wind = None
+        self.dragger = None
+        self.wind_speed = 4.0  # Mean wind speed
+        self.gust_speed = 1.5  # Amplitude of the gusts
 
     def setup(self):
         """
         Set up the cloth flag scene.
         """
         # Create a cloth with 10x10 particles
-        self.cloth = Cloth(width=10, height=10)
+        self.cloth = Cloth(
+            width=10, height=10, long_range_attachments=self.long_range_attachments
+        )
 
         # Fix the top row of particles to simulate a flagpole
         for i in range(10):
             self.cloth.particles[i].is_fixed = True
 
+        self.world = PhysicsWorld(gravity=Vector2D(0, 9.81))
+        body = self.world.add(self.cloth)
+        # Gusting wind; the flag catches more of it where it is spread across the flow
+        self.wind = self.world.add_field(
+            ClothAerodynamics(
+                self.cloth.triangles,
+                flow=self.flow,
+                density=0.5,
+                drag=1.0,
+                lift=0.5,
+                offset=body.particle_start,
+            )
+        )
+
+        # The cloth is 9 units wide; show it enlarged so it can be grabbed
+        self.renderer.camera = Camera(-5.0, -2.0, self.width, self.height, zoom=40.0)
+        self.dragger = ParticleDragger(self.world, pick_radius=0.5)
+        self.renderer.handlers.append(
+            MouseDragHandler(self.dragger, self.renderer.camera)
+        )
+
+    def flow(self, time):
+        """
+        Return the wind velocity at a given time.
+
+        Args:
+            time (float): Simulation time.
+
+        Returns:
+            tuple: (x, y) wind velocity.
+        """
+        return (self.wind_speed + self.gust_speed * math.sin(1.3 * time), 0.0)
+
     def update(self, delta_time):
         """
         Update the cloth flag scene for a given time step.
@@ -38,13 +92,7 @@ class ClothFlagScene(SceneBase):
         Args:
             delta_time (float): The time step for the update.
         """
-        # Apply wind force to the cloth
-        for particle in self.cloth.particles:
-            if not particle.is_fixed:
-                particle.apply_force(self.wind_force)
-
-        # Update the cloth
-        self.cloth.update(delta_time)
+        self.world.step(delta_time)
 
     def render(self, renderer):
         """
@@ -54,7 +102,7 @@ class ClothFlagScene(SceneBase):
             renderer: The renderer to use for drawing the scene.
         """
         # Render the cloth
-        self.cloth.render(renderer)
+        self.world.render(renderer)
 
     def __repr__(self):
         return "ClothFlagScene()"
@@ -2,9 +2,12 @@
 # Implementation of a scene demonstrating a swinging rope using position-based dynamics.
 # Updated to use Verlet integration with multiple constraint iterations and strong gravity.
 
+import time
+
 import pygame
 
 from core.vector2d import Vector2D
+from integration.governor import FrameBudgetGovernor
 from integration.verlet import VerletIntegrator
 from objects.rope import Rope
 from rendering.debug_renderer import DebugRenderer
@@ -33,6 +36,7 @@ class RopeSwingScene:
         self.rope = None
         self.renderer = None
         self.integrator = None
+        self.governor = None
 
     def setup(self):
         """
@@ -42,8 +46,8 @@ class RopeSwingScene:
         start_position = Vector2D(400, 100)
         self.rope = Rope(start_position, self.num_particles, self.segment_length)
 
-        # Create the renderer
-        self.renderer = DebugRenderer(width=800, height=600)
+        # Create the renderer; only the swinging rope changes between frames
+        self.renderer = DebugRenderer(width=800, height=600, dirty_rects=True)
 
         # Create the integrator with constraints and proper physics parameters
         gravity = Vector2D(0, self.gravity_strength)
@@ -55,6 +59,9 @@ class RopeSwingScene:
             gravity=gravity,
         )
 
+        # Drop constraint iterations when a step overruns the 60 FPS frame budget
+        self.governor = FrameBudgetGovernor(self.integrator, min_iterations=3)
+
     def run(self):
         """
         Run the simulation loop for the rope swing scene.
@@ -82,7 +89,9 @@ class RopeSwingScene:
 
             # Update physics using Verlet integration with PBD
             # Gravity is now handled by the integrator, not applied here
+            started = time.perf_counter()
             self.integrator.integrate(0.016)  # Fixed time step of ~60fps
+            self.governor.record(time.perf_counter() - started)
 
             # Render the rope
             self.rope.render(self.renderer)
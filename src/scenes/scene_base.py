@@ -1,6 +1,8 @@
 # scene_base.py
 # Base class for defining simulation scenes.
 
+import time
+
 from core.vector2d import Vector2D
 from rendering.debug_renderer import DebugRenderer
 
@@ -9,6 +11,10 @@ class SceneBase:
     """
     Base class for defining simulation scenes.
     A scene includes a set of objects, a renderer, and methods for updating and rendering the scene.
+
+    Scenes may assign a FrameBudgetGovernor to ``governor``; run() then reports the wall
+    time of every update to it so that quality is lowered when updates overrun the
+    frame budget.
     """
 
     def __init__(self, width=800, height=600):
@@ -24,6 +30,7 @@ class SceneBase:
         self.objects = []
         self.renderer = DebugRenderer(width, height)
         self.running = False
+        self.governor = None
 
     def setup(self):
         """
@@ -61,7 +68,10 @@ class SceneBase:
             self.running = self.renderer.handle_events()
 
             # Update the scene
+            started = time.perf_counter()
             self.update(1.0 / 60.0)  # Assume 60 FPS
+            if self.governor is not None:
+                self.governor.record(time.perf_counter() - started)
 
             # Render the scene
             self.renderer.clear()
@@ -2,51 +2,62 @@
 # A scene for stress-testing the physics simulation with a large number of objects.
 
 from core.vector2d import Vector2D
+from integration.world import PhysicsWorld
 from objects.cloth import Cloth
-from objects.ragdoll import Ragdoll
+from objects.ragdoll import ragdoll_topology
 from objects.rope import Rope
-from objects.softbody import SoftBody
+from objects.softbody import softbody_topology
 
 
 class StressTestScene:
     """
     A scene designed to stress-test the physics simulation by creating a large number of objects.
     This scene includes multiple ropes, ragdolls, softbodies, and cloths to test performance and stability.
+    All objects live in one PhysicsWorld and are advanced by a single global solve.
+    With level of detail enabled, bodies outside the 800x600 window or small on screen
+    are simulated with fewer iterations and at a lower rate.
     """
 
-    def __init__(self):
+    def __init__(self, lod=True):
         """
         Initialize the stress test scene with multiple objects.
+
+        Args:
+            lod (bool, optional): Whether to simulate offscreen and small bodies at a
+                lower level of detail. Defaults to True.
         """
+        self.world = PhysicsWorld(gravity=Vector2D(0, 9.81))
         self.ropes = []
-        self.ragdolls = []
-        self.softbodies = []
         self.cloths = []
 
         # Create multiple ropes
         for i in range(5):
             start_position = Vector2D(100 + i * 50, 50)
             rope = Rope(start_position, num_particles=20, segment_length=5.0)
+            self.world.add(rope)
             self.ropes.append(rope)
 
-        # Create multiple ragdolls
-        for i in range(3):
-            position = Vector2D(300 + i * 100, 100)
-            ragdoll = Ragdoll(position, limb_length=20.0)
-            self.ragdolls.append(ragdoll)
-
-        # Create multiple softbodies
-        for i in range(4):
-            position = Vector2D(500 + i * 80, 150)
-            softbody = SoftBody(position, width=30, height=30, rows=5, cols=5)
-            self.softbodies.append(softbody)
+        # Ragdolls and softbodies are identical copies of one template each, so they
+        # are spawned as instances straight into the world buffers.
+        self.ragdolls = self.world.spawn(
+            ragdoll_topology(limb_length=20.0),
+            [(300 + i * 100, 100) for i in range(3)],
+        )
+        self.softbodies = self.world.spawn(
+            softbody_topology(width=30, height=30, rows=5, cols=5),
+            [(500 + i * 80, 150) for i in range(4)],
+        )
 
         # Create multiple cloths
         for i in range(2):
-            position = Vector2D(200 + i * 200, 200)
             cloth = Cloth(width=10, height=10)
+            self.world.add(cloth)
             self.cloths.append(cloth)
 
+        if lod:
+            self.world.enable_lod((0, 0, 800, 600))
+            self.world.lod.track(self.ragdolls + self.softbodies)
+
     def update(self, delta_time):
         """
         Update all objects in the stress test scene.
@@ -54,17 +65,7 @@ class StressTestScene:
         Args:
             delta_time (float): The time step for the update.
         """
-        for rope in self.ropes:
-            rope.update(delta_time)
-
-        for ragdoll in self.ragdolls:
-            ragdoll.update(delta_time)
-
-        for softbody in self.softbodies:
-            softbody.update(delta_time)
-
-        for cloth in self.cloths:
-            cloth.update(delta_time)
+        self.world.step(delta_time)
 
     def render(self, renderer):
         """
@@ -73,17 +74,7 @@ class StressTestScene:
         Args:
             renderer: The renderer to use for drawing the objects.
         """
-        for rope in self.ropes:
-            rope.render(renderer)
-
-        for ragdoll in self.ragdolls:
-            ragdoll.render(renderer)
-
-        for softbody in self.softbodies:
-            softbody.render(renderer)
-
-        for cloth in self.cloths:
-            cloth.render(renderer)
+        self.world.render(renderer)
 
     def __repr__(self):
         return f"StressTestScene(ropes={len(self.ropes)}, ragdolls={len(self.ragdolls)}, softbodies={len(self.softbodies)}, cloths={len(self.cloths)})"
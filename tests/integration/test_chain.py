@@ -20,9 +20,9 @@ class TestChain(unittest.TestCase):
         self.assertEqual(len(self.chain.springs), 4)
 
     def test_chain_update(self):
-        initial_positions = [p.position for p in self.chain.particles]
+        initial_positions = [p.position.copy() for p in self.chain.particles]
         self.chain.update(0.016)
-        final_positions = [p.position for p in self.chain.particles]
+        final_positions = [p.position.copy() for p in self.chain.particles]
         self.assertNotEqual(initial_positions, final_positions)
 
     def test_invalid_chain_initialization(self):
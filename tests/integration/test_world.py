@@ -0,0 +1,135 @@
+# test_world.py
+# Integration tests for the PhysicsWorld class.
+
+import unittest
+
+import numpy as np
+
+from core.vector2d import Vector2D
+from objects.ragdoll import Ragdoll, ragdoll_topology
+from src.integration.world import PhysicsWorld
+from src.objects.cloth import Cloth
+from src.objects.rope import Rope
+
+
+class TestPhysicsWorld(unittest.TestCase):
+    """
+    Integration tests for the PhysicsWorld class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.world = PhysicsWorld(gravity=Vector2D(0, 9.81), constraint_iterations=10)
+        self.rope = Rope(Vector2D(0, 0), 10, 5.0)
+        self.cloth = Cloth(width=5, height=5)
+        self.world.add(self.rope)
+        self.world.add(self.cloth)
+
+    def test_registration(self):
+        """
+        Test that registered objects are merged into the global buffers.
+        """
+        self.assertEqual(self.world.system.num_particles, 10 + 25)
+        self.assertEqual(
+            self.world.system.num_constraints,
+            len(self.rope.springs) + len(self.cloth.springs),
+        )
+        self.assertEqual(self.world.index_of(self.cloth.particles[0]), 10)
+        with self.assertRaises(ValueError):
+            self.world.add(self.rope)
+
+    def test_step_and_sync(self):
+        """
+        Test that stepping moves free particles and sync writes them back.
+        """
+        initial = [p.position.copy() for p in self.rope.particles]
+        for _ in range(10):
+            self.world.step(0.016)
+        self.world.sync()
+        self.assertEqual(self.rope.particles[0].position, initial[0])
+        for particle, start in zip(self.rope.particles[1:], initial[1:]):
+            self.assertNotEqual(particle.position, start)
+
+    def test_world_settings(self):
+        """
+        Test that world-level settings drive the shared integrator.
+        """
+        self.world.gravity = Vector2D(0, 0)
+        self.world.damping = 1.0
+        self.world.constraint_iterations = 3
+        self.assertEqual(self.world.integrator.constraint_iterations, 3)
+        before = self.world.system.positions.copy()
+        self.world.step(0.016)
+        np.testing.assert_allclose(self.world.system.positions, before, atol=1e-9)
+        with self.assertRaises(ValueError):
+            PhysicsWorld(substeps=0)
+
+    def test_cross_object_constraint(self):
+        """
+        Test that particles of different objects can be connected.
+        """
+        tip = self.rope.particles[-1]
+        corner = self.cloth.particles[0]
+        self.world.connect(tip, corner, rest_length=1.0)
+        for _ in range(100):
+            self.world.step(0.016)
+        positions = self.world.system.positions
+        distance = np.linalg.norm(
+            positions[self.world.index_of(tip)] - positions[self.world.index_of(corner)]
+        )
+        self.assertLess(distance, 5.0)
+
+    def test_remove(self):
+        """
+        Test that removing an object writes back its state and drops its constraints.
+        """
+        link = self.world.connect(self.rope.particles[-1], self.cloth.particles[0])
+        self.world.step(0.016)
+        self.world.remove(self.rope)
+        self.assertFalse(link.alive)
+        self.assertNotIn(self.rope, self.world.objects)
+        self.assertEqual(self.world.system.num_active_particles, 25)
+        self.assertGreater(self.rope.particles[-1].position.y, -45.0)
+        self.world.system.compact()
+        self.world.step(0.016)
+        self.world.sync()
+        self.assertEqual(self.world.index_of(self.cloth.particles[0]), 0)
+
+    def test_remove_index_link(self):
+        """
+        Test that constraints added by world index are dropped with their object.
+        """
+        other = Rope(Vector2D(20, 0), 5, 5.0)
+        self.world.add(other)
+        link = self.world.connect(
+            self.world.index_of(self.cloth.particles[-1]),
+            self.world.index_of(other.particles[-1]),
+        )
+        self.world.remove(other)
+        self.assertFalse(link.alive)
+        self.world.step(0.016)
+
+    def test_spawn(self):
+        """
+        Test that template instances share the buffers with registered objects.
+        """
+        bodies = self.world.spawn(ragdoll_topology(20.0, 0.5), [(0, 0), (100, 0)])
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(self.world.system.num_particles, 35 + 12)
+
+    def test_matches_object_layout(self):
+        """
+        Test that an added ragdoll keeps its masses and positions.
+        """
+        ragdoll = Ragdoll(Vector2D(400, 300))
+        body = self.world.add(ragdoll)
+        np.testing.assert_allclose(
+            self.world.system.masses[body.particles],
+            [p.mass for p in ragdoll.particles],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# test_aerodynamics.py
+# Unit tests for the per-triangle cloth aerodynamics.
+
+import unittest
+
+import numpy as np
+
+from core.aerodynamics import ClothAerodynamics
+from core.particle_system import ParticleSystem
+from core.vector2d import Vector2D
+from integration.world import PhysicsWorld
+from objects.cloth import Cloth
+
+
+def total_force(field, system, delta_time=0.1):
+    """The total (x, y) force of a field on a particle system."""
+    fx, fy = field.vertex_forces(
+        system.positions, system.old_positions, 0.0, delta_time
+    )
+    return np.array([fx.sum(), fy.sum()])
+
+
+class TestClothAerodynamics(unittest.TestCase):
+    """
+    Unit tests for the ClothAerodynamics class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a right triangle whose left edge faces the wind.
+        """
+        self.system = ParticleSystem()
+        self.system.add_particles([(0, 0), (1, 0), (0, 1)])
+        self.triangles = [(0, 1, 2)]
+
+    def test_plate_across_the_flow(self):
+        """
+        Test the force on an edge facing the flow head-on: density / 2 * length * u^2.
+        """
+        field = ClothAerodynamics(self.triangles, flow=(2.0, 0.0), density=1.5)
+        np.testing.assert_allclose(total_force(field, self.system), (3.0, 0.0))
+
+    def test_winding_does_not_matter(self):
+        """
+        Test that both windings of a triangle feel the same force.
+        """
+        forward = ClothAerodynamics([(0, 1, 2)], flow=(1.0, 0.5))
+        backward = ClothAerodynamics([(0, 2, 1)], flow=(1.0, 0.5))
+        np.testing.assert_allclose(
+            total_force(forward, self.system), total_force(backward, self.system)
+        )
+
+    def test_lift_and_drag(self):
+        """
+        Test that an inclined edge produces lift across the flow, scaled by the lift
+        coefficient, and drag along it, scaled by the drag coefficient.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0, 0), (1, 1), (-1, 1)])
+        both = total_force(ClothAerodynamics([(0, 1, 2)], flow=(1.0, 0.0)), system)
+        self.assertGreater(both[0], 0.0)
+        self.assertNotAlmostEqual(both[1], 0.0)
+        drag_only = total_force(
+            ClothAerodynamics([(0, 1, 2)], flow=(1.0, 0.0), lift=0.0), system
+        )
+        lift_only = total_force(
+            ClothAerodynamics([(0, 1, 2)], flow=(1.0, 0.0), drag=0.0), system
+        )
+        np.testing.assert_allclose(drag_only, (both[0], 0.0), atol=1e-12)
+        np.testing.assert_allclose(lift_only, (0.0, both[1]), atol=1e-12)
+
+    def test_no_force_without_relative_motion(self):
+        """
+        Test that a triangle moving with the air feels no force, and a triangle moving
+        through still air is slowed down.
+        """
+        delta_time = 0.1
+        self.system.old_positions[:, 0] -= 0.3
+        field = ClothAerodynamics(self.triangles, flow=(3.0, 0.0))
+        np.testing.assert_allclose(
+            total_force(field, self.system, delta_time), 0.0, atol=1e-12
+        )
+        still = ClothAerodynamics(self.triangles)
+        self.assertLess(total_force(still, self.system, delta_time)[0], 0.0)
+
+    def test_degenerate_triangle(self):
+        """
+        Test that a collapsed triangle feels no force.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0, 0), (1, 0), (2, 0)])
+        field = ClothAerodynamics([(0, 1, 2)], flow=(0.0, 5.0))
+        np.testing.assert_allclose(total_force(field, system), 0.0)
+
+    def test_apply_divides_by_mass(self):
+        """
+        Test that apply() spreads the force over the vertices and skips fixed ones.
+        """
+        system = ParticleSystem()
+        system.add_particles(
+            [(0, 0), (1, 0), (0, 1), (5, 5)],
+            masses=[1.0, 2.0, 1.0, 1.0],
+            fixed=[False, False, True, False],
+        )
+        field = ClothAerodynamics(self.triangles, flow=(2.0, 0.0))
+        field.apply(system, delta_time=0.1)
+        # The left edge (particles 2 -> 0) takes all the force: 2 along x.
+        np.testing.assert_allclose(
+            system.accelerations, [(1.0, 0.0), (0.0, 0.0), (0.0, 0.0), (0.0, 0.0)]
+        )
+
+    def test_offset(self):
+        """
+        Test that the offset shifts the triangles onto a body's particles.
+        """
+        system = ParticleSystem()
+        system.add_particles([(9, 9), (0, 0), (1, 0), (0, 1)])
+        field = ClothAerodynamics(self.triangles, flow=(2.0, 0.0), offset=1)
+        field.apply(system, delta_time=0.1)
+        np.testing.assert_allclose(system.accelerations[:, 0], (0.0, 1.0, 0.0, 1.0))
+
+    def test_time_varying_flow(self):
+        """
+        Test that a callable flow is evaluated at the simulation time.
+        """
+        field = ClothAerodynamics(self.triangles, flow=lambda t: (t, 0.0))
+        fx, _ = field.vertex_forces(
+            self.system.positions, self.system.old_positions, 2.0, 0.1
+        )
+        self.assertAlmostEqual(fx.sum(), 2.0)
+
+    def test_invalid_arguments(self):
+        """
+        Test that malformed triangles and a missing time step raise errors.
+        """
+        with self.assertRaises(ValueError):
+            ClothAerodynamics([(0, 1)])
+        with self.assertRaises(ValueError):
+            ClothAerodynamics([(0, 1, -1)])
+        with self.assertRaises(ValueError):
+            ClothAerodynamics(self.triangles).apply(self.system)
+
+    def test_cloth_blows_downwind(self):
+        """
+        Test that a hanging cloth in a PhysicsWorld is blown along the wind.
+        """
+        cloth = Cloth(width=6, height=6)
+        for particle in cloth.particles[:6]:
+            particle.is_fixed = True
+        world = PhysicsWorld(gravity=Vector2D(0, 9.81))
+        body = world.add(cloth)
+        world.add_field(
+            ClothAerodynamics(
+                cloth.triangles,
+                flow=(6.0, 0.0),
+                density=0.2,
+                offset=body.particle_start,
+            )
+        )
+        start = world.system.positions[body.particles, 0].mean()
+        for _ in range(60):
+            world.step(1 / 60)
+        self.assertGreater(world.system.positions[body.particles, 0].mean(), start)
+
+
+if __name__ == "__main__":
+    unittest.main()
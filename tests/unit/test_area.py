@@ -0,0 +1,223 @@
+# test_area.py
+# Unit tests for the TriangleAreaConstraints and PressureConstraints classes.
+
+import unittest
+
+import numpy as np
+
+from core.area import (
+    PressureConstraints,
+    TriangleAreaConstraints,
+    grid_boundary,
+)
+from core.topology import grid_triangles
+from core.vector2d import Vector2D
+from src.integration.world import PhysicsWorld
+from src.objects.softbody import SoftBody
+from src.scenes.blob_slime import BlobSlime
+
+
+def grid_positions(rows, cols):
+    """Row-major unit grid positions."""
+    xs, ys = np.meshgrid(np.arange(cols, dtype=float), np.arange(rows, dtype=float))
+    return np.column_stack((xs.ravel(), ys.ravel()))
+
+
+class TestGridHelpers(unittest.TestCase):
+    """
+    Unit tests for the grid boundary and triangulation helpers.
+    """
+
+    def test_boundary(self):
+        """
+        Test that the boundary visits every edge particle once, in order.
+        """
+        boundary = grid_boundary(3, 4)
+        self.assertEqual(boundary.tolist(), [0, 1, 2, 3, 7, 11, 10, 9, 8, 4])
+        with self.assertRaises(ValueError):
+            grid_boundary(1, 4)
+
+    def test_triangles(self):
+        """
+        Test that the triangles tile the grid.
+        """
+        triangles = grid_triangles(3, 4)
+        self.assertEqual(triangles.shape, (12, 3))
+        areas = TriangleAreaConstraints.from_positions(
+            grid_positions(3, 4), triangles
+        ).targets
+        np.testing.assert_allclose(areas, 0.5)
+
+
+class TestTriangleAreaConstraints(unittest.TestCase):
+    """
+    Unit tests for the TriangleAreaConstraints class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a triangulated 3x4 grid.
+        """
+        self.rest = grid_positions(3, 4)
+        self.constraints = TriangleAreaConstraints.from_positions(
+            self.rest, grid_triangles(3, 4)
+        )
+        self.inv_masses = np.ones(12)
+
+    def test_restores_squashed_areas(self):
+        """
+        Test that squashed triangles regain their area without moving the body.
+        """
+        positions = self.rest * (1.0, 0.3)
+        center = positions.mean(axis=0)
+        for _ in range(50):
+            self.constraints.project(positions, self.inv_masses)
+        np.testing.assert_allclose(
+            self.constraints.current_areas(positions), 0.5, atol=1e-3
+        )
+        np.testing.assert_allclose(positions.mean(axis=0), center, atol=1e-12)
+
+    def test_fixed_particles_do_not_move(self):
+        """
+        Test that pinned particles are not moved.
+        """
+        positions = self.rest * 0.5
+        self.inv_masses[:4] = 0.0
+        self.constraints.project(positions, self.inv_masses)
+        np.testing.assert_array_equal(positions[:4], self.rest[:4] * 0.5)
+
+    def test_mismatched_targets(self):
+        """
+        Test that every triangle needs a target.
+        """
+        with self.assertRaises(ValueError):
+            TriangleAreaConstraints([(0, 1, 2)], [1.0, 2.0])
+
+
+class TestPressureConstraints(unittest.TestCase):
+    """
+    Unit tests for the PressureConstraints class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: the boundary of a 3x4 grid.
+        """
+        self.rest = grid_positions(3, 4)
+        self.constraints = PressureConstraints.from_positions(
+            self.rest, [grid_boundary(3, 4)]
+        )
+        self.inv_masses = np.ones(12)
+
+    def test_rest_area(self):
+        """
+        Test that the rest area is the area enclosed by the boundary.
+        """
+        self.assertEqual(self.constraints.num_polygons, 1)
+        np.testing.assert_allclose(self.constraints.rest_areas, [6.0])
+
+    def test_restores_squashed_area(self):
+        """
+        Test that one global constraint restores the area of a squashed body.
+        """
+        positions = self.rest * (1.0, 0.3)
+        for _ in range(3):
+            self.constraints.project(positions, self.inv_masses)
+        np.testing.assert_allclose(
+            self.constraints.current_areas(positions), [6.0], rtol=1e-5
+        )
+        np.testing.assert_array_equal(positions[[5, 6]], self.rest[[5, 6]] * (1, 0.3))
+
+    def test_pressure_inflates(self):
+        """
+        Test that a pressure above one inflates the polygon.
+        """
+        self.constraints.pressure = 1.5
+        positions = self.rest.copy()
+        for _ in range(5):
+            self.constraints.project(positions, self.inv_masses)
+        np.testing.assert_allclose(
+            self.constraints.current_areas(positions), [9.0], rtol=1e-5
+        )
+
+    def test_shifted(self):
+        """
+        Test that a shifted copy acts on the same polygon further down a buffer.
+        """
+        shifted = self.constraints.shifted(12)
+        positions = np.concatenate((self.rest, self.rest * 0.5))
+        shifted.project(positions, np.ones(24))
+        np.testing.assert_array_equal(positions[:12], self.rest)
+        self.assertGreater(shifted.current_areas(positions)[0], 6.0 * 0.25)
+
+    def test_invalid_polygons(self):
+        """
+        Test that invalid polygons and pressures are rejected.
+        """
+        with self.assertRaises(ValueError):
+            PressureConstraints([(0, 1)], [1.0])
+        with self.assertRaises(ValueError):
+            PressureConstraints([(0, 1, 2)], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            PressureConstraints([(0, 1, 2)], [1.0], pressure=-1.0)
+
+
+class TestAreaPreservingSoftBody(unittest.TestCase):
+    """
+    Tests for softbodies that keep their area.
+    """
+
+    def test_modes(self):
+        """
+        Test that each mode attaches the matching constraint set.
+        """
+        pressure = SoftBody(Vector2D(0, 0), 100, 100, 5, 5, preserve_area="pressure")
+        self.assertIsInstance(pressure.area_constraints, PressureConstraints)
+        triangles = SoftBody(Vector2D(0, 0), 100, 100, 5, 5, preserve_area="triangles")
+        self.assertEqual(len(triangles.area_constraints), 32)
+        self.assertIsNone(SoftBody(Vector2D(0, 0), 100, 100, 5, 5).area_constraints)
+        with self.assertRaises(ValueError):
+            SoftBody(Vector2D(0, 0), 100, 100, 5, 5, preserve_area="volume")
+
+    def test_blob_slime_keeps_its_volume(self):
+        """
+        Test that the slime regains its area after being squashed.
+        """
+        scene = BlobSlime()
+        softbody = scene.softbody
+        for particle in softbody.particles:
+            particle.position.y = 300 + (particle.position.y - 300) * 0.3
+            particle.old_position = particle.position.copy()
+        scene.update(0.016)
+        positions = np.array([(p.position.x, p.position.y) for p in softbody.particles])
+        area = softbody.area_constraints.current_areas(positions)[0]
+        self.assertAlmostEqual(
+            area / softbody.area_constraints.rest_areas[0], 1.0, delta=0.1
+        )
+
+    def test_world_merges_pressure(self):
+        """
+        Test that a world-simulated body keeps its area with soft springs.
+        """
+        world = PhysicsWorld(constraint_iterations=4)
+        softbody = SoftBody(
+            Vector2D(0, 0),
+            100,
+            100,
+            5,
+            5,
+            spring_stiffness=0.1,
+            preserve_area="pressure",
+        )
+        body = world.add(softbody)
+        world.system.positions[body.particles, 1] *= 0.5
+        for _ in range(10):
+            world.step(0.016)
+        area = softbody.area_constraints.current_areas(
+            world.system.positions[body.particles]
+        )[0]
+        self.assertAlmostEqual(area / 10000.0, 1.0, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# test_attachment.py
+# Unit tests for the AttachmentConstraints class.
+
+import unittest
+
+import numpy as np
+
+from core.attachment import AttachmentConstraints
+from core.constraint_set import project_particles
+from core.particle_system import ParticleSystem
+from core.vector2d import Vector2D
+from src.integration.world import PhysicsWorld
+from src.objects.cloth import Cloth
+from src.objects.rope import Rope
+
+
+class TestAttachmentConstraints(unittest.TestCase):
+    """
+    Unit tests for the AttachmentConstraints class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a five-particle path pinned at particle 0.
+        """
+        self.edges = [(0, 1), (1, 2), (2, 3), (3, 4)]
+        self.attachments = AttachmentConstraints(self.edges, [1.0, 1.0, 1.0, 1.0])
+        self.inv_masses = np.array([0.0, 1.0, 1.0, 1.0, 1.0])
+
+    def test_geodesic_rest_lengths(self):
+        """
+        Test that each free particle is attached to its nearest pin along the graph.
+        """
+        self.attachments.update([True, False, False, False, True])
+        pairs = dict(map(tuple, self.attachments.indices.tolist()))
+        self.assertEqual(pairs, {1: 0, 2: 0, 3: 4})
+        np.testing.assert_allclose(self.attachments.rest_lengths, [1.0, 2.0, 1.0])
+
+    def test_unilateral_projection(self):
+        """
+        Test that stretched particles are pulled back and slack ones are left alone.
+        """
+        positions = np.array(
+            [(0.0, 0.0), (0.5, 0.0), (1.0, 0.0), (3.0, 0.0), (6.0, 0.0)]
+        )
+        self.attachments.project(positions, self.inv_masses)
+        np.testing.assert_allclose(positions[:, 0], [0.0, 0.5, 1.0, 3.0, 4.0])
+
+    def test_pins_change(self):
+        """
+        Test that the attachments follow the pinned particles.
+        """
+        positions = np.array([(float(i), 0.0) for i in range(5)])
+        self.attachments.project(positions, self.inv_masses)
+        self.assertEqual(len(self.attachments), 4)
+        self.inv_masses[4] = 0.0
+        self.attachments.project(positions, self.inv_masses)
+        self.assertEqual(len(self.attachments), 3)
+        self.assertEqual(self.attachments.indices[-1].tolist(), [3, 4])
+
+    def test_pins_from_system_flags(self):
+        """
+        Test that in a system the pins are the fixed particles, and that particles
+        with a zero inverse mass that are not fixed are neither anchors nor moved.
+        """
+        system = ParticleSystem()
+        system.add_particles(
+            [(6.0 * i, 0.0) for i in range(5)], fixed=[True] + [False] * 4
+        )
+        system.inv_masses[3] = 0.0
+        self.attachments.prepare(system)
+        positions = system.positions
+        self.attachments.project(positions, system.inv_masses)
+        self.assertEqual(len(self.attachments), 4)
+        np.testing.assert_allclose(positions[:, 0], [0.0, 1.0, 2.0, 18.0, 4.0])
+
+    def test_unreachable_particles(self):
+        """
+        Test that particles without a reachable pin get no attachment.
+        """
+        attachments = AttachmentConstraints([(0, 1), (2, 3)], [1.0, 1.0])
+        attachments.update([True, False, False, False])
+        self.assertEqual(attachments.indices.tolist(), [[1, 0]])
+
+    def test_shifted(self):
+        """
+        Test that shifted copies cover the shifted particles.
+        """
+        shifted = self.attachments.shifted(10)
+        self.assertEqual(shifted.particles.tolist(), [10, 11, 12, 13, 14])
+        self.assertEqual(self.attachments.particles.tolist(), [0, 1, 2, 3, 4])
+
+
+class TestLongRangeAttachmentOptions(unittest.TestCase):
+    """
+    Tests for the long-range attachment options of ropes and cloth.
+    """
+
+    def test_rope_stretch_is_bounded(self):
+        """
+        Test that a rope particle dragged far away is pulled back within reach of the anchor.
+        """
+        rope = Rope(Vector2D(0, 0), 30, 5.0, long_range_attachments=True)
+        tail = rope.particles[-1]
+        tail.position.set(0.0, -1000.0)
+        project_particles(rope.constraint_sets, rope.particles)
+        distance = rope.particles[0].position.distance_to(tail.position)
+        self.assertAlmostEqual(distance, 29 * 5.0)
+
+    def test_cloth_follows_later_pins(self):
+        """
+        Test that cloth attachments pick up particles pinned after construction.
+        """
+        lowest = []
+        for enabled in (False, True):
+            cloth = Cloth(width=5, height=5, long_range_attachments=enabled)
+            for particle in cloth.particles[:5]:
+                particle.is_fixed = True
+            for _ in range(200):
+                cloth.update(1 / 60)
+            lowest.append(max(particle.position.y for particle in cloth.particles))
+        self.assertGreater(lowest[0], 4.02)
+        self.assertLess(lowest[1], 4.01)
+
+    def test_world_merges_attachments(self):
+        """
+        Test that a world solves the attachments of registered objects.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 500), constraint_iterations=1)
+        rope = Rope(Vector2D(0, 0), 30, 5.0, long_range_attachments=True)
+        world.add(rope)
+        for _ in range(60):
+            world.step(1 / 60)
+        positions = world.system.positions
+        self.assertLessEqual(
+            np.linalg.norm(positions[29] - positions[0]), 29 * 5.0 + 1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
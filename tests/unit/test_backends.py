@@ -0,0 +1,115 @@
+# test_backends.py
+# Unit tests for the kernel backends of the array-backed integration path.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration import backends, kernels, numba_kernels
+from integration.verlet import VerletIntegrator
+
+
+def hanging_cloth():
+    """A 10x10 cloth pinned along its top row, with some initial motion."""
+    system = ParticleSystem()
+    system.add_topology(
+        grid_topology(10, 10, pattern=("structural", "shear")).replace(
+            fixed=np.arange(100) < 10
+        )
+    )
+    system.old_positions[10:] -= np.random.default_rng(0).normal(0, 0.05, (90, 2))
+    return system
+
+
+class TestBackendSelection(unittest.TestCase):
+    """
+    Unit tests for resolving and loading backends.
+    """
+
+    def test_numpy_backend(self):
+        """
+        Test that the NumPy backend is always the NumPy kernels.
+        """
+        self.assertEqual(backends.resolve_backend("numpy"), "numpy")
+        self.assertIs(backends.load_backend("numpy"), kernels)
+
+    def test_unknown_backend(self):
+        """
+        Test that unknown backends are rejected.
+        """
+        with self.assertRaises(ValueError):
+            backends.load_backend("cuda")
+        with self.assertRaises(ValueError):
+            VerletIntegrator(ParticleSystem(), backend="cuda")
+
+    def test_fallback_without_numba(self):
+        """
+        Test that the Numba backend falls back to NumPy when Numba is missing.
+        """
+        with mock.patch.object(numba_kernels, "NUMBA_AVAILABLE", False):
+            self.assertEqual(backends.resolve_backend("numba"), "numpy")
+            self.assertIs(backends.load_backend("numba"), kernels)
+            integrator = VerletIntegrator(hanging_cloth(), backend="numba")
+            self.assertEqual(integrator.backend, "numpy")
+            integrator.integrate(0.016)
+
+
+@unittest.skipUnless(backends.numba_available(), "Numba is not installed")
+class TestNumbaKernels(unittest.TestCase):
+    """
+    Tests that the compiled kernels reproduce the NumPy kernels.
+    """
+
+    def test_kernels_match(self):
+        """
+        Test each compiled kernel against its NumPy counterpart.
+        """
+        reference, compiled = hanging_cloth(), hanging_cloth()
+        reference.accelerations[:] = compiled.accelerations[:] = (0.5, -1.0)
+        for system, module in ((reference, kernels), (compiled, numba_kernels)):
+            module.verlet_integrate(
+                system.positions,
+                system.old_positions,
+                system.accelerations,
+                system.inv_masses,
+                np.array((0.0, 9.81)),
+                0.016,
+            )
+            module.project_distance_constraints(
+                system.positions,
+                system.inv_masses,
+                system.edges,
+                system.rest_lengths,
+                system.stiffness,
+                relaxation=1.5,
+            )
+            module.apply_damping(
+                system.positions, system.old_positions, system.inv_masses, 0.9
+            )
+        np.testing.assert_allclose(compiled.positions, reference.positions, atol=1e-12)
+        np.testing.assert_array_equal(compiled.old_positions, reference.old_positions)
+        np.testing.assert_array_equal(compiled.accelerations, 0.0)
+
+    def test_integrator_matches(self):
+        """
+        Test that a simulation gives the same result on both backends.
+        """
+        results = []
+        for backend in ("numpy", "numba"):
+            system = hanging_cloth()
+            integrator = VerletIntegrator(
+                system, gravity=Vector2D(0, 9.81), backend=backend
+            )
+            self.assertEqual(integrator.backend, backend)
+            for _ in range(30):
+                integrator.integrate(0.016)
+            results.append(system.positions.copy())
+        np.testing.assert_allclose(results[1], results[0], atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
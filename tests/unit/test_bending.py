@@ -0,0 +1,143 @@
+# test_bending.py
+# Unit tests for the BendingConstraints class.
+
+import unittest
+
+import numpy as np
+
+from core.bending import BendingConstraints, measure_bending
+from core.particle import Particle
+from core.vector2d import Vector2D
+from integration.world import PhysicsWorld
+from objects.chain import AngleConstraint, Chain
+
+
+class TestBendingConstraints(unittest.TestCase):
+    """
+    Unit tests for the BendingConstraints class.
+    """
+
+    def setUp(self):
+        """
+        Set up a bent particle triplet.
+        """
+        self.positions = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)])
+        self.inv_masses = np.ones(3)
+
+    def test_measure(self):
+        """
+        Test the measured angle and skip-one distance of a right angle.
+        """
+        indices = [(0, 1, 2)]
+        self.assertAlmostEqual(measure_bending(self.positions, indices)[0], -np.pi / 2)
+        self.assertAlmostEqual(
+            measure_bending(self.positions, indices, "distance")[0], np.sqrt(2)
+        )
+
+    def test_angle_projection_converges(self):
+        """
+        Test that repeated projection straightens the triplet.
+        """
+        bending = BendingConstraints([(0, 1, 2)], [np.pi])
+        for _ in range(50):
+            bending.project(self.positions, self.inv_masses)
+        angle = measure_bending(self.positions, [(0, 1, 2)])[0]
+        self.assertAlmostEqual(abs(angle), np.pi, places=3)
+
+    def test_distance_projection(self):
+        """
+        Test that the skip-one variant restores the outer distance.
+        """
+        bending = BendingConstraints([(0, 1, 2)], [2.0], mode="distance")
+        for _ in range(20):
+            bending.project(self.positions, self.inv_masses)
+        distance = measure_bending(self.positions, [(0, 1, 2)], "distance")[0]
+        self.assertAlmostEqual(distance, 2.0, places=6)
+
+    def test_fixed_particles_do_not_move(self):
+        """
+        Test that particles with zero inverse mass are left in place.
+        """
+        inv_masses = np.array([0.0, 0.0, 1.0])
+        bending = BendingConstraints([(0, 1, 2)], [np.pi])
+        bending.project(self.positions, inv_masses)
+        np.testing.assert_allclose(self.positions[:2], [(0, 0), (1, 0)])
+        self.assertGreater(self.positions[2, 0], 1.0)
+
+    def test_shift_and_remap(self):
+        """
+        Test that index shifting returns a copy and remapping renumbers in place.
+        """
+        bending = BendingConstraints([(0, 1, 2)], [np.pi])
+        shifted = bending.shifted(10)
+        np.testing.assert_array_equal(shifted.indices, [(10, 11, 12)])
+        np.testing.assert_array_equal(bending.indices, [(0, 1, 2)])
+        shifted.remap(np.arange(20) - 5)
+        np.testing.assert_array_equal(shifted.indices, [(5, 6, 7)])
+
+    def test_invalid_arguments(self):
+        """
+        Test that invalid modes, targets and stiffness raise errors.
+        """
+        with self.assertRaises(ValueError):
+            BendingConstraints(mode="twist")
+        with self.assertRaises(ValueError):
+            BendingConstraints([(0, 1, 2)], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            BendingConstraints([(0, 1, 2)], [1.0], stiffness=2.0)
+
+
+class TestChainBending(unittest.TestCase):
+    """
+    Tests for the batched angle constraints of the Chain class.
+    """
+
+    def test_add_angle_constraint(self):
+        """
+        Test that angle constraints are added to the batched table.
+        """
+        chain = Chain(particle_count=5)
+        chain.add_angle_constraint(0, 1, 2, np.pi)
+        chain.add_angle_constraint(1, 2, 3, np.pi)
+        self.assertEqual(len(chain.bending), 2)
+        with self.assertRaises(IndexError):
+            chain.add_angle_constraint(0, 1, 5, np.pi)
+        chain.update(0.016)
+
+    def test_bending_stiffens_chain(self):
+        """
+        Test that a cantilevered chain with angle constraints holds its shape in a world.
+        """
+        sags = []
+        for stiff in (False, True):
+            chain = Chain(particle_count=6, link_length=10.0)
+            chain.particles[1].is_fixed = True
+            if stiff:
+                chain.add_bending_constraints(mode="angle")
+            world = PhysicsWorld(gravity=Vector2D(0, 50.0), constraint_iterations=20)
+            world.add(chain)
+            for _ in range(100):
+                world.step(0.016)
+            world.sync()
+            sags.append(chain.particles[-1].position.y)
+        self.assertGreater(sags[0], 20.0)
+        self.assertLess(sags[1], 1.0)
+
+    def test_angle_constraint_object(self):
+        """
+        Test that the single AngleConstraint works on Particle objects.
+        """
+        particles = [
+            Particle(Vector2D(0, 0), is_fixed=True),
+            Particle(Vector2D(1, 0), is_fixed=True),
+            Particle(Vector2D(1, 1)),
+        ]
+        constraint = AngleConstraint(*particles, np.pi)
+        for _ in range(20):
+            constraint.apply()
+        self.assertAlmostEqual(particles[2].position.y, 0.0, places=2)
+        self.assertGreater(particles[2].position.x, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
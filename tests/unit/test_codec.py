@@ -0,0 +1,194 @@
+# test_codec.py
+# Unit tests for the StateEncoder and StateDecoder classes.
+
+import unittest
+
+import numpy as np
+
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.codec import DELTA, KEYFRAME, StateDecoder, StateEncoder, body_ranges
+from integration.world import PhysicsWorld
+
+
+def kind(frame):
+    """Kind (KEYFRAME or DELTA) of an encoded frame."""
+    return frame[5]
+
+
+class TestRoundTrip(unittest.TestCase):
+    """
+    Unit tests for encoding and decoding moving particles.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: two drifting clusters of particles, far apart.
+        """
+        rng = np.random.default_rng(1)
+        self.positions = np.concatenate(
+            (rng.uniform(0, 50, (300, 2)), rng.uniform(5000, 5100, (200, 2)))
+        )
+        self.velocities = rng.normal(0, 0.2, (500, 2))
+        self.ranges = [(0, 300), (300, 200)]
+
+    def frames(self, count):
+        """Positions of the clusters over count frames."""
+        return [self.positions + step * self.velocities for step in range(count)]
+
+    def test_accuracy(self):
+        """
+        Test that decoded positions are within half a grid step for every setting.
+        """
+        for bits in (16, 24):
+            for compression in (None, "zlib", "lzma"):
+                for delta in ("difference", "xor", "predicted"):
+                    with self.subTest(bits=bits, compression=compression, delta=delta):
+                        encoder = StateEncoder(
+                            bits, 10, compression=compression, delta=delta
+                        )
+                        decoder = StateDecoder()
+                        for positions in self.frames(15):
+                            decoded = decoder.decode(
+                                encoder.encode(positions, self.ranges)
+                            )
+                            # Each cluster's grid spans about 1.5 times its size
+                            tolerance = 0.5 * 1.6 * 100 / (2**bits - 1)
+                            self.assertLess(
+                                np.abs(decoded - positions).max(), tolerance
+                            )
+
+    def test_per_object_grids(self):
+        """
+        Test that separate ranges keep the precision of small, distant objects.
+        """
+        positions = self.frames(1)[0]
+        shared = StateDecoder().decode(StateEncoder().encode(positions))
+        separate = StateDecoder().decode(StateEncoder().encode(positions, self.ranges))
+        self.assertLess(
+            np.abs(separate - positions).max() * 10, np.abs(shared - positions).max()
+        )
+
+    def test_delta_frames_are_small(self):
+        """
+        Test that slow motion needs one byte per value and compresses well.
+        """
+        encoder = StateEncoder(compression="zlib")
+        frames = [encoder.encode(p, self.ranges) for p in self.frames(3)]
+        self.assertEqual([kind(frame) for frame in frames], [KEYFRAME, DELTA, DELTA])
+        self.assertLess(len(frames[2]), 0.75 * len(frames[0]))
+        uncompressed = StateEncoder()
+        uncompressed.encode(self.positions, self.ranges)
+        delta = uncompressed.encode(self.positions + 0.01, self.ranges)
+        # One byte for each of the 1000 coordinates, plus the headers
+        self.assertLess(len(delta), 1000 + 30)
+
+
+class TestKeyframes(unittest.TestCase):
+    """
+    Unit tests for the choice between keyframes and delta frames.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: an encoder and a small set of particles.
+        """
+        self.encoder = StateEncoder(keyframe_interval=4)
+        self.positions = np.array([[0.0, 0.0], [10.0, 10.0], [20.0, 0.0]])
+
+    def kinds(self, frames):
+        """Kinds of the encoded frames."""
+        return [
+            kind(self.encoder.encode(positions, ranges)) for positions, ranges in frames
+        ]
+
+    def test_interval(self):
+        """
+        Test that a keyframe is written every keyframe_interval frames.
+        """
+        kinds = self.kinds([(self.positions, None)] * 6)
+        self.assertEqual(kinds, [KEYFRAME, DELTA, DELTA, DELTA, KEYFRAME, DELTA])
+
+    def test_triggers(self):
+        """
+        Test that leaving the grid, new ranges, new particles and requests force keyframes.
+        """
+        self.encoder.keyframe_interval = 100
+        far = self.positions + (100.0, 0.0)
+        more = np.vstack((far, [[1.0, 1.0]]))
+        kinds = self.kinds(
+            [
+                (self.positions, None),
+                (self.positions + 1.0, None),
+                (far, None),
+                (far, [(0, 1)]),
+                (more, [(0, 1)]),
+            ]
+        )
+        self.assertEqual(kinds, [KEYFRAME, DELTA, KEYFRAME, KEYFRAME, KEYFRAME])
+        self.encoder.request_keyframe()
+        self.assertEqual(self.kinds([(more, [(0, 1)])]), [KEYFRAME])
+
+    def test_lost_frame(self):
+        """
+        Test that a delta frame cannot be decoded after a lost frame.
+        """
+        frames = [self.encoder.encode(self.positions + step) for step in range(5)]
+        decoder = StateDecoder()
+        with self.assertRaises(ValueError):
+            decoder.decode(frames[1])
+        decoder.decode(frames[0])
+        with self.assertRaises(ValueError):
+            decoder.decode(frames[2])
+        np.testing.assert_allclose(
+            decoder.decode(frames[4]), self.positions + 4, atol=1e-3
+        )
+
+    def test_invalid(self):
+        """
+        Test that invalid settings and input are rejected.
+        """
+        with self.assertRaises(ValueError):
+            StateEncoder(bits=12)
+        with self.assertRaises(ValueError):
+            StateEncoder(compression="bz2")
+        with self.assertRaises(ValueError):
+            self.encoder.encode([[np.nan, 0.0]])
+        with self.assertRaises(ValueError):
+            self.encoder.encode(self.positions, [(0, 2), (1, 2)])
+        with self.assertRaises(ValueError):
+            StateDecoder().decode(b"nonsense" * 4)
+
+    def test_empty(self):
+        """
+        Test frames without particles.
+        """
+        decoded = StateDecoder().decode(self.encoder.encode(np.empty((0, 2))))
+        self.assertEqual(decoded.shape, (0, 2))
+
+
+class TestWorld(unittest.TestCase):
+    """
+    Unit tests for encoding the particle system of a world.
+    """
+
+    def test_encode_system(self):
+        """
+        Test that every spawned body gets its own grid.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 100))
+        bodies = world.spawn(grid_topology(3, 3), [(0.0, 0.0), (500.0, 0.0)])
+        world.system.add_particles([(900.0, 900.0)])
+        self.assertEqual(body_ranges(world.system), [(0, 9), (9, 9)])
+        encoder = StateEncoder()
+        decoder = StateDecoder()
+        for _ in range(3):
+            world.step(0.016)
+            decoded = decoder.decode(encoder.encode_system(world.system))
+            np.testing.assert_allclose(decoded, world.system.positions, atol=1e-3)
+        world.system.despawn(bodies[0])
+        self.assertEqual(body_ranges(world.system), [(9, 9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
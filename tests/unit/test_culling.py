@@ -0,0 +1,202 @@
+# test_culling.py
+# Unit tests for the Camera class and viewport culling of objects and particle systems.
+
+import unittest
+
+import numpy as np
+
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from rendering.camera import Camera
+from rendering.culling import particles_visible, visible_springs
+from src.integration.world import PhysicsWorld
+from src.objects.chain import Chain
+from src.objects.cloth import Cloth
+from src.objects.ragdoll import Ragdoll
+from src.objects.rope import Rope
+from src.objects.softbody import SoftBody
+
+
+class RecordingRenderer:
+    """A renderer that records its draw calls, optionally through a camera."""
+
+    def __init__(self, camera=None):
+        self.camera = camera
+        self.lines = []
+        self.points = []
+
+    @property
+    def viewport(self):
+        return self.camera.viewport if self.camera is not None else None
+
+    def draw_line(self, start, end, color=None):
+        self.lines.append(((start.x, start.y), (end.x, end.y)))
+
+    def draw_point(self, position, color=None, radius=3):
+        self.points.append((position.x, position.y))
+
+
+class Untouchable(list):
+    """A list of elements that fails the test when anything iterates over it."""
+
+    def __iter__(self):
+        raise AssertionError("Visited the elements of an offscreen object.")
+
+
+class TestCamera(unittest.TestCase):
+    """
+    Unit tests for the Camera class.
+    """
+
+    def test_viewport_and_transform(self):
+        """
+        Test the visible area and the world-to-screen mapping.
+        """
+        camera = Camera(100, 50, 800, 600, zoom=2.0, margin=0.0)
+        self.assertEqual(camera.viewport, (100, 50, 500, 350))
+        self.assertEqual(camera.to_screen(150, 100), (100, 100))
+        self.assertEqual(camera.to_world(100, 100), (150, 100))
+        camera.center_on(0, 0)
+        self.assertEqual(camera.viewport, (-200, -150, 200, 150))
+        camera.margin = 10.0
+        self.assertEqual(camera.viewport, (-205, -155, 205, 155))
+
+    def test_invalid(self):
+        """
+        Test that empty or unzoomed cameras are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Camera(width=0)
+        with self.assertRaises(ValueError):
+            Camera(zoom=0)
+
+
+class TestObjectCulling(unittest.TestCase):
+    """
+    Tests for objects skipping geometry outside the viewport.
+    """
+
+    def test_offscreen_object_draws_nothing(self):
+        """
+        Test that an object outside the viewport issues no draw calls.
+        """
+        rope = Rope(Vector2D(2000, 100), 10, 5.0)
+        renderer = RecordingRenderer(Camera(margin=0.0))
+        rope.render(renderer)
+        self.assertEqual((renderer.lines, renderer.points), ([], []))
+        self.assertFalse(particles_visible(rope.particles, renderer.viewport))
+
+    def test_offscreen_objects_skip_their_elements(self):
+        """
+        Test that offscreen objects are rejected from their bounds, without visiting
+        any particle or spring.
+        """
+        objects = [
+            Rope(Vector2D(2000, 100), 10, 5.0),
+            Chain(num_links=5, position=Vector2D(2000, 100)),
+            Cloth(width=3, height=3),
+            SoftBody(Vector2D(2000, 100), 50, 50, 3, 3),
+            Ragdoll(Vector2D(2000, 100)),
+        ]
+        renderer = RecordingRenderer(Camera(margin=0.0))
+        for obj in objects:
+            with self.subTest(type(obj).__name__):
+                if isinstance(obj, Cloth):
+                    for particle in obj.particles:
+                        particle.position += Vector2D(2000, 0)
+                        particle.old_position += Vector2D(2000, 0)
+                obj.update(0.016)
+                obj.particles = Untouchable(obj.particles)
+                obj.springs = Untouchable(obj.springs)
+                obj.render(renderer)
+                self.assertEqual((renderer.lines, renderer.points), ([], []))
+
+    def test_bounds_follow_motion(self):
+        """
+        Test that an object moved into view by an update, or by a world, is drawn.
+        """
+        rope = Rope(Vector2D(2000, 100), 2, 5.0)
+        rope.particles[0].is_fixed = False
+        for particle in rope.particles:
+            particle.old_position = particle.position + Vector2D(1500, 0)
+        rope.update(1.0)
+        renderer = RecordingRenderer(Camera(margin=0.0))
+        rope.render(renderer)
+        self.assertEqual(len(renderer.points), 2)
+
+        world = PhysicsWorld()
+        rope = Rope(Vector2D(100, 100), 2, 5.0)
+        world.add(rope)
+        world.system.positions[:, 0] += 2000.0
+        world.sync()
+        renderer = RecordingRenderer(Camera(margin=0.0))
+        rope.render(renderer)
+        self.assertEqual((renderer.lines, renderer.points), ([], []))
+
+    def test_partly_visible_object(self):
+        """
+        Test that only the visible part of an object is drawn.
+        """
+        rope = Rope(Vector2D(780, 100), 10, 5.0)
+        for index, particle in enumerate(rope.particles):
+            particle.position = Vector2D(780 + 5 * index, 100)
+        renderer = RecordingRenderer(Camera(margin=0.0))
+        rope.render(renderer)
+        self.assertEqual(len(renderer.points), 5)
+        self.assertEqual(len(renderer.lines), 5)
+        self.assertEqual(len(list(visible_springs(rope.springs, None))), 9)
+
+    def test_without_camera(self):
+        """
+        Test that renderers without a camera still draw everything.
+        """
+        cloth = Cloth(width=3, height=3)
+        renderer = RecordingRenderer()
+        cloth.render(renderer)
+        self.assertEqual(len(renderer.points), 9)
+        self.assertEqual(len(renderer.lines), len(cloth.springs))
+
+
+class TestParticleSystemCulling(unittest.TestCase):
+    """
+    Tests for viewport culling of array-backed particle systems.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a row of 20 grids, one every 100 units.
+        """
+        self.system = ParticleSystem()
+        self.system.add_instances(
+            grid_topology(4, 4, spacing_x=10.0), [(100.0 * k, 0.0) for k in range(20)]
+        )
+
+    def test_draws_only_visible_content(self):
+        """
+        Test that only the grids inside the viewport are drawn.
+        """
+        renderer = RecordingRenderer(Camera(-5, -5, 340, 100, margin=0.0))
+        self.system.render(renderer)
+        self.assertEqual(len(renderer.points), 4 * 16)
+        everything = RecordingRenderer()
+        self.system.render(everything)
+        per_grid = len(everything.lines) // 20
+        self.assertEqual(len(renderer.lines), 4 * per_grid)
+        self.assertTrue(set(renderer.lines) <= set(everything.lines))
+
+    def test_follows_motion(self):
+        """
+        Test that culling stays exact as the particles move.
+        """
+        renderer = RecordingRenderer(Camera(-5, -5, 340, 100, margin=0.0))
+        self.system.render(renderer)
+        self.system.positions[:, 0] += 100.0
+        renderer = RecordingRenderer(renderer.camera)
+        self.system.render(renderer)
+        self.assertEqual(len(renderer.points), 3 * 16)
+        self.assertGreaterEqual(np.min(np.array(renderer.points)[:, 0]), 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# test_debug_renderer.py
+# Unit tests for the dirty-rectangle mode of the DebugRenderer class.
+
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core.vector2d import Vector2D
+from rendering.debug_renderer import DebugRenderer
+
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+
+class TestDirtyRects(unittest.TestCase):
+    """
+    Unit tests for redrawing only the changed regions.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a dirty-rectangle renderer with the display mocked.
+        """
+        self.renderer = DebugRenderer(200, 100, dirty_rects=True, max_dirty_rects=4)
+        patcher = mock.patch.object(pygame.display, "update")
+        self.update = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(pygame.display, "flip")
+        self.flip = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def frame(self, *points):
+        """Draw a static horizontal line and some points, then present them."""
+        self.renderer.clear()
+        self.renderer.draw_line(Vector2D(10, 50), Vector2D(190, 50), WHITE)
+        for x, y in points:
+            self.renderer.draw_point(Vector2D(x, y), RED, radius=3)
+        self.renderer.render()
+
+    def pixel(self, x, y):
+        """Color of a screen pixel."""
+        return tuple(self.renderer.screen.get_at((x, y)))[:3]
+
+    def test_first_frame_is_full(self):
+        """
+        Test that the first frame is drawn and presented in full.
+        """
+        self.frame((50, 50))
+        self.flip.assert_called_once()
+        self.assertEqual(self.renderer.updated, [pygame.Rect(0, 0, 200, 100)])
+        self.assertEqual(self.pixel(50, 50), RED)
+        self.assertEqual(self.pixel(150, 50), WHITE)
+
+    def test_static_frame_presents_nothing(self):
+        """
+        Test that an unchanged frame neither draws nor updates the display.
+        """
+        self.frame((50, 50))
+        self.frame((50, 50))
+        self.assertEqual(self.renderer.updated, [])
+        self.update.assert_not_called()
+
+    def test_moved_point(self):
+        """
+        Test that a moved point clears its old region and keeps the static line.
+        """
+        self.frame((50, 50))
+        self.frame((120, 50))
+        (rects,) = self.update.call_args.args
+        self.assertEqual(len(rects), 2)
+        self.assertTrue(any(rect.collidepoint(50, 50) for rect in rects))
+        self.assertTrue(any(rect.collidepoint(120, 50) for rect in rects))
+        self.assertTrue(all(rect.width < 20 for rect in rects))
+        self.assertEqual(self.pixel(50, 50), WHITE)
+        self.assertEqual(self.pixel(52, 48), (0, 0, 0))
+        self.assertEqual(self.pixel(120, 50), RED)
+
+    def test_many_regions_are_merged(self):
+        """
+        Test that more regions than the limit are presented as their union.
+        """
+        self.frame((20, 20), (40, 20), (60, 20))
+        self.frame((20, 80), (40, 80), (60, 80))
+        (rect,) = self.renderer.updated
+        self.assertTrue(rect.collidepoint(20, 20) and rect.collidepoint(60, 80))
+
+    def test_invalidate(self):
+        """
+        Test that an invalidated renderer presents the whole window again.
+        """
+        self.frame((50, 50))
+        self.renderer.invalidate()
+        self.frame((50, 50))
+        self.assertEqual(self.flip.call_count, 2)
+
+    def test_immediate_mode(self):
+        """
+        Test that the default mode draws immediately and flips every frame.
+        """
+        renderer = DebugRenderer(200, 100)
+        renderer.clear()
+        renderer.draw_point(Vector2D(50, 50), RED)
+        self.assertEqual(tuple(renderer.screen.get_at((50, 50)))[:3], RED)
+        renderer.render()
+        self.flip.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+# test_diagnostics.py
+# Unit tests for the Diagnostics class.
+
+import unittest
+
+import numpy as np
+
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.diagnostics import FIELDS, Diagnostics
+from integration.world import PhysicsWorld
+from src.objects.cloth import Cloth
+
+
+def moving_pair():
+    """Two particles of mass 1 and 3 joined by a unit-length constraint."""
+    system = ParticleSystem()
+    system.add_particles([(0.0, 0.0), (2.0, 0.0)], masses=[1.0, 3.0])
+    system.add_constraints([(0, 1)], [1.0])
+    system.old_positions[:] = system.positions - (0.1, 0.0)
+    return system
+
+
+class TestMeasurements(unittest.TestCase):
+    """
+    Unit tests for the measured quantities.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a moving pair under gravity.
+        """
+        self.system = moving_pair()
+        self.diagnostics = Diagnostics(self.system, gravity=Vector2D(0, 10))
+
+    def test_energy_and_momentum(self):
+        """
+        Test the kinetic energy, potential energy and momentum of the pair.
+        """
+        self.system.positions[1, 1] = 1.0
+        self.system.old_positions[1, 1] = 1.0
+        sample = self.diagnostics.measure(0.1)
+        self.assertAlmostEqual(sample["kinetic_energy"], 0.5 * 4.0)
+        self.assertAlmostEqual(sample["potential_energy"], -3.0 * 10.0)
+        self.assertAlmostEqual(sample["momentum_x"], 4.0)
+        self.assertAlmostEqual(sample["momentum_y"], 0.0)
+
+    def test_stretch(self):
+        """
+        Test the relative stretch of the constraints.
+        """
+        self.system.add_particles([(0.0, 1.0)])
+        self.system.add_constraints([(0, 2)], [2.0])
+        sample = self.diagnostics.measure(0.1)
+        self.assertAlmostEqual(sample["max_stretch"], 1.0)
+        self.assertAlmostEqual(sample["rms_stretch"], np.sqrt((1.0 + 0.25) / 2))
+
+    def test_fixed_and_removed_are_ignored(self):
+        """
+        Test that fixed particles and removed constraints do not contribute.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0.0, 0.0)], fixed=True)
+        body = system.spawn(grid_topology(2, 2))
+        system.old_positions[:] = system.positions - 1.0
+        system.despawn(body)
+        sample = Diagnostics(system, gravity=Vector2D(0, 10)).measure(1.0)
+        for name in FIELDS[2:]:
+            self.assertEqual(sample[name], 0.0)
+
+    def test_float32_buffers(self):
+        """
+        Test that float32 buffers are measured in float64.
+        """
+        system = ParticleSystem(dtype=np.float32)
+        system.add_particles([(1000.0, 0.0)])
+        system.old_positions[0, 0] = 999.9
+        sample = Diagnostics(system).measure(0.1)
+        self.assertAlmostEqual(sample["momentum_x"], 1.0, places=3)
+
+
+class TestHistory(unittest.TestCase):
+    """
+    Unit tests for sampling and querying the history.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: diagnostics sampling every third step.
+        """
+        self.diagnostics = Diagnostics(moving_pair(), interval=3, capacity=4)
+
+    def test_interval(self):
+        """
+        Test that only every interval-th step is sampled.
+        """
+        samples = [self.diagnostics.update(0.1) for _ in range(9)]
+        self.assertEqual([s is not None for s in samples], [False, False, True] * 3)
+        self.assertEqual(self.diagnostics.history("step").tolist(), [3, 6, 9])
+        np.testing.assert_allclose(self.diagnostics.history("time"), [0.3, 0.6, 0.9])
+        self.assertEqual(self.diagnostics.latest()["step"], 9)
+
+    def test_capacity_and_ranges(self):
+        """
+        Test that the oldest samples are dropped and ranges select by step.
+        """
+        for _ in range(18):
+            self.diagnostics.update(0.1)
+        self.assertEqual(len(self.diagnostics), 4)
+        self.assertEqual(self.diagnostics.history("step").tolist(), [9, 12, 15, 18])
+        self.assertEqual(
+            self.diagnostics.history("step", start=12, stop=18).tolist(), [12, 15]
+        )
+        history = self.diagnostics.history(stop=12)
+        self.assertEqual(history.dtype.names, FIELDS)
+        self.assertEqual(len(history), 1)
+
+    def test_empty_and_clear(self):
+        """
+        Test the queries without samples.
+        """
+        self.assertIsNone(self.diagnostics.latest())
+        self.assertEqual(len(self.diagnostics.history()), 0)
+        for _ in range(3):
+            self.diagnostics.update(0.1)
+        self.diagnostics.clear()
+        self.assertEqual(len(self.diagnostics), 0)
+        with self.assertRaises(ValueError):
+            self.diagnostics.history("speed")
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Diagnostics(moving_pair(), interval=0)
+        with self.assertRaises(ValueError):
+            Diagnostics(moving_pair(), capacity=0)
+        with self.assertRaises(ValueError):
+            Diagnostics(moving_pair(), energy_growth=1.0)
+
+
+class TestBlowUpCallbacks(unittest.TestCase):
+    """
+    Unit tests for the blow-up callbacks.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: diagnostics that record every callback.
+        """
+        self.system = moving_pair()
+        self.diagnostics = Diagnostics(self.system, max_stretch=2.0)
+        self.calls = []
+        self.diagnostics.add_callback(
+            lambda diagnostics, sample, reasons: self.calls.append(reasons)
+        )
+
+    def test_stable_motion(self):
+        """
+        Test that a stable system triggers no callback.
+        """
+        for _ in range(5):
+            self.diagnostics.update(0.1)
+        self.assertEqual(self.calls, [])
+
+    def test_reasons(self):
+        """
+        Test the non-finite, stretch and energy checks.
+        """
+        self.diagnostics.update(0.1)
+        self.system.positions[1, 0] = 5.0
+        self.diagnostics.update(0.1)
+        self.assertEqual(self.calls, [["stretch", "energy"]])
+        self.system.positions[0, 0] = np.nan
+        self.diagnostics.update(0.1)
+        self.assertIn("non-finite", self.calls[-1])
+
+    def test_remove_callback(self):
+        """
+        Test that removed callbacks are no longer called.
+        """
+        callback = self.diagnostics._callbacks[0]
+        self.diagnostics.remove_callback(callback)
+        self.system.positions[1, 0] = 10.0
+        self.diagnostics.update(0.1)
+        self.assertEqual(self.calls, [])
+
+
+class TestWorldDiagnostics(unittest.TestCase):
+    """
+    Tests for diagnostics sampled by a PhysicsWorld.
+    """
+
+    def test_free_fall(self):
+        """
+        Test that a falling cloth gains kinetic energy while keeping its shape.
+        """
+        world = PhysicsWorld(damping=1.0, substeps=2)
+        world.add(Cloth(width=4, height=4))
+        diagnostics = world.enable_diagnostics(interval=2)
+        for _ in range(10):
+            world.step(0.016)
+        kinetic = diagnostics.history("kinetic_energy")
+        self.assertEqual(len(kinetic), 5)
+        self.assertTrue(np.all(np.diff(kinetic) > 0))
+        self.assertTrue(np.all(np.diff(diagnostics.history("potential_energy")) < 0))
+        self.assertLess(diagnostics.history("max_stretch").max(), 1e-6)
+        self.assertAlmostEqual(diagnostics.latest()["time"], 0.16)
+
+    def test_gravity_follows_world(self):
+        """
+        Test that changing the world's gravity updates the diagnostics.
+        """
+        world = PhysicsWorld()
+        diagnostics = world.enable_diagnostics()
+        world.gravity = Vector2D(0, -1)
+        self.assertIs(diagnostics.gravity, world.gravity)
+        world.disable_diagnostics()
+        self.assertIsNone(world.diagnostics)
+
+
+if __name__ == "__main__":
+    unittest.main()
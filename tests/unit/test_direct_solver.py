@@ -0,0 +1,176 @@
+# test_direct_solver.py
+# Unit tests for the DirectDistanceSolver class and the direct solver mode.
+
+import unittest
+
+import numpy as np
+
+from core.vector2d import Vector2D
+from src.core.particle_system import ParticleSystem
+from src.core.topology import Topology
+from src.integration.direct_solver import DirectDistanceSolver
+from src.integration.verlet import VerletIntegrator
+from src.integration.world import PhysicsWorld
+from src.objects.ragdoll import Ragdoll
+from src.objects.rope import Rope
+
+
+def rope_topology(count, segment_length=5.0):
+    """A vertical rope pinned at its first particle."""
+    positions = np.column_stack((np.zeros(count), np.arange(count) * segment_length))
+    edges = np.column_stack((np.arange(count - 1), np.arange(1, count)))
+    fixed = np.zeros(count, dtype=bool)
+    fixed[0] = True
+    return Topology(positions, edges, np.full(count - 1, segment_length), fixed=fixed)
+
+
+class TestDirectDistanceSolver(unittest.TestCase):
+    """
+    Unit tests for the DirectDistanceSolver class.
+    """
+
+    def test_matches_dense_solve(self):
+        """
+        Test that a tree solve equals the dense linearized solution.
+        """
+        rng = np.random.default_rng(0)
+        edges = np.array([(0, 1), (1, 2), (1, 3), (1, 4), (4, 5), (4, 6), (0, 7)])
+        positions = rng.normal(size=(8, 2))
+        inv_masses = rng.uniform(0.5, 2.0, 8)
+        inv_masses[7] = 0.0
+        rest_lengths = np.ones(len(edges))
+
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        length = np.linalg.norm(delta, axis=1)
+        normal = delta / length[:, None]
+        jacobian = np.zeros((len(edges), 16))
+        for e, (i, j) in enumerate(edges):
+            jacobian[e, 2 * i : 2 * i + 2] = normal[e]
+            jacobian[e, 2 * j : 2 * j + 2] = -normal[e]
+        weights = np.diag(np.repeat(inv_masses, 2))
+        multipliers = np.linalg.solve(
+            jacobian @ weights @ jacobian.T, rest_lengths - length
+        )
+        expected = positions + (weights @ jacobian.T @ multipliers).reshape(-1, 2)
+
+        DirectDistanceSolver(edges).solve(positions, inv_masses, rest_lengths)
+        np.testing.assert_allclose(positions, expected, atol=1e-12)
+
+    def test_converges_in_few_solves(self):
+        """
+        Test that repeated solves remove a small stretch of a bent rope (each solve is
+        a Newton step, so the error shrinks quadratically).
+        """
+        rng = np.random.default_rng(1)
+        angles = np.cumsum(rng.normal(0.0, 0.3, 49))
+        segments = np.column_stack((np.cos(angles), np.sin(angles))) * 1.005
+        positions = np.vstack(([0.0, 0.0], np.cumsum(segments, axis=0)))
+        edges = np.column_stack((np.arange(49), np.arange(1, 50)))
+        inv_masses = np.ones(50)
+        inv_masses[0] = 0.0
+        solver = DirectDistanceSolver(edges)
+        for _ in range(4):
+            solver.solve(positions, inv_masses, np.ones(49))
+        lengths = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+        np.testing.assert_allclose(lengths, 1.0, atol=1e-9)
+        self.assertTrue(np.array_equal(positions[0], [0.0, 0.0]))
+
+    def test_fixed_constraint_is_ignored(self):
+        """
+        Test that a constraint between two fixed particles does not break the solve.
+        """
+        positions = np.array([(0.0, 0.0), (3.0, 0.0), (5.0, 0.0)])
+        inv_masses = np.array([0.0, 0.0, 1.0])
+        DirectDistanceSolver([(0, 1), (1, 2)]).solve(
+            positions, inv_masses, np.array([1.0, 1.0])
+        )
+        np.testing.assert_allclose(positions, [(0.0, 0.0), (3.0, 0.0), (4.0, 0.0)])
+
+    def test_rejects_cycles(self):
+        """
+        Test that cyclic or repeated constraints are rejected.
+        """
+        with self.assertRaises(ValueError):
+            DirectDistanceSolver([(0, 1), (1, 2), (2, 0)])
+        with self.assertRaises(ValueError):
+            DirectDistanceSolver([(0, 1), (1, 0)])
+
+
+class TestDirectSolverMode(unittest.TestCase):
+    """
+    Tests for the direct solver mode of the Verlet integrator.
+    """
+
+    def rope_length(self, solver, iterations):
+        system = ParticleSystem()
+        system.add_topology(rope_topology(201))
+        system.old_positions[1:, 0] -= 2.0  # start swinging sideways
+        integrator = VerletIntegrator(
+            system,
+            constraint_iterations=iterations,
+            gravity=Vector2D(0, 9.81),
+            solver=solver,
+        )
+        for _ in range(60):
+            integrator.integrate(1 / 60)
+        return np.linalg.norm(np.diff(system.positions, axis=0), axis=1).sum()
+
+    def test_long_rope_is_inextensible(self):
+        """
+        Test that a 200-link rope keeps its length with two direct iterations, while
+        ten iterative passes let it stretch.
+        """
+        rest_length = 200 * 5.0
+        self.assertGreater(self.rope_length("iterative", 10), rest_length * 1.01)
+        self.assertAlmostEqual(self.rope_length("direct", 2), rest_length, places=3)
+
+    def test_object_based_rope(self):
+        """
+        Test the direct mode on Particle and Spring objects.
+        Damping is disabled because it runs after the constraint solve.
+        """
+        rope = Rope(Vector2D(0, 0), 30, 5.0)
+        rope.particles[-1].old_position -= Vector2D(3.0, 0.0)
+        integrator = VerletIntegrator(
+            rope.particles,
+            rope.springs,
+            constraint_iterations=2,
+            damping=1.0,
+            gravity=Vector2D(0, 9.81),
+            solver="direct",
+        )
+        for _ in range(30):
+            integrator.integrate(1 / 60)
+        for spring in rope.springs:
+            length = spring.particle1.position.distance_to(spring.particle2.position)
+            self.assertAlmostEqual(length, 5.0, places=6)
+        anchor = rope.particles[0].position
+        self.assertEqual((anchor.x, anchor.y), (0, 0))
+
+    def test_world_with_ragdoll(self):
+        """
+        Test a direct-mode world containing a (tree-shaped) ragdoll.
+        Damping is disabled because it runs after the constraint solve.
+        """
+        world = PhysicsWorld(damping=1.0, constraint_iterations=3, solver="direct")
+        ragdoll = Ragdoll(Vector2D(0, 0), limb_length=20.0, stiffness=1.0)
+        world.add(ragdoll)
+        for _ in range(20):
+            world.step(1 / 60)
+        system = world.system
+        lengths = np.linalg.norm(
+            system.positions[system.edges[:, 0]] - system.positions[system.edges[:, 1]],
+            axis=1,
+        )
+        np.testing.assert_allclose(lengths, system.rest_lengths, atol=1e-6)
+
+    def test_unknown_solver(self):
+        """
+        Test that an unknown solver name is rejected.
+        """
+        with self.assertRaises(ValueError):
+            VerletIntegrator([], solver="multigrid")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+# test_force_field.py
+# Unit tests for the vectorized force fields.
+
+import unittest
+
+import numpy as np
+
+from core.force_field import (
+    DragField,
+    RadialField,
+    TurbulentWind,
+    UniformField,
+    VortexField,
+    box_region,
+    circle_region,
+    value_noise,
+)
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.world import PhysicsWorld
+
+
+def make_system(positions, masses=1.0, fixed=False):
+    """A particle system with the given particles."""
+    system = ParticleSystem()
+    system.add_particles(positions, masses=masses, fixed=fixed)
+    return system
+
+
+class TestUniformField(unittest.TestCase):
+    """
+    Unit tests for the UniformField class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a light, a heavy and a fixed particle.
+        """
+        self.system = make_system([(0, 0), (1, 0), (2, 0)], masses=[1.0, 4.0, 1.0])
+        self.system.set_fixed([2])
+
+    def test_force_and_acceleration(self):
+        """
+        Test that forces scale with the inverse mass and accelerations do not.
+        """
+        UniformField(Vector2D(2.0, 0.0)).apply(self.system)
+        np.testing.assert_allclose(
+            self.system.accelerations, [[2, 0], [0.5, 0], [0, 0]]
+        )
+        UniformField((0.0, 1.0), acceleration=True).apply(self.system)
+        np.testing.assert_allclose(self.system.accelerations[:, 1], [1, 1, 0])
+
+    def test_time_varying(self):
+        """
+        Test that callable parameters are evaluated at the given time.
+        """
+        field = UniformField(lambda t: (t, 0.0))
+        field.apply(self.system, time=3.0)
+        self.assertEqual(self.system.accelerations[0, 0], 3.0)
+
+    def test_indices_and_regions(self):
+        """
+        Test that indices and regions limit the affected particles.
+        """
+        system = make_system([(x, 0.0) for x in range(10)])
+        UniformField((1.0, 0.0), indices=slice(2, 6)).apply(system)
+        UniformField((0.0, 1.0), region=box_region(4, -1, 7.5, 1)).apply(system)
+        UniformField(
+            (0.0, 10.0), indices=[0, 1, 8, 9], region=circle_region((9, 0), 1.0)
+        ).apply(system)
+        np.testing.assert_array_equal(
+            system.accelerations[:, 0], [0, 0, 1, 1, 1, 1, 0, 0, 0, 0]
+        )
+        np.testing.assert_array_equal(
+            system.accelerations[:, 1], [0, 0, 0, 0, 1, 1, 1, 1, 10, 10]
+        )
+        field = UniformField(
+            (1.0, 0.0), indices=slice(0, 5), region=box_region(3, -1, 9, 1)
+        )
+        field.apply(system)
+        self.assertEqual(system.accelerations[3, 0], 2.0)
+        self.assertEqual(system.accelerations[5, 0], 1.0)
+        field.enabled = False
+        field.apply(system)
+        self.assertEqual(system.accelerations[3, 0], 2.0)
+
+
+class TestRadialFields(unittest.TestCase):
+    """
+    Unit tests for the RadialField and VortexField classes.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: particles at distances 1, 2 and 10 from the origin.
+        """
+        self.system = make_system([(1, 0), (0, 2), (-10, 0)])
+
+    def test_attractor(self):
+        """
+        Test an inverse-square attractor with a limited range.
+        """
+        RadialField((0, 0), 4.0, radius=5.0, falloff=2.0).apply(self.system)
+        np.testing.assert_allclose(
+            self.system.accelerations, [[-4, 0], [0, -1], [0, 0]]
+        )
+
+    def test_repulsor_and_softening(self):
+        """
+        Test that negative strengths push away and softening bounds the force.
+        """
+        RadialField(Vector2D(0, 0), -1.0, falloff=1.0, softening=2.0).apply(self.system)
+        np.testing.assert_allclose(
+            self.system.accelerations, [[0.5, 0], [0, 0.5], [-0.1, 0]]
+        )
+        with self.assertRaises(ValueError):
+            RadialField((0, 0), 1.0, softening=0.0)
+
+    def test_vortex(self):
+        """
+        Test that a vortex pushes perpendicular to the direction of its center.
+        """
+        VortexField(lambda t: (t, 0.0), 1.0).apply(self.system, time=0.0)
+        np.testing.assert_allclose(
+            self.system.accelerations, [[0, 1], [-1, 0], [0, -1]]
+        )
+
+
+class TestTurbulentWind(unittest.TestCase):
+    """
+    Unit tests for the TurbulentWind class and value noise.
+    """
+
+    def test_noise(self):
+        """
+        Test that value noise is bounded, smooth and seeded.
+        """
+        x = np.linspace(-50, 50, 20001)
+        noise = value_noise(x, 0.3 * x)
+        self.assertLessEqual(np.abs(noise).max(), 1.0)
+        self.assertGreater(noise.std(), 0.2)
+        self.assertLess(np.abs(np.diff(noise)).max(), 0.02)
+        self.assertFalse(np.allclose(noise, value_noise(x, 0.3 * x, seed=1)))
+
+    def test_wind(self):
+        """
+        Test that the turbulence varies around the mean wind and drifts over time.
+        """
+        system = make_system(np.random.default_rng(0).uniform(0, 500, (2000, 2)))
+        wind = TurbulentWind((10.0, 0.0), turbulence=2.0, scale=20.0)
+        first = np.column_stack(wind.forces(system.positions, None, 0.0))
+        self.assertLessEqual(np.abs(first - (10.0, 0.0)).max(), 2.0)
+        np.testing.assert_allclose(first.mean(axis=0), (10.0, 0.0), atol=0.2)
+        later = np.column_stack(wind.forces(system.positions, None, 1.0))
+        self.assertGreater(np.abs(later - first).max(), 0.5)
+        np.testing.assert_array_equal(
+            TurbulentWind((10.0, 0.0)).forces(system.positions, None, 0.0), (10.0, 0.0)
+        )
+        with self.assertRaises(ValueError):
+            TurbulentWind((1.0, 0.0), scale=0.0)
+
+
+class TestDragField(unittest.TestCase):
+    """
+    Unit tests for the DragField class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: particles moving right at 10 and 20 units per second.
+        """
+        self.system = make_system([(0, 0), (0, 5)])
+        self.system.old_positions[:] -= [(0.1, 0.0), (0.2, 0.0)]
+
+    def test_linear_and_quadratic(self):
+        """
+        Test the drag force against the velocity.
+        """
+        DragField(linear=0.5, quadratic=0.1).apply(self.system, delta_time=0.01)
+        np.testing.assert_allclose(self.system.accelerations, [[-15, 0], [-50, 0]])
+        with self.assertRaises(ValueError):
+            DragField(linear=1.0).apply(self.system)
+
+    def test_strong_drag_stops_at_most(self):
+        """
+        Test that very strong drag stops particles instead of reversing them.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 0), damping=1.0)
+        world.system.add_particles([(0, 0)])
+        world.system.old_positions[:] -= (0.1, 0.0)
+        world.add_field(DragField(linear=1e6))
+        world.step(0.01)
+        np.testing.assert_allclose(
+            world.system.positions - world.system.old_positions, [[0, 0]], atol=1e-12
+        )
+
+    def test_flow(self):
+        """
+        Test that drag in a moving medium pulls particles to the flow velocity.
+        """
+        DragField(linear=1.0, flow=(10.0, 0.0)).apply(self.system, delta_time=0.01)
+        np.testing.assert_allclose(self.system.accelerations, [[0, 0], [-10, 0]])
+
+
+class TestWorldFields(unittest.TestCase):
+    """
+    Unit tests for force fields in a PhysicsWorld.
+    """
+
+    def test_fields_apply_every_substep(self):
+        """
+        Test that fields act on every substep with the current time.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 0), damping=1.0, substeps=4)
+        (body,) = world.spawn(grid_topology(2, 2), [(0.0, 0.0)])
+        times = []
+        field = world.add_field(
+            UniformField(
+                lambda t: times.append(t) or (1.0, 0.0), indices=body.particles
+            )
+        )
+        world.step(0.04)
+        np.testing.assert_allclose(times, [0.0, 0.01, 0.02, 0.03])
+        self.assertAlmostEqual(world.time, 0.04)
+        # Constant acceleration 1 over 0.04 s, starting at rest
+        np.testing.assert_allclose(world.system.positions[:, 0] - [0, 1, 0, 1], 0.001)
+        world.remove_field(field)
+        self.assertEqual(world.fields, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# test_governor.py
+# Unit tests for the FrameBudgetGovernor class.
+
+import unittest
+
+from integration.governor import FrameBudgetGovernor
+from integration.verlet import VerletIntegrator
+from integration.world import PhysicsWorld
+
+
+def simulated_cost(world, per_iteration=0.001):
+    """Step time of a world whose cost grows with substeps and iterations."""
+    return world.substeps * world.constraint_iterations * per_iteration
+
+
+class TestFrameBudgetGovernor(unittest.TestCase):
+    """
+    Unit tests for the FrameBudgetGovernor class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a world with 2 substeps of 10 iterations.
+        """
+        self.world = PhysicsWorld(constraint_iterations=10, substeps=2)
+        self.governor = FrameBudgetGovernor(
+            self.world, budget=0.010, min_iterations=2, cooldown=5, settle=2
+        )
+
+    def run_steps(self, count, per_iteration):
+        """Record count steps of the simulated cost."""
+        for _ in range(count):
+            self.governor.record(simulated_cost(self.world, per_iteration))
+
+    def test_bounds_default_to_target(self):
+        """
+        Test that the target's settings are the maximums.
+        """
+        self.assertEqual(self.governor.max_iterations, 10)
+        self.assertEqual(self.governor.max_substeps, 2)
+
+    def test_holds_budget_under_load(self):
+        """
+        Test that iterations drop before substeps until the budget holds.
+        """
+        self.run_steps(100, 0.001)
+        self.assertLessEqual(simulated_cost(self.world), 0.010)
+        self.assertEqual(self.world.substeps, 2)
+        self.assertEqual(self.world.constraint_iterations, 5)
+        self.assertTrue(all(d.reason == "over budget" for d in self.governor.decisions))
+
+    def test_bounds_are_respected(self):
+        """
+        Test that quality never drops below the minimums, even over budget.
+        """
+        self.run_steps(200, 0.1)
+        self.assertEqual(self.world.constraint_iterations, 2)
+        self.assertEqual(self.world.substeps, 1)
+        settings = [d.setting for d in self.governor.decisions]
+        self.assertEqual(settings[-1], "substeps")
+        self.assertNotIn("substeps", settings[: settings.index("substeps")])
+
+    def test_restores_with_headroom(self):
+        """
+        Test that quality returns to the maximums once the load is gone.
+        """
+        self.run_steps(200, 0.1)
+        self.run_steps(500, 0.0001)
+        self.assertEqual(self.world.constraint_iterations, 10)
+        self.assertEqual(self.world.substeps, 2)
+        restored = [d for d in self.governor.decisions if d.reason == "headroom"]
+        self.assertEqual(restored[0].setting, "substeps")
+        self.assertTrue(all(d.new == d.old + 1 for d in restored))
+
+    def test_no_change_within_budget(self):
+        """
+        Test that steps between the headroom and the budget change nothing.
+        """
+        self.run_steps(100, 0.0004)
+        self.assertEqual(list(self.governor.decisions), [])
+
+    def test_decisions_are_logged(self):
+        """
+        Test that every decision is logged.
+        """
+        with self.assertLogs("integration.governor", level="INFO") as logs:
+            self.run_steps(20, 0.001)
+        self.assertEqual(len(logs.records), len(self.governor.decisions))
+        self.assertIn("constraint_iterations 10 -> 5", logs.output[0])
+
+    def test_integrator_target(self):
+        """
+        Test that an integrator without substeps only has its iterations adjusted.
+        """
+        integrator = VerletIntegrator([], constraint_iterations=8)
+        governor = FrameBudgetGovernor(integrator, budget=0.01, cooldown=1)
+        self.assertIsNone(governor.max_substeps)
+        for _ in range(50):
+            governor.record(1.0)
+        self.assertEqual(integrator.constraint_iterations, 1)
+
+    def test_history_is_bounded(self):
+        """
+        Test that only the most recent decisions are kept.
+        """
+        governor = FrameBudgetGovernor(
+            self.world, budget=0.010, min_iterations=2, cooldown=5, settle=2, history=3
+        )
+        with self.assertLogs("integration.governor", level="INFO") as logs:
+            for per_iteration in (0.001, 0.0001, 0.001, 0.0001):
+                for _ in range(60):
+                    governor.record(simulated_cost(self.world, per_iteration))
+        self.assertGreater(len(logs.records), 3)
+        self.assertEqual(len(governor.decisions), 3)
+        self.assertIn(
+            f"{governor.decisions[-1].old} -> {governor.decisions[-1].new}",
+            logs.output[-1],
+        )
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            FrameBudgetGovernor(self.world, budget=0)
+        with self.assertRaises(ValueError):
+            FrameBudgetGovernor(self.world, min_iterations=20)
+        with self.assertRaises(ValueError):
+            FrameBudgetGovernor(self.world, min_substeps=3)
+        with self.assertRaises(ValueError):
+            FrameBudgetGovernor(self.world, headroom=1.5)
+        with self.assertRaises(ValueError):
+            FrameBudgetGovernor(self.world, history=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+# test_lod.py
+# Unit tests for the LevelOfDetail and LodTier classes.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core.force_field import DragField, UniformField
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.lod import DEFAULT_TIERS, LevelOfDetail, LodTier
+from integration.verlet import VerletIntegrator
+from integration.world import PhysicsWorld
+from src.objects.rope import Rope
+
+VIEWPORT = (0, 0, 800, 600)
+
+
+def falling_grid(lod, damping=1.0, offset=(2000.0, 0.0)):
+    """A world with one drifting 3x3 grid, optionally under level of detail."""
+    world = PhysicsWorld(damping=damping, gravity=Vector2D(0, 100))
+    (body,) = world.spawn(grid_topology(3, 3), [offset])
+    world.system.old_positions[body.particles] -= (1.0, 0.0)
+    if lod:
+        world.enable_lod(VIEWPORT, hold=0)
+        world.lod.track(body)
+    return world, body
+
+
+def velocity(world, body):
+    """Implicit Verlet velocity of a body's first particle."""
+    index = body.particle_start
+    return world.system.positions[index] - world.system.old_positions[index]
+
+
+class TestTiers(unittest.TestCase):
+    """
+    Unit tests for the tier assignment.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a large, a small and an offscreen rope.
+        """
+        self.world = PhysicsWorld()
+        self.bodies = [
+            self.world.add(Rope(Vector2D(100, 100), 20, 10.0)),
+            self.world.add(Rope(Vector2D(300, 100), 3, 2.0)),
+            self.world.add(Rope(Vector2D(2000, 100), 20, 10.0)),
+        ]
+        self.lod = self.world.enable_lod(VIEWPORT, hold=5)
+
+    def names(self):
+        """Current tier names of the ropes."""
+        return [self.lod.tier_of(body).name for body in self.bodies]
+
+    def test_classification(self):
+        """
+        Test that tiers follow visibility and screen size.
+        """
+        for _ in range(6):
+            self.world.step(0.016)
+        self.assertEqual(self.names(), ["full", "distant", "offscreen"])
+        self.assertEqual(
+            self.lod.counts(), {"full": 1, "reduced": 0, "distant": 1, "offscreen": 1}
+        )
+
+    def test_hold_delays_downgrades(self):
+        """
+        Test that downgrades wait for hold steps and upgrades do not.
+        """
+        for _ in range(4):
+            self.world.step(0.016)
+        self.assertEqual(self.names(), ["full", "full", "full"])
+        self.world.step(0.016)
+        self.assertEqual(self.names()[2], "offscreen")
+        self.lod.viewport = (0, 0, 3000, 600)
+        self.world.step(0.016)
+        self.assertEqual(self.names()[2], "full")
+
+    def test_scale_and_margin(self):
+        """
+        Test that zooming in and a margin raise the tiers.
+        """
+        self.lod.scale = 10.0
+        self.lod.margin = 2000.0
+        self.lod.hold = 0
+        self.world.step(0.016)
+        self.assertEqual(self.names(), ["full", "reduced", "full"])
+
+    def test_removed_bodies_are_dropped(self):
+        """
+        Test that removed objects are no longer managed.
+        """
+        self.world.remove(self.world.objects[0])
+        self.world.step(0.016)
+        self.assertEqual(len(self.lod.bodies()), 2)
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid tiers and viewports are rejected.
+        """
+        with self.assertRaises(ValueError):
+            LodTier("broken", interval=0)
+        with self.assertRaises(ValueError):
+            LevelOfDetail(self.world, VIEWPORT, tiers=[DEFAULT_TIERS[-1]])
+        with self.assertRaises(ValueError):
+            LevelOfDetail(self.world, (0, 0, 0, 600))
+
+
+class TestMultiRate(unittest.TestCase):
+    """
+    Unit tests for bodies updated at a lower rate.
+    """
+
+    def test_long_steps(self):
+        """
+        Test that an offscreen body moves every fourth step with a 4x longer step.
+        """
+        world, body = falling_grid(lod=True)
+        start = world.system.positions[body.particle_start].copy()
+        world.step(0.016)
+        moved = (4.0, 100 * 0.064**2)
+        np.testing.assert_allclose(velocity(world, body), moved)
+        for _ in range(3):
+            world.step(0.016)
+        np.testing.assert_allclose(
+            world.system.positions[body.particle_start], start + moved
+        )
+
+    def test_follows_full_rate(self):
+        """
+        Test that a multi-rate body stays close to the full-rate trajectory.
+        """
+        full, body = falling_grid(lod=False, damping=0.99)
+        reduced, _ = falling_grid(lod=True, damping=0.99)
+        start = full.system.positions[body.particles].copy()
+        for _ in range(40):
+            full.step(0.016)
+            reduced.step(0.016)
+        positions = full.system.positions[body.particles]
+        travelled = np.abs(positions - start).max()
+        error = np.abs(positions - reduced.system.positions[body.particles]).max()
+        self.assertLess(error, 0.1 * travelled)
+
+    def test_transitions_keep_velocity(self):
+        """
+        Test that entering and leaving a slower tier preserves the velocity.
+        """
+        world, body = falling_grid(lod=True, offset=(400.0, 300.0))
+        world.lod.scale = 1000.0
+        world.step(0.016)
+        np.testing.assert_allclose(velocity(world, body), (1.0, 100 * 0.016**2))
+        current = velocity(world, body)
+        world.lod.viewport = (0, 0, 10, 10)
+        world.step(0.016)
+        # Rescaled to the 4x longer step; the body is frozen during this step
+        np.testing.assert_allclose(velocity(world, body), current * 4)
+        world.lod.viewport = VIEWPORT
+        world.step(0.016)
+        np.testing.assert_allclose(velocity(world, body), current + (0, 100 * 0.016**2))
+
+    def test_forces_accumulate_while_frozen(self):
+        """
+        Test that forces applied during skipped steps act on the next update.
+        """
+        world, body = falling_grid(lod=True)
+        world.gravity = Vector2D(0, 0)
+        for step in range(5):
+            world.apply_force(Vector2D(1.0, 0.0), np.arange(9))
+            world.step(0.016)
+        # Step 0 applies one force, step 4 the four forces of steps 1 to 4; each
+        # acts N = 4 times longer.
+        expected = 4.0 + 4 * (1 + 4) * 0.016**2
+        self.assertAlmostEqual(velocity(world, body)[0], expected)
+        np.testing.assert_array_equal(world.system.inv_masses[:9], 1.0)
+
+    def test_fields_follow_full_rate(self):
+        """
+        Test that force fields move a multi-rate body like a full-rate one, with one
+        or more substeps.
+        """
+        for substeps in (1, 2):
+            with self.subTest(substeps=substeps):
+                worlds = []
+                for lod in (False, True):
+                    world, body = falling_grid(lod=lod, damping=0.99)
+                    world.gravity = Vector2D(0, 0)
+                    world.substeps = substeps
+                    world.add_field(UniformField((0.0, 100.0), acceleration=True))
+                    world.add_field(DragField(linear=0.5))
+                    worlds.append(world)
+                start = worlds[0].system.positions[body.particles].copy()
+                for _ in range(40):
+                    for world in worlds:
+                        world.step(0.016)
+                full, reduced = (
+                    world.system.positions[body.particles] for world in worlds
+                )
+                fallen = full[:, 1] - start[:, 1]
+                self.assertGreater(fallen.min(), 10.0)
+                error = np.abs(full - reduced).max()
+                self.assertLess(error, 0.1 * np.abs(full - start).max())
+
+    def test_attachments_keep_their_pins(self):
+        """
+        Test that freezing a rope with long-range attachments does not recompute its
+        attachments.
+        """
+        world = PhysicsWorld()
+        rope = Rope(Vector2D(2000, 100), 20, 10.0, long_range_attachments=True)
+        body = world.add(rope)
+        world.enable_lod(VIEWPORT, hold=0)
+        (attachments,) = world.system.constraint_sets
+        world.step(0.016)
+        pairs = attachments.indices.copy()
+        with mock.patch.object(
+            type(attachments), "update", side_effect=AssertionError("recomputed")
+        ):
+            for _ in range(8):
+                world.step(0.016)
+        np.testing.assert_array_equal(attachments.indices, pairs)
+        self.assertEqual(len(pairs), 19)
+
+
+class TestIterationLimits(unittest.TestCase):
+    """
+    Unit tests for per-constraint iteration limits of the integrator.
+    """
+
+    def test_limits(self):
+        """
+        Test that constraints only take part in iterations below their limit.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0, 0), (2, 0), (10, 0), (12, 0)])
+        system.add_constraints([(0, 1), (2, 3)], [1.0, 1.0])
+        integrator = VerletIntegrator(system, constraint_iterations=4, damping=1.0)
+        integrator.iteration_limits = np.array([0, 4])
+        integrator.integrate(0.016)
+        self.assertAlmostEqual(system.positions[1, 0] - system.positions[0, 0], 2.0)
+        self.assertAlmostEqual(system.positions[3, 0] - system.positions[2, 0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+# test_metrics.py
+# Unit tests for the MetricsExporter class.
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from unittest import mock
+
+from core.vector2d import Vector2D
+from integration import metrics
+from integration.metrics import METRIC_PHASES, MetricsExporter
+from integration.verlet import PHASES
+from integration.world import PhysicsWorld
+from src.objects.rope import Rope
+
+
+def phase_times(value):
+    """Equal wall times for every integrator phase."""
+    return dict.fromkeys(PHASES, value)
+
+
+class TestAggregation(unittest.TestCase):
+    """
+    Unit tests for recording and aggregating steps.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: an exporter that is flushed by hand.
+        """
+        self.world = PhysicsWorld()
+        self.world.add(Rope(Vector2D(0, 0), 10, 5.0))
+        self.exporter = MetricsExporter(
+            self.world, jsonl_path=os.devnull, buckets=(0.001, 0.01)
+        )
+
+    def test_histograms(self):
+        """
+        Test that step times are counted into their buckets.
+        """
+        self.exporter.record(0.0005, phase_times(0.0001), 8)
+        self.exporter.record(0.005, phase_times(0.002), 8)
+        self.exporter.record(0.5, phase_times(0.02), 16)
+        snapshot = self.exporter.flush()
+        self.assertEqual(snapshot["steps"], 3)
+        self.assertEqual(snapshot["constraint_iterations"], 32)
+        self.assertEqual(snapshot["phases"]["step"]["counts"], [1, 1, 1])
+        self.assertEqual(snapshot["phases"]["damping"]["counts"], [1, 1, 1])
+        self.assertAlmostEqual(snapshot["phases"]["step"]["sum"], 0.5055)
+        self.assertEqual(set(snapshot["phases"]), set(METRIC_PHASES))
+
+    def test_gauges(self):
+        """
+        Test the particle, constraint and memory gauges.
+        """
+        snapshot = self.exporter.flush()
+        self.assertEqual(snapshot["particles"], 10)
+        self.assertEqual(snapshot["constraints"], 9)
+        self.assertGreater(snapshot["buffer_bytes"], 0)
+        self.assertGreater(snapshot["resident_bytes"], 0)
+
+    def test_peak_memory_fallback(self):
+        """
+        Test that the peak memory fallback is read in bytes on macOS and in
+        kilobytes elsewhere.
+        """
+        usage = mock.Mock(return_value=SimpleNamespace(ru_maxrss=1000))
+        resource = SimpleNamespace(getrusage=usage, RUSAGE_SELF=0)
+        for platform, expected in (("darwin", 1000), ("linux", 1024000)):
+            with self.subTest(platform=platform), mock.patch.object(
+                metrics, "resource", resource
+            ), mock.patch.object(metrics.sys, "platform", platform), mock.patch(
+                "builtins.open", side_effect=OSError
+            ):
+                self.assertEqual(metrics._resident_memory(), expected)
+        with mock.patch.object(metrics, "resource", None), mock.patch(
+            "builtins.open", side_effect=OSError
+        ):
+            self.assertEqual(metrics._resident_memory(), 0)
+
+    def test_dropped_records(self):
+        """
+        Test that records beyond the capacity are dropped and counted.
+        """
+        exporter = MetricsExporter(self.world, jsonl_path=os.devnull, capacity=2)
+        for _ in range(5):
+            exporter.record(0.001, phase_times(0.0), 1)
+        snapshot = exporter.flush()
+        self.assertEqual(snapshot["steps"], 2)
+        self.assertEqual(snapshot["dropped"], 3)
+
+    def test_prometheus_text(self):
+        """
+        Test the cumulative buckets of the Prometheus text.
+        """
+        self.exporter.record(0.0005, phase_times(0.0), 8)
+        self.exporter.record(0.005, phase_times(0.0), 8)
+        self.exporter.flush()
+        text = self.exporter.prometheus()
+        self.assertIn("verlet_steps_total 2\n", text)
+        self.assertIn('verlet_phase_seconds_bucket{phase="step",le="0.01"} 2\n', text)
+        self.assertIn('verlet_phase_seconds_bucket{phase="step",le="+Inf"} 2\n', text)
+        self.assertIn('verlet_phase_seconds_count{phase="integrate"} 2\n', text)
+        self.assertIn("verlet_particles 10\n", text)
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            MetricsExporter(self.world)
+        with self.assertRaises(ValueError):
+            MetricsExporter(self.world, port=0, interval=0)
+        with self.assertRaises(ValueError):
+            MetricsExporter(self.world, port=0, buckets=(0.1, 0.01))
+
+
+class TestPublishing(unittest.TestCase):
+    """
+    Tests for the background thread, the HTTP endpoint and the JSON lines.
+    """
+
+    def test_world_metrics(self):
+        """
+        Test that a world records its steps and publishes them on both outputs.
+        """
+        world = PhysicsWorld(substeps=2, constraint_iterations=4)
+        world.add(Rope(Vector2D(0, 0), 10, 5.0))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.jsonl")
+            exporter = world.enable_metrics(port=0, jsonl_path=path, interval=0.05)
+            for _ in range(20):
+                world.step(0.016)
+            exporter.flush()
+            host, port = exporter.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+                text = response.read().decode()
+            world.disable_metrics()
+            with open(path) as stream:
+                lines = [json.loads(line) for line in stream]
+
+        self.assertIsNone(world.metrics)
+        self.assertIn("verlet_steps_total 20\n", text)
+        self.assertIn("verlet_constraint_iterations_total 160\n", text)
+        self.assertEqual(lines[-1]["steps"], 20)
+        step = lines[-1]["phases"]["step"]["sum"]
+        self.assertGreaterEqual(step, lines[-1]["phases"]["constraints"]["sum"])
+
+    def test_unknown_path(self):
+        """
+        Test that the endpoint answers unknown paths with 404.
+        """
+        with MetricsExporter(PhysicsWorld(), port=0) as exporter:
+            host, port = exporter.address
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(f"http://{host}:{port}/other")
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
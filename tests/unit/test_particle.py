@@ -104,6 +104,14 @@ class TestParticle(unittest.TestCase):
         self.particle.apply_force(extreme_force)
         self.assertEqual(self.particle.acceleration, extreme_force)
 
+    def test_position_not_shared(self):
+        """
+        Test that a particle does not move the vector it was created from.
+        """
+        self.particle.acceleration = Vector2D(10, 20)
+        self.particle.update_position(0.1)
+        self.assertEqual(self.position, Vector2D(0, 0))
+
 
 if __name__ == "__main__":
     unittest.main()
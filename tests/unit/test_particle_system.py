@@ -0,0 +1,463 @@
+# test_particle_system.py
+# Unit tests for the ParticleSystem class and the array-backed Verlet integration path.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core.attachment import AttachmentConstraints
+from core.bending import BendingConstraints
+from core.particle_system import ParticleSystem
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.verlet import VerletIntegrator, _chebyshev_omega
+from objects.ragdoll import Ragdoll, ragdoll_topology
+
+
+class TestParticleSystem(unittest.TestCase):
+    """
+    Unit tests for the ParticleSystem class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment.
+        """
+        self.system = ParticleSystem()
+
+    def test_add_particles(self):
+        """
+        Test that particles are appended with the right inverse masses.
+        """
+        start = self.system.add_particles(
+            [(0, 0), (1, 0), (2, 0)], 2.0, [True, False, False]
+        )
+        self.assertEqual(start, 0)
+        self.assertEqual(self.system.num_particles, 3)
+        np.testing.assert_allclose(self.system.inv_masses, [0.0, 0.5, 0.5])
+
+    def test_add_constraints_out_of_range(self):
+        """
+        Test that constraints must refer to existing particles.
+        """
+        self.system.add_particles([(0, 0), (1, 0)])
+        with self.assertRaises(IndexError):
+            self.system.add_constraints([(0, 2)], 1.0)
+
+    def test_add_instances(self):
+        """
+        Test that instancing tiles positions and offsets constraint indices.
+        """
+        template = ragdoll_topology(20.0, 0.5)
+        starts = self.system.add_instances(template, [(0, 0), (100, 0), (200, 50)])
+        np.testing.assert_array_equal(starts, [0, 6, 12])
+        self.assertEqual(self.system.num_particles, 18)
+        self.assertEqual(self.system.num_constraints, 15)
+        np.testing.assert_allclose(
+            self.system.positions[12:18], template.positions + (200, 50)
+        )
+        np.testing.assert_array_equal(self.system.edges[10:15], template.edges + 12)
+
+    def test_instances_match_objects(self):
+        """
+        Test that an instanced ragdoll matches a constructed one.
+        """
+        ragdoll = Ragdoll(Vector2D(30, 40), limb_length=10.0)
+        self.system.add_topology(ragdoll_topology(10.0, 0.5), (30, 40))
+        positions = [(p.position.x, p.position.y) for p in ragdoll.particles]
+        np.testing.assert_allclose(self.system.positions, positions)
+        np.testing.assert_allclose(
+            self.system.masses, [p.mass for p in ragdoll.particles]
+        )
+
+    def test_dtype(self):
+        """
+        Test that the floating-point buffers use the requested type, also after growth.
+        """
+        system = ParticleSystem(dtype="float32")
+        system.add_instances(grid_topology(3, 3), np.zeros((50, 2)))
+        self.assertEqual(system.positions.dtype, np.float32)
+        self.assertEqual(system.rest_lengths.dtype, np.float32)
+        self.assertEqual(system.edges.dtype, np.intp)
+        with self.assertRaises(ValueError):
+            ParticleSystem(dtype=np.int32)
+
+    def test_apply_force(self):
+        """
+        Test that forces are scaled by inverse mass and skip fixed particles.
+        """
+        self.system.add_particles([(0, 0), (1, 0)], 2.0, [True, False])
+        self.system.apply_force(Vector2D(4.0, 0.0))
+        np.testing.assert_allclose(self.system.accelerations, [(0, 0), (2, 0)])
+
+
+class TestParticlePool(unittest.TestCase):
+    """
+    Unit tests for spawning and despawning bodies in a ParticleSystem.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment.
+        """
+        self.system = ParticleSystem(capacity=4, compact_threshold=None)
+        self.template = ragdoll_topology(20.0, 0.5)
+
+    def test_buffers_grow(self):
+        """
+        Test that spawning beyond the capacity grows the buffers and keeps the data.
+        """
+        bodies = [self.system.spawn(self.template, (i * 50, 0)) for i in range(10)]
+        self.assertEqual(self.system.num_particles, 60)
+        self.assertGreaterEqual(len(self.system._positions), 60)
+        np.testing.assert_allclose(
+            self.system.positions[bodies[3].particles],
+            self.template.positions + (150, 0),
+        )
+
+    def test_despawn_deactivates_and_reuses_slots(self):
+        """
+        Test that despawned slots are inactive and reused by the next spawn.
+        """
+        first = self.system.spawn(self.template)
+        second = self.system.spawn(self.template, (100, 0))
+        self.system.spawn(self.template, (200, 0))
+        self.system.despawn(second)
+        self.assertFalse(second.alive)
+        self.assertFalse(self.system.active[second.particles].any())
+        self.assertFalse(self.system.inv_masses[second.particles].any())
+        self.assertFalse(self.system.stiffness[second.constraints].any())
+        self.assertEqual(self.system.num_active_particles, 12)
+
+        reused = self.system.spawn(self.template, (300, 0))
+        self.assertEqual(reused.particle_start, 6)
+        self.assertEqual(reused.constraint_start, 5)
+        self.assertEqual(first.particle_start, 0)
+        self.assertEqual(self.system.num_particles, 18)
+
+    def test_despawn_at_end_shrinks(self):
+        """
+        Test that despawning the last body releases its slots entirely.
+        """
+        self.system.spawn(self.template)
+        last = self.system.spawn(self.template, (100, 0))
+        self.system.despawn(last)
+        self.assertEqual(self.system.num_particles, 6)
+        self.assertEqual(self.system.num_constraints, 5)
+        with self.assertRaises(ValueError):
+            self.system.despawn(last)
+
+    def test_compact_remaps_handles(self):
+        """
+        Test that compaction keeps handles and constraint indices consistent.
+        """
+        bodies = [self.system.spawn(self.template, (i * 100, 0)) for i in range(4)]
+        self.system.despawn(bodies[0])
+        self.system.despawn(bodies[2])
+        self.system.compact()
+        self.assertEqual(self.system.num_particles, 12)
+        self.assertEqual(self.system.fragmentation, 0.0)
+        for body, offset in ((bodies[1], 100), (bodies[3], 300)):
+            np.testing.assert_allclose(
+                self.system.positions[body.particles],
+                self.template.positions + (offset, 0),
+            )
+            np.testing.assert_array_equal(
+                self.system.edges[body.constraints],
+                self.template.edges + body.particle_start,
+            )
+
+    def test_automatic_compaction(self):
+        """
+        Test that despawning past the threshold compacts the buffers.
+        """
+        system = ParticleSystem(compact_threshold=0.5)
+        bodies = [system.spawn(self.template, (i * 100, 0)) for i in range(4)]
+        for body in bodies[:3]:
+            system.despawn(body)
+        self.assertEqual(system.num_particles, 6)
+        self.assertEqual(bodies[3].particle_start, 0)
+
+    def test_despawn_removes_links(self):
+        """
+        Test that links to a despawned body are removed with it, so that neither
+        stepping nor compaction sees a constraint to a freed particle.
+        """
+        first = self.system.spawn(self.template)
+        second = self.system.spawn(self.template, (100, 0))
+        link = self.system.link([(first.particle_start, second.particle_start)], [1.0])
+        self.system.add_constraints([(1, second.particle_start + 1)], [1.0])
+        self.system.despawn(second)
+        self.assertFalse(link.alive)
+        self.assertEqual(self.system.num_particles, 6)
+        self.assertEqual(self.system.num_constraints, 5)
+        self.assertTrue((self.system.edges[self.system.constraint_active] < 6).all())
+
+        integrator = VerletIntegrator(self.system, gravity=Vector2D(0, 9.81))
+        integrator.integrate(0.016)
+
+    def test_compact_after_despawning_linked_body(self):
+        """
+        Test that compacting after despawning a linked body keeps only valid edges.
+        """
+        bodies = [self.system.spawn(self.template, (i * 100, 0)) for i in range(3)]
+        self.system.link([(bodies[0].particle_start, bodies[1].particle_start)], [1.0])
+        kept = self.system.link(
+            [(bodies[0].particle_start, bodies[2].particle_start)], [1.0]
+        )
+        self.system.despawn(bodies[1])
+        self.system.compact()
+        self.assertTrue(kept.alive)
+        self.assertEqual(self.system.num_constraints, 11)
+        np.testing.assert_array_equal(
+            self.system.edges[kept.constraints],
+            [(bodies[0].particle_start, bodies[2].particle_start)],
+        )
+        np.testing.assert_allclose(
+            self.system.positions[bodies[2].particle_start],
+            (200, 0) + self.template.positions[0],
+        )
+
+    def test_despawn_visits_only_the_body_links(self):
+        """
+        Test that despawning a linked body only visits the links of its own
+        particles, without scanning the constraints of the rest of the system.
+        """
+        bodies = [self.system.spawn(self.template, (i * 100, 0)) for i in range(200)]
+        for first, second in zip(bodies, bodies[1:]):
+            self.system.link([(first.particle_start + 5, second.particle_start)], [1.0])
+        self.assertEqual(len(self.system._dangling_constraints(bodies[100])), 2)
+
+        scan = mock.PropertyMock(side_effect=AssertionError("scanned all constraints"))
+        with mock.patch.object(ParticleSystem, "edges", scan), mock.patch.object(
+            ParticleSystem, "constraint_active", scan
+        ):
+            self.system.despawn(bodies[100])
+        self.assertEqual(self.system.constraint_active.sum(), 200 * 5 + 199 - 5 - 2)
+        self.assertEqual(len(self.system._link_rows), 197)
+
+    def test_compact_keeps_link_index(self):
+        """
+        Test that the link index follows compaction, so links can still be removed
+        with their bodies afterwards.
+        """
+        bodies = [self.system.spawn(self.template, (i * 100, 0)) for i in range(3)]
+        self.system.link([(bodies[1].particle_start, bodies[2].particle_start)], [1.0])
+        self.system.despawn(bodies[0])
+        self.system.compact()
+        self.system.despawn(bodies[2])
+        self.assertEqual(self.system.num_constraints, 5)
+        self.assertFalse(self.system._link_rows)
+
+    def test_despawn_drops_constraint_set_rows(self):
+        """
+        Test that constraint set rows of a despawned body are dropped, so they neither
+        act on a body spawned into its slots nor get remapped onto other particles.
+        """
+        first = self.system.spawn(self.template)
+        second = self.system.spawn(self.template, (100, 0))
+        third = self.system.spawn(self.template, (200, 0))
+        start = second.particle_start
+        bending = self.system.add_constraint_set(
+            BendingConstraints(
+                [(0, 1, 2), (start + 3, start + 4, start + 5)], [0.5, 1.5]
+            )
+        )
+        attachment = self.system.add_constraint_set(
+            AttachmentConstraints(
+                self.template.edges + start, self.template.rest_lengths
+            )
+        )
+
+        self.system.despawn(second)
+        self.assertNotIn(attachment, self.system.constraint_sets)
+        np.testing.assert_array_equal(bending.indices, [(0, 1, 2)])
+        np.testing.assert_array_equal(bending.targets, [0.5])
+
+        replacement = self.system.spawn(self.template, (300, 0))
+        self.assertEqual(replacement.particle_start, start)
+        self.system.despawn(first)
+        self.assertNotIn(bending, self.system.constraint_sets)
+
+        kept = self.system.add_constraint_set(
+            BendingConstraints([(third.particle_start, start, start + 1)], [0.0])
+        )
+        self.system.compact()
+        np.testing.assert_array_equal(
+            kept.indices,
+            [
+                (
+                    third.particle_start,
+                    replacement.particle_start,
+                    replacement.particle_start + 1,
+                )
+            ],
+        )
+
+    def test_compact_rejects_sets_on_freed_particles(self):
+        """
+        Test that compaction refuses to remap a constraint set onto other particles
+        when it refers to a freed particle.
+        """
+        self.system.spawn(self.template)
+        second = self.system.spawn(self.template, (100, 0))
+        self.system.spawn(self.template, (200, 0))
+        self.system.despawn(second)
+        stale = BendingConstraints([(6, 7, 8)], [0.0])
+        self.system.constraint_sets.append(stale)
+        with self.assertRaises(ValueError):
+            self.system.compact()
+        np.testing.assert_array_equal(stale.indices, [(6, 7, 8)])
+
+    def test_integration_skips_inactive_particles(self):
+        """
+        Test that despawned slots neither move nor affect the live bodies.
+        """
+        first = self.system.spawn(self.template)
+        second = self.system.spawn(self.template, (100, 0))
+        self.system.spawn(self.template, (200, 0))
+        self.system.despawn(second)
+        frozen = self.system.positions[second.particles].copy()
+
+        reference = ParticleSystem()
+        reference.spawn(self.template)
+        for system in (self.system, reference):
+            integrator = VerletIntegrator(system, gravity=Vector2D(0, 9.81))
+            for _ in range(10):
+                integrator.integrate(0.016)
+        np.testing.assert_allclose(self.system.positions[second.particles], frozen)
+        np.testing.assert_allclose(
+            self.system.positions[first.particles], reference.positions
+        )
+
+
+class TestArrayVerletIntegration(unittest.TestCase):
+    """
+    Tests for VerletIntegrator operating on a ParticleSystem.
+    """
+
+    def test_fixed_particles_do_not_move(self):
+        """
+        Test that gravity moves free particles but not fixed ones.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0, 0), (0, 10)], 1.0, [True, False])
+        integrator = VerletIntegrator(system, gravity=Vector2D(0, 9.81))
+        integrator.integrate(0.016)
+        np.testing.assert_allclose(system.positions[0], (0, 0))
+        self.assertGreater(system.positions[1, 1], 10)
+
+    def test_constraints_hold_rest_length(self):
+        """
+        Test that a hanging cloth stays close to its rest lengths.
+        """
+        system = ParticleSystem()
+        system.add_topology(
+            grid_topology(6, 6, pattern=("structural", "shear")).replace(
+                fixed=np.arange(36) < 6
+            )
+        )
+        integrator = VerletIntegrator(
+            system, constraint_iterations=20, gravity=Vector2D(0, 9.81)
+        )
+        for _ in range(60):
+            integrator.integrate(0.016)
+        i, j = system.edges.T
+        lengths = np.linalg.norm(system.positions[i] - system.positions[j], axis=1)
+        np.testing.assert_allclose(lengths, system.rest_lengths, rtol=0.05)
+
+    def test_apply_force_out_of_range(self):
+        """
+        Test that applying a force to a missing particle raises an error.
+        """
+        system = ParticleSystem()
+        system.add_particles([(0, 0)])
+        integrator = VerletIntegrator(system)
+        with self.assertRaises(IndexError):
+            integrator.apply_force(1, Vector2D(1, 0))
+
+
+class TestChebyshevAcceleration(unittest.TestCase):
+    """
+    Tests for the Chebyshev semi-iterative acceleration of the array-backed solve.
+    """
+
+    def yanked_rope(self, count=100):
+        """A rope pinned at its first particle, every free particle moving downwards."""
+        system = ParticleSystem()
+        system.add_particles(
+            np.column_stack((np.zeros(count), np.arange(count))),
+            1.0,
+            np.arange(count) == 0,
+        )
+        system.add_constraints(
+            np.column_stack((np.arange(count - 1), np.arange(1, count))),
+            np.ones(count - 1),
+        )
+        system.old_positions[1:] -= (0.0, 0.1)
+        return system
+
+    def max_stretch(self, system):
+        """The largest absolute length error of any constraint."""
+        i, j = system.edges.T
+        lengths = np.linalg.norm(system.positions[i] - system.positions[j], axis=1)
+        return np.max(np.abs(lengths - system.rest_lengths))
+
+    def test_weights(self):
+        """
+        Test the warm-up weights and the convergence to the optimal weight.
+        """
+        rho, omega, weights = 0.9, 1.0, []
+        for iteration in range(60):
+            omega = _chebyshev_omega(iteration, rho, 2, omega)
+            weights.append(omega)
+        self.assertEqual(weights[:2], [1.0, 1.0])
+        self.assertAlmostEqual(weights[2], 2.0 / (2.0 - rho * rho))
+        self.assertAlmostEqual(weights[-1], 2.0 / (1.0 + np.sqrt(1.0 - rho * rho)))
+
+    def test_accelerates_convergence(self):
+        """
+        Test that the same iteration count leaves far less stretch when accelerated.
+        """
+        residuals = []
+        for rho in (None, 0.99):
+            system = self.yanked_rope()
+            integrator = VerletIntegrator(
+                system,
+                constraint_iterations=20,
+                damping=1.0,
+                gravity=Vector2D(0, 0),
+                chebyshev_rho=rho,
+            )
+            integrator.integrate(0.016)
+            np.testing.assert_array_equal(system.positions[0], (0.0, 0.0))
+            residuals.append(self.max_stretch(system))
+        self.assertLess(residuals[1], residuals[0] / 2)
+
+    def test_warmup_only_matches_plain_solve(self):
+        """
+        Test that iterations within the warm-up are plain Jacobi iterations.
+        """
+        plain, accelerated = self.yanked_rope(), self.yanked_rope()
+        VerletIntegrator(plain, constraint_iterations=4).integrate(0.016)
+        VerletIntegrator(
+            accelerated, constraint_iterations=4, chebyshev_rho=0.9, chebyshev_warmup=4
+        ).integrate(0.016)
+        np.testing.assert_allclose(accelerated.positions, plain.positions)
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid Chebyshev settings are rejected.
+        """
+        system = self.yanked_rope()
+        with self.assertRaises(ValueError):
+            VerletIntegrator(system, chebyshev_rho=1.0)
+        with self.assertRaises(ValueError):
+            VerletIntegrator(system, chebyshev_rho=0.9, chebyshev_warmup=0)
+        with self.assertRaises(ValueError):
+            VerletIntegrator(system, chebyshev_rho=0.9, solver="direct")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+# test_picking.py
+# Unit tests for particle picking and dragging.
+
+import os
+import unittest
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.picking import DragSpring, ParticleDragger, ParticlePicker
+from integration.world import PhysicsWorld
+from rendering.camera import Camera
+from rendering.interaction import MouseDragHandler
+
+
+def scattered_world(count=500, seed=0):
+    """A world of unconnected particles scattered over a 100 x 100 square."""
+    world = PhysicsWorld(gravity=Vector2D(0, 0))
+    positions = np.random.default_rng(seed).uniform(0, 100, (count, 2))
+    world.system.add_particles(positions)
+    return world
+
+
+def brute_nearest(positions, x, y):
+    """Index and distance of the nearest position, by scanning them all."""
+    distances = np.hypot(positions[:, 0] - x, positions[:, 1] - y)
+    return int(np.argmin(distances)), float(distances.min())
+
+
+class TestParticlePicker(unittest.TestCase):
+    """
+    Unit tests for the ParticlePicker class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: scattered particles and a picker.
+        """
+        self.world = scattered_world()
+        self.picker = ParticlePicker(self.world)
+        self.points = np.random.default_rng(1).uniform(-50, 150, (100, 2))
+
+    def test_nearest_matches_scan(self):
+        """
+        Test that nearest() agrees with scanning every particle, also far outside.
+        """
+        positions = self.world.system.positions
+        for x, y in self.points:
+            with self.subTest(x=x, y=y):
+                self.assertEqual(
+                    self.picker.nearest(x, y), brute_nearest(positions, x, y)[0]
+                )
+
+    def test_max_distance(self):
+        """
+        Test that nothing is picked beyond the maximum distance.
+        """
+        positions = self.world.system.positions
+        for x, y in self.points:
+            index, distance = brute_nearest(positions, x, y)
+            expected = index if distance <= 5.0 else None
+            self.assertEqual(self.picker.nearest(x, y, max_distance=5.0), expected)
+
+    def test_within_matches_scan(self):
+        """
+        Test that within() returns exactly the particles inside the radius.
+        """
+        positions = self.world.system.positions
+        for x, y in self.points[:20]:
+            distances = np.hypot(positions[:, 0] - x, positions[:, 1] - y)
+            np.testing.assert_array_equal(
+                self.picker.within(x, y, 12.0), np.flatnonzero(distances <= 12.0)
+            )
+
+    def test_inactive_particles_are_skipped(self):
+        """
+        Test that despawned particles are never picked.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 0))
+        first, second = world.spawn(grid_topology(3, 3), [(0, 0), (10, 0)])
+        picker = ParticlePicker(world)
+        self.assertIn(picker.nearest(0, 0), range(9))
+        world.system.despawn(first)
+        self.assertIn(picker.nearest(0, 0), range(9, 18))
+        self.assertEqual(len(picker.within(1, 1, 2.0)), 0)
+
+    def test_empty_world(self):
+        """
+        Test that a world without particles picks nothing.
+        """
+        picker = ParticlePicker(PhysicsWorld())
+        self.assertIsNone(picker.nearest(0, 0))
+        self.assertEqual(len(picker.within(0, 0, 10.0)), 0)
+
+    def test_index_is_rebuilt_lazily(self):
+        """
+        Test that the index is only rebuilt when queried after particles moved far.
+        """
+        self.picker.nearest(50, 50)
+        self.assertEqual(self.picker.rebuilds, 1)
+        for _ in range(5):
+            self.picker.nearest(20, 20)
+        self.assertEqual(self.picker.rebuilds, 1)
+
+        # Stepping alone does not rebuild; a small drift is within the slack
+        self.world.system.old_positions[:, 0] -= 0.01
+        self.world.step(1 / 60)
+        self.assertEqual(self.picker.rebuilds, 1)
+        self.picker.nearest(20, 20)
+        self.assertEqual(self.picker.rebuilds, 1)
+
+        # Moving particles by hand needs invalidate()
+        self.world.system.positions[:, 0] += 50.0
+        self.picker.invalidate()
+        positions = self.world.system.positions
+        self.assertEqual(
+            self.picker.nearest(60, 60), brute_nearest(positions, 60, 60)[0]
+        )
+        self.assertEqual(self.picker.rebuilds, 2)
+
+    def test_invalid_arguments(self):
+        """
+        Test that non-positive cell sizes and slack are rejected.
+        """
+        with self.assertRaises(ValueError):
+            ParticlePicker(self.world, cell_size=0)
+        with self.assertRaises(ValueError):
+            ParticlePicker(self.world, slack=-1.0)
+
+
+class TestDragging(unittest.TestCase):
+    """
+    Unit tests for the DragSpring and ParticleDragger classes.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a small cloth hanging from its top row.
+        """
+        self.world = PhysicsWorld(gravity=Vector2D(0, 9.81))
+        self.body = self.world.spawn(grid_topology(4, 4, spacing_x=10.0), [(0, 0)])[0]
+        self.world.system.set_fixed(range(4), True)
+        self.dragger = ParticleDragger(self.world, pick_radius=3.0)
+
+    def step(self, count):
+        """Advance the world a number of frames."""
+        for _ in range(count):
+            self.world.step(1 / 60)
+
+    def test_drag_pulls_particle_to_target(self):
+        """
+        Test that a dragged particle settles at the target and is let go afterwards.
+        """
+        index = self.world.system.add_particles([(100, 0)])
+        self.assertEqual(self.dragger.begin(101, 1), index)
+        self.assertTrue(self.dragger.dragging)
+        self.assertIn(self.dragger.spring, self.world.fields)
+        self.dragger.move(120, 10)
+        self.step(120)
+        np.testing.assert_allclose(
+            self.world.system.positions[index], (120, 10), atol=0.05
+        )
+        self.dragger.end()
+        self.assertFalse(self.dragger.dragging)
+        self.assertEqual(self.world.fields, [])
+
+    def test_drag_moves_cloth(self):
+        """
+        Test that dragging a corner of the cloth pulls it towards the target.
+        """
+        index = self.dragger.begin(31, 29)
+        self.assertEqual(index, 15)
+        start = self.world.system.positions[index].copy()
+        self.dragger.move(60, 30)
+        self.step(60)
+        self.assertGreater(self.world.system.positions[index, 0], start[0] + 5.0)
+
+    def test_fixed_particles_stay(self):
+        """
+        Test that dragging a fixed particle does not move it.
+        """
+        index = self.dragger.begin(0, 0)
+        self.assertEqual(index, 0)
+        self.dragger.move(20, 20)
+        self.step(10)
+        np.testing.assert_allclose(self.world.system.positions[0], (0, 0))
+
+    def test_miss(self):
+        """
+        Test that nothing is dragged when no particle is within the pick radius.
+        """
+        self.assertIsNone(self.dragger.begin(5, 5))
+        self.assertFalse(self.dragger.dragging)
+        self.dragger.move(1, 1)
+        self.dragger.end()
+
+    def test_despawned_particle_is_released(self):
+        """
+        Test that despawning the dragged particle ends the drag.
+        """
+        self.dragger.begin(30, 30)
+        self.world.system.despawn(self.body)
+        self.dragger.move(40, 40)
+        self.assertFalse(self.dragger.dragging)
+
+    def test_step_after_despawning_dragged_particle(self):
+        """
+        Test that stepping after despawning the dragged particle neither fails nor
+        drags a particle spawned into its slots.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 0))
+        kept, dragged = world.spawn(grid_topology(2, 2), [(0, 0), (10, 0)])
+        dragger = ParticleDragger(world, pick_radius=1.0)
+        self.assertEqual(dragger.begin(11, 1), 3 + 4)
+        spring = dragger.spring
+        world.system.despawn(dragged)
+        world.step(1 / 60)
+        self.assertFalse(spring.enabled)
+
+        (dragged,) = world.spawn(grid_topology(2, 2), [(10, 0)])
+        self.assertEqual(dragger.begin(10, 0), dragged.particle_start)
+        world.system.despawn(dragged)
+        (spawned,) = world.spawn(grid_topology(2, 2), [(10, 0)])
+        self.assertEqual(spawned.particle_start, dragged.particle_start)
+        start = world.system.positions[spawned.particles].copy()
+        world.step(1 / 60)
+        np.testing.assert_allclose(world.system.positions[spawned.particles], start)
+        self.assertFalse(dragger.dragging)
+        self.assertEqual(world.fields, [])
+
+    def test_drag_follows_compaction(self):
+        """
+        Test that the spring keeps pulling its particle after the buffers compact.
+        """
+        world = PhysicsWorld(gravity=Vector2D(0, 0))
+        first, second = world.spawn(grid_topology(2, 2), [(0, 0), (10, 0)])
+        dragger = ParticleDragger(world, pick_radius=1.0)
+        dragger.begin(10, 0)
+        world.system.despawn(first)
+        world.system.compact()
+        dragger.move(10, -5)
+        world.step(1 / 60)
+        self.assertTrue(dragger.dragging)
+        self.assertEqual(dragger.spring.index, second.particle_start)
+        self.assertLess(world.system.positions[second.particle_start, 1], 0.0)
+
+    def test_spring_validation(self):
+        """
+        Test that invalid spring parameters are rejected.
+        """
+        with self.assertRaises(ValueError):
+            DragSpring(0, (0, 0), frequency=0.0)
+        with self.assertRaises(ValueError):
+            DragSpring(0, (0, 0), damping_ratio=-1.0)
+        with self.assertRaises(ValueError):
+            ParticleDragger(self.world, pick_radius=-1.0)
+
+    def test_mouse_handler(self):
+        """
+        Test that mouse events drive the dragger through the camera.
+        """
+        camera = Camera(0, 0, 200, 200, zoom=2.0)
+        handler = MouseDragHandler(self.dragger, camera)
+        down = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(60, 60), button=1)
+        self.assertTrue(handler(down))
+        self.assertEqual(self.dragger.spring.index, 15)
+        motion = pygame.event.Event(pygame.MOUSEMOTION, pos=(80, 70), rel=(20, 10))
+        self.assertTrue(handler(motion))
+        self.assertEqual(self.dragger.spring.target, (40, 35))
+        up = pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(80, 70), button=1)
+        self.assertTrue(handler(up))
+        self.assertFalse(self.dragger.dragging)
+        self.assertFalse(handler(up))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,291 @@
+# test_server.py
+# Unit tests for the SimulationServer class.
+
+import asyncio
+import base64
+import json
+import os
+import struct
+import unittest
+
+import numpy as np
+
+from core.topology import grid_topology
+from core.vector2d import Vector2D
+from integration.server import (
+    SimulationServer,
+    _read_websocket_frame,
+    decode_edges,
+    decode_message,
+    decode_positions,
+    read_message,
+)
+from integration.world import PhysicsWorld
+
+
+def grid_world(rows=3, cols=3):
+    """A world with one falling grid."""
+    world = PhysicsWorld(gravity=Vector2D(0, 100))
+    world.spawn(grid_topology(rows, cols, spacing_x=10.0), [(100.0, 100.0)])
+    return world
+
+
+async def next_of(reader, kind):
+    """Read messages until one of the given type arrives."""
+    while True:
+        header, body = await asyncio.wait_for(read_message(reader), 2.0)
+        if header["type"] == kind:
+            return header, body
+
+
+class TestTcp(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for TCP clients.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Set up test fixtures: a server with two worlds and a connected client.
+        """
+        self.worlds = {"a": grid_world(), "b": grid_world(2, 2)}
+        self.server = await SimulationServer(self.worlds, rate=200.0).start()
+        self.reader, self.writer = await asyncio.open_connection(*self.server.address)
+
+    async def asyncTearDown(self):
+        """
+        Close the client and the server.
+        """
+        self.writer.close()
+        await self.server.stop()
+
+    async def command(self, **request):
+        """Send a command and return its reply."""
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        while True:
+            header, body = await asyncio.wait_for(read_message(self.reader), 2.0)
+            if header["type"] in ("ok", "error", "topology"):
+                return header, body
+
+    async def test_frames(self):
+        """
+        Test that frames carry the positions of the worlds.
+        """
+        header, _ = await next_of(self.reader, "worlds")
+        self.assertEqual(header["worlds"], ["a", "b"])
+        await self.command(command="pause")
+        header, body = await next_of(self.reader, "frame")
+        world = self.worlds[header["world"]]
+        np.testing.assert_allclose(
+            decode_positions(header, body), world.system.positions, rtol=1e-6
+        )
+        self.assertGreater(header["step"], 0)
+
+    async def test_pause_and_step(self):
+        """
+        Test that paused worlds only advance by the requested steps.
+        """
+        header, _ = await self.command(command="pause", world="a")
+        self.assertEqual(header, {"type": "ok", "command": "pause"})
+        self.assertTrue(self.server.paused("a"))
+        steps = self.server._states["a"].steps
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server._states["a"].steps, steps)
+        self.assertGreater(self.server._states["b"].steps, steps)
+        await self.command(command="step", world="a", count=3)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server._states["a"].steps, steps + 3)
+
+    async def test_step_count_must_be_positive(self):
+        """
+        Test that non-positive step counts are rejected and leave paused worlds paused.
+        """
+        await self.command(command="pause", world="a")
+        for count in (0, -3):
+            header, _ = await self.command(command="step", world="a", count=count)
+            self.assertEqual(header["type"], "error")
+        state = self.server._states["a"]
+        steps = state.steps
+        await asyncio.sleep(0.05)
+        self.assertEqual(state.steps, steps)
+        self.assertEqual(state.pending, 0)
+
+    async def test_subscribe_topology_and_gravity(self):
+        """
+        Test subscriptions, topology requests and gravity changes.
+        """
+        await self.command(command="subscribe", worlds=["b"])
+        for _ in range(5):
+            header, _ = await next_of(self.reader, "frame")
+            self.assertEqual(header["world"], "b")
+        header, body = await self.command(command="topology", world="b")
+        edges = decode_edges(header, body)
+        np.testing.assert_array_equal(edges, self.worlds["b"].system.edges)
+        await self.command(command="gravity", world="a", value=[0, -5])
+        self.assertEqual(self.worlds["a"].gravity.y, -5)
+
+    async def test_errors(self):
+        """
+        Test that bad commands are answered with errors.
+        """
+        header, _ = await self.command(command="fly")
+        self.assertEqual(header["type"], "error")
+        header, _ = await self.command(command="pause", world="c")
+        self.assertIn("Unknown world", header["error"])
+        self.writer.write(b"not json\n")
+        header, _ = await next_of(self.reader, "error")
+        self.assertEqual(header["type"], "error")
+
+
+class TestBackpressure(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for slow clients.
+    """
+
+    async def test_slow_client_drops_frames(self):
+        """
+        Test that a client that does not read loses frames without stalling the clock.
+        """
+        server = await SimulationServer(grid_world(100, 100), rate=200.0).start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.address)
+            server._states["world"].paused = True
+            ticks = server.ticks
+            # 500 frames of 80 kB are far more than the socket buffers hold
+            for _ in range(500):
+                server.broadcast()
+                await asyncio.sleep(0.001)
+            (client,) = server._clients
+            self.assertGreater(server.ticks, ticks + 50)
+            self.assertGreater(client.dropped, 0)
+            self.assertLessEqual(len(client.frames), server.queue_size)
+            writer.close()
+        finally:
+            await server.stop()
+
+    async def test_client_flooding_commands_is_disconnected(self):
+        """
+        Test that a client whose replies pile up beyond the limit is disconnected.
+        """
+        server = await SimulationServer(grid_world(), max_replies=8).start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.address)
+            await next_of(reader, "worlds")
+            (client,) = server._clients
+            # No await in between, so the writer task cannot send any of them
+            for _ in range(20):
+                server.handle_command(client, b'{"command": "topology"}')
+            self.assertLessEqual(len(client.replies), 8)
+            self.assertTrue(client.writer.is_closing())
+            with self.assertRaises(asyncio.IncompleteReadError):
+                while True:
+                    await asyncio.wait_for(read_message(reader), 2.0)
+            writer.close()
+        finally:
+            await server.stop()
+
+    def test_invalid(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            SimulationServer({})
+        with self.assertRaises(ValueError):
+            SimulationServer(grid_world(), rate=0)
+        with self.assertRaises(ValueError):
+            SimulationServer(grid_world(), queue_size=0)
+        with self.assertRaises(ValueError):
+            SimulationServer(grid_world(), max_replies=0)
+        with self.assertRaises(ValueError):
+            SimulationServer(grid_world(), max_message_size=0)
+
+
+class TestWebSocket(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for WebSocket clients.
+    """
+
+    async def test_handshake_and_messages(self):
+        """
+        Test the opening handshake, a binary frame and a masked text command.
+        """
+        server = SimulationServer(grid_world(), websocket_port=0, rate=200.0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.websocket_address)
+            key = base64.b64encode(os.urandom(16))
+            writer.write(
+                b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                b"Connection: Upgrade\r\nSec-WebSocket-Key: " + key + b"\r\n"
+                b"Sec-WebSocket-Version: 13\r\n\r\n"
+            )
+            response = await reader.readuntil(b"\r\n\r\n")
+            self.assertTrue(response.startswith(b"HTTP/1.1 101"))
+
+            async def receive():
+                first, length = await reader.readexactly(2)
+                if length == 126:
+                    (length,) = struct.unpack("!H", await reader.readexactly(2))
+                self.assertEqual(first, 0x82)
+                return decode_message(await reader.readexactly(length))
+
+            header, _ = await asyncio.wait_for(receive(), 2.0)
+            self.assertEqual(header["type"], "worlds")
+            command = json.dumps({"command": "pause"}).encode()
+            mask = os.urandom(4)
+            masked = bytes(b ^ mask[i % 4] for i, b in enumerate(command))
+            writer.write(bytes([0x81, 0x80 | len(command)]) + mask + masked)
+            while header["type"] != "ok":
+                header, body = await asyncio.wait_for(receive(), 2.0)
+                if header["type"] == "frame":
+                    self.assertEqual(len(decode_positions(header, body)), 9)
+            self.assertTrue(server.paused("world"))
+            writer.close()
+        finally:
+            await server.stop()
+
+    async def test_unmasking(self):
+        """
+        Test that masked payloads of any length are unmasked.
+        """
+        for length in (0, 1, 7, 130):
+            payload = os.urandom(length)
+            mask = os.urandom(4)
+            masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            header = (
+                struct.pack("!BB", 0x82, 0x80 | length)
+                if length < 126
+                else struct.pack("!BBH", 0x82, 0x80 | 126, length)
+            )
+            reader = asyncio.StreamReader()
+            reader.feed_data(header + mask + masked)
+            self.assertEqual(
+                await _read_websocket_frame(reader, 1 << 16), (0x2, payload)
+            )
+
+    async def test_oversized_message_is_refused(self):
+        """
+        Test that a message longer than the limit is refused with close status 1009
+        before its payload is read.
+        """
+        server = SimulationServer(grid_world(), websocket_port=0, max_message_size=64)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.websocket_address)
+            key = base64.b64encode(os.urandom(16))
+            writer.write(
+                b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                b"Connection: Upgrade\r\nSec-WebSocket-Key: " + key + b"\r\n"
+                b"Sec-WebSocket-Version: 13\r\n\r\n"
+            )
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(struct.pack("!BBQ", 0x81, 0x80 | 127, 1 << 40) + os.urandom(4))
+            data = await asyncio.wait_for(reader.read(), 2.0)
+            self.assertIn(struct.pack("!BBH", 0x88, 2, 1009), data)
+            self.assertEqual(server.clients, 0)
+            writer.close()
+        finally:
+            await server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
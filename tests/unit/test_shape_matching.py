@@ -0,0 +1,180 @@
+# test_shape_matching.py
+# Unit tests for the ShapeMatchingConstraints class and shape matching softbodies.
+
+import unittest
+
+import numpy as np
+
+from core.shape_matching import ShapeMatchingConstraints, grid_clusters
+from core.vector2d import Vector2D
+from src.integration.world import PhysicsWorld
+from src.objects.softbody import SoftBody
+
+
+def rotation(angle):
+    """A 2x2 rotation matrix."""
+    return np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+
+
+class TestShapeMatchingConstraints(unittest.TestCase):
+    """
+    Unit tests for the ShapeMatchingConstraints class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a random point cloud as the rest shape.
+        """
+        self.rest = np.random.default_rng(0).normal(size=(20, 2))
+        self.inv_masses = np.ones(20)
+
+    def test_rigid_motion_is_a_goal(self):
+        """
+        Test that a rotated and translated rest shape is left in place in every mode.
+        """
+        positions = self.rest @ rotation(0.7).T + (3.0, -4.0)
+        for mode in ("rigid", "linear", "quadratic"):
+            constraints = ShapeMatchingConstraints(self.rest, mode=mode)
+            np.testing.assert_allclose(
+                constraints.goal_positions(positions), positions, atol=1e-12
+            )
+
+    def test_collapse_is_restored_in_one_pass(self):
+        """
+        Test that a crushed body returns to its rest shape in a single projection.
+        """
+        constraints = ShapeMatchingConstraints(self.rest)
+        positions = self.rest * 0.01
+        constraints.project(positions, self.inv_masses)
+        np.testing.assert_allclose(
+            positions - positions.mean(axis=0),
+            self.rest - self.rest.mean(axis=0),
+            atol=1e-12,
+        )
+
+    def test_deformable_modes(self):
+        """
+        Test that the linear and quadratic fits reproduce matching deformations.
+        """
+        sheared = self.rest @ np.array([[1.25, 0.3], [0.0, 0.8]]).T
+        constraints = ShapeMatchingConstraints(self.rest, mode="linear", beta=1.0)
+        np.testing.assert_allclose(
+            constraints.goal_positions(sheared), sheared, atol=1e-12
+        )
+
+        bent = self.rest.copy()
+        bent[:, 0] += 0.3 * self.rest[:, 1] ** 2
+        constraints = ShapeMatchingConstraints(self.rest, mode="quadratic", beta=1.0)
+        np.testing.assert_allclose(constraints.goal_positions(bent), bent, atol=1e-12)
+
+        rigid = ShapeMatchingConstraints(self.rest)
+        self.assertGreater(np.abs(rigid.goal_positions(bent) - bent).max(), 0.1)
+
+    def test_fixed_particles_do_not_move(self):
+        """
+        Test that pinned particles are not pulled towards their goals.
+        """
+        constraints = ShapeMatchingConstraints(self.rest)
+        positions = self.rest * 0.5
+        self.inv_masses[3] = 0.0
+        constraints.project(positions, self.inv_masses)
+        np.testing.assert_array_equal(positions[3], self.rest[3] * 0.5)
+
+    def test_clusters(self):
+        """
+        Test that grid clusters overlap and cover the grid, and are matched separately.
+        """
+        clusters = grid_clusters(4, 5, 3)
+        self.assertEqual(len(clusters), 4)
+        covered = np.concatenate(clusters)
+        self.assertEqual(set(covered.tolist()), set(range(20)))
+        self.assertEqual(np.bincount(covered)[7], 4)
+
+        constraints = ShapeMatchingConstraints(self.rest, clusters=clusters)
+        self.assertEqual(constraints.num_clusters, 4)
+        self.assertEqual(len(constraints), len(covered))
+        positions = self.rest * 0.5
+        constraints.project(positions, self.inv_masses)
+        self.assertTrue(np.all(np.isfinite(positions)))
+
+    def test_shifted(self):
+        """
+        Test that a shifted copy matches the same shape further down a buffer.
+        """
+        constraints = ShapeMatchingConstraints(self.rest).shifted(5)
+        positions = np.zeros((25, 2))
+        positions[5:] = self.rest * 0.01
+        constraints.project(positions, np.ones(25))
+        np.testing.assert_array_equal(positions[:5], 0.0)
+        np.testing.assert_allclose(
+            np.ptp(positions[5:], axis=0), np.ptp(self.rest, axis=0)
+        )
+
+    def test_invalid_settings(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            ShapeMatchingConstraints(self.rest, mode="cubic")
+        with self.assertRaises(ValueError):
+            ShapeMatchingConstraints(self.rest, beta=1.5)
+        with self.assertRaises(ValueError):
+            ShapeMatchingConstraints(self.rest, clusters=[[0, 1], []])
+        with self.assertRaises(ValueError):
+            ShapeMatchingConstraints(self.rest, clusters=[[0, 20]])
+        with self.assertRaises(ValueError):
+            grid_clusters(4, 4, 1)
+
+
+class TestShapeMatchingSoftBody(unittest.TestCase):
+    """
+    Tests for softbodies that keep their shape with shape matching.
+    """
+
+    def squashed_height(self, **options):
+        """Squash a softbody to a tenth of its height and return it after one update."""
+        softbody = SoftBody(Vector2D(0, 0), 100, 100, 5, 5, **options)
+        for particle in softbody.particles:
+            particle.position.y *= 0.1
+            particle.old_position = particle.position.copy()
+        softbody.update(0.016)
+        ys = [particle.position.y for particle in softbody.particles]
+        return max(ys) - min(ys)
+
+    def test_selectable_per_instance(self):
+        """
+        Test that only softbodies created with a mode carry shape matching.
+        """
+        self.assertIsNone(SoftBody(Vector2D(0, 0), 100, 100, 5, 5).shape_matching)
+        softbody = SoftBody(
+            Vector2D(0, 0), 100, 100, 5, 5, shape_matching="quadratic", cluster_size=3
+        )
+        self.assertEqual(softbody.shape_matching.mode, "quadratic")
+        self.assertEqual(softbody.shape_matching.num_clusters, 4)
+        self.assertEqual(softbody.constraint_sets, [softbody.shape_matching])
+
+    def test_restores_squashed_shape(self):
+        """
+        Test that shape matching restores a squashed body in one update, which springs
+        alone do not.
+        """
+        self.assertLess(self.squashed_height(), 90)
+        self.assertAlmostEqual(self.squashed_height(shape_matching="rigid"), 100, 3)
+
+    def test_world_merges_shape_matching(self):
+        """
+        Test that a world-simulated softbody keeps its shape while falling.
+        """
+        world = PhysicsWorld(constraint_iterations=1)
+        softbody = SoftBody(
+            Vector2D(0, 0), 100, 100, 5, 5, shape_matching="linear", cluster_size=3
+        )
+        body = world.add(softbody)
+        for _ in range(30):
+            world.step(0.016)
+        positions = world.system.positions[body.particles]
+        np.testing.assert_allclose(np.ptp(positions, axis=0), (100, 100), rtol=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
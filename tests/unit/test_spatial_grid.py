@@ -0,0 +1,100 @@
+# test_spatial_grid.py
+# Unit tests for the SegmentGrid and SegmentIndex classes.
+
+import unittest
+
+import numpy as np
+
+from core.spatial_grid import SegmentGrid, SegmentIndex, boxes_in_rect, segment_bounds
+
+
+def brute_force(starts, ends, rect):
+    """Indices of the segments whose bounding boxes overlap rect."""
+    lower, upper = segment_bounds(starts, ends)
+    return np.flatnonzero(boxes_in_rect(lower, upper, rect))
+
+
+class TestSegmentGrid(unittest.TestCase):
+    """
+    Unit tests for the SegmentGrid class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: short and long random segments around the origin.
+        """
+        rng = np.random.default_rng(0)
+        self.starts = rng.uniform(-500, 500, (400, 2))
+        self.ends = self.starts + rng.normal(0, 20, (400, 2))
+        self.ends[:10] = self.starts[:10] + rng.uniform(-300, 300, (10, 2))
+        self.grid = SegmentGrid(self.starts, self.ends, cell_size=50.0)
+
+    def test_matches_brute_force(self):
+        """
+        Test that queries return exactly the overlapping segments.
+        """
+        for rect in [
+            (0, 0, 100, 80),
+            (-420, -30, -300, 10),
+            (-1000, -1000, 1000, 1000),
+            (2000, 2000, 2100, 2100),
+            (12.5, 12.5, 12.5, 12.5),
+        ]:
+            with self.subTest(rect=rect):
+                np.testing.assert_array_equal(
+                    self.grid.query(rect), brute_force(self.starts, self.ends, rect)
+                )
+
+    def test_empty(self):
+        """
+        Test a grid without segments.
+        """
+        grid = SegmentGrid(np.empty((0, 2)), np.empty((0, 2)), 10.0)
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(len(grid.query((0, 0, 100, 100))), 0)
+        with self.assertRaises(ValueError):
+            SegmentGrid(self.starts, self.ends, 0.0)
+
+
+class TestSegmentIndex(unittest.TestCase):
+    """
+    Unit tests for the SegmentIndex class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures: a chain of 100 unit segments along x.
+        """
+        self.positions = np.column_stack((np.arange(101.0), np.zeros(101)))
+        self.edges = np.column_stack((np.arange(100), np.arange(1, 101)))
+        self.index = SegmentIndex(cell_size=8.0)
+
+    def test_lazy_rebuilds(self):
+        """
+        Test that small motion reuses the grid and large motion rebuilds it.
+        """
+        self.assertTrue(self.index.update(self.positions, self.edges))
+        self.assertEqual(self.index.slack, 2.0)
+        self.positions[:, 1] += 1.5
+        self.assertFalse(self.index.update(self.positions, self.edges))
+        np.testing.assert_array_equal(self.index.query((10, 1, 12, 2)), [9, 10, 11, 12])
+        self.assertEqual(self.index.query((10, -1, 12, 0)).tolist(), [])
+        self.positions[50, 1] += 5.0
+        self.assertTrue(self.index.update(self.positions, self.edges))
+        self.assertFalse(self.index.update(self.positions, self.edges))
+        self.assertTrue(self.index.update(self.positions, self.edges[:50]))
+        self.assertEqual(self.index.rebuilds, 3)
+
+    def test_default_cell_size(self):
+        """
+        Test that the cell size follows the segment length.
+        """
+        index = SegmentIndex()
+        index.update(self.positions, self.edges)
+        self.assertEqual(index.cell_size, 8.0)
+        with self.assertRaises(ValueError):
+            SegmentIndex().query((0, 0, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# test_topology.py
+# Unit tests for the array-based topology builders.
+
+import unittest
+
+import numpy as np
+
+from core.topology import Topology, grid_topology, grid_triangles
+
+
+class TestGridTopology(unittest.TestCase):
+    """
+    Unit tests for grid_topology.
+    """
+
+    def test_structural_counts(self):
+        """
+        Test that a structural grid has one edge per horizontal and vertical neighbour pair.
+        """
+        topology = grid_topology(5, 4)
+        self.assertEqual(topology.num_particles, 20)
+        self.assertEqual(topology.num_edges, 5 * 3 + 4 * 4)
+
+    def test_positions_are_row_major(self):
+        """
+        Test that particle row * cols + col sits at (col * spacing_x, row * spacing_y).
+        """
+        topology = grid_topology(3, 4, spacing_x=2.0, spacing_y=5.0)
+        np.testing.assert_allclose(topology.positions[1 * 4 + 3], (6.0, 5.0))
+
+    def test_rest_lengths_match_positions(self):
+        """
+        Test that every rest length equals the distance between its particles.
+        """
+        topology = grid_topology(
+            4, 5, spacing_x=1.5, spacing_y=0.5, pattern=("structural", "shear", "bend")
+        )
+        i, j = topology.edges.T
+        distances = np.linalg.norm(
+            topology.positions[i] - topology.positions[j], axis=1
+        )
+        np.testing.assert_allclose(distances, topology.rest_lengths)
+
+    def test_shear_supersedes_diagonal(self):
+        """
+        Test that requesting both shear and diagonal does not duplicate edges.
+        """
+        both = grid_topology(3, 3, pattern=("diagonal", "shear"))
+        shear = grid_topology(3, 3, pattern="shear")
+        self.assertIs(both, shear)
+        self.assertEqual(len({tuple(sorted(e)) for e in both.edges.tolist()}), 8)
+
+    def test_memoized(self):
+        """
+        Test that identical requests return the same cached topology.
+        """
+        self.assertIs(grid_topology(6, 6, 1.0), grid_topology(6, 6, 1.0, 1.0))
+        self.assertIsNot(grid_topology(6, 6, 1.0), grid_topology(6, 6, 2.0))
+
+    def test_arrays_are_read_only(self):
+        """
+        Test that shared topology arrays cannot be modified in place.
+        """
+        topology = grid_topology(2, 2)
+        with self.assertRaises(ValueError):
+            topology.positions[0, 0] = 10.0
+
+    def test_invalid_arguments(self):
+        """
+        Test that invalid sizes and patterns raise errors.
+        """
+        with self.assertRaises(ValueError):
+            grid_topology(0, 3)
+        with self.assertRaises(ValueError):
+            grid_topology(3, 3, pattern="hexagonal")
+
+    def test_invalid_topology(self):
+        """
+        Test that edges referring to missing particles are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Topology([(0, 0), (1, 0)], [(0, 2)], [1.0])
+
+
+class TestGridTriangles(unittest.TestCase):
+    """
+    Unit tests for grid_triangles.
+    """
+
+    def test_two_triangles_per_cell(self):
+        """
+        Test that every cell is split into two triangles that cover it exactly.
+        """
+        triangles = grid_triangles(3, 4)
+        self.assertEqual(triangles.shape, (2 * 2 * 3, 3))
+        positions = grid_topology(3, 4).positions
+        corners = positions[triangles]
+        ab = corners[:, 1] - corners[:, 0]
+        ac = corners[:, 2] - corners[:, 0]
+        areas = 0.5 * np.abs(ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0])
+        np.testing.assert_allclose(areas, 0.5)
+        self.assertAlmostEqual(areas.sum(), 2 * 3)
+
+    def test_edges_belong_to_the_grid(self):
+        """
+        Test that the triangle edges are structural or diagonal springs of the grid.
+        """
+        triangles = grid_triangles(3, 3)
+        edges = {
+            tuple(sorted(edge))
+            for edge in grid_topology(
+                3, 3, pattern=("structural", "diagonal")
+            ).edges.tolist()
+        }
+        for triangle in triangles.tolist():
+            for k in range(3):
+                self.assertIn(tuple(sorted((triangle[k], triangle[k - 1]))), edges)
+
+    def test_memoized_and_read_only(self):
+        """
+        Test that the triangles are cached and cannot be modified in place.
+        """
+        triangles = grid_triangles(2, 2)
+        self.assertIs(grid_triangles(2, 2), triangles)
+        with self.assertRaises(ValueError):
+            triangles[0, 0] = 3
+
+    def test_invalid_arguments(self):
+        """
+        Test that non-positive sizes raise errors.
+        """
+        with self.assertRaises(ValueError):
+            grid_triangles(0, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -137,6 +137,81 @@ class TestVector2D(unittest.TestCase):
         extreme_vector = Vector2D(1e10, 1e10)
         self.assertAlmostEqual(extreme_vector.magnitude(), 1.41421356237e10, places=1)
 
+    def test_unchecked_constructor(self):
+        """
+        Test that the unchecked constructor builds an equal vector.
+        """
+        vector = Vector2D.unchecked(3.0, 4.0)
+        self.assertIsInstance(vector, Vector2D)
+        self.assertEqual(vector, Vector2D(3.0, 4.0))
+
+    def test_slots(self):
+        """
+        Test that vectors carry no per-instance attribute dictionary.
+        """
+        vector = Vector2D(1.0, 2.0)
+        self.assertFalse(hasattr(vector, "__dict__"))
+        with self.assertRaises(AttributeError):
+            vector.z = 3.0
+
+    def test_in_place_operators(self):
+        """
+        Test that the in-place operators mutate the vector instead of replacing it.
+        """
+        vector = Vector2D(1.0, 2.0)
+        original = vector
+        vector += Vector2D(1.0, 1.0)
+        vector -= 0.5
+        vector *= 2.0
+        vector /= 4.0
+        self.assertIs(vector, original)
+        self.assertEqual(vector, Vector2D(0.75, 1.25))
+
+    def test_in_place_operators_leave_copies_untouched(self):
+        """
+        Test that a copy keeps its value when the original is mutated in place.
+        """
+        vector = Vector2D(1.0, 2.0)
+        snapshot = vector.copy()
+        vector += Vector2D(5.0, 5.0)
+        self.assertEqual(snapshot, Vector2D(1.0, 2.0))
+
+    def test_invalid_in_place_operations(self):
+        """
+        Test that invalid in-place operations raise errors and leave the vector unchanged.
+        """
+        vector = Vector2D(3.0, 4.0)
+        with self.assertRaises(TypeError):
+            vector += "invalid_vector"
+        with self.assertRaises(TypeError):
+            vector *= "invalid_scalar"
+        self.assertEqual(vector, Vector2D(3.0, 4.0))
+
+    def test_length_squared(self):
+        """
+        Test the squared magnitude and squared distance helpers.
+        """
+        vector = Vector2D(3.0, 4.0)
+        self.assertEqual(vector.length_squared(), 25.0)
+        self.assertEqual(vector.distance_squared_to(Vector2D(0.0, 0.0)), 25.0)
+
+    def test_add_scaled(self):
+        """
+        Test that add_scaled adds a scaled vector in place.
+        """
+        vector = Vector2D(1.0, 1.0)
+        result = vector.add_scaled(Vector2D(2.0, -4.0), 0.5)
+        self.assertIs(result, vector)
+        self.assertEqual(vector, Vector2D(2.0, -1.0))
+
+    def test_set(self):
+        """
+        Test that set overwrites both components in place.
+        """
+        vector = Vector2D(1.0, 1.0)
+        self.assertIs(vector.set(5.0, 6.0), vector)
+        self.assertEqual(vector, Vector2D(5.0, 6.0))
+
 
 if __name__ == "__main__":
     unittest.main()
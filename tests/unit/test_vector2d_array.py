@@ -0,0 +1,150 @@
+# test_vector2d_array.py
+# Unit tests for the Vector2DArray class.
+
+import unittest
+
+import numpy as np
+
+from core.vector2d import Vector2D
+from core.vector2d_array import Vector2DArray
+
+
+class TestVector2DArray(unittest.TestCase):
+    """
+    Unit tests for the Vector2DArray class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.vectors = Vector2DArray([(3.0, 4.0), (1.0, 0.0), (0.0, -2.0)])
+
+    def test_initialization(self):
+        """
+        Test that the batch wraps an (N, 2) float array.
+        """
+        self.assertEqual(len(self.vectors), 3)
+        self.assertEqual(self.vectors.data.shape, (3, 2))
+        self.assertTrue(np.array_equal(self.vectors.xs, [3.0, 1.0, 0.0]))
+        self.assertTrue(np.array_equal(self.vectors.ys, [4.0, 0.0, -2.0]))
+        self.assertEqual(len(Vector2DArray()), 0)
+
+    def test_invalid_initialization(self):
+        """
+        Test that data that is not made of (x, y) rows is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Vector2DArray([1.0, 2.0, 3.0])
+
+    def test_list_conversions(self):
+        """
+        Test the conversions to and from lists of Vector2D.
+        """
+        vectors = [Vector2D(1.0, 2.0), Vector2D(3.0, 4.0)]
+        batch = Vector2DArray.from_vectors(vectors)
+        self.assertEqual(batch.to_vectors(), vectors)
+        self.assertEqual(list(batch), vectors)
+        self.assertEqual(batch[1], Vector2D(3.0, 4.0))
+        self.assertIsInstance(batch[0:1], Vector2DArray)
+
+    def test_setitem(self):
+        """
+        Test that single vectors can be written into the batch.
+        """
+        self.vectors[1] = Vector2D(5.0, 6.0)
+        self.assertEqual(self.vectors[1], Vector2D(5.0, 6.0))
+
+    def test_arithmetic(self):
+        """
+        Test addition and subtraction with batches, single vectors and scalars.
+        """
+        other = Vector2DArray([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)])
+        self.assertEqual(
+            self.vectors + other, Vector2DArray([(4.0, 5.0), (3.0, 2.0), (3.0, 1.0)])
+        )
+        self.assertEqual(
+            self.vectors - Vector2D(1.0, 0.0),
+            Vector2DArray([(2.0, 4.0), (0.0, 0.0), (-1.0, -2.0)]),
+        )
+        self.assertEqual(
+            Vector2D(1.0, 0.0) + self.vectors,
+            Vector2DArray([(4.0, 4.0), (2.0, 0.0), (1.0, -2.0)]),
+        )
+        self.assertEqual(
+            self.vectors + 1.0, Vector2DArray([(4.0, 5.0), (2.0, 1.0), (1.0, -1.0)])
+        )
+        self.assertEqual(
+            -self.vectors, Vector2DArray([(-3.0, -4.0), (-1.0, 0.0), (0.0, 2.0)])
+        )
+
+    def test_scaling(self):
+        """
+        Test multiplication and division by scalars and per-vector scalars.
+        """
+        self.assertEqual(
+            self.vectors * 2.0, Vector2DArray([(6.0, 8.0), (2.0, 0.0), (0.0, -4.0)])
+        )
+        self.assertEqual(
+            2.0 * self.vectors, Vector2DArray([(6.0, 8.0), (2.0, 0.0), (0.0, -4.0)])
+        )
+        self.assertEqual(
+            self.vectors / [1.0, 2.0, 4.0],
+            Vector2DArray([(3.0, 4.0), (0.5, 0.0), (0.0, -0.5)]),
+        )
+
+    def test_in_place_operators(self):
+        """
+        Test that the in-place operators mutate the batch.
+        """
+        data = self.vectors.data
+        self.vectors += Vector2D(1.0, 1.0)
+        self.vectors *= 2.0
+        self.vectors.add_scaled(Vector2D(1.0, 0.0), [1.0, 0.0, -1.0])
+        self.assertIs(self.vectors.data, data)
+        self.assertEqual(
+            self.vectors, Vector2DArray([(9.0, 10.0), (4.0, 2.0), (1.0, -2.0)])
+        )
+
+    def test_reductions(self):
+        """
+        Test magnitude, dot product and distance.
+        """
+        self.assertTrue(np.allclose(self.vectors.magnitude(), [5.0, 1.0, 2.0]))
+        self.assertTrue(np.allclose(self.vectors.length_squared(), [25.0, 1.0, 4.0]))
+        self.assertTrue(
+            np.allclose(self.vectors.dot(Vector2D(1.0, 1.0)), [7.0, 1.0, -2.0])
+        )
+        self.assertTrue(np.allclose(self.vectors.dot(self.vectors), [25.0, 1.0, 4.0]))
+        self.assertTrue(
+            np.allclose(self.vectors.distance_to(Vector2D(0.0, 0.0)), [5.0, 1.0, 2.0])
+        )
+
+    def test_normalize(self):
+        """
+        Test that every vector is normalized, and that zero vectors are rejected.
+        """
+        self.assertTrue(np.allclose(self.vectors.normalize().magnitude(), 1.0))
+        with self.assertRaises(ZeroDivisionError):
+            Vector2DArray.zeros(2).normalize()
+
+    def test_invalid_operations(self):
+        """
+        Test that invalid operations raise errors.
+        """
+        with self.assertRaises(TypeError):
+            self.vectors + "invalid_vector"
+        with self.assertRaises(TypeError):
+            self.vectors * Vector2D(1.0, 1.0)
+
+    def test_copy(self):
+        """
+        Test that a copy does not share data with the original.
+        """
+        copy = self.vectors.copy()
+        self.vectors += 1.0
+        self.assertEqual(copy[0], Vector2D(3.0, 4.0))
+
+
+if __name__ == "__main__":
+    unittest.main()